@@ -1,5 +1,33 @@
 import re
 
+_enumReverseMaps = {}
+
+def getEnumReverseMap(enumClass):
+    """
+    Returns a cached ``{index: key}`` mapping for the enumerators on the
+    specified class. The mapping is built on first request only.
+
+    :param enumClass: A class with enumerator keys, for example
+        :class:`~maya.OpenMaya.MFn`,
+        :class:`~maya.OpenMaya.MFnNumericData`,
+        :class:`~maya.OpenMaya.MFnData`
+        etc.
+    :type enumClass: :class:`~maya.OpenMaya.MFn`
+    :return: The mapping.
+    :rtype: :class:`dict`
+    """
+    try:
+        return _enumReverseMaps[enumClass]
+
+    except KeyError:
+        keys = [k for k in enumClass.__dict__.keys(
+                ) if re.match(r"^k[A-Z0-9].*$", k)]
+
+        _enumReverseMaps[enumClass] = out = dict(
+            [(enumClass.__dict__[key], key) for key in keys])
+
+        return out
+
 def enumIndexToKey(index, enumClass):
     """
     Given an integer enumerator index, returns the matching key.
@@ -14,7 +42,4 @@ def enumIndexToKey(index, enumClass):
     :return: The key.
     :rtype: :class:`str`
     """
-    keys = [k for k in enumClass.__dict__.keys(
-            ) if re.match(r"^k[A-Z0-9].*$", k)]
-
-    return dict([(enumClass.__dict__[key], key) for key in keys])[index]
\ No newline at end of file
+    return getEnumReverseMap(enumClass)[index]
@@ -4,6 +4,14 @@ The contents of this module can be directly accessed via the
 
     * The entire :mod:`pymel.core` namespace
     * :class:`~paya.lib.names.Name`
+    * :class:`~paya.lib.nodereuse.ReuseNodes`
+    * :class:`~paya.lib.lazymath.LazyMath`
+    * :class:`~paya.lib.mathops.FoldConstants`
+    * :class:`~paya.lib.buildbatch.BuildBatch`
+    * :class:`~paya.lib.spatialindex.SpatialIndex`
+    * :class:`~paya.lib.deformerindex.DeformerIndex`
+    * :class:`~paya.lib.symmetry.SymmetryMap`
+    * :class:`~paya.lib.buildprofiler.BuildProfiler`
     * :func:`~paya.lib.mathops.createMatrix` / ``cm``
     * :class:`~paya.lib.skel.Chain`
     * ``controlShapes``, an instance of :class:`~paya.lib.controlshapes.ControlShapesLibrary`
@@ -25,8 +33,15 @@ from pymel.core import *
 
 from paya.util import toOs
 from paya.lib.names import Name
+from paya.lib.nodereuse import ReuseNodes
+from paya.lib.lazymath import LazyMath
+from paya.lib.buildbatch import BuildBatch
+from paya.lib.spatialindex import SpatialIndex
+from paya.lib.deformerindex import DeformerIndex
+from paya.lib.symmetry import SymmetryMap
+from paya.lib.buildprofiler import BuildProfiler
 from paya.lib.typeman import conform
-from paya.lib.mathops import createMatrix, \
+from paya.lib.mathops import FoldConstants, createMatrix, \
     createScaleMatrix, cm, csm, degToUI, info as mathInfo
 from paya.lib.skel import Chain
 from paya.lib.controls import createControl, \
@@ -0,0 +1,538 @@
+"""
+Optional NumPy backend for the value-only (soft) paths of the curve-framing
+functions in :mod:`paya.lib.mathops`.
+
+The functions here take and return ``(N, 3)`` vector arrays and ``(N, 4, 4)``
+matrix arrays. They're dispatched to automatically by their
+:mod:`~paya.lib.mathops` counterparts when no plugs are involved, NumPy is
+available and ``config['useNumpy']`` is ``True`` (it's ``False`` by
+default, or when the key is missing); they can also be called directly, for
+example by layout tools that already hold sample arrays. Array inputs are
+always handled here, regardless of the setting.
+
+Matrices follow Maya's row-vector convention: rows 0-2 are the X, Y and Z
+axes, and row 3 is the translation.
+"""
+
+import pymel.core as p
+
+from paya.config import config
+from paya.lib.typeman import conformVectorArg
+
+try:
+    import numpy as np
+
+except ImportError:
+    np = None
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    AVAILABILITY / CONVERSIONS
+#----------------------------------------------------------|
+
+def available():
+    """
+    :return: ``True`` if NumPy could be imported and the backend is enabled
+        via ``config['useNumpy']``.
+    :rtype: bool
+    """
+    return np is not None and config.get('useNumpy', False)
+
+def requireNumpy():
+    """
+    :raises ImportError: NumPy isn't available.
+    """
+    if np is None:
+        raise ImportError("This operation requires NumPy.")
+
+def isArray(item):
+    """
+    :param item: the item to inspect
+    :return: ``True`` if *item* is a NumPy array.
+    :rtype: bool
+    """
+    return np is not None and isinstance(item, np.ndarray)
+
+def asVectorArray(vectors):
+    """
+    :param vectors: the vectors to convert; any components beyond the
+        first three (for example the W of a
+        :class:`~paya.runtime.data.Point`) are dropped
+    :type vectors: :class:`numpy.ndarray`, [list, tuple,
+        :class:`~paya.runtime.data.Vector`]
+    :return: An ``(N, 3)`` float array.
+    :rtype: :class:`numpy.ndarray`
+    """
+    if not isArray(vectors):
+        vectors = [tuple(vector)[:3] for vector in vectors]
+
+    vectors = np.asarray(vectors, dtype=float)
+
+    if not vectors.size:
+        return np.zeros((0, 3))
+
+    return vectors.reshape(-1, vectors.shape[-1])[:, :3]
+
+def conformVectorArray(arg, num):
+    """
+    Array version of :func:`~paya.lib.typeman.conformVectorArg`.
+
+    :param arg: a single vector value, or one vector value per member
+    :type arg: :class:`numpy.ndarray`, list, tuple,
+        :class:`~paya.runtime.data.Vector`
+    :param int num: the required number of vectors
+    :raises ValueError: Wrong number of vectors.
+    :return: An ``(num, 3)`` float array.
+    :rtype: :class:`numpy.ndarray`
+    """
+    if isArray(arg):
+        arg = asVectorArray(arg)
+
+        if len(arg) == 1:
+            return np.repeat(arg, num, axis=0)
+
+        if len(arg) == num:
+            return arg
+
+        raise ValueError("Wrong number of vectors.")
+
+    return asVectorArray(conformVectorArg(arg, listLength=num))
+
+def asVectors(array):
+    """
+    :param array: an ``(N, 3)`` array
+    :type array: :class:`numpy.ndarray`
+    :return: The rows, as PyMEL vectors.
+    :rtype: [:class:`~paya.runtime.data.Vector`]
+    """
+    return [p.datatypes.Vector(row) for row in array.tolist()]
+
+def asMatrices(array):
+    """
+    :param array: an ``(N, 4, 4)`` array
+    :type array: :class:`numpy.ndarray`
+    :return: The members, as PyMEL matrices.
+    :rtype: [:class:`~paya.runtime.data.Matrix`]
+    """
+    return [p.datatypes.Matrix(member) for member in array.tolist()]
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    PRIMITIVES
+#----------------------------------------------------------|
+
+def dots(a, b):
+    """
+    :return: Row-wise dot products of two ``(N, 3)`` arrays.
+    :rtype: :class:`numpy.ndarray`
+    """
+    return np.einsum('ij,ij->i', a, b)
+
+def lengths(vectors):
+    """
+    :return: Row-wise lengths of an ``(N, 3)`` array.
+    :rtype: :class:`numpy.ndarray`
+    """
+    return np.sqrt(dots(vectors, vectors))
+
+def normalize(vectors):
+    """
+    Normalizes an ``(N, 3)`` array row-wise. Zero-length rows are left
+    as they are, as with :meth:`pymel.core.datatypes.Vector.normal`.
+
+    :rtype: :class:`numpy.ndarray`
+    """
+    lens = lengths(vectors)
+    lens[lens == 0.0] = 1.0
+
+    return vectors / lens[:, None]
+
+def rotateByAxisAngle(vectors, axes, angles):
+    """
+    Rotates each vector around the matching axis by the matching angle,
+    using Rodrigues' formula.
+
+    :param vectors: the vectors to rotate
+    :type vectors: :class:`numpy.ndarray`
+    :param axes: the rotation axes; needn't be normalized
+    :type axes: :class:`numpy.ndarray`
+    :param angles: per-vector angles, in radians
+    :type angles: :class:`numpy.ndarray`
+    :return: The rotated vectors.
+    :rtype: :class:`numpy.ndarray`
+    """
+    axes = normalize(axes)
+    cos = np.cos(angles)[:, None]
+    sin = np.sin(angles)[:, None]
+
+    return vectors * cos \
+        + np.cross(axes, vectors) * sin \
+        + axes * dots(axes, vectors)[:, None] * (1.0 - cos)
+
+def axisAngleMatrices(axes, angles):
+    """
+    :param axes: the rotation axes; needn't be normalized
+    :type axes: :class:`numpy.ndarray`
+    :param angles: per-axis angles, in radians
+    :type angles: :class:`numpy.ndarray`
+    :return: ``(N, 3, 3)`` rotation matrices, for use with row vectors.
+    :rtype: :class:`numpy.ndarray`
+    """
+    axes = normalize(axes)
+    x, y, z = axes.T
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+    inv = 1.0 - cos
+
+    out = np.empty((len(axes), 3, 3))
+
+    out[:, 0, 0] = cos + x * x * inv
+    out[:, 0, 1] = x * y * inv + z * sin
+    out[:, 0, 2] = x * z * inv - y * sin
+    out[:, 1, 0] = y * x * inv - z * sin
+    out[:, 1, 1] = cos + y * y * inv
+    out[:, 1, 2] = y * z * inv + x * sin
+    out[:, 2, 0] = z * x * inv + y * sin
+    out[:, 2, 1] = z * y * inv - x * sin
+    out[:, 2, 2] = cos + z * z * inv
+
+    return out
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    FRAMING
+#----------------------------------------------------------|
+
+def deflipVectors(vectors):
+    """
+    Array version of :func:`paya.lib.mathops.deflipVectors`.
+
+    :param vectors: the source vectors
+    :type vectors: :class:`numpy.ndarray`
+    :return: The normalized, deflipped vectors.
+    :rtype: :class:`numpy.ndarray`
+    """
+    vectors = normalize(asVectorArray(vectors))
+
+    if len(vectors) > 1:
+        flip = np.concatenate(
+            [[False], dots(vectors[:-1], vectors[1:]) < 0.0])
+
+        vectors[flip] *= -1.0
+
+    return vectors
+
+def _blendMissing(vectors, missing, ratios):
+    # Array version of mathops.blendNones()
+    keyed = ~missing
+
+    out = vectors.copy()
+
+    for i in range(3):
+        out[missing, i] = np.interp(ratios[missing],
+                                    ratios[keyed], vectors[keyed, i])
+
+    return out
+
+def getFramedAimAndUpVectors(points, upVectors, tolerance=1e-7):
+    """
+    Array version of :func:`paya.lib.mathops.getFramedAimAndUpVectors`.
+
+    :param points: the starting points
+    :type points: :class:`numpy.ndarray`
+    :param upVectors: one up hint vector, or one vector per point
+    :type upVectors: :class:`numpy.ndarray`
+    :param float tolerance: any cross products below this length will be
+        interpolated from neighbours; defaults to 1e-7
+    :raises ValueError: Fewer than two points were provided.
+    :return: An array of aim vectors and an array of up vectors.
+    :rtype: (:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+    """
+    points = asVectorArray(points)
+    refVecs = conformVectorArray(upVectors, len(points))
+    ln = len(points)
+
+    if ln < 2:
+        raise ValueError("Need at least two points.")
+
+    if ln == 2:
+        aimVec = points[1] - points[0]
+        return np.array([aimVec, aimVec]), refVecs.copy()
+
+    aimVecs = np.diff(points, axis=0)
+
+    aimVecLengths = lengths(aimVecs)
+    lengthRatios = np.concatenate(
+        [[0.0], np.cumsum(aimVecLengths) / aimVecLengths.sum()])
+
+    normalAims = normalize(aimVecs)
+    upVecs = np.cross(normalAims[:-1], normalAims[1:])
+    missing = lengths(upVecs) < tolerance
+
+    if missing.all():
+        upVecs = refVecs[:len(aimVecs)-1].copy()
+
+    else:
+        upVecs = normalize(upVecs)
+
+        # Bias towards the reference vectors
+        flip = ~missing & (dots(refVecs[1:-1], upVecs) < 0.0)
+        upVecs[flip] *= -1.0
+
+        if missing.any():
+            upVecs = _blendMissing(upVecs, missing, lengthRatios[1:-1])
+
+        upVecs = deflipVectors(upVecs)
+
+    # Pad
+    upVecs = np.concatenate([upVecs[:1], upVecs, upVecs[-1:]])
+    aimVecs = np.concatenate([aimVecs, aimVecs[-1:]])
+
+    return aimVecs, upVecs
+
+def createAimMatrices(aimAxis, aimVectors, upAxis, upVectors, points):
+    """
+    Array equivalent of calling
+    ``createMatrix(aimAxis, aimVector, upAxis, upVector, t=point).pick(t=True, r=True)``
+    on each member.
+
+    :param str aimAxis: the axis to align to the aim vectors, e.g. ``'-y'``
+    :param aimVectors: the aim vectors
+    :type aimVectors: :class:`numpy.ndarray`
+    :param str upAxis: the axis to align to the up vectors, e.g. ``'x'``
+    :param upVectors: the up vectors
+    :type upVectors: :class:`numpy.ndarray`
+    :param points: the translations
+    :type points: :class:`numpy.ndarray`
+    :return: ``(N, 4, 4)`` orthonormal matrices.
+    :rtype: :class:`numpy.ndarray`
+    """
+    vec1 = asVectorArray(aimVectors)
+    vec2 = asVectorArray(upVectors)
+
+    absAxis1 = aimAxis.strip('-')
+    absAxis2 = upAxis.strip('-')
+    absAxis3 = [ax for ax in 'xyz' if ax not in (absAxis1, absAxis2)][0]
+
+    if '-' in aimAxis:
+        vec1 = vec1 * -1.0
+
+    if '-' in upAxis:
+        vec2 = vec2 * -1.0
+
+    if '{}{}'.format(absAxis1, absAxis2) in 'xyzxy':
+        vec3 = np.cross(vec1, vec2)
+        vec2 = np.cross(vec3, vec1)
+
+    else:
+        vec3 = np.cross(vec2, vec1)
+        vec2 = np.cross(vec1, vec3)
+
+    out = np.zeros((len(vec1), 4, 4))
+
+    for axis, vec in zip(
+            (absAxis1, absAxis2, absAxis3),
+            (vec1, vec2, vec3)
+    ):
+        out[:, 'xyz'.index(axis), :3] = normalize(vec)
+
+    out[:, 3, :3] = asVectorArray(points)
+    out[:, 3, 3] = 1.0
+
+    return out
+
+def getChainedAimMatrices(points, aimAxis, upAxis,
+                          upVectors, framed=False, tolerance=1e-7):
+    """
+    Array version of the soft path of
+    :func:`paya.lib.mathops.getChainedAimMatrices`.
+
+    :param points: the starting points
+    :type points: :class:`numpy.ndarray`
+    :param str aimAxis: the axis to align to the aiming vectors
+    :param str upAxis: the axis to align to the resolved up vectors
+    :param upVectors: one up vector, or one vector per point
+    :type upVectors: :class:`numpy.ndarray`
+    :param bool framed: perform cross product framing via
+        :func:`getFramedAimAndUpVectors`; defaults to False
+    :param float tolerance: if *framed* is on, any cross products below
+        this length will be interpolated from neighbours; defaults to 1e-7
+    :return: ``(N, 4, 4)`` chained-aiming matrices.
+    :rtype: :class:`numpy.ndarray`
+    """
+    points = asVectorArray(points)
+    upVectors = conformVectorArray(upVectors, len(points))
+
+    if framed:
+        aimVectors, upVectors = getFramedAimAndUpVectors(
+            points, upVectors, tolerance=tolerance)
+
+    else:
+        if len(points) < 2:
+            raise ValueError("Need at least two points.")
+
+        aimVectors = np.diff(points, axis=0)
+        aimVectors = np.concatenate([aimVectors, aimVectors[-1:]])
+
+    return createAimMatrices(aimAxis, aimVectors, upAxis, upVectors, points)
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    PARALLEL TRANSPORT
+#----------------------------------------------------------|
+
+def parallelTransport(normal, tangents, fromEnd=False):
+    """
+    Array version of the soft path of
+    :func:`paya.lib.mathops.parallelTransport`. The per-step rotations
+    are computed in one pass; only their accumulation is sequential.
+
+    :param normal: the starting normal
+    :type normal: list, tuple, :class:`~paya.runtime.data.Vector`,
+        :class:`numpy.ndarray`
+    :param tangents: the tangent samples along the curve
+    :type tangents: :class:`numpy.ndarray`
+    :param bool fromEnd: indicate that *normal* is at the end, not the
+        start, of the sequence; defaults to False
+    :return: The resolved normals.
+    :rtype: :class:`numpy.ndarray`
+    """
+    tangents = asVectorArray(tangents)
+
+    if fromEnd:
+        tangents = tangents[::-1]
+
+    normal = asVectorArray([normal])[0]
+    numTangents = len(tangents)
+
+    # Perpendicularise
+    firstTangent = normalize(tangents[:1])[0]
+    normal = normal - np.dot(normal, firstTangent) * firstTangent
+
+    out = np.empty((numTangents, 3))
+    out[0] = normal
+
+    if numTangents > 1:
+        normalTangents = normalize(tangents)
+        thisTangents = normalTangents[:-1]
+        nextTangents = normalTangents[1:]
+
+        cosines = dots(thisTangents, nextTangents)
+        binormals = np.cross(thisTangents, nextTangents)
+
+        rotate = (cosines < 1.0-1e-7) & (lengths(binormals) > 0.0)
+
+        matrices = np.zeros((numTangents-1, 3, 3))
+        matrices[:] = np.identity(3)
+
+        matrices[rotate] = axisAngleMatrices(
+            binormals[rotate],
+            np.arccos(np.clip(cosines[rotate], -1.0, 1.0))
+        )
+
+        for i, matrix in enumerate(matrices):
+            out[i+1] = np.dot(out[i], matrix)
+
+    if fromEnd:
+        out = out[::-1]
+
+    return out
+
+def _unwindAngles(angles, unwindSwitch):
+    # Array version of Angle.unwindSwitch(), for radians in [0, 2pi]
+    wind = 2.0 * np.pi
+
+    if unwindSwitch == 1:
+        return np.mod(angles, wind)
+
+    if unwindSwitch == 2:
+        return np.mod(angles, -wind)
+
+    angles = np.mod(angles, wind)
+    angles[angles > np.pi] -= wind
+
+    return angles
+
+def blendCurveNormalSets(normalsA, normalsB,
+                         tangents, ratios=None, unwindSwitch=0):
+    """
+    Array version of the soft path of
+    :func:`paya.lib.mathops.blendCurveNormalSets`.
+
+    :param normalsA: the first set of normals
+    :type normalsA: :class:`numpy.ndarray`
+    :param normalsB: the second set of normals
+    :type normalsB: :class:`numpy.ndarray`
+    :param tangents: the curve tangents around which to rotate the normals
+    :type tangents: :class:`numpy.ndarray`
+    :param ratios: per-normal blend ratios; if omitted, a uniform range
+        will be generated; defaults to None
+    :type ratios: None, [float], :class:`numpy.ndarray`
+    :param int unwindSwitch: 0 for shortest, 1 for positive and 2 for
+        negative angle unwinding; defaults to 0
+    :raises ValueError: Unequal argument lengths.
+    :return: The blended normals.
+    :rtype: :class:`numpy.ndarray`
+    """
+    normalsA = asVectorArray(normalsA)
+    normalsB = asVectorArray(normalsB)
+    tangents = asVectorArray(tangents)
+    num = len(tangents)
+
+    if ratios is None:
+        ratios = np.linspace(0.0, 1.0, num)
+
+    else:
+        ratios = np.asarray(ratios, dtype=float)
+
+    if not (len(normalsA) == len(normalsB) == len(ratios) == num):
+        raise ValueError("Unequal argment lengths.")
+
+    # Vector.angleTo(clockNormal=...)
+    unitA = normalize(normalsA)
+    unitB = normalize(normalsB)
+
+    angles = np.arccos(np.clip(dots(unitA, unitB), -1.0, 1.0))
+    clockwise = dots(normalize(np.cross(normalsA, tangents)), unitB) > 0.0
+    angles[clockwise] = 2.0 * np.pi - angles[clockwise]
+
+    angles = _unwindAngles(angles, int(unwindSwitch)) * ratios
+
+    return rotateByAxisAngle(normalsA, tangents, angles)
+
+def bidirectionalParallelTransport(startNormal, endNormal,
+                                   tangents, ratios=None, unwindSwitch=0):
+    """
+    Array version of the soft path of
+    :func:`paya.lib.mathops.bidirectionalParallelTransport`.
+
+    :param startNormal: the normal at the start of the blend range, or
+        ``None``
+    :param endNormal: the normal at the end of the blend range, or ``None``
+    :param tangents: tangents along the blend range
+    :type tangents: :class:`numpy.ndarray`
+    :param ratios: per-tangent blend ratios; defaults to None
+    :type ratios: None, [float], :class:`numpy.ndarray`
+    :param int unwindSwitch: 0 for shortest, 1 for positive and 2 for
+        negative angle unwinding; defaults to 0
+    :raises ValueError: Both *startNormal* and *endNormal* are ``None``.
+    :return: The normals.
+    :rtype: :class:`numpy.ndarray`
+    """
+    if startNormal is None and endNormal is None:
+        raise ValueError(
+            "Please provide a start normal and / or an end normal.")
+
+    tangents = asVectorArray(tangents)
+    fwds = bwds = None
+
+    if startNormal is not None:
+        fwds = parallelTransport(startNormal, tangents)
+
+    if endNormal is not None:
+        bwds = parallelTransport(endNormal, tangents, fromEnd=True)
+
+    if fwds is not None:
+        if bwds is not None:
+            return blendCurveNormalSets(fwds, bwds, tangents,
+                                        ratios=ratios,
+                                        unwindSwitch=unwindSwitch)
+        return fwds
+
+    return bwds
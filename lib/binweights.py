@@ -0,0 +1,678 @@
+"""
+Compact binary skin weight files, read and written via bulk
+:class:`MFnSkinCluster <maya.api.OpenMayaAnim.MFnSkinCluster>` calls rather
+than ``deformerWeights`` XML. Requires NumPy.
+
+File layout (all values little-endian):
+
+-   8-byte magic (``b'PAYAWTS\\0'``)
+-   ``uint32`` format version
+-   ``uint32`` header length
+-   UTF-8 JSON header, space-padded to a 16-byte boundary; see
+    :func:`readHeader`
+-   16-byte-aligned arrays, at the offsets recorded in the header:
+
+    -   ``indptr`` (``int64``, one per component plus one): CSR row offsets
+    -   ``indices`` (``uint16`` or ``uint32``): influence indices
+    -   ``weights`` (``float32`` or ``float16``): non-zero weights
+    -   ``blendWeights`` (``float32``, one per component, optional): DQ
+        blend weights
+
+The header can be read without touching the arrays, and the arrays can be
+memory-mapped.
+"""
+
+import hashlib
+import json
+import os
+import struct
+
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+
+import paya.lib.arraymath as _am
+from paya.lib.arraymath import np
+from paya.util import short
+
+magic = b'PAYAWTS\x00'
+version = 1
+fileExtension = '.pwb'
+manifestName = 'weightsManifest.json'
+
+_preamble = struct.Struct('<8sII')
+_alignment = 16
+
+# The maximum number of weights passed to each setWeights() call by
+# apply(), to bound the size of temporary MDoubleArray instances
+applyChunkSize = 1 << 20
+
+#------------------------------------------------------------|
+#------------------------------------------------------------|    FILE I/O
+#------------------------------------------------------------|
+
+def isBinaryWeightsFile(filepath):
+    """
+    :param str filepath: the file to inspect
+    :return: ``True`` if the file starts with the binary weights magic.
+    :rtype: bool
+    """
+    with open(filepath, 'rb') as f:
+        return f.read(len(magic)) == magic
+
+def readHeader(filepath):
+    """
+    Reads the header of a binary weights file without loading its arrays.
+
+    :param str filepath: the file to read
+    :raises ValueError: The file isn't a binary weights file, or its
+        version isn't supported.
+    :return: The header, with the following keys:
+
+        -   ``'shape'``, ``'deformer'``, ``'deformerType'``: node names
+        -   ``'componentType'``: ``'vertex'`` or ``'cv'``
+        -   ``'numComponents'``, ``'numInfluences'``, ``'numWeights'``
+        -   ``'influences'``: influence names, in index order
+        -   ``'settings'``: skinCluster settings, for recreation
+        -   ``'arrays'``: per-array ``'dtype'``, ``'offset'`` and
+            ``'count'``
+    :rtype: dict
+    """
+    with open(filepath, 'rb') as f:
+        _magic, _version, headerLength = _preamble.unpack(
+            f.read(_preamble.size))
+
+        if _magic != magic:
+            raise ValueError(
+                "Not a binary weights file: {}".format(filepath))
+
+        if _version > version:
+            raise ValueError(
+                "Unsupported binary weights version {}: {}".format(
+                    _version, filepath))
+
+        return json.loads(f.read(headerLength).decode('utf-8'))
+
+def _align(offset):
+    return -(-offset // _alignment) * _alignment
+
+def write(filepath, header, arrays):
+    """
+    Low-level writer.
+
+    :param str filepath: the destination file
+    :param dict header: header information; the ``'arrays'`` key will be
+        filled in
+    :param dict arrays: name: array pairs; arrays are written in order
+    :return: The written header.
+    :rtype: dict
+    """
+    _am.requireNumpy()
+    arrays = {name: np.ascontiguousarray(array) \
+              for name, array in arrays.items()}
+    header = dict(header)
+
+    def getHeaderBytes(offset):
+        info = {}
+
+        for name, array in arrays.items():
+            offset = _align(offset)
+            info[name] = {'dtype': array.dtype.newbyteorder('<').str,
+                          'offset': offset,
+                          'count': int(array.size)}
+            offset += array.nbytes
+
+        header['arrays'] = info
+        return json.dumps(header).encode('utf-8')
+
+    # Offsets depend on the header length, and vice versa; iterate until
+    # the padded length settles
+    headerLength = 0
+
+    while True:
+        headerBytes = getHeaderBytes(_preamble.size+headerLength)
+        paddedLength = _align(_preamble.size+len(headerBytes)) \
+                       - _preamble.size
+
+        if paddedLength == headerLength:
+            break
+
+        headerLength = paddedLength
+
+    headerBytes += b' ' * (headerLength-len(headerBytes))
+
+    with open(filepath, 'wb') as f:
+        f.write(_preamble.pack(magic, version, headerLength))
+        f.write(headerBytes)
+
+        for name, array in arrays.items():
+            info = header['arrays'][name]
+            f.write(b'\x00' * (info['offset']-f.tell()))
+            f.write(array.astype(info['dtype'], copy=False).tobytes())
+
+    return header
+
+@short(memoryMap='mm')
+def read(filepath, memoryMap=True):
+    """
+    Low-level reader.
+
+    :param str filepath: the file to read
+    :param bool memoryMap/mm: memory-map the arrays instead of reading
+        them into memory; defaults to ``True``
+    :return: The header (see :func:`readHeader`) and a dictionary of
+        arrays.
+    :rtype: (:class:`dict`, :class:`dict`)
+    """
+    _am.requireNumpy()
+    header = readHeader(filepath)
+    arrays = {}
+
+    for name, info in header['arrays'].items():
+        dtype = np.dtype(info['dtype'])
+        count = info['count']
+
+        if memoryMap and count:
+            arrays[name] = np.memmap(filepath, dtype=dtype, mode='r',
+                                     offset=info['offset'], shape=(count,))
+
+        else:
+            with open(filepath, 'rb') as f:
+                f.seek(info['offset'])
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count)
+
+    return header, arrays
+
+#------------------------------------------------------------|
+#------------------------------------------------------------|    PACKING
+#------------------------------------------------------------|
+
+@short(float16='f16', weightTolerance='wt')
+def packWeights(weights, float16=False, weightTolerance=0.0):
+    """
+    Converts a dense weights matrix to CSR arrays.
+
+    :param weights: a ``(numComponents, numInfluences)`` weights array
+    :type weights: :class:`numpy.ndarray`
+    :param bool float16/f16: quantize weights to ``float16``; this halves
+        the size of the weights array, with an error of up to about 2.5e-4;
+        defaults to ``False``
+    :param float weightTolerance/wt: discard weights at or below this
+        value; defaults to 0.0
+    :return: ``indptr``, ``indices`` and ``weights`` arrays.
+    :rtype: (:class:`numpy.ndarray`, :class:`numpy.ndarray`,
+        :class:`numpy.ndarray`)
+    """
+    _am.requireNumpy()
+    weights = np.asarray(weights, dtype=np.float64)
+    numInfluences = weights.shape[1]
+
+    mask = weights > weightTolerance
+    indptr = np.zeros(weights.shape[0]+1, dtype=np.int64)
+    np.cumsum(mask.sum(axis=1), out=indptr[1:])
+
+    rows, cols = np.nonzero(mask)
+    indexType = np.uint16 if numInfluences <= 0xffff else np.uint32
+
+    return (indptr,
+            cols.astype(indexType),
+            weights[rows, cols].astype(
+                np.float16 if float16 else np.float32))
+
+def unpackWeights(indptr, indices, weights, numInfluences):
+    """
+    Converts CSR arrays back to a dense weights matrix.
+
+    :param indptr: CSR row offsets
+    :param indices: influence indices
+    :param weights: non-zero weights
+    :param int numInfluences: the number of influences (columns)
+    :return: A ``(numComponents, numInfluences)`` ``float64`` array.
+    :rtype: :class:`numpy.ndarray`
+    """
+    _am.requireNumpy()
+    indptr = np.asarray(indptr)
+    numComponents = len(indptr)-1
+
+    out = np.zeros((numComponents, numInfluences), dtype=np.float64)
+    rows = np.repeat(np.arange(numComponents), np.diff(indptr))
+    out[rows, np.asarray(indices, dtype=np.int64)] = weights
+
+    return out
+
+#------------------------------------------------------------|
+#------------------------------------------------------------|    SKINCLUSTER ACCESS
+#------------------------------------------------------------|
+
+def _getSkinFn(skinCluster):
+    sel = om2.MSelectionList()
+    sel.add(str(skinCluster))
+
+    return oma2.MFnSkinCluster(sel.getDependNode(0))
+
+def isSupportedShape(shape):
+    """
+    :param shape: the shape to inspect
+    :type shape: str, :class:`~paya.runtime.nodes.DeformableShape`
+    :return: ``True`` if binary weights can be read and written for
+        *shape*, i.e. if it's a mesh or a NURBS curve.
+    :rtype: bool
+    """
+    sel = om2.MSelectionList()
+    sel.add(str(shape))
+    dagPath = sel.getDagPath(0)
+
+    return dagPath.hasFn(om2.MFn.kMesh) \
+           or dagPath.hasFn(om2.MFn.kNurbsCurve)
+
+def _getShapeAccess(skinFn, shape=None):
+    # Returns a dag path, a complete components object, the number of
+    # components and a component type label
+    if shape is None:
+        dagPath = skinFn.getPathAtIndex(0)
+
+    else:
+        sel = om2.MSelectionList()
+        sel.add(str(shape))
+        dagPath = sel.getDagPath(0)
+
+    if dagPath.hasFn(om2.MFn.kMesh):
+        num = om2.MFnMesh(dagPath).numVertices
+        compType = om2.MFn.kMeshVertComponent
+        label = 'vertex'
+
+    elif dagPath.hasFn(om2.MFn.kNurbsCurve):
+        num = om2.MFnNurbsCurve(dagPath).numCVs
+        compType = om2.MFn.kCurveCVComponent
+        label = 'cv'
+
+    else:
+        raise TypeError(
+            "Binary weights are only supported on meshes and "+
+            "NURBS curves: {}".format(dagPath.partialPathName()))
+
+    fn = om2.MFnSingleIndexedComponent()
+    components = fn.create(compType)
+    fn.setCompleteData(num)
+
+    return dagPath, components, num, label
+
+def _getInfluenceNames(skinFn):
+    return [path.partialPathName() for path in skinFn.influenceObjects()]
+
+def _getComponentBlock(label, start, end):
+    fn = om2.MFnSingleIndexedComponent()
+    components = fn.create(om2.MFn.kMeshVertComponent \
+        if label == 'vertex' else om2.MFn.kCurveCVComponent)
+    fn.addElements(list(range(start, end)))
+
+    return components
+
+def matchInfluences(names, skinPaths):
+    """
+    Matches influence names, as stored in file headers, to the
+    influences on a skinCluster.
+
+    :param names: the names to match; these can be full or partial DAG
+        paths, or short names
+    :type names: [str]
+    :param skinPaths: the full DAG paths of the skinCluster influences
+    :type skinPaths: [str]
+    :raises ValueError: Some names couldn't be matched, or matched more
+        than one influence, or more than one name matched the same
+        influence.
+    :return: For each name, the index of the matching influence in
+        *skinPaths*.
+    :rtype: [int]
+    """
+    out = []
+    missing = []
+    ambiguous = []
+
+    for name in names:
+        suffix = name if name.startswith('|') else '|'+name
+        matches = [i for i, path in enumerate(skinPaths) \
+                   if path == name or path.endswith(suffix)]
+
+        if len(matches) == 1:
+            out.append(matches[0])
+
+        elif matches:
+            ambiguous.append(name)
+
+        else:
+            missing.append(name)
+
+    if len(set(out)) != len(out):
+        ambiguous += [name for name, index in zip(names, out) \
+                      if out.count(index) > 1]
+
+    errors = []
+
+    if missing:
+        errors.append("missing: {}".format(', '.join(missing)))
+
+    if ambiguous:
+        errors.append("ambiguous: {}".format(', '.join(ambiguous)))
+
+    if errors:
+        raise ValueError("Couldn't match influences ({}).".format(
+            '; '.join(errors)))
+
+    return out
+
+def extract(skinCluster, shape=None):
+    """
+    Reads skin weights and DQ blend weights from the scene. This is the
+    only part of :func:`dump` that uses the Maya API, and must be run on
+    the main thread; the results can be passed to :func:`encode` and
+    :func:`write` on any thread.
+
+    :param skinCluster: the skinCluster to export
+    :type skinCluster: str, :class:`~paya.runtime.nodes.SkinCluster`
+    :param shape: the shape to export; defaults to the first shape under
+        the skinCluster
+    :type shape: str, :class:`~paya.runtime.nodes.DeformableShape`
+    :return: A partial header, a dense ``(numComponents, numInfluences)``
+        weights array and a blend weights array.
+    :rtype: (:class:`dict`, :class:`numpy.ndarray`,
+        :class:`numpy.ndarray`)
+    """
+    _am.requireNumpy()
+
+    skinFn = _getSkinFn(skinCluster)
+    dagPath, components, num, label = _getShapeAccess(skinFn, shape)
+    influences = _getInfluenceNames(skinFn)
+    numInfluences = len(influences)
+
+    weights, _numInfluences = skinFn.getWeights(dagPath, components)
+
+    # Stream out of the MDoubleArray, rather than via a Python list
+    weights = np.fromiter(weights, dtype=np.float64,
+                          count=len(weights)).reshape(num, numInfluences)
+
+    blendWeights = np.array(skinFn.getBlendWeights(
+        dagPath, components), dtype=np.float32)
+
+    settings = {}
+
+    for attrName in ['skinningMethod', 'maxInfluences',
+                     'maintainMaxInfluences', 'normalizeWeights']:
+        settings[attrName] = skinFn.findPlug(
+            attrName, False).asInt()
+
+    header = {
+        'shape': dagPath.partialPathName(),
+        'deformer': skinFn.name(),
+        'deformerType': 'skinCluster',
+        'componentType': label,
+        'numComponents': num,
+        'numInfluences': numInfluences,
+        'influences': influences,
+        'settings': settings
+    }
+
+    return header, weights, blendWeights
+
+@short(float16='f16', weightTolerance='wt')
+def encode(header,
+           weights,
+           blendWeights=None,
+           float16=False,
+           weightTolerance=0.0):
+    """
+    Packs the output of :func:`extract` for :func:`write`. Safe to call
+    from worker threads.
+
+    :param dict header: the partial header returned by :func:`extract`
+    :param weights: the dense weights array returned by :func:`extract`
+    :type weights: :class:`numpy.ndarray`
+    :param blendWeights: the blend weights array returned by
+        :func:`extract`; defaults to ``None``
+    :type blendWeights: :class:`numpy.ndarray`, ``None``
+    :param bool float16/f16: quantize weights to ``float16``; defaults to
+        ``False``
+    :param float weightTolerance/wt: discard weights at or below this
+        value; defaults to 0.0
+    :return: The completed header, and a dictionary of arrays.
+    :rtype: (:class:`dict`, :class:`dict`)
+    """
+    indptr, indices, values = packWeights(
+        weights, f16=float16, wt=weightTolerance)
+
+    header = dict(header)
+    header['numWeights'] = int(values.size)
+
+    arrays = {'indptr': indptr, 'indices': indices, 'weights': values}
+
+    if blendWeights is not None:
+        arrays['blendWeights'] = np.asarray(blendWeights, dtype=np.float32)
+
+    return header, arrays
+
+@short(shape='sh', float16='f16', weightTolerance='wt')
+def dump(skinCluster,
+         filepath,
+         shape=None,
+         float16=False,
+         weightTolerance=0.0):
+    """
+    Writes skin weights and DQ blend weights to a binary weights file.
+    Equivalent to :func:`extract`, :func:`encode` and :func:`write` in
+    sequence.
+
+    :param skinCluster: the skinCluster to export
+    :type skinCluster: str, :class:`~paya.runtime.nodes.SkinCluster`
+    :param str filepath: the destination file
+    :param shape/sh: the shape to export; defaults to the first shape
+        under the skinCluster
+    :type shape: str, :class:`~paya.runtime.nodes.DeformableShape`
+    :param bool float16/f16: quantize weights to ``float16``; defaults to
+        ``False``
+    :param float weightTolerance/wt: discard weights at or below this
+        value; defaults to 0.0
+    :return: The written header.
+    :rtype: dict
+    """
+    header, arrays = encode(*extract(skinCluster, shape),
+                            f16=float16, wt=weightTolerance)
+
+    return write(filepath, header, arrays)
+
+@short(memoryMap='mm')
+def decode(filepath, memoryMap=False):
+    """
+    Reads a binary weights file into dense arrays, for :func:`apply`.
+    Safe to call from worker threads.
+
+    :param str filepath: the file to read
+    :param bool memoryMap/mm: memory-map the file arrays; defaults to
+        ``False``
+    :return: The header, a dense ``(numComponents, numInfluences)``
+        weights array in file influence order, and a blend weights array
+        (or ``None``).
+    :rtype: (:class:`dict`, :class:`numpy.ndarray`,
+        :class:`numpy.ndarray` | ``None``)
+    """
+    header, arrays = read(filepath, mm=memoryMap)
+
+    weights = unpackWeights(arrays['indptr'], arrays['indices'],
+                            arrays['weights'], header['numInfluences'])
+
+    blendWeights = arrays.get('blendWeights')
+
+    if blendWeights is not None:
+        blendWeights = np.asarray(blendWeights, dtype=np.float64)
+
+    return header, weights, blendWeights
+
+@short(shape='sh', normalize='nr')
+def apply(skinCluster,
+          header,
+          weights,
+          blendWeights=None,
+          shape=None,
+          normalize=False):
+    """
+    Applies the output of :func:`decode` to a skinCluster. Uses the Maya
+    API, and must be run on the main thread. Influences are matched by
+    DAG path via :func:`matchInfluences`; influences on the skinCluster
+    that aren't listed in the header are zeroed.
+
+    :param skinCluster: the skinCluster to load onto
+    :type skinCluster: str, :class:`~paya.runtime.nodes.SkinCluster`
+    :param dict header: the header returned by :func:`decode`
+    :param weights: the dense weights returned by :func:`decode`
+    :type weights: :class:`numpy.ndarray`
+    :param blendWeights: if provided, DQ blend weights to apply; defaults
+        to ``None``
+    :type blendWeights: :class:`numpy.ndarray`, ``None``
+    :param shape/sh: the shape to load onto; defaults to the first shape
+        under the skinCluster
+    :type shape: str, :class:`~paya.runtime.nodes.DeformableShape`
+    :param bool normalize/nr: normalize weights on load; defaults to
+        ``False``
+    :raises ValueError: The component count doesn't match, or influences
+        listed in the header are missing from the skinCluster, or are
+        ambiguous.
+    """
+    skinFn = _getSkinFn(skinCluster)
+    dagPath, components, num, label = _getShapeAccess(skinFn, shape)
+
+    if num != header['numComponents']:
+        raise ValueError(
+            ("Component count mismatch: {} has {}, file "+
+             "has {}.").format(dagPath.partialPathName(), num,
+                               header['numComponents']))
+
+    skinPaths = [path.fullPathName() \
+                 for path in skinFn.influenceObjects()]
+
+    try:
+        mapping = matchInfluences(header['influences'], skinPaths)
+
+    except ValueError as exc:
+        raise ValueError("{}: {}".format(skinFn.name(), exc))
+
+    # Write in blocks of components, so that weights never pass through
+    # one large Python list / MDoubleArray; columns are remapped to the
+    # skinCluster's influence order as we go
+    numInfluences = len(skinPaths)
+    remap = mapping != list(range(numInfluences))
+    influenceIndices = om2.MIntArray(list(range(numInfluences)))
+    blockSize = max(1, applyChunkSize // max(1, numInfluences))
+
+    for start in range(0, num, blockSize):
+        end = min(num, start+blockSize)
+        block = weights[start:end]
+
+        if remap:
+            _block = np.zeros((end-start, numInfluences), dtype=np.float64)
+            _block[:, mapping] = block
+            block = _block
+
+        skinFn.setWeights(dagPath,
+                          _getComponentBlock(label, start, end),
+                          influenceIndices,
+                          om2.MDoubleArray(block.ravel().tolist()),
+                          normalize=normalize)
+
+    if blendWeights is not None:
+        skinFn.setBlendWeights(
+            dagPath, components,
+            om2.MDoubleArray(np.asarray(
+                blendWeights, dtype=np.float64).tolist()))
+
+@short(shape='sh', normalize='nr', blendWeights='bw')
+def load(skinCluster,
+         filepath,
+         shape=None,
+         normalize=False,
+         blendWeights=True):
+    """
+    Applies a binary weights file to a skinCluster. Equivalent to
+    :func:`decode` and :func:`apply` in sequence.
+
+    :param skinCluster: the skinCluster to load onto
+    :type skinCluster: str, :class:`~paya.runtime.nodes.SkinCluster`
+    :param str filepath: the file to read
+    :param shape/sh: the shape to load onto; defaults to the first shape
+        under the skinCluster
+    :type shape: str, :class:`~paya.runtime.nodes.DeformableShape`
+    :param bool normalize/nr: normalize weights on load; defaults to
+        ``False``
+    :param bool blendWeights/bw: load DQ blend weights too, where
+        available; defaults to ``True``
+    :raises ValueError: The component count doesn't match, or influences
+        listed in the file are missing from the skinCluster.
+    """
+    header, weights, _blendWeights = decode(filepath, mm=True)
+
+    apply(skinCluster, header, weights,
+          blendWeights=_blendWeights if blendWeights else None,
+          sh=shape, nr=normalize)
+
+#------------------------------------------------------------|
+#------------------------------------------------------------|    CONTENT HASHING
+#------------------------------------------------------------|
+
+def getContentHash(header, weights, blendWeights=None, options=None):
+    """
+    Hashes the output of :func:`extract`, for incremental archiving. Safe
+    to call from worker threads.
+
+    :param dict header: the partial header returned by :func:`extract`
+    :param weights: the dense weights array returned by :func:`extract`
+    :type weights: :class:`numpy.ndarray`
+    :param blendWeights: the blend weights array returned by
+        :func:`extract`; defaults to ``None``
+    :type blendWeights: :class:`numpy.ndarray`, ``None``
+    :param options: export options that affect the written file, and
+        should therefore trigger a rewrite when changed; defaults to
+        ``None``
+    :type options: dict, None
+    :return: A hex digest.
+    :rtype: str
+    """
+    meta = {key: header[key] for key in [
+        'shape', 'deformer', 'numComponents', 'influences', 'settings']}
+
+    meta['options'] = options or {}
+
+    hsh = hashlib.sha1(json.dumps(meta, sort_keys=True).encode('utf-8'))
+    hsh.update(np.ascontiguousarray(weights, dtype=np.float64).tobytes())
+
+    if blendWeights is not None:
+        hsh.update(np.ascontiguousarray(
+            blendWeights, dtype=np.float32).tobytes())
+
+    return hsh.hexdigest()
+
+def readManifest(dirPath):
+    """
+    :param str dirPath: the weights directory
+    :return: The contents of the directory's manifest, keyed by file
+        name, or an empty dictionary if there isn't one.
+    :rtype: dict
+    """
+    filepath = os.path.join(dirPath, manifestName)
+
+    if os.path.isfile(filepath):
+        with open(filepath, 'r') as f:
+            return json.load(f)
+
+    return {}
+
+def writeManifest(dirPath, manifest):
+    """
+    :param str dirPath: the weights directory
+    :param dict manifest: the manifest contents, keyed by file name; each
+        entry should carry ``'hash'``, ``'deformer'``, ``'shape'`` and
+        ``'options'`` keys
+    """
+    filepath = os.path.join(dirPath, manifestName)
+    tmpPath = filepath+'.tmp'
+
+    with open(tmpPath, 'w') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+
+    os.replace(tmpPath, filepath)
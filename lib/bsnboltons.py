@@ -3,6 +3,8 @@ This module is not for direct import / use. It defines the ``.targets``
 interface on :class:`~paya.runtime.nodes.BlendShape`.
 """
 import os
+import re
+import json
 from tempfile import gettempdir
 
 import maya.cmds as m
@@ -13,6 +15,8 @@ mel.eval('source blendShapeDeleteTargetGroup')
 import pymel.util as _pu
 from paya.util import short, toPosix
 from paya.lib.symmetry import SymmetricModelling
+import paya.lib.arraymath as _am
+from paya.lib.arraymath import np
 import paya.runtime as r
 
 #-------------------------------------------------------------------------------|
@@ -59,6 +63,113 @@ def subtargetValueToIndex(value):
     value = int(value)
     return 5000 + value
 
+#----------------------------------------------------------------|    Delta arrays
+
+deltasFileVersion = 1
+
+_componentPrefixes = {'mesh': 'vtx', 'nurbsCurve': 'cv'}
+
+def _getComponentPrefix(bsn):
+    base = bsn.getBaseObjects()[0]
+    nodeType = base.nodeType()
+
+    try:
+        return _componentPrefixes[nodeType]
+
+    except KeyError:
+        raise TypeError(
+            "Delta arrays are only supported for meshes and NURBS "+
+            "curves, not '{}'.".format(nodeType))
+
+def _readDeltas(inputTargetItem):
+    # Returns (indices, deltas) arrays for an inputTargetItem plug
+    _am.requireNumpy()
+    inputTargetItem = str(inputTargetItem)
+
+    points = m.getAttr(inputTargetItem+'.inputPointsTarget')
+    components = m.getAttr(inputTargetItem+'.inputComponentsTarget')
+
+    if not (points and components):
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 3))
+
+    ranges = []
+
+    for component in components:
+        mt = re.search(r"\[(\d+)(?::(\d+))?\]$", component)
+
+        if mt:
+            start, end = mt.groups()
+            start = int(start)
+            end = start if end is None else int(end)
+            ranges.append(np.arange(start, end+1, dtype=np.int64))
+
+    indices = np.concatenate(ranges) if ranges \
+        else np.zeros(0, dtype=np.int64)
+
+    deltas = np.array(points, dtype=np.float64)[:, :3]
+
+    return indices, deltas
+
+def _compressRanges(indices):
+    # Yields (start, end) pairs for runs in a sorted array
+    if not len(indices):
+        return
+
+    breaks = np.nonzero(np.diff(indices) != 1)[0]
+    starts = np.concatenate([[indices[0]], indices[breaks+1]])
+    ends = np.concatenate([indices[breaks], [indices[-1]]])
+
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        yield start, end
+
+def _writeDeltas(inputTargetItem, indices, deltas, prefix):
+    # Writes (indices, deltas) arrays to an inputTargetItem plug via
+    # undoable setAttr calls
+    _am.requireNumpy()
+    inputTargetItem = str(inputTargetItem)
+
+    indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+    deltas = np.asarray(deltas, dtype=np.float64).reshape(-1, 3)
+
+    if len(indices) != len(deltas):
+        raise ValueError(
+            "Mismatched indices and deltas ({} vs {}).".format(
+                len(indices), len(deltas)))
+
+    # Component lists are compressed into ranges, so sort first to keep
+    # points aligned
+    order = np.argsort(indices, kind='stable')
+    indices = indices[order]
+    deltas = deltas[order]
+
+    if len(indices) and not np.diff(indices).all():
+        raise ValueError("Duplicate indices in deltas.")
+
+    components = ['{}[{}]'.format(prefix, start) if start == end \
+                  else '{}[{}:{}]'.format(prefix, start, end) \
+                  for start, end in _compressRanges(indices)]
+
+    points = [tuple(point)+(1.0,) for point in deltas.tolist()]
+
+    m.setAttr(inputTargetItem+'.inputPointsTarget',
+              len(points), *points, type='pointArray')
+
+    m.setAttr(inputTargetItem+'.inputComponentsTarget',
+              len(components), *components, type='componentList')
+
+def _flipDeltas(indices, deltas, mapping, axis):
+    # Unmatched (-1) entries keep their original indices and deltas, as
+    # in SymmetryMap.flipDeltas()
+    indices = np.asarray(indices, dtype=np.int64)
+    mirrors = np.asarray(mapping, dtype=np.int64)[indices]
+    matched = mirrors >= 0
+
+    deltas = np.array(deltas, dtype=np.float64).reshape(-1, 3)
+    axisIndex = 'xyz'.index(axis.lower().strip('-'))
+    deltas[matched, axisIndex] *= -1.0
+
+    return np.where(matched, mirrors, indices), deltas
+
 #----------------------------------------------------------------|    Classes
 
 class Subtarget:
@@ -199,6 +310,35 @@ class Subtarget:
         self.geoInput.disconnect(inputs=True)
         return self
 
+    #--------------------------------------------------------|    Delta arrays
+
+    def getDeltas(self):
+        """
+        Reads stored deltas in bulk. Live shape inputs are ignored. Requires
+        NumPy.
+
+        :return: A sparse representation of the deltas, as an ``(N,)``
+            array of component indices and an ``(N, 3)`` array of deltas.
+        :rtype: (:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+        """
+        return _readDeltas(self.inputTargetItem)
+
+    def setDeltas(self, indices, deltas):
+        """
+        Writes stored deltas in bulk. This will only have an effect if there
+        is no live shape input. Requires NumPy.
+
+        :param indices: ``(N,)`` component indices
+        :type indices: :class:`numpy.ndarray`, [int]
+        :param deltas: ``(N, 3)`` deltas
+        :type deltas: :class:`numpy.ndarray`, [[float]]
+        :return: ``self``
+        :rtype: :class:`Subtarget`
+        """
+        _writeDeltas(self.inputTargetItem, indices, deltas,
+                     _getComponentPrefix(self.node()))
+        return self
+
     #--------------------------------------------------------|    Repr
 
     def __repr__(self):
@@ -383,6 +523,99 @@ class Target:
 
         return self
 
+    def getDeltas(self):
+        """
+        Reads stored deltas for every subtarget, including inbetweens. See
+        :meth:`Subtarget.getDeltas`.
+
+        :return: A dictionary of logical (sparse, 5000 -> 6000) subtarget
+            index: ``(indices, deltas)``.
+        :rtype: dict
+        """
+        return {index: _readDeltas(self.inputTargetItem[index]) \
+                for index in self.indices()}
+
+    @short(replace='rep')
+    def setDeltas(self, deltas, replace=False):
+        """
+        Writes stored deltas for several subtargets at once. Subtargets
+        that don't exist yet are created. This will only have an effect
+        where there's no live shape input.
+
+        :param dict deltas: a dictionary of logical (sparse, 5000 -> 6000)
+            subtarget index: ``(indices, deltas)``, as returned by
+            :meth:`getDeltas`
+        :param bool replace/rep: clear deltas on any existing subtargets
+            not included in *deltas*; defaults to ``False``
+        :return: ``self``
+        :rtype: :class:`Target`
+        """
+        prefix = _getComponentPrefix(self.node())
+
+        if replace:
+            for index in self.indices():
+                if index not in deltas:
+                    _writeDeltas(self.inputTargetItem[index],
+                                 [], [], prefix)
+
+        for index, (indices, _deltas) in deltas.items():
+            _writeDeltas(self.inputTargetItem[index],
+                         indices, _deltas, prefix)
+
+        return self
+
+    def scaleDeltas(self, factor):
+        """
+        Multiplies stored deltas on all subtargets, including inbetweens.
+
+        :param float factor: the scaling factor
+        :return: ``self``
+        :rtype: :class:`Target`
+        """
+        self.setDeltas({index: (indices, deltas * factor) for index, (
+            indices, deltas) in self.getDeltas().items()})
+
+        return self
+
+    @short(axis='ax')
+    def flipDeltas(self, mapping, axis='x'):
+        """
+        Swaps stored deltas across the symmetry plane on all subtargets,
+        including inbetweens. Deltas on unmatched components are left as
+        they are. See also :meth:`flip`, which can take a
+        :class:`~paya.lib.symmetry.SymmetryMap` instead.
+
+        :param mapping: an array, as long as the component count, that
+            maps each component index to its mirror counterpart, or to
+            ``-1`` where there isn't one (as in
+            :attr:`~paya.lib.symmetry.SymmetryMap.mapping`)
+        :type mapping: :class:`numpy.ndarray`, [int]
+        :param str axis/ax: the mirror axis; defaults to ``'x'``
+        :return: ``self``
+        :rtype: :class:`Target`
+        """
+        self.setDeltas({index: _flipDeltas(
+            indices, deltas, mapping, axis) for index, (
+            indices, deltas) in self.getDeltas().items()}, rep=True)
+
+        return self
+
+    @short(replace='rep')
+    def copyDeltasFrom(self, otherTarget, replace=True):
+        """
+        Array-level counterpart to :meth:`copyDeltaFrom`. Includes
+        inbetweens, and works across blend shape nodes.
+
+        :param otherTarget: the target to copy from
+        :type otherTarget: :class:`Target`
+        :param bool replace/rep: clear deltas on subtargets that don't
+            exist on *otherTarget*; defaults to ``True``
+        :return: ``self``
+        :rtype: :class:`Target`
+        """
+        self.setDeltas(otherTarget.getDeltas(), rep=replace)
+        return self
+
     #--------------------------------------------------------|    Space management
 
     def isTransformSpace(self):
@@ -606,18 +839,27 @@ class Target:
     @short(
         mirrorDirection='md',
         symmetryAxis='sa',
-        symmetryEdge='se'
+        symmetryEdge='se',
+        symmetryMap='sm'
     )
     def flip(
             self,
             mirrorDirection=1,
             symmetryAxis='x',
             symmetryEdge=None,
-            uv=False
+            uv=False,
+            symmetryMap=None
     ):
         """
         Flips this blend shape target.
 
+        If *symmetryMap* is provided, the stored deltas of every subtarget
+        (including inbetweens) are flipped directly via
+        :meth:`~paya.lib.symmetry.SymmetryMap.flipDeltas`, and the other
+        symmetry options are ignored. This is much faster when flipping
+        many targets on the same mesh, but only works on object-space
+        targets with no live shape inputs.
+
         :param int mirrorDirection: 1 for positive along, -1 for negative;
             defaults to 1
         :param str symmetryAxis/sa: one of 'X', 'Y', or 'Z'
@@ -627,9 +869,19 @@ class Target:
         :type symmetryEdge/se: str, int, :class:`~paya.runtime.comps.MeshEdge`,
             list
         :param bool uv: flip in UV space; defaults to False
+        :param symmetryMap/sm: a precomputed symmetry map for the base
+            mesh; defaults to ``None``
+        :type symmetryMap/sm: None, :class:`~paya.lib.symmetry.SymmetryMap`
         :return: ``self``
         :rtype: ``Target``
         """
+        if symmetryMap is not None:
+            self.setDeltas({index: symmetryMap.flipDeltas(
+                indices, deltas) for index, (indices, deltas) \
+                in self.getDeltas().items()}, rep=True)
+
+            return self
+
         bsn = self.node()
 
         kwargs = {'e': True, 'ft': [0, self.index()]}
@@ -651,6 +903,27 @@ class Target:
 
         return self
 
+    @short(mirrorDirection='md')
+    def mirror(self, symmetryMap, mirrorDirection=1):
+        """
+        Mirrors the stored deltas of every subtarget (including inbetweens)
+        from one side of the base mesh to the other. Only works on
+        object-space targets with no live shape inputs.
+
+        :param symmetryMap: a precomputed symmetry map for the base mesh
+        :type symmetryMap: :class:`~paya.lib.symmetry.SymmetryMap`
+        :param int mirrorDirection/md: 1 to mirror from the positive side,
+            -1 to mirror from the negative side; defaults to 1
+        :return: ``self``
+        :rtype: ``Target``
+        """
+        self.setDeltas({index: symmetryMap.mirrorDeltas(
+            indices, deltas, direction=mirrorDirection) \
+            for index, (indices, deltas) \
+            in self.getDeltas().items()}, rep=True)
+
+        return self
+
     #--------------------------------------------------------|    Member retrievals
 
     def getLogicalFromPhysicalIndex(self, physicalIndex):
@@ -1482,6 +1755,245 @@ class Targets:
 
         return self
 
+    #-------------------------------------------------------|    Delta arrays
+
+    def _resolveTargets(self, targets):
+        targets = _pu.expandArgs(*targets)
+
+        if targets:
+            return [target if isinstance(target, Target) \
+                    else self[target] for target in targets]
+
+        return list(self)
+
+    def getDeltas(self, *targets):
+        """
+        :param \*targets: the targets to read, as :class:`Target`
+            instances, aliases or logical indices; defaults to all targets
+        :return: A dictionary of logical target index: the output of
+            :meth:`Target.getDeltas`.
+        :rtype: dict
+        """
+        return {target.index(): target.getDeltas() \
+                for target in self._resolveTargets(targets)}
+
+    def scaleDeltas(self, factor, *targets):
+        """
+        Batched :meth:`Target.scaleDeltas`.
+
+        :param float factor: the scaling factor
+        :param \*targets: the targets to edit, as :class:`Target`
+            instances, aliases or logical indices; defaults to all targets
+        :return: ``self``
+        :rtype: :class:`Targets`
+        """
+        for target in self._resolveTargets(targets):
+            target.scaleDeltas(factor)
+
+        return self
+
+    @short(axis='ax')
+    def flipDeltas(self, mapping, *targets, axis='x'):
+        """
+        Batched :meth:`Target.flipDeltas`.
+
+        :param mapping: an array, as long as the component count, that
+            maps each component index to its mirror counterpart, or to
+            ``-1`` where there isn't one
+        :type mapping: :class:`numpy.ndarray`, [int]
+        :param \*targets: the targets to edit, as :class:`Target`
+            instances, aliases or logical indices; defaults to all targets
+        :param str axis/ax: the mirror axis; defaults to ``'x'``
+        :return: ``self``
+        :rtype: :class:`Targets`
+        """
+        for target in self._resolveTargets(targets):
+            target.flipDeltas(mapping, axis=axis)
+
+        return self
+
+    @short(replace='rep')
+    def copyDeltas(self, pairs, replace=True):
+        """
+        Batched :meth:`Target.copyDeltasFrom`.
+
+        :param pairs: ``(source, destination)`` pairs, as :class:`Target`
+            instances, aliases or logical indices; sources that are
+            :class:`Target` instances may belong to other blend shape
+            nodes
+        :type pairs: [(:class:`Target`, :class:`Target`)]
+        :param bool replace/rep: clear deltas on destination subtargets
+            that don't exist on the source; defaults to ``True``
+        :return: ``self``
+        :rtype: :class:`Targets`
+        """
+        for source, dest in pairs:
+            if not isinstance(source, Target):
+                source = self[source]
+
+            if not isinstance(dest, Target):
+                dest = self[dest]
+
+            dest.copyDeltasFrom(source, rep=replace)
+
+        return self
+
+    def flip(self, symmetryMap, *targets):
+        """
+        Flips many targets at once, using a precomputed symmetry map. See
+        :meth:`Target.flip`.
+
+        :param symmetryMap: a precomputed symmetry map for the base mesh
+        :type symmetryMap: :class:`~paya.lib.symmetry.SymmetryMap`
+        :param \*targets: the targets to flip, as :class:`Target`
+            instances, aliases or logical indices; defaults to all targets
+        :return: ``self``
+        :rtype: :class:`Targets`
+        """
+        for target in self._resolveTargets(targets):
+            target.flip(symmetryMap=symmetryMap)
+
+        return self
+
+    @short(mirrorDirection='md')
+    def mirror(self, symmetryMap, *targets, mirrorDirection=1):
+        """
+        Mirrors many targets at once, using a precomputed symmetry map. See
+        :meth:`Target.mirror`.
+
+        :param symmetryMap: a precomputed symmetry map for the base mesh
+        :type symmetryMap: :class:`~paya.lib.symmetry.SymmetryMap`
+        :param \*targets: the targets to mirror, as :class:`Target`
+            instances, aliases or logical indices; defaults to all targets
+        :param int mirrorDirection/md: 1 to mirror from the positive side,
+            -1 to mirror from the negative side; defaults to 1
+        :return: ``self``
+        :rtype: :class:`Targets`
+        """
+        for target in self._resolveTargets(targets):
+            target.mirror(symmetryMap, mirrorDirection=mirrorDirection)
+
+        return self
+
+    def exportDeltas(self, filepath, *targets):
+        """
+        Exports stored deltas, including inbetweens, to a compressed NumPy
+        ``.npz`` archive. Unlike :meth:`Target.export`, this includes
+        inbetween data. Live shape inputs are ignored; only stored deltas
+        are written.
+
+        :param str filepath: the destination file path
+        :param \*targets: the targets to export, as :class:`Target`
+            instances, aliases or logical indices; defaults to all targets
+        :return: ``self``
+        :rtype: :class:`Targets`
+        """
+        _am.requireNumpy()
+
+        header = {'version': deltasFileVersion, 'targets': []}
+        table = []
+        allIndices = []
+        allDeltas = []
+        start = 0
+
+        for target in self._resolveTargets(targets):
+            index = target.index()
+
+            header['targets'].append({
+                'index': index,
+                'alias': self.getAliasFromLogicalIndex(index)
+            })
+
+            for subIndex, (indices, deltas) in target.getDeltas().items():
+                table.append([index, subIndex, start, len(indices)])
+                allIndices.append(indices)
+                allDeltas.append(deltas)
+                start += len(indices)
+
+        np.savez_compressed(
+            filepath,
+            header=np.array(json.dumps(header)),
+            table=np.array(table, dtype=np.int64).reshape(-1, 4),
+            indices=np.concatenate(allIndices).astype(np.int32) \
+                if allIndices else np.zeros(0, dtype=np.int32),
+            deltas=np.concatenate(allDeltas).astype(np.float32) \
+                if allDeltas else np.zeros((0, 3), dtype=np.float32)
+        )
+
+        return self
+
+    @short(createMissing='cm')
+    def importDeltas(self, filepath, createMissing=True):
+        """
+        Imports deltas exported using :meth:`exportDeltas`. Targets are
+        matched by alias where possible, otherwise by logical index.
+
+        :param str filepath: the source file path
+        :param bool createMissing/cm: create targets that don't exist yet;
+            if ``False``, they're skipped; defaults to ``True``
+        :return: The targets that were written to.
+        :rtype: [:class:`Target`]
+        """
+        _am.requireNumpy()
+
+        with np.load(filepath, allow_pickle=False) as data:
+            header = json.loads(str(data['header']))
+            table = data['table']
+            allIndices = data['indices'].astype(np.int64)
+            allDeltas = data['deltas'].astype(np.float64)
+
+        if header['version'] > deltasFileVersion:
+            raise ValueError(
+                "Unsupported deltas file version: {}".format(
+                    header['version']))
+
+        weight = self.node().attr('weight')
+        aliases = dict([(alias, plug.index()) \
+                        for alias, plug in self.node().listAliases()])
+        indices = set(self.indices())
+        out = []
+
+        for entry in header['targets']:
+            fileIndex = entry['index']
+            alias = entry['alias']
+
+            if alias in aliases:
+                index = aliases[alias]
+                target = Target(index, self)
+
+            elif fileIndex in indices and not alias:
+                index = fileIndex
+                target = Target(index, self)
+
+            elif createMissing:
+                index = fileIndex if fileIndex not in indices \
+                    else weight.getNextArrayIndex()
+
+                # Initialising the weight is enough to create the target;
+                # the input target group will be populated by setDeltas()
+                weight[index].set(0.0)
+                indices.add(index)
+
+                target = Target(index, self)
+
+                if alias:
+                    target.setAlias(alias)
+                    aliases[alias] = index
+
+            else:
+                continue
+
+            rows = table[table[:, 0] == fileIndex]
+
+            target.setDeltas({int(subIndex): (
+                allIndices[start:start+count],
+                allDeltas[start:start+count]
+            ) for _index, subIndex, start, count in rows.tolist()})
+
+            out.append(target)
+
+        return out
+
     #-------------------------------------------------------|    Repr
 
     def __repr__(self):
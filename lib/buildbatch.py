@@ -0,0 +1,337 @@
+"""
+Batched connections and attribute edits for large builds. See
+:class:`BuildBatch`.
+"""
+
+from functools import wraps
+
+import maya.cmds as m
+import maya.mel as mel
+import maya.OpenMaya as om
+import pymel.core as p
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    VALUE FORMATTING
+#----------------------------------------------------------|
+
+def _isNumber(item):
+    return isinstance(item, (bool, int, float)) \
+        and not isinstance(item, p.datatypes.Unit)
+
+def formatSetAttrArgs(value, mathDimension):
+    """
+    :param value: the value to set
+    :param mathDimension: the math dimension of the destination plug, as
+        returned by :meth:`~paya.runtime.plugs.Attribute.mathDimension`
+    :type mathDimension: :class:`int`, ``None``
+    :return: MEL ``setAttr`` flags and arguments for *value*, or ``None``
+        if the value can't be batched.
+    :rtype: :class:`str`, ``None``
+    """
+    if mathDimension == 1:
+        if _isNumber(value):
+            return repr(float(value)) \
+                if isinstance(value, float) else str(int(value))
+
+        return None
+
+    if mathDimension in (2, 3, 4):
+        if isinstance(value, (p.datatypes.EulerRotation,
+                              p.datatypes.Quaternion)):
+            # Carry units / ordering; leave these to PyMEL
+            return None
+
+        if isinstance(value, (list, tuple, p.datatypes.Vector)):
+            values = list(value)
+
+            if len(values) == mathDimension \
+                    and all(map(_isNumber, values)):
+                return ' '.join([repr(float(x)) for x in values])
+
+        return None
+
+    if mathDimension == 16:
+        if isinstance(value, p.datatypes.Matrix):
+            values = list(value.flat)
+
+        elif isinstance(value, (list, tuple)) and len(value) == 16:
+            values = list(value)
+
+        else:
+            return None
+
+        if all(map(_isNumber, values)):
+            return '-type "matrix" '+' '.join(
+                [repr(float(x)) for x in values])
+
+    return None
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    NODES
+#----------------------------------------------------------|
+
+def _getPlugRef(plug):
+    # Returns (node handle, attribute path); handles stay valid across
+    # renames and reparenting, and unlike UUIDs are never shared
+    handle = om.MObjectHandle(plug.node().__apimobject__())
+    return handle, plug.plugAttr(longName=True, fullPath=True)
+
+def _getNodeName(handle):
+    # Returns a unique name for the node, or None if it's been deleted
+    if not handle.isValid():
+        return None
+
+    mobj = handle.object()
+
+    if mobj.hasFn(om.MFn.kDagNode):
+        return om.MFnDagNode(mobj).fullPathName()
+
+    return om.MFnDependencyNode(mobj).name()
+
+def createNodes(nodeType, names):
+    """
+    Creates several nodes of the same type with a single MEL call.
+
+    :param str nodeType: the node type
+    :param names: names for the nodes; Maya will make them unique if
+        needed
+    :type names: :class:`list` [:class:`str`]
+    :return: The nodes, in order.
+    :rtype: :class:`list` [:class:`~paya.runtime.nodes.DependNode`]
+    """
+    if not names:
+        return []
+
+    lines = ['string $payaBatchNodes[];', 'clear $payaBatchNodes;']
+
+    for i, name in enumerate(names):
+        lines.append(
+            '$payaBatchNodes[{}] = `createNode -ss -n "{}" "{}"`;'.format(
+                i, name, nodeType))
+
+    lines.append('$payaBatchNodes;')
+    created = mel.eval('\n'.join(lines))
+
+    return [p.PyNode(name) for name in created]
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    CONTEXT MANAGER
+#----------------------------------------------------------|
+
+class BuildBatch:
+    """
+    Context manager. Inside the block, connections made via ``>>`` or
+    :meth:`~paya.runtime.plugs.Attribute.put`, and simple numeric or
+    matrix values set via :meth:`~paya.runtime.plugs.Attribute.set` or
+    :meth:`~paya.runtime.plugs.Attribute.put`, are queued rather than
+    issued one command at a time. The queue is committed as a single MEL
+    call when:
+
+    -   the outermost block exits;
+    -   the queue reaches :attr:`chunkSize` operations;
+    -   a Paya plug method that reads or disconnects is called (for
+        example :meth:`~paya.runtime.plugs.Attribute.get`);
+    -   a set can't be batched and must be issued directly;
+    -   :meth:`flush` is called explicitly.
+
+    Node creation isn't deferred, since callers need the node straight
+    away; to create many nodes of one type in a single call, use
+    :func:`createNodes`. The whole block is wrapped in a single undo
+    chunk.
+
+    Queued operations hold handles to their nodes, and so survive
+    renames and reparenting inside the block; operations on nodes
+    deleted before the queue is committed are skipped with a warning.
+
+    .. warning::
+
+        Raw :mod:`maya.cmds` or PyMEL node-level queries (e.g.
+        :meth:`~pymel.core.nodetypes.DependNode.inputs`) don't trigger a
+        flush. Call :meth:`flush` before using them on batched nodes.
+
+    :Example:
+
+        .. code-block:: python
+
+            with r.BuildBatch():
+                for i in range(10000):
+                    node = r.nodes.MultiplyDivide.createNode()
+                    driver >> node.attr('input1X')
+                    node.attr('input2X').set(i)
+    """
+    __depth__ = 0
+    __queue__ = []
+
+    chunkSize = 5000
+
+    def __enter__(self):
+        if not BuildBatch.__depth__:
+            m.undoInfo(openChunk=True, chunkName='BuildBatch')
+
+        BuildBatch.__depth__ += 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        BuildBatch.__depth__ -= 1
+
+        if not BuildBatch.__depth__:
+            try:
+                if exc_type is None:
+                    BuildBatch.flush()
+
+                else:
+                    BuildBatch.clear()
+
+            finally:
+                m.undoInfo(closeChunk=True)
+
+        return False
+
+    #------------------------------------------------------|    Queue management
+
+    @classmethod
+    def active(cls):
+        """
+        :return: ``True`` if a :class:`BuildBatch` block is open.
+        :rtype: bool
+        """
+        return cls.__depth__ > 0
+
+    @classmethod
+    def clear(cls):
+        """
+        Discards queued operations without committing them.
+        """
+        del(cls.__queue__[:])
+
+    @classmethod
+    def flush(cls):
+        """
+        Commits any queued operations. Operations on nodes that have been
+        deleted since they were queued are skipped with a warning.
+        """
+        if not cls.__queue__:
+            return
+
+        queue = cls.__queue__[:]
+        cls.clear()
+
+        names = {}
+
+        def plugName(ref):
+            handle, attrName = ref
+            key = handle.hashCode()
+
+            try:
+                nodeName = names[key]
+
+            except KeyError:
+                nodeName = names[key] = _getNodeName(handle)
+
+            if nodeName is not None:
+                return '{}.{}'.format(nodeName, attrName)
+
+        lines = []
+        skipped = []
+
+        for operation, source, dest in queue:
+            destName = plugName(dest)
+
+            if operation == 'connect':
+                sourceName = plugName(source)
+
+                if sourceName is None or destName is None:
+                    skipped.append((operation, source[1], dest[1]))
+                    continue
+
+                lines.append('connectAttr -f "{}" "{}";'.format(
+                    sourceName, destName))
+
+            else:
+                if destName is None:
+                    skipped.append((operation, None, dest[1]))
+                    continue
+
+                lines.append('setAttr "{}" {};'.format(destName, source))
+
+        if skipped:
+            m.warning(
+                "BuildBatch: skipped {} queued operation(s) on deleted "
+                "nodes, e.g. {} of '{}'.".format(
+                    len(skipped), skipped[0][0], skipped[0][2])
+            )
+
+        if lines:
+            mel.eval('\n'.join(lines))
+
+    @classmethod
+    def _queue(cls, operation, source, dest):
+        cls.__queue__.append((operation, source, dest))
+
+        if len(cls.__queue__) >= cls.chunkSize:
+            cls.flush()
+
+    @classmethod
+    def queueConnection(cls, source, dest):
+        """
+        Queues a forced connection if a batch is open.
+
+        :param source: the source plug
+        :type source: :class:`~paya.runtime.plugs.Attribute`
+        :param dest: the destination plug
+        :type dest: :class:`~paya.runtime.plugs.Attribute`
+        :return: ``True`` if the connection was queued, otherwise
+            ``False``.
+        :rtype: bool
+        """
+        if not cls.__depth__:
+            return False
+
+        if not (isinstance(source, p.Attribute) \
+                and isinstance(dest, p.Attribute)):
+            return False
+
+        cls._queue('connect', _getPlugRef(source), _getPlugRef(dest))
+
+        return True
+
+    @classmethod
+    def queueSet(cls, plug, value):
+        """
+        Queues an attribute set if a batch is open and the value is
+        simple enough to be expressed as MEL ``setAttr`` arguments. If
+        the value can't be queued, any pending operations are committed
+        so that the caller can set it directly.
+
+        :param plug: the plug to set
+        :type plug: :class:`~paya.runtime.plugs.Attribute`
+        :param value: the value to set
+        :return: ``True`` if the set was queued, otherwise ``False``.
+        :rtype: bool
+        """
+        if not cls.__depth__:
+            return False
+
+        args = formatSetAttrArgs(value, plug.mathDimension())
+
+        if args is None:
+            cls.flush()
+            return False
+
+        cls._queue('set', args, _getPlugRef(plug))
+        return True
+
+def flushesBuildBatch(f):
+    """
+    Decorator for Paya plug methods that read scene state or would
+    otherwise be affected by queued operations. Commits any pending
+    :class:`BuildBatch` operations before the method runs.
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if BuildBatch.__queue__:
+            BuildBatch.flush()
+
+        return f(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,442 @@
+"""
+Structured instrumentation for rig builds. See :class:`BuildProfiler`.
+"""
+
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+from contextlib import contextmanager
+
+import maya.cmds as m
+import maya.api.OpenMaya as om2
+
+import paya
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    HELPERS
+#----------------------------------------------------------|
+
+def _getPeakMemoryMB():
+    # Process peak where the platform reports it, otherwise Maya's current
+    # heap size
+    try:
+        import resource
+
+    except ImportError:
+        return m.memory(heapMemory=True, megaByte=True)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if sys.platform == 'darwin':
+        return peak / (1024.0 * 1024.0)
+
+    return peak / 1024.0
+
+def _getCurrentMemoryMB():
+    # Current resident set size where the platform reports it, otherwise
+    # Maya's current heap size
+    try:
+        with open('/proc/self/statm') as f:
+            resident = int(f.read().split()[1])
+
+    except (OSError, IndexError, ValueError):
+        return m.memory(heapMemory=True, megaByte=True)
+
+    return resident * os.sysconf('SC_PAGE_SIZE') / (1024.0 * 1024.0)
+
+def _isPayaFile(filename, _cache={}):
+    try:
+        return _cache[filename]
+
+    except KeyError:
+        root = os.path.normcase(os.path.abspath(paya.rootdir))
+        path = os.path.normcase(os.path.abspath(filename))
+        result = _cache[filename] = path.startswith(root+os.sep)
+
+        return result
+
+def _getHotCalls(profile, numCalls):
+    stats = pstats.Stats(profile).stats
+    out = []
+
+    for (filename, lineno, funcName), \
+            (primCalls, calls, totalTime, cumTime, callers) \
+            in stats.items():
+        if not _isPayaFile(filename):
+            continue
+
+        out.append({
+            'function': '{}:{}({})'.format(
+                os.path.relpath(filename, paya.rootdir), lineno, funcName),
+            'calls': calls,
+            'totalTime': totalTime,
+            'cumulativeTime': cumTime
+        })
+
+    out.sort(key=lambda x: x['totalTime'], reverse=True)
+    return out[:numCalls]
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    PROFILER
+#----------------------------------------------------------|
+
+class BuildProfiler:
+    """
+    Context manager. Records per-stage build metrics while active, for
+    emission as a JSON summary and as a Chrome trace-event file (which can
+    be opened in ``chrome://tracing`` or `Perfetto <https://ui.perfetto.dev>`_).
+
+    For every built stage, the summary includes:
+
+    -   wall time, broken down into phases (e.g. opening, importing and
+        saving snapshots, and running the stage method)
+    -   the number of DG nodes created by the stage method, by type
+    -   memory use, as ``memoryMB``, the current resident set size when
+        the stage ended, and ``memoryDeltaMB``, its change since the stage
+        began (a negative delta means memory was released); where the
+        resident set size is unavailable, Maya's heap size is used instead
+    -   the Paya functions with the most internal time during the stage
+        method
+
+    The top-level ``peakMemoryMB`` in the summary is the peak process
+    memory for the whole session, as reported by the operating system,
+    and isn't broken down by stage, since the peak only ever rises.
+
+    Instrumentation points in :meth:`~paya.rigtypes.rig.rig.Rig.build`
+    call the module-level :func:`stage`, :func:`phase` and :func:`run`
+    helpers, which do nothing unless a profiler is active.
+
+    :Example:
+
+        .. code-block:: python
+
+            with BuildProfiler('myRig') as profiler:
+                MyRig.build()
+
+            profiler.save(outputDir)
+
+    :param str name: a name for the profiled process; defaults to
+        ``'build'``
+    :param int hotCalls: the number of Paya hot calls to keep per stage;
+        set to 0 to skip Python-level profiling, which slows builds down;
+        defaults to 20
+    """
+    __active__ = None
+
+    def __init__(self, name='build', hotCalls=20):
+        self.name = name
+        self.hotCalls = hotCalls
+        self._events = []
+        self._stages = []
+        self._restored = []
+        self._workerSlots = {}
+        self._currentStage = None
+        self._previous = None
+        self._startTime = None
+        self._endTime = None
+
+    #------------------------------------------------------|    Context
+
+    def __enter__(self):
+        self._previous = BuildProfiler.__active__
+        BuildProfiler.__active__ = self
+        self._startTime = time.perf_counter()
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._endTime = time.perf_counter()
+        BuildProfiler.__active__ = self._previous
+        self._previous = None
+
+        self._addEvent(self.name, 'build',
+                       self._startTime, self._endTime)
+
+        return False
+
+    @classmethod
+    def active(cls):
+        """
+        :return: The active profiler, if any.
+        :rtype: :class:`BuildProfiler`, ``None``
+        """
+        return cls.__active__
+
+    #------------------------------------------------------|    Recording
+
+    def _addEvent(self, name, category, start, end, tid=0, **args):
+        self._events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self._startTime) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': 1,
+            'tid': tid,
+            'args': args
+        })
+
+    @contextmanager
+    def phase(self, name, **args):
+        """
+        Context manager. Times a phase of the build, such as opening or
+        saving a snapshot. Inside a :meth:`stage` block, the time is also
+        added to that stage's breakdown.
+
+        :param str name: the phase name
+        :param \*\*args: extra information for the trace event
+        """
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            end = time.perf_counter()
+            stage = self._currentStage
+
+            if stage is not None:
+                phases = stage['phases']
+                phases[name] = phases.get(name, 0.0) + (end - start)
+                args.setdefault('stage', stage['stage'])
+
+            self._addEvent(name, 'phase', start, end, **args)
+
+    @contextmanager
+    def stage(self, stageName):
+        """
+        Context manager. Brackets the building of a single stage.
+
+        :param str stageName: the stage name
+        """
+        record = {'stage': stageName,
+                  'wallTime': None,
+                  'phases': {},
+                  'nodesCreated': {},
+                  'numNodesCreated': 0,
+                  'memoryMB': None,
+                  'memoryDeltaMB': None,
+                  'hotCalls': []}
+
+        previous = self._currentStage
+        self._currentStage = record
+        startMemory = _getCurrentMemoryMB()
+        start = time.perf_counter()
+
+        try:
+            yield record
+
+        finally:
+            end = time.perf_counter()
+            self._currentStage = previous
+
+            record['wallTime'] = end - start
+            record['memoryMB'] = _getCurrentMemoryMB()
+            record['memoryDeltaMB'] = record['memoryMB'] - startMemory
+            self._stages.append(record)
+
+            self._addEvent(stageName, 'stage', start, end,
+                           numNodesCreated=record['numNodesCreated'],
+                           memoryMB=record['memoryMB'],
+                           memoryDeltaMB=record['memoryDeltaMB'])
+
+    @contextmanager
+    def run(self, **args):
+        """
+        Context manager. Times the stage method itself, counting created
+        nodes and, if configured, profiling Paya calls.
+
+        :param \*\*args: extra information for the trace event
+        """
+        record = self._currentStage
+        nodesCreated = {} if record is None else record['nodesCreated']
+
+        def onNodeAdded(node, *_):
+            typeName = om2.MFnDependencyNode(node).typeName
+            nodesCreated[typeName] = nodesCreated.get(typeName, 0) + 1
+
+        callback = om2.MDGMessage.addNodeAddedCallback(
+            onNodeAdded, 'dependNode')
+
+        profile = None
+
+        if self.hotCalls and record is not None:
+            profile = cProfile.Profile()
+
+            try:
+                profile.enable()
+
+            except ValueError:
+                # Another profiler is already running
+                profile = None
+
+        try:
+            with self.phase('run', **args):
+                yield
+
+        finally:
+            if profile is not None:
+                profile.disable()
+
+            om2.MMessage.removeCallback(callback)
+
+            if record is not None:
+                record['numNodesCreated'] = sum(nodesCreated.values())
+
+                if profile is not None:
+                    record['hotCalls'] = _getHotCalls(
+                        profile, self.hotCalls)
+
+    def markRestored(self, stageName):
+        """
+        Records that a stage was restored from a snapshot, rather than
+        built.
+
+        :param str stageName: the stage name
+        """
+        self._restored.append(stageName)
+
+    def addWorkerStage(self, stageName, start, end, worker=None):
+        """
+        Records a stage built out-of-process.
+
+        :param str stageName: the stage name
+        :param float start: the :func:`time.perf_counter` start time
+        :param float end: the :func:`time.perf_counter` end time
+        :param worker: an identifier for the worker; each is given its
+            own row in the trace; defaults to ``None``
+        """
+        tid = self._workerSlots.setdefault(
+            worker, len(self._workerSlots)+1)
+
+        self._stages.append({'stage': stageName,
+                             'wallTime': end - start,
+                             'worker': worker})
+
+        self._addEvent(stageName, 'worker', start, end, tid=tid)
+
+    #------------------------------------------------------|    Output
+
+    def getSummary(self):
+        """
+        :return: A JSON-compatible summary of the build.
+        :rtype: :class:`dict`
+        """
+        endTime = self._endTime
+
+        if endTime is None:
+            endTime = time.perf_counter()
+
+        return {
+            'name': self.name,
+            'wallTime': endTime - self._startTime,
+            'peakMemoryMB': _getPeakMemoryMB(),
+            'stages': self._stages,
+            'restored': self._restored,
+            'phases': self._getPhaseTotals()
+        }
+
+    def _getPhaseTotals(self):
+        out = {}
+
+        for event in self._events:
+            if event['cat'] == 'phase':
+                out[event['name']] = out.get(
+                    event['name'], 0.0) + event['dur'] / 1e6
+
+        return out
+
+    def getTraceEvents(self):
+        """
+        :return: A Chrome trace-event document.
+        :rtype: :class:`dict`
+        """
+        meta = [{'name': 'process_name', 'ph': 'M', 'pid': 1,
+                 'args': {'name': self.name}},
+                {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 0,
+                 'args': {'name': 'main'}}]
+
+        for worker, tid in self._workerSlots.items():
+            meta.append({'name': 'thread_name', 'ph': 'M',
+                         'pid': 1, 'tid': tid,
+                         'args': {'name': 'worker {}'.format(tid)}})
+
+        return {'traceEvents': meta + self._events,
+                'displayTimeUnit': 'ms'}
+
+    def save(self, dirPath):
+        """
+        Writes ``<name>_profile.json`` and ``<name>_trace.json`` into the
+        specified directory.
+
+        :param dirPath: the destination directory; will be created if
+            necessary
+        :type dirPath: str, :class:`~pathlib.Path`
+        :return: The summary and trace file paths.
+        :rtype: (:class:`str`, :class:`str`)
+        """
+        dirPath = str(dirPath)
+
+        if not os.path.isdir(dirPath):
+            os.makedirs(dirPath)
+
+        summaryPath = os.path.join(
+            dirPath, '{}_profile.json'.format(self.name))
+
+        tracePath = os.path.join(
+            dirPath, '{}_trace.json'.format(self.name))
+
+        with open(summaryPath, 'w') as f:
+            json.dump(self.getSummary(), f, indent=4)
+
+        with open(tracePath, 'w') as f:
+            json.dump(self.getTraceEvents(), f)
+
+        return summaryPath, tracePath
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    INSTRUMENTATION POINTS
+#----------------------------------------------------------|
+
+@contextmanager
+def _noop():
+    yield None
+
+def stage(stageName):
+    """
+    Context manager. See :meth:`BuildProfiler.stage`. Does nothing if no
+    profiler is active.
+    """
+    profiler = BuildProfiler.__active__
+
+    if profiler is None:
+        return _noop()
+
+    return profiler.stage(stageName)
+
+def phase(name, **args):
+    """
+    Context manager. See :meth:`BuildProfiler.phase`. Does nothing if no
+    profiler is active.
+    """
+    profiler = BuildProfiler.__active__
+
+    if profiler is None:
+        return _noop()
+
+    return profiler.phase(name, **args)
+
+def run(**args):
+    """
+    Context manager. See :meth:`BuildProfiler.run`. Does nothing if no
+    profiler is active.
+    """
+    profiler = BuildProfiler.__active__
+
+    if profiler is None:
+        return _noop()
+
+    return profiler.run(**args)
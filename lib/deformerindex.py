@@ -0,0 +1,270 @@
+"""
+Scene-wide deformer / geometry lookups. See :class:`DeformerIndex`.
+"""
+
+from functools import wraps
+
+import maya.cmds as m
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+
+_inheritedTypes = {}
+
+def _getInheritedTypes(nodeName, typeName):
+    try:
+        return _inheritedTypes[typeName]
+
+    except KeyError:
+        result = _inheritedTypes[typeName] = \
+            set(m.nodeType(nodeName, inherited=True))
+
+        return result
+
+def _getMObject(node):
+    sel = om2.MSelectionList()
+    sel.add(str(node))
+
+    return sel.getDependNode(0)
+
+class DeformerIndex:
+    """
+    Maps deformers to the geometries they deform, and vice versa, in a
+    single pass over the scene's geometry filters, rather than via
+    per-shape history traversal. Nodes are tracked by handle, so renames
+    and reparenting don't affect lookups.
+
+    Use :meth:`get` to retrieve an index. Outside of a
+    ``with DeformerIndex():`` block, this builds a fresh index every time.
+    Inside one, a single index is built lazily and shared by all queries,
+    including :meth:`~paya.runtime.nodes.GeometryFilter.getFromGeo` and
+    :meth:`~paya.runtime.nodes.GeometryFilter.getShapes`. It's updated
+    automatically whenever a deformer is created or deleted: deleted
+    deformers are dropped straight away, and new ones are indexed on the
+    next query, once their geometry is connected.
+
+    .. warning::
+
+        Changes to deformer membership on existing deformers (for example,
+        via ``deformer(e=True, g=...)``) aren't detected inside a cached
+        block. Call :meth:`invalidate` after making them.
+
+    :Example:
+
+        .. code-block:: python
+
+            with r.DeformerIndex():
+                for geo in geos:
+                    skins = r.nodes.SkinCluster.getFromGeo(geo)
+    """
+    __depth__ = 0
+    __cached__ = None
+    __callbacks__ = []
+
+    def __init__(self):
+        self._byShape = None
+        self._byDeformer = None
+        self._added = []
+
+    #------------------------------------------------------|    Context
+
+    def __enter__(self):
+        if not DeformerIndex.__depth__:
+            DeformerIndex.__cached__ = self
+
+            DeformerIndex.__callbacks__ = [
+                om2.MDGMessage.addNodeAddedCallback(
+                    DeformerIndex._onDeformerAdded, 'geometryFilter'),
+                om2.MDGMessage.addNodeRemovedCallback(
+                    DeformerIndex._onDeformerRemoved, 'geometryFilter')
+            ]
+
+        DeformerIndex.__depth__ += 1
+        return DeformerIndex.__cached__
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        DeformerIndex.__depth__ -= 1
+
+        if not DeformerIndex.__depth__:
+            om2.MMessage.removeCallbacks(DeformerIndex.__callbacks__)
+            DeformerIndex.__callbacks__ = []
+            DeformerIndex.__cached__ = None
+
+        return False
+
+    @classmethod
+    def active(cls):
+        """
+        :return: ``True`` if a cached index is in use.
+        :rtype: bool
+        """
+        return cls.__depth__ > 0
+
+    @classmethod
+    def get(cls):
+        """
+        :return: The cached index if inside a ``with DeformerIndex():``
+            block, otherwise a new index.
+        :rtype: :class:`DeformerIndex`
+        """
+        if cls.__cached__ is not None:
+            return cls.__cached__
+
+        return cls()
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Discards the cached index, if any, so that it's rebuilt on the next
+        query.
+        """
+        if cls.__cached__ is not None:
+            cls.__cached__._byShape = None
+            cls.__cached__._byDeformer = None
+            cls.__cached__._added = []
+
+    @classmethod
+    def _onDeformerAdded(cls, deformer, *args):
+        # Geometry isn't connected yet; defer until the next query
+        index = cls.__cached__
+
+        if index is not None and index._byShape is not None:
+            index._added.append(om2.MObjectHandle(deformer))
+
+    @classmethod
+    def _onDeformerRemoved(cls, deformer, *args):
+        index = cls.__cached__
+
+        if index is not None and index._byShape is not None:
+            index._removeDeformer(deformer)
+
+    #------------------------------------------------------|    Building
+
+    def _build(self):
+        self._byShape = {}
+        self._byDeformer = {}
+        self._added = []
+
+        it = om2.MItDependencyNodes(om2.MFn.kGeometryFilt)
+
+        while not it.isDone():
+            self._addDeformer(it.thisNode())
+            it.next()
+
+    def _addDeformer(self, deformer):
+        # Returns False, without indexing anything, if the deformer has no
+        # output geometry yet
+        handle = om2.MObjectHandle(deformer)
+        shapes = [om2.MObjectHandle(shape) for shape \
+                  in oma2.MFnGeometryFilter(deformer).getOutputGeometry()]
+
+        if not shapes:
+            return False
+
+        for shapeHandle in shapes:
+            self._byShape.setdefault(
+                shapeHandle.hashCode(), []).append((shapeHandle, handle))
+
+        self._byDeformer.setdefault(
+            handle.hashCode(), []).append((handle, shapes))
+
+        return True
+
+    def _removeDeformer(self, deformer):
+        key = om2.MObjectHandle(deformer).hashCode()
+        entries = self._byDeformer.get(key, [])
+        removed = [entry for entry in entries \
+                   if entry[0].object() == deformer]
+
+        entries[:] = [entry for entry in entries \
+                      if entry[0].object() != deformer]
+
+        for handle, shapes in removed:
+            for shapeHandle in shapes:
+                shapeEntries = self._byShape.get(shapeHandle.hashCode(), [])
+                shapeEntries[:] = [entry for entry in shapeEntries \
+                                   if entry[1] is not handle]
+
+        self._added = [handle for handle in self._added \
+                       if handle.object() != deformer]
+
+    def _update(self):
+        if self._byShape is None:
+            self._build()
+
+        elif self._added:
+            added, self._added = self._added, []
+
+            for handle in added:
+                if handle.isValid() \
+                        and not self._addDeformer(handle.object()):
+                    # Not hooked up yet; try again on the next query
+                    self._added.append(handle)
+
+    def _lookup(self, table, node):
+        self._update()
+
+        obj = _getMObject(node)
+        entries = getattr(self, table).get(
+            om2.MObjectHandle(obj).hashCode(), [])
+
+        return [value for handle, value in entries \
+                if handle.isValid() and handle.object() == obj]
+
+    #------------------------------------------------------|    Queries
+
+    def getDeformers(self, shape, type=None):
+        """
+        :param shape: the shape to inspect
+        :type shape: str, :class:`~paya.runtime.nodes.DeformableShape`
+        :param type: if provided, only return deformers of this type
+            (inherited types are honoured); defaults to ``None``
+        :type type: str, None
+        :return: The names of deformers that deform *shape*.
+        :rtype: [str]
+        """
+        out = []
+
+        for handle in self._lookup('_byShape', shape):
+            if not handle.isValid():
+                continue
+
+            fn = om2.MFnDependencyNode(handle.object())
+            name = fn.name()
+
+            if type is None or type in _getInheritedTypes(
+                    name, fn.typeName):
+                out.append(name)
+
+        return out
+
+    def getShapes(self, deformer):
+        """
+        :param deformer: the deformer to inspect
+        :type deformer: str, :class:`~paya.runtime.nodes.GeometryFilter`
+        :return: Full DAG paths for the shapes deformed by *deformer*.
+        :rtype: [str]
+        """
+        out = []
+
+        for shapes in self._lookup('_byDeformer', deformer):
+            for handle in shapes:
+                if handle.isValid():
+                    out.append(om2.MDagPath.getAPathTo(
+                        handle.object()).fullPathName())
+
+        return out
+
+def usesDeformerIndex(f):
+    """
+    Decorator for batch methods that make repeated deformer / geometry
+    queries. Runs the method inside a ``with DeformerIndex():`` block, so
+    that a single index is shared by all of its lookups. When combined
+    with :class:`~paya.util.short`, apply this decorator first (i.e.
+    underneath).
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        with DeformerIndex():
+            return f(*args, **kwargs)
+
+    return wrapper
@@ -1,3 +1,5 @@
+from collections import deque
+
 from paya.util import short, without_duplicates
 from pymel.util import expandArgs
 
@@ -48,6 +50,9 @@ class EvalGraph:
 
     To get a build sequence for the entire graph, either iterate over the
     object or call :meth:`getBuildSequence`.
+
+    Adjacency is precomputed on instantiation, and upstream / downstream
+    traces are cached, so repeated queries on large graphs are cheap.
     """
     #--------------------------------------------------------|    Init
 
@@ -97,39 +102,48 @@ class EvalGraph:
 
     #--------------------------------------------------------|    Initial analysis
 
-    def _calcAllNodes(self):
-        out = []
-
-        for node, inputs in self._dct.items():
-            for item in inputs + [node]:
-                if item not in out:
-                    out.append(item)
+    def _calcAdjacency(self):
+        # Nodes in order of first appearance; inputs and outputs as ordered,
+        # duplicate-free lists, with sets alongside for membership tests
+        nodes = {}
+        inputs = {}
 
-        return out
+        for node, nodeInputs in self._dct.items():
+            nodeInputs = list(dict.fromkeys(nodeInputs))
 
-    def _calcStartNodes(self):
-        return [node for node in self._nodes if not self._dct.get(node)]
+            for item in nodeInputs + [node]:
+                nodes.setdefault(item, None)
 
-    def _calcEndNodes(self):
-        allInputs = []
+            inputs[node] = nodeInputs
 
-        for node in self._nodes:
-            allInputs += self._dct.get(node, [])
+        self._nodes = list(nodes)
+        self._nodeSet = set(nodes)
+        self._inputs = {node: inputs.get(node, []) for node in self._nodes}
 
-        allInputs = set(allInputs)
+        outputs = {node: [] for node in self._nodes}
 
-        return [node for node in self._nodes if node not in allInputs]
+        # Outputs follow node order, as they would when scanning the nodes
+        for node in self._nodes:
+            for input in self._inputs[node]:
+                outputs[input].append(node)
 
-    def _calcOrphanNodes(self):
-        return [node for node in self._nodes \
-            if node in self._startNodes and node in self._endNodes]
+        self._outputs = outputs
 
     def _expand(self):
-        self._nodes = self._calcAllNodes()
+        self._calcAdjacency()
         self._cycleCheck()
-        self._endNodes = self._calcEndNodes()
-        self._startNodes = self._calcStartNodes()
-        self._orphanNodes = self._calcOrphanNodes()
+
+        self._startNodes = [node for node \
+            in self._nodes if not self._inputs[node]]
+
+        self._endNodes = [node for node \
+            in self._nodes if not self._outputs[node]]
+
+        self._orphanNodes = [node for node in self._nodes \
+            if not (self._inputs[node] or self._outputs[node])]
+
+        self._upstreamCache = {}
+        self._downstreamCache = {}
 
     #--------------------------------------------------------|    Basic user inspections
 
@@ -161,14 +175,23 @@ class EvalGraph:
                 raise ValueError("Multiple flags are not supported.")
 
             if startTerminals:
-                return self._startNodes
+                return self._startNodes[:]
 
             if endTerminals:
-                return self._endNodes
+                return self._endNodes[:]
+
+            return self._orphanNodes[:]
 
-            return self._orphanNodes
+        return self._nodes[:]
 
-        return self._nodes
+    def __iter__(self):
+        return iter(self.getBuildSequence())
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        return node in self._nodeSet
 
     #--------------------------------------------------------|    Topo Analysis
 
@@ -179,7 +202,7 @@ class EvalGraph:
         :rtype: [:class:`str`]
         """
         self.assertNodeExists(node)
-        return self._dct.get(node, [])
+        return self._inputs[node][:]
 
     def getNodeOutputs(self, node):
         """
@@ -188,34 +211,130 @@ class EvalGraph:
         :rtype: [:class:`str`]
         """
         self.assertNodeExists(node)
-        
-        return [_node for _node in \
-            self._nodes if node in self._dct.get(_node, [])]
+        return self._outputs[node][:]
 
     def assertNodeExists(self, node):
-        if node not in self._nodes:
+        if node not in self._nodeSet:
             raise NonexistentNodeError(
                 "Node does not exist: {}".format(node)
             )
 
+    def _findCycles(self):
+        # Tarjan's strongly-connected components, iteratively; returns
+        # components with more than one member, or with a self-loop
+        index = {}
+        lowLink = {}
+        stack = []
+        onStack = set()
+        out = []
+        counter = 0
+
+        for root in self._nodes:
+            if root in index:
+                continue
+
+            work = [(root, iter(self._outputs[root]))]
+            index[root] = lowLink[root] = counter
+            counter += 1
+            stack.append(root)
+            onStack.add(root)
+
+            while work:
+                node, outputs = work[-1]
+                advanced = False
+
+                for output in outputs:
+                    if output not in index:
+                        index[output] = lowLink[output] = counter
+                        counter += 1
+                        stack.append(output)
+                        onStack.add(output)
+                        work.append((output, iter(self._outputs[output])))
+                        advanced = True
+                        break
+
+                    elif output in onStack:
+                        lowLink[node] = min(lowLink[node], index[output])
+
+                if advanced:
+                    continue
+
+                work.pop()
+
+                if work:
+                    parent = work[-1][0]
+                    lowLink[parent] = min(lowLink[parent], lowLink[node])
+
+                if lowLink[node] == index[node]:
+                    component = []
+
+                    while True:
+                        member = stack.pop()
+                        onStack.discard(member)
+                        component.append(member)
+
+                        if member == node:
+                            break
+
+                    if len(component) > 1 \
+                            or node in self._outputs[node]:
+                        out.append(component[::-1])
+
+        return out
+
     def _cycleCheck(self):
-        for node in self._nodes:
-            def _trace(_node, callers):
-                if _node in callers:
-                    raise CycleError(
-                        "Node visited more than once: {}".format(_node)
-                    )
+        # Kahn's algorithm; if not every node can be ordered, there's a
+        # cycle, which is then located for the error message
+        numInputs = {node: len(self._inputs[node]) for node in self._nodes}
+        queue = deque(node for node, num in numInputs.items() if not num)
+        numOrdered = 0
+
+        while queue:
+            node = queue.popleft()
+            numOrdered += 1
+
+            for output in self._outputs[node]:
+                numInputs[output] -= 1
+
+                if not numInputs[output]:
+                    queue.append(output)
+
+        if numOrdered < len(self._nodes):
+            cycles = self._findCycles()
+
+            raise CycleError(
+                "Evaluation cycle(s) detected: {}".format(
+                    "; ".join([" -> ".join(map(str, cycle+cycle[:1])) \
+                               for cycle in cycles])))
+
+    def _traceUpstream(self, node, visited=None, includeSelf=False):
+        # Iterative equivalent of a recursive, input-first depth-first
+        # trace; each node is listed after all of its own inputs. Nodes
+        # in *visited* are skipped, along with their inputs
+        out = []
+
+        if visited is None:
+            visited = set()
 
-                outputs = self.getNodeOutputs(_node)
+        visited.add(node)
+        work = [(node, iter(self._inputs[node]))]
 
-                if outputs:
-                    callers = callers[:]
-                    callers.append(_node)
+        while work:
+            _node, inputs = work[-1]
+
+            for input in inputs:
+                if input not in visited:
+                    visited.add(input)
+                    work.append((input, iter(self._inputs[input])))
+                    break
+
+            else:
+                work.pop()
 
-                    for output in outputs:
-                        _trace(output, callers)
+                if includeSelf or _node != node:
+                    out.append(_node)
 
-            _trace(node, [])
+        return out
 
     def getNodesUpstreamOf(self, node):
         """
@@ -223,18 +342,15 @@ class EvalGraph:
         :return: All nodes upstream of *node*.
         :rtype: [:class:`str`]
         """
-        out = []
+        self.assertNodeExists(node)
 
-        def _trace(_node):
-            if _node not in out:
-                for input in self.getNodeInputs(_node):
-                    _trace(input)
+        try:
+            result = self._upstreamCache[node]
 
-                if _node != node:
-                    out.append(_node)
+        except KeyError:
+            result = self._upstreamCache[node] = self._traceUpstream(node)
 
-        _trace(node)
-        return out
+        return result[:]
 
     def getNodesDownstreamOf(self, node):
         """
@@ -242,53 +358,65 @@ class EvalGraph:
         :return: All nodes downstream of *node*.
         :rtype: [:class:`str`]
         """
-        out = []
+        self.assertNodeExists(node)
 
-        def _trace(_node):
-            if _node not in out:
-                if _node != node:
-                    out.append(_node)
+        try:
+            result = self._downstreamCache[node]
 
-                outputs = self.getNodeOutputs(_node)
+        except KeyError:
+            # Iterative, output-first depth-first (pre-order) trace
+            result = []
+            visited = {node}
+            stack = self._outputs[node][::-1]
 
-                if outputs:
-                    for output in outputs:
-                        _trace(output)
+            while stack:
+                _node = stack.pop()
 
-        _trace(node)
-        return out
+                if _node in visited:
+                    continue
+
+                visited.add(_node)
+                result.append(_node)
+                stack += self._outputs[_node][::-1]
+
+            self._downstreamCache[node] = result
+
+        return result[:]
 
     def getPath(self, start, end):
         """
         :param str start: the start node
         :param str end: the end node
         :raises NoPathError: A path could not be found.
-        :return: A path from the start to the end node.
+        :return: The shortest path from the start to the end node.
         :rtype: [:class:`str`]
         """
-        buff = {}
-        
         self.assertNodeExists(start)
         self.assertNodeExists(end)
 
-        def _trace(_node, path):
-            path = path[:]
-            path.append(_node)
+        # Breadth-first, so each node is visited only once
+        parents = {start: None}
+        queue = deque([start])
 
-            if _node == end:
-                buff['result'] = path
+        while queue:
+            node = queue.popleft()
 
-            else:
-                for output in self.getNodeOutputs(_node):
-                    _trace(output, path)
+            if node == end:
+                path = []
 
-        _trace(start, [])
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
 
-        try:
-            return buff['result']
-        except KeyError:
-            raise NoPathError(
-                "Couldn't find a path between '{}' and '{}'.".format(start, end))
+                return path[::-1]
+
+            for output in self._outputs[node]:
+                if output not in parents:
+                    parents[output] = node
+                    queue.append(output)
+
+        raise NoPathError(
+            "Couldn't find a path between '{}' and '{}'.".format(start, end))
 
     def reduceTargetList(self, *targets):
         """
@@ -307,23 +435,12 @@ class EvalGraph:
             self.assertNodeExists(target)
 
         # Remove nodes that are upstream of other nodes in the list
-        upstreamMap = {
-            target: self.getNodesUpstreamOf(target) \
-            for target in targets
-        }
+        implied = set()
 
-        skipNodes = []
-
-        for nodeToPrune in targets:
-            for refNode in targets:
-                if nodeToPrune == refNode:
-                    continue
-
-                if nodeToPrune in upstreamMap[refNode]:
-                    skipNodes.append(nodeToPrune)
+        for target in targets:
+            implied.update(self.getNodesUpstreamOf(target))
 
-        return [target for target \
-            in targets if target not in skipNodes]
+        return [target for target in targets if target not in implied]
 
     def getBuildSequence(self, targets=None):
         """
@@ -342,19 +459,11 @@ class EvalGraph:
             targets = self._endNodes
 
         fullSequence = []
+        visited = set()
 
         for target in targets:
-            thisSequence = []
-
-            def _trace(_node):
-                if _node not in fullSequence:
-                    if _node not in thisSequence:
-                        for input in self.getNodeInputs(_node):
-                            _trace(input)
-
-                    thisSequence.append(_node)
-
-            _trace(target)
-            fullSequence += thisSequence
+            if target not in visited:
+                fullSequence += self._traceUpstream(
+                    target, visited=visited, includeSelf=True)
 
-        return fullSequence
\ No newline at end of file
+        return fullSequence
@@ -0,0 +1,587 @@
+"""
+Deferred plug math. See :class:`LazyMath`.
+"""
+
+from functools import wraps, reduce
+
+import pymel.core as p
+
+from paya.util import LazyModule
+
+r = LazyModule('paya.runtime')
+_mo = LazyModule('paya.lib.mathops')
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    CONTEXT MANAGER
+#----------------------------------------------------------|
+
+class LazyMath:
+    """
+    Context manager. Inside the block, operators decorated with
+    :func:`deferrable` (``+``, ``-``, ``*``, ``/``, unary ``-`` and
+    :meth:`~paya.runtime.plugs.Matrix.inverse` on
+    :class:`~paya.runtime.plugs.Math1D`,
+    :class:`~paya.runtime.plugs.Vector` and
+    :class:`~paya.runtime.plugs.Matrix`) don't create nodes; instead, they
+    return :class:`Expression` instances that can be combined further.
+
+    Expressions are compiled into node networks when they're connected
+    (``>>``), passed to a non-deferred method, or explicitly compiled via
+    :meth:`Expression.compile`. Compilation folds constant sub-trees and
+    fuses operation chains:
+
+    -   Chained matrix products are emitted as a single ``multMatrix``.
+    -   Scalar and vector sums / differences are emitted as a single
+        ``plusMinusAverage`` wherever possible.
+    -   Double negations and double inversions are skipped.
+
+    Expressions that are never used are never built. Constant folding via
+    :class:`~paya.lib.mathops.FoldConstants` is also enabled inside the
+    block.
+
+    :Example:
+
+        .. code-block:: python
+
+            with r.LazyMath():
+                total = a + b + c - d # nothing built yet
+                total >> loc.attr('ty') # one plusMinusAverage node
+    """
+    __depth__ = 0
+    __suspended__ = 0
+
+    def __enter__(self):
+        self._folding = _mo.FoldConstants()
+        self._folding.__enter__()
+        LazyMath.__depth__ += 1
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        LazyMath.__depth__ -= 1
+        self._folding.__exit__(exc_type, exc_val, exc_tb)
+
+        return False
+
+    @classmethod
+    def deferring(cls):
+        """
+        :return: ``True`` if operators should currently return
+            :class:`Expression` instances.
+        :rtype: bool
+        """
+        return cls.__depth__ > 0 and not cls.__suspended__
+
+def deferrable(operation):
+    """
+    Decorator for plug operator methods. Inside a :class:`LazyMath` block,
+    the method returns an :class:`Expression` instead of running, unless
+    the operands aren't supported, in which case the method runs as
+    normal.
+
+    :param str operation: one of ``'add'``, ``'sub'``, ``'mul'``,
+        ``'div'``, ``'neg'`` or ``'inverse'``
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(self, *args, **kwargs):
+            if LazyMath.__depth__ and not LazyMath.__suspended__:
+                expr = Expression.fromOperation(
+                    operation, self, *args, **kwargs)
+
+                if expr is not None:
+                    return expr
+
+            return f(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    EXPRESSIONS
+#----------------------------------------------------------|
+
+def getDimension(item):
+    """
+    :param item: a value, plug or :class:`Expression`
+    :return: The math dimension of *item*, or ``None`` if it can't be
+        established.
+    :rtype: :class:`int`, ``None``
+    """
+    if isinstance(item, Expression):
+        return item.dimension
+
+    try:
+        return _mo.info(item)['dimension']
+
+    except TypeError:
+        return None
+
+def inferDimension(operation, leftDim, rightDim=None):
+    """
+    :param str operation: the operation
+    :param int leftDim: the dimension of the left operand
+    :param rightDim: the dimension of the right operand, if any
+    :type rightDim: :class:`int`, ``None``
+    :return: The dimension of the operation output, or ``None`` if the
+        operation can't be deferred.
+    :rtype: :class:`int`, ``None``
+    """
+    if operation == 'neg':
+        return leftDim if leftDim in (1, 3) else None
+
+    if operation == 'inverse':
+        return 16 if leftDim == 16 else None
+
+    if leftDim in (1, 3) and rightDim in (1, 3):
+        return max(leftDim, rightDim)
+
+    if operation == 'mul':
+        if (leftDim, rightDim) == (3, 16):
+            return 3
+
+        if (leftDim, rightDim) == (16, 16):
+            return 16
+
+    return None
+
+def _compileItem(item):
+    if isinstance(item, Expression):
+        return item.compile()
+
+    return item
+
+def _isPlug(item):
+    return isinstance(item, p.Attribute)
+
+def _isZero(item):
+    if isinstance(item, (int, float)):
+        return float(item) == 0.0
+
+    return all([float(member) == 0.0 for member in item])
+
+def _combineConstants(a, b, operation):
+    # Element-wise, with scalar broadcasting; avoids the dot-product
+    # behaviour of PyMEL vector multiplication
+    aIsScalar = isinstance(a, (int, float))
+    bIsScalar = isinstance(b, (int, float))
+
+    if operation == 'add':
+        f = lambda x, y: x + y
+
+    else:
+        f = lambda x, y: x * y
+
+    if aIsScalar and bIsScalar:
+        return f(a, b)
+
+    if aIsScalar:
+        a = [a] * 3
+
+    if bIsScalar:
+        b = [b] * 3
+
+    return p.datatypes.Vector([f(x, y) for x, y in zip(a, b)])
+
+
+class Expression:
+    """
+    A deferred plug math operation, returned by operators inside a
+    :class:`LazyMath` block. Supports the same arithmetic operators as
+    the plugs it was derived from; any other attribute access compiles
+    the expression and is forwarded to the resulting plug.
+    """
+
+    def __init__(self, operation, operands, dimension, plugClass=None):
+        """
+        :param str operation: the operation
+        :param list operands: the operands, in left-to-right order
+        :param int dimension: the output dimension
+        :param plugClass: an optional plug class to assign to 3D outputs
+        """
+        self.operation = operation
+        self.operands = operands
+        self.dimension = dimension
+        self.plugClass = plugClass
+        self._compiled = None
+
+    @classmethod
+    def fromOperation(cls, operation, this, other=None, swap=False):
+        """
+        :param str operation: the operation
+        :param this: the operand on which the operator was invoked
+        :param other: the other operand, if any
+        :param bool swap: the operator was invoked in reflected mode;
+            defaults to ``False``
+        :return: An expression, or ``None`` if the operation can't be
+            deferred.
+        :rtype: :class:`Expression`, ``None``
+        """
+        if operation in ('neg', 'inverse'):
+            operands = [this]
+
+        else:
+            if not isinstance(other, Expression):
+                try:
+                    other = _mo.info(other)['item']
+
+                except TypeError:
+                    return None
+
+            operands = [other, this] if swap else [this, other]
+
+        dimension = inferDimension(operation,
+                                   *[getDimension(x) for x in operands])
+
+        if dimension is None:
+            return None
+
+        if isinstance(this, Expression):
+            plugClass = this.plugClass
+
+        elif dimension == 3 and getDimension(this) == 3:
+            plugClass = type(this)
+
+        else:
+            plugClass = None
+
+        return cls(operation, operands, dimension, plugClass=plugClass)
+
+    #------------------------------------------------------|    Operators
+
+    def _binary(self, operation, other, swap=False):
+        expr = Expression.fromOperation(operation, self, other, swap=swap)
+
+        if expr is None:
+            left, right = self.compile(), _compileItem(other)
+
+            if swap:
+                left, right = right, left
+
+            return {'add': lambda x, y: x + y,
+                    'sub': lambda x, y: x - y,
+                    'mul': lambda x, y: x * y,
+                    'div': lambda x, y: x / y}[operation](left, right)
+
+        return expr
+
+    def __add__(self, other):
+        return self._binary('add', other)
+
+    def __radd__(self, other):
+        return self._binary('add', other, swap=True)
+
+    def __sub__(self, other):
+        return self._binary('sub', other)
+
+    def __rsub__(self, other):
+        return self._binary('sub', other, swap=True)
+
+    def __mul__(self, other):
+        return self._binary('mul', other)
+
+    def __rmul__(self, other):
+        return self._binary('mul', other, swap=True)
+
+    def __truediv__(self, other):
+        return self._binary('div', other)
+
+    def __rtruediv__(self, other):
+        return self._binary('div', other, swap=True)
+
+    def __neg__(self):
+        expr = Expression.fromOperation('neg', self)
+
+        if expr is None:
+            return -self.compile()
+
+        return expr
+
+    def inverse(self):
+        """
+        :return: The inverse of this (matrix) expression.
+        :rtype: :class:`Expression`
+        """
+        expr = Expression.fromOperation('inverse', self)
+
+        if expr is None:
+            return self.compile().inverse()
+
+        return expr
+
+    def __pow__(self, other):
+        return self.compile() ** _compileItem(other)
+
+    def __rpow__(self, other):
+        return _compileItem(other) ** self.compile()
+
+    def __xor__(self, other):
+        return self.compile() ^ _compileItem(other)
+
+    def __rxor__(self, other):
+        return _compileItem(other) ^ self.compile()
+
+    def __rshift__(self, other):
+        compiled = self.compile()
+
+        if _isPlug(compiled):
+            return compiled >> other
+
+        return p.Attribute(other).put(compiled, p=False)
+
+    def __getattr__(self, item):
+        if item.startswith('__'):
+            raise AttributeError(item)
+
+        return getattr(self.compile(), item)
+
+    #------------------------------------------------------|    Compilation
+
+    def compile(self):
+        """
+        Builds, or retrieves, the node network for this expression.
+        Sub-trees that only involve values are returned as values.
+
+        :return: The output.
+        :rtype: :class:`~paya.runtime.plugs.Math`,
+            :class:`float`, :class:`~paya.runtime.data.Vector`,
+            :class:`~paya.runtime.data.Matrix`
+        """
+        compiled = self._compiled
+
+        if compiled is not None:
+            if not _isPlug(compiled) or compiled.exists():
+                return compiled
+
+        LazyMath.__suspended__ += 1
+
+        try:
+            self._compiled = compiled = self._emit()
+
+        finally:
+            LazyMath.__suspended__ -= 1
+
+        return compiled
+
+    def _emit(self):
+        operation = self.operation
+
+        if operation == 'neg':
+            operand = self.operands[0]
+
+            if isinstance(operand, Expression) \
+                    and operand.operation == 'neg':
+                return _compileItem(operand.operands[0])
+
+            return -_compileItem(operand)
+
+        if operation == 'inverse':
+            operand = self.operands[0]
+
+            if isinstance(operand, Expression) \
+                    and operand.operation == 'inverse':
+                return _compileItem(operand.operands[0])
+
+            return _compileItem(operand).inverse()
+
+        if operation in ('add', 'sub'):
+            return self._emitSum()
+
+        if operation == 'mul':
+            if self.dimension == 16:
+                return _mo.multMatrices(
+                    *map(_compileItem, self._collectMatrixFactors()))
+
+            if all([getDimension(x) in (1, 3) for x in self.operands]):
+                return self._emitProduct()
+
+        left, right = map(_compileItem, self.operands)
+
+        return {'mul': lambda x, y: x * y,
+                'div': lambda x, y: x / y}[operation](left, right)
+
+    #------------------------------------------------------|    Sums
+
+    def _collectTerms(self, sign=1):
+        # Returns [(sign, item)], flattening uncompiled sums and negations
+        terms = []
+        signs = (sign, -sign if self.operation == 'sub' else sign)
+
+        for operand, _sign in zip(self.operands, signs):
+            if isinstance(operand, Expression) \
+                    and operand._compiled is None:
+
+                if operand.operation in ('add', 'sub'):
+                    terms += operand._collectTerms(sign=_sign)
+                    continue
+
+                if operand.operation == 'neg':
+                    inner = operand.operands[0]
+
+                    if isinstance(inner, Expression) \
+                            and inner._compiled is None \
+                            and inner.operation in ('add', 'sub'):
+                        terms += inner._collectTerms(sign=-_sign)
+
+                    else:
+                        terms.append((-_sign, inner))
+
+                    continue
+
+            terms.append((_sign, operand))
+
+        return terms
+
+    def _emitSum(self):
+        dimension = self.dimension
+        constant = 0.0
+        positives = []
+        negatives = []
+
+        for sign, item in self._collectTerms():
+            item = _compileItem(item)
+
+            if _isPlug(item):
+                (positives if sign > 0 else negatives).append(item)
+
+            else:
+                if sign < 0:
+                    item = _combineConstants(item, -1.0, 'mul')
+
+                constant = _combineConstants(constant, item, 'add')
+
+        if not (positives or negatives):
+            return constant
+
+        if not _isZero(constant):
+            positives.append(constant)
+
+        if not negatives and len(positives) == 1:
+            return positives[0]
+
+        if not positives:
+            positives = [0.0]
+
+        elif negatives and len(positives) > 1:
+            positives = [self._createSumNode(positives)]
+
+        return self._createSumNode(positives+negatives,
+                                   subtract=bool(negatives))
+
+    def _createSumNode(self, items, subtract=False):
+        dimension = self.dimension
+        node = r.nodes.PlusMinusAverage.createNode()
+
+        if subtract:
+            node.attr('operation').set(2)
+
+        for i, item in enumerate(items):
+            isplug = _isPlug(item)
+
+            if dimension == 1:
+                node.attr('input1D')[i].put(item, p=isplug)
+
+            elif getDimension(item) == 1:
+                for child in node.attr('input3D')[i].getChildren():
+                    child.put(item, p=isplug)
+
+            else:
+                node.attr('input3D')[i].put(item, p=isplug)
+
+        if dimension == 1:
+            return node.attr('output1D')
+
+        output = node.attr('output3D')
+
+        if self.plugClass is not None:
+            output = output.setClass(self.plugClass)
+
+        return output
+
+    #------------------------------------------------------|    Products
+
+    def _collectFactors(self):
+        # Element-wise products; divisions by values are converted into
+        # multiplications by reciprocals
+        factors = []
+
+        for operand in self.operands:
+            if isinstance(operand, Expression) \
+                    and operand._compiled is None \
+                    and operand.dimension in (1, 3):
+
+                # Only element-wise products can be flattened; vector *
+                # matrix sub-products are kept whole, as single factors
+                if operand.operation == 'mul' \
+                        and all([getDimension(x) in (1, 3) \
+                                 for x in operand.operands]):
+                    factors += operand._collectFactors()
+                    continue
+
+                if operand.operation == 'div':
+                    divisor = operand.operands[1]
+
+                    if not isinstance(divisor, Expression) \
+                            and not _isPlug(divisor) \
+                            and not _isZero(divisor):
+                        if isinstance(divisor, (int, float)):
+                            reciprocal = 1.0 / divisor
+
+                        else:
+                            reciprocal = p.datatypes.Vector(
+                                [1.0 / x for x in divisor])
+
+                        factors += [operand.operands[0], reciprocal]
+                        continue
+
+            factors.append(operand)
+
+        return factors
+
+    def _emitProduct(self):
+        constant = 1.0
+        plugs = []
+
+        for item in map(_compileItem, self._collectFactors()):
+            if _isPlug(item):
+                plugs.append(item)
+
+            else:
+                constant = _combineConstants(constant, item, 'mul')
+
+        if not plugs:
+            return constant
+
+        # Put 3D plugs first, so that the output type is preserved
+        plugs.sort(key=lambda x: getDimension(x) != 3)
+        result = reduce(lambda x, y: x * y, plugs)
+
+        if not _mo.isIdentityOperand(constant, 'mul'):
+            result = result * constant
+
+        if self.dimension == 3 and self.plugClass is not None:
+            result = result.setClass(self.plugClass)
+
+        return result
+
+    def _collectMatrixFactors(self):
+        factors = []
+
+        for operand in self.operands:
+            if isinstance(operand, Expression) \
+                    and operand._compiled is None \
+                    and operand.operation == 'mul' \
+                    and operand.dimension == 16:
+                factors += operand._collectMatrixFactors()
+
+            else:
+                factors.append(operand)
+
+        return factors
+
+    #------------------------------------------------------|    Repr
+
+    def __repr__(self):
+        return "{}({!r}, {})".format(self.__class__.__name__,
+                                     self.operation, self.operands)
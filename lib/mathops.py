@@ -1,6 +1,7 @@
 import warnings
 from collections import UserDict
 
+import maya.cmds as m
 import maya.OpenMaya as om
 from paya.lib.typeman import *
 import paya.apiutil as _au
@@ -8,6 +9,9 @@ import pymel.util as _pu
 import pymel.core as p
 
 from paya.util import LazyModule, short
+import paya.lib.nodereuse as _nr
+import paya.lib.lazymath as _lm
+import paya.lib.arraymath as _am
 r = LazyModule('paya.runtime')
 
 uncap = lambda x: x[0].lower()+x[1:]
@@ -229,6 +233,9 @@ def info(item, defaultUnitType=None, quiet=False):
     # in Python 3.0
     out = {'item': None, 'dimension': None, 'unitType': None, 'isPlug': False}
 
+    if isinstance(item, _lm.Expression):
+        item = item.compile()
+
     def fromAttr(x):
         plugInfo = x.plugInfo()
         out['dimension'] = plugInfo.get('mathDimension')
@@ -300,6 +307,257 @@ def info(item, defaultUnitType=None, quiet=False):
 
     return out
 
+#--------------------------------------------------------------|
+#--------------------------------------------------------------|    Constant folding
+#--------------------------------------------------------------|
+
+class FoldConstants:
+    """
+    Context manager. Inside the block, plug math operators resolve value
+    operands before creating nodes:
+
+    -   Identity operations (``+0``, ``-0``, ``*1``, ``/1``, ``**1``, and
+        identity matrices) return the plug operand unchanged.
+    -   A constant ``+``, ``-``, ``*`` or ``/`` on the output of a scalar
+        operation with a single constant operand is collapsed onto that
+        operation's source, with the constants combined, so that
+        ``plug * 2 * 0.5`` resolves back to ``plug``.
+    -   :func:`multMatrices` drops identity values.
+
+    Since the returned plugs may differ in type and units from the
+    outputs that would otherwise have been created, folding is opt-in.
+    It's also enabled inside :class:`~paya.lib.lazymath.LazyMath` blocks.
+
+    Folding can leave intermediate nodes behind; for example, in
+    ``plug * 2 * 0.5``, the node for ``plug * 2``. These are kept by
+    default, since the caller may still hold their outputs. Pass
+    *removeDeadNodes* to delete them on block exit instead.
+    """
+    __depth__ = 0
+    __records__ = {}
+    __created__ = []
+    __folded__ = []
+
+    @short(removeDeadNodes='rdn')
+    def __init__(self, removeDeadNodes=False):
+        """
+        :param bool removeDeadNodes/rdn: on block exit, delete nodes that
+            were created and folded through inside the block, and that
+            have no outgoing connections; only use this if none of their
+            outputs are needed after the block; defaults to ``False``
+        """
+        self.removeDeadNodes = removeDeadNodes
+
+    def __enter__(self):
+        FoldConstants.__depth__ += 1
+
+        self._createdStart = len(FoldConstants.__created__)
+        self._foldedStart = len(FoldConstants.__folded__)
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        FoldConstants.__depth__ -= 1
+
+        try:
+            if self.removeDeadNodes:
+                self._removeDeadNodes()
+
+        finally:
+            if FoldConstants.__depth__ == 0:
+                FoldConstants.__records__ = {}
+                FoldConstants.__created__ = []
+                FoldConstants.__folded__ = []
+
+        return False
+
+    @classmethod
+    def active(cls):
+        """
+        :return: ``True`` if folding is currently enabled.
+        :rtype: bool
+        """
+        return cls.__depth__ > 0
+
+    def _removeDeadNodes(self):
+        created = set(FoldConstants.__created__[self._createdStart:])
+
+        nodes = [str(node) for node in dict.fromkeys(
+            FoldConstants.__folded__[self._foldedStart:]) \
+            if node in created and node.exists()]
+
+        dead = [node for node in nodes \
+                if not m.listConnections(node, s=False, d=True)]
+
+        if dead:
+            m.delete(dead)
+
+identityOperands = {'add': 0.0, 'sub': 0.0, 'mul': 1.0,
+                    'div': 1.0, 'pow': 1.0}
+
+def isIdentityOperand(value, operation, swap=False):
+    """
+    :param value: a non-plug operand of dimension 1, 3 or 16
+    :param str operation: one of ``'add'``, ``'sub'``, ``'mul'``,
+        ``'div'`` or ``'pow'``
+    :param bool swap: *value* is the left operand; defaults to ``False``
+    :return: ``True`` if applying *operation* with *value* would return
+        the other operand unchanged.
+    :rtype: bool
+    """
+    if swap and operation in ('sub', 'div', 'pow'):
+        return False
+
+    if isinstance(value, p.datatypes.Matrix):
+        return operation == 'mul' and value.isEquivalent(
+            p.datatypes.Matrix(), tol=1e-10)
+
+    identity = identityOperands[operation]
+
+    if isinstance(value, (int, float)):
+        return float(value) == identity
+
+    try:
+        return all([float(member) == identity for member in value])
+
+    except TypeError:
+        return False
+
+def foldsIdentity(value, operation, swap=False):
+    """
+    :param value: a non-plug operand of dimension 1, 3 or 16
+    :param str operation: one of ``'add'``, ``'sub'``, ``'mul'``,
+        ``'div'`` or ``'pow'``
+    :param bool swap: *value* is the left operand; defaults to ``False``
+    :return: ``True`` if :class:`FoldConstants` is active and *value* is
+        an identity operand for *operation*.
+    :rtype: bool
+    """
+    return FoldConstants.__depth__ > 0 \
+        and isIdentityOperand(value, operation, swap=swap)
+
+# While FoldConstants is active, single-plug, single-constant scalar
+# operations are recorded on FoldConstants.__records__, keyed by output
+# plug, so that chains such as plug * 2 * 0.5 can be collapsed back onto
+# the original source
+
+def recordFoldableOutput(output, operation, source, constant,
+                         sourceDest, constantDest):
+    """
+    Called by :class:`~paya.runtime.plugs.Math1D` operators to record
+    scalar operations that can be collapsed by :func:`foldScalarOperation`.
+    Does nothing unless :class:`FoldConstants` is active.
+
+    :param output: the operation output
+    :type output: :class:`~paya.runtime.plugs.Math1D`
+    :param str operation: one of ``'add'`` or ``'mul'``; subtraction and
+        division should be recorded as their inverted equivalents
+    :param source: the plug operand
+    :type source: :class:`~paya.runtime.plugs.Math1D`
+    :param float constant: the value operand
+    :param sourceDest: the node input connected to *source*
+    :type sourceDest: :class:`~paya.runtime.plugs.Math1D`
+    :param constantDest: the node input set to the original constant
+    :type constantDest: :class:`~paya.runtime.plugs.Math1D`
+    """
+    if FoldConstants.__depth__ == 0 \
+            or isinstance(constant, (bool, p.datatypes.Unit)):
+        return
+
+    FoldConstants.__records__[_nr.getOperandKey(output)] = (
+        operation, source, constant, sourceDest,
+        constantDest, constantDest.get()
+    )
+
+    FoldConstants.__created__.append(output.node())
+
+def _getFoldRecord(plug, operation):
+    records = FoldConstants.__records__
+
+    try:
+        key = _nr.getOperandKey(plug)
+        record = records[key]
+
+    except (KeyError, TypeError):
+        return None
+
+    _operation, source, constant, sourceDest, \
+        constantDest, constantValue = record
+
+    if _operation != operation:
+        return None
+
+    # Make sure the node hasn't been edited since it was recorded
+    try:
+        if sourceDest.inputs(plugs=True) != [source] \
+                or constantDest.isConnected() \
+                or constantDest.get() != constantValue:
+            del(records[key])
+            return None
+
+    except p.MayaAttributeError:
+        del(records[key])
+        return None
+
+    return source, constant
+
+def foldScalarOperation(plug, operation, constant, swap=False):
+    """
+    Attempts to resolve a scalar operation between a plug and a plain
+    value without creating a new node. Identity operations (``+0``,
+    ``*1`` etc.) return the plug as-is; operations on the output of a
+    recorded single-constant operation are collapsed onto that operation's
+    source, with the constants combined. Does nothing unless
+    :class:`FoldConstants` is active.
+
+    :param plug: the plug operand
+    :type plug: :class:`~paya.runtime.plugs.Math1D`
+    :param str operation: one of ``'add'``, ``'sub'``, ``'mul'``,
+        ``'div'`` or ``'pow'``
+    :param float constant: the value operand
+    :param bool swap: *constant* is the left operand; defaults to
+        ``False``
+    :return: The folded result, or ``None`` if folding wasn't possible.
+    :rtype: :class:`~paya.runtime.plugs.Math1D`, ``None``
+    """
+    if FoldConstants.__depth__ == 0:
+        return None
+
+    if isIdentityOperand(constant, operation, swap=swap):
+        return plug
+
+    if swap or isinstance(constant, (bool, p.datatypes.Unit)):
+        return None
+
+    if operation in ('add', 'sub'):
+        record = _getFoldRecord(plug, 'add')
+
+        if record:
+            source, previous = record
+
+            if operation == 'sub':
+                constant = -constant
+
+            FoldConstants.__folded__.append(plug.node())
+            return source + (previous + constant)
+
+    elif operation in ('mul', 'div'):
+        record = _getFoldRecord(plug, 'mul')
+
+        if record:
+            source, previous = record
+
+            if operation == 'div':
+                if constant == 0:
+                    return None
+
+                constant = 1.0 / constant
+
+            FoldConstants.__folded__.append(plug.node())
+            return source * (previous * constant)
+
+    return None
+
 #--------------------------------------------------------------|
 #--------------------------------------------------------------|    Soft interpolation utilities
 #--------------------------------------------------------------|
@@ -554,6 +812,14 @@ def multMatrices(*matrices):
         outElems.append(matrix)
         plugStates.append(isplug)
 
+    if FoldConstants.__depth__ and any(plugStates):
+        # Drop identity values, e.g. the result of cancelling offsets
+        pairs = [pair for pair in zip(outElems, plugStates) if pair[1] \
+                 or not isIdentityOperand(pair[0], 'mul')]
+
+        outElems = [pair[0] for pair in pairs]
+        plugStates = [pair[1] for pair in pairs]
+
     if len(outElems) is 1:
         return outElems[0]
 
@@ -926,11 +1192,20 @@ def deflipVectors(vectors):
     Returns a list where each vector is flipped if that would bring it closer
     to the preceding one. This is a value-only method.
 
+    If *vectors* is a NumPy array, the result will also be an array.
+
     :param vectors: the source vectors (values)
-    :type vectors: [tuple, list, :class:`~paya.runtime.data.Vector`]
+    :type vectors: [tuple, list, :class:`~paya.runtime.data.Vector`],
+        :class:`numpy.ndarray`
     :return: The deflipped vectors.
-    :rtype: [:class:`~paya.runtime.data.Vector`]
+    :rtype: [:class:`~paya.runtime.data.Vector`], :class:`numpy.ndarray`
     """
+    if _am.isArray(vectors):
+        return _am.deflipVectors(vectors)
+
+    if _am.available():
+        return _am.asVectors(_am.deflipVectors(vectors))
+
     vectors = [p.datatypes.Vector(v).normal() for v in vectors]
     ln = len(vectors)
 
@@ -1014,16 +1289,30 @@ def getFramedAimAndUpVectors(points, upVector, tolerance=1e-7):
     towards the provided hints. Where the points are in-line, cross products
     are either blended from neighbours or swapped out for the user up vectors.
 
+    If *points* is a NumPy array, the results will also be arrays.
+
     :param points: the starting points
-    :type points: [tuple, list, :class:`~paya.runtime.data.Point`]
+    :type points: [tuple, list, :class:`~paya.runtime.data.Point`],
+        :class:`numpy.ndarray`
     :param upVector: one up hint vector, or one vector per point
-    :type upVector: tuple, list, :class:`~paya.runtime.data.Vector`
+    :type upVector: tuple, list, :class:`~paya.runtime.data.Vector`,
+        :class:`numpy.ndarray`
     :param bool tolerance/tol: any cross products below this length will be
         interpolated from neighbours; defaults to 1e-7
     :return: A list of aim vectors and a list of up vectors.
     :rtype: ([:class:`~paya.runtime.data.Vector`],
-        [:class:`~paya.runtime.data.Vector`])
+        [:class:`~paya.runtime.data.Vector`]),
+        (:class:`numpy.ndarray`, :class:`numpy.ndarray`)
     """
+    if _am.isArray(points) or _am.available():
+        aimVecs, upVecs = _am.getFramedAimAndUpVectors(
+            points, upVector, tolerance=tolerance)
+
+        if _am.isArray(points):
+            return aimVecs, upVecs
+
+        return _am.asVectors(aimVecs), _am.asVectors(upVecs)
+
     refVector = upVector
     points = [p.datatypes.Point(point) for point in points]
     ln = len(points)
@@ -1072,10 +1361,7 @@ def getFramedAimAndUpVectors(points, upVector, tolerance=1e-7):
             _upVecs = []
 
             for upVec, refVec in zip(upVecs, refVecs[1:-1]):
-                if upVec is None:
-                    _upVecs.append(upVec)
-
-                else:
+                if upVec is not None:
                     neg = upVec * -1
 
                     if refVec.dot(neg) > refVec.dot(upVec):
@@ -1112,7 +1398,11 @@ def getChainedAimMatrices(
         tolerance=1e-7
 ):
     """
-    :param points: the starting points
+    :param points: the starting points; if this is a NumPy array, all other
+        arguments must be values, and the matrices will be returned as an
+        ``(N, 4, 4)`` array
+    :type points: [list, tuple, :class:`~paya.runtime.data.Point`,
+        :class:`~paya.runtime.plugs.Vector`], :class:`numpy.ndarray`
     :param aimAxis: the matrix axes to align to the aiming vectors,
         for example '-y'.
     :param upAxis: the matrix axes to align to the resolved up vectors,
@@ -1137,8 +1427,12 @@ def getChainedAimMatrices(
         the arguments were plugs
     :return: Chained-aiming matrices, suitable for drawing or driving chains
         or control hierarchies.
-    :rtype: [:class:`~paya.runtime.plugs.Matrix`]
+    :rtype: [:class:`~paya.runtime.plugs.Matrix`], :class:`numpy.ndarray`
     """
+    if _am.isArray(points):
+        return _am.getChainedAimMatrices(points, aimAxis, upAxis, upVector,
+                                         framed=framed, tolerance=tolerance)
+
     # pointInfos = [mathInfo(point) for point in points]
     # points = [pointInfo[0] for pointInfo in pointInfos]
 
@@ -1183,7 +1477,15 @@ def getChainedAimMatrices(
 
     matrices = []
 
-    if hasPlugs or not framed:
+    if not hasPlugs and _am.available():
+        matrices = _am.asMatrices(
+            _am.getChainedAimMatrices(
+                points, aimAxis, upAxis, upVectors,
+                framed=framed, tolerance=tolerance
+            )
+        )
+
+    elif hasPlugs or not framed:
         aimVectors = getAimVectors(points)
         aimVectors.append(aimVectors[-1])
 
@@ -1249,20 +1551,25 @@ def parallelTransport(normal, tangents, fromEnd=False):
     <https://citeseerx.ist.psu.edu/viewdoc/download?doi=10.1.1.65.7632&rep=rep1&type=pdf>`_.
 
     If any of the arguments are plugs, the outputs will be plugs as well. The
-    first output normal is a pass-through of the *normal* argument.
+    first output normal is a pass-through of the *normal* argument. If
+    *tangents* is a NumPy array, *normal* must be a value, and the normals
+    will be returned as an array.
 
     :param normal: the starting normal (or up vector)
     :type normal: list, tuple, :class:`~paya.runtime.data.Vector`,
         :class:`~paya.runtime.plugs.Vector`
     :param tangents: the tangent samples along the curve
     :type tangents: [list, tuple, :class:`~paya.runtime.data.Vector`,
-        :class:`~paya.runtime.plugs.Vector`]
+        :class:`~paya.runtime.plugs.Vector`], :class:`numpy.ndarray`
     :param bool fromEnd/fe: indicate that *normal* is at the end, not the
         start, of the sequence, and solve accordingly; defaults to False
     :return: The resolved normals / up vectors.
     :rtype: [:class:`paya.runtime.data.Vector`],
-        [:class:`paya.runtime.plugs.Vector`]
+        [:class:`paya.runtime.plugs.Vector`], :class:`numpy.ndarray`
     """
+    if _am.isArray(tangents):
+        return _am.parallelTransport(normal, tangents, fromEnd=fromEnd)
+
     tangents = list(tangents)
 
     if fromEnd:
@@ -1317,6 +1624,9 @@ def parallelTransport(normal, tangents, fromEnd=False):
 
                 outNormals.append(nextNormal)
 
+    elif _am.available():
+        outNormals = _am.asVectors(_am.parallelTransport(normal, tangents))
+
     else:
         # Soft implementation
         for i, thisTangent in enumerate(tangents[:-1]):
@@ -1349,7 +1659,9 @@ def blendCurveNormalSets(normalsA,
     """
     Blends between two sets of normals along a curve. The number of
     tangents, normalsA, normalsB and ratios must be the same. If any inputs
-    are plugs then the outputs will also be plugs.
+    are plugs then the outputs will also be plugs. If *tangents* is a NumPy
+    array, all other arguments must be values, and the normals will be
+    returned as an array.
 
     :param normalsA: the first set of normals
     :type normalsA: [list, tuple,
@@ -1381,12 +1693,17 @@ def blendCurveNormalSets(normalsA,
     """
     #-------------------------------|    Wrangle args / early escape
 
+    if _am.isArray(tangents):
+        return _am.blendCurveNormalSets(normalsA, normalsB, tangents,
+                                        ratios=ratios,
+                                        unwindSwitch=unwindSwitch)
+
     # Check lengths
     numTangents = len(tangents)
     numNormalsA = len(normalsA)
     numNormalsB = len(normalsB)
 
-    if numTangents is numNormalsA is numNormalsB:
+    if numTangents == numNormalsA == numNormalsB:
         if ratios is None:
             ratios = floatRange(0, 1, numTangents)
             numRatios = numTangents
@@ -1395,7 +1712,7 @@ def blendCurveNormalSets(normalsA,
             ratios = list(ratios)
             numRatios = len(ratios)
 
-            if numRatios is not numTangents:
+            if numRatios != numTangents:
                 raise ValueError("Unequal argment lengths.")
 
     else:
@@ -1426,6 +1743,13 @@ def blendCurveNormalSets(normalsA,
         or any((normalBInfo[3] for normalBInfo in normalBInfos)) \
         or any((ratioInfo[3] for ratioInfo in ratioInfos))
 
+    if not hasPlugs and _am.available():
+        return _am.asVectors(
+            _am.blendCurveNormalSets(normalsA, normalsB, tangents,
+                                     ratios=ratios,
+                                     unwindSwitch=unwindSwitch)
+        )
+
     if hasPlugs:
         tangents = forceVectorsAsPlugs(tangents)
         normalsA = forceVectorsAsPlugs(normalsA)
@@ -1459,7 +1783,9 @@ def bidirectionalParallelTransport(startNormal,
     """
     Blends between a forward and backward parallel-transport solution. If
     either *startNormal* or *endNormal* are ``None``, the solution will
-    only be performed in one direction and returned on its own.
+    only be performed in one direction and returned on its own. If
+    *tangents* is a NumPy array, all other arguments must be values, and the
+    normals will be returned as an array.
 
     :param startNormal: the normal at the start of the blend range
     :type startNormal: list, tuple,
@@ -1471,6 +1797,9 @@ def bidirectionalParallelTransport(startNormal,
     :param tangents: tangents along the blend range; one normal will
         be generated per tangent; the more tangents, the higher the
         accurace of the parallel transport solve
+    :type tangents: [list, tuple,
+        :class:`~paya.runtime.data.Vector`,
+        :class:`~paya.runtime.plugs.Vector`], :class:`numpy.ndarray`
     :param ratios: if provided, should be a list of float values or plugs
         (one per tangent); if omitted, a uniform float range will be generated
         automatically; defaults to None
@@ -1488,12 +1817,18 @@ def bidirectionalParallelTransport(startNormal,
         - Both *startNormal* and *endNormal* are ``None``
 
     :return: The normals.
-    :rtype: [:class:`~paya.runtime.plugs.Vector`]
+    :rtype: [:class:`~paya.runtime.plugs.Vector`], :class:`numpy.ndarray`
     """
     if (startNormal is None) and (endNormal is None):
         raise ValueError(
             "Please provide a start normal and / or an end normal.")
 
+    if _am.isArray(tangents):
+        return _am.bidirectionalParallelTransport(
+            startNormal, endNormal, tangents,
+            ratios=ratios, unwindSwitch=unwindSwitch
+        )
+
     if ratios:
         if len(ratios) != len(tangents):
             raise ValueError("Unequal numbers of ratios and tangents.")
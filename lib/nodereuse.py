@@ -0,0 +1,179 @@
+"""
+Opt-in common-subexpression elimination for plug math. See
+:class:`ReuseNodes`.
+"""
+
+from functools import wraps
+
+import pymel.core as p
+
+from paya.config import config
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    KEYS
+#----------------------------------------------------------|
+
+def getOperandKey(item):
+    """
+    :param item: an operand passed to a plug operator
+    :raises TypeError: The item can't be keyed.
+    :return: A hashable key for the operand. Plugs are keyed by node UUID
+        and attribute path, so that renames don't affect lookups.
+    """
+    if item is None:
+        return None
+
+    if isinstance(item, p.Attribute):
+        node = item.node()
+        uuid = node.__apimfn__().uuid().asString()
+
+        return ('plug', uuid, item.plugAttr(longName=True, fullPath=True))
+
+    if isinstance(item, p.datatypes.Array):
+        key = (type(item).__name__, tuple(item.flat))
+
+        if isinstance(item, p.datatypes.EulerRotation):
+            key += (str(item.order), str(item.unit))
+
+        return key
+
+    if isinstance(item, (bool, int, float, str)):
+        # Also catches Angle, Distance and Time
+        key = (type(item).__name__, item)
+
+        if isinstance(item, p.datatypes.Unit):
+            key += (str(item.unit),)
+
+        return key
+
+    if isinstance(item, (list, tuple)):
+        return tuple(map(getOperandKey, item))
+
+    raise TypeError("Can't key operand: {}".format(item))
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    CONTEXT MANAGER
+#----------------------------------------------------------|
+
+class ReuseNodes:
+    """
+    Context manager. Inside the block, plug operators decorated with
+    :func:`reusable` (``+``, ``*``,
+    :meth:`~paya.runtime.plugs.Matrix.inverse` and so on) return the
+    output of a previous, identical call instead of creating a new node.
+    Calls are considered identical if they invoke the same operation on
+    the same plug class, with the same input plugs and constant operands.
+
+    Outputs that no longer exist (for example, after an undo) are
+    silently recomputed. The cache is cleared when the outermost block
+    exits.
+
+    .. warning::
+
+        Only use this where utility node outputs are treated as read-only;
+        editing the inputs of a returned node will affect every
+        expression that shares it.
+
+    :Example:
+
+        .. code-block:: python
+
+            with r.ReuseNodes() as reuse:
+                a = jointA.attr('wm') * parentInverse
+                b = jointA.attr('wm') * parentInverse # same plug as 'a'
+
+            print(reuse.numReused) # 1
+    """
+    __depth__ = 0
+    __cache__ = {}
+    __num_reused__ = 0
+
+    def __init__(self):
+        self.numReused = 0
+
+    def __enter__(self):
+        if not ReuseNodes.__depth__:
+            ReuseNodes.__cache__.clear()
+            ReuseNodes.__num_reused__ = 0
+
+        ReuseNodes.__depth__ += 1
+        self._startCount = ReuseNodes.__num_reused__
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        ReuseNodes.__depth__ -= 1
+        self.numReused = ReuseNodes.__num_reused__ - self._startCount
+
+        if not ReuseNodes.__depth__:
+            ReuseNodes.__cache__.clear()
+
+            if config['verbose']:
+                print("ReuseNodes: reused {} operator output(s).".format(
+                    self.numReused))
+
+        return False
+
+    @classmethod
+    def active(cls):
+        """
+        :return: ``True`` if a :class:`ReuseNodes` block is currently open.
+        :rtype: bool
+        """
+        return cls.__depth__ > 0
+
+def reusable(f):
+    """
+    Decorator for plug operator methods. Inside a :class:`ReuseNodes`
+    block, calls are looked up against previous, identical calls before
+    any nodes are created. Outside of such a block the method runs
+    unchanged.
+
+    Methods wrapped in this way must return a new plug without editing
+    any existing node. When combined with :class:`~paya.util.short`,
+    apply this decorator first (i.e. underneath).
+    """
+    opName = f.__qualname__
+
+    @wraps(f)
+    def wrapper(self, *args, **kwargs):
+        if not ReuseNodes.__depth__:
+            return f(self, *args, **kwargs)
+
+        try:
+            key = (
+                opName,
+                type(self).__name__,
+                getOperandKey(self),
+                getOperandKey(args),
+                tuple(sorted([(k, getOperandKey(v)
+                              ) for k, v in kwargs.items()]))
+            )
+
+            hash(key)
+
+        except TypeError:
+            return f(self, *args, **kwargs)
+
+        cache = ReuseNodes.__cache__
+
+        try:
+            result = cache[key]
+
+            if result.exists():
+                ReuseNodes.__num_reused__ += 1
+                return result
+
+            del(cache[key])
+
+        except KeyError:
+            pass
+
+        result = f(self, *args, **kwargs)
+
+        if isinstance(result, p.Attribute):
+            cache[key] = result
+
+        return result
+
+    return wrapper
@@ -1,3 +1,10 @@
+import hashlib
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+import maya.OpenMaya as om
+
 import paya.runtime as r
 
 def getKnotList(numCVs, degree, bezier=False):
@@ -94,4 +101,296 @@ def legalNumCVsForBezier(numCVs):
         bezier curve, otherwise False.
     """
     numAnchors = (numCVs + 2) / 3
-    return numAnchors.is_integer()
\ No newline at end of file
+    return numAnchors.is_integer()
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    ARC-LENGTH TABLES
+#----------------------------------------------------------|
+
+# Five-point Gauss-Legendre abscissae and weights over [-1, 1]
+_gaussNodes = (
+    0.0,
+    -0.5384693101056831, 0.5384693101056831,
+    -0.9061798459386640, 0.9061798459386640
+)
+
+_gaussWeights = (
+    0.5688888888888889,
+    0.4786286704993665, 0.4786286704993665,
+    0.2369268850561891, 0.2369268850561891
+)
+
+def getCurveDataHash(mfn):
+    """
+    :param mfn: a function set for the curve
+    :type mfn: :class:`~maya.OpenMaya.MFnNurbsCurve`
+    :return: A SHA-1 digest of the curve's degree, form, knots and
+        object-space CVs. Curves with identical geometry return identical
+        digests.
+    :rtype: str
+    """
+    knots = om.MDoubleArray()
+    mfn.getKnots(knots)
+
+    cvs = om.MPointArray()
+    mfn.getCVs(cvs, om.MSpace.kObject)
+
+    values = array('d', [mfn.degree(), mfn.form(),
+                         knots.length(), cvs.length()])
+
+    values.extend([knots[i] for i in range(knots.length())])
+
+    for i in range(cvs.length()):
+        cv = cvs[i]
+        values.extend((cv.x, cv.y, cv.z, cv.w))
+
+    return hashlib.sha1(values.tobytes()).hexdigest()
+
+def _getCurveState(mfn):
+    # Cheap, C++-side summary of the curve; any edit that could change an
+    # arc-length table would change the length or where it falls
+    length = mfn.length()
+
+    return (mfn.degree(), mfn.form(), mfn.numCVs(), mfn.numKnots(),
+            length, mfn.findParamFromLength(length / 3.0),
+            mfn.findParamFromLength(length * 2.0 / 3.0))
+
+_curveDataHashes = OrderedDict()
+
+def _getCachedCurveDataHash(mfn):
+    # Digests are remembered per data object, and only recomputed if the
+    # object has gone, or if its summary has changed
+    handle = om.MObjectHandle(mfn.object())
+    key = handle.hashCode()
+    state = _getCurveState(mfn)
+    entry = _curveDataHashes.pop(key, None)
+
+    if entry is not None and entry[0].isValid() and entry[1] == state:
+        digest = entry[2]
+
+    else:
+        digest = getCurveDataHash(mfn)
+
+        while len(_curveDataHashes) >= maxArcLengthTables:
+            _curveDataHashes.popitem(last=False)
+
+    _curveDataHashes[key] = (handle, state, digest)
+    return digest
+
+class ArcLengthTable:
+    """
+    Lookup table of cumulative curve lengths at increasing parameters.
+    Lengths are integrated from the curve derivative using adaptive
+    Gauss-Legendre quadrature, with table entries placed densely enough
+    that linearly-interpolated lookups stay within *tolerance*. Once
+    built, all length / parameter / fraction conversions are binary
+    searches.
+
+    Rather than instantiating this directly, use :func:`getArcLengthTable`,
+    which shares tables between curves with identical geometry.
+
+    :param mfn: a function set for the curve
+    :type mfn: :class:`~maya.OpenMaya.MFnNurbsCurve`
+    :param float tolerance: the maximum lookup error, as a fraction of
+        the curve length; defaults to :attr:`defaultTolerance`
+    """
+    defaultTolerance = 1e-5
+    samplesPerSpan = 4
+    maxDepth = 12
+
+    def __init__(self, mfn, tolerance=None):
+        if tolerance is None:
+            tolerance = self.defaultTolerance
+
+        self.tolerance = tolerance
+
+        self._mfn = mfn
+        self._point = om.MPoint()
+        self._tangent = om.MVector()
+
+        # Start with a few entries per span, so that quadrature never
+        # straddles a knot
+        knots = om.MDoubleArray()
+        mfn.getKnots(knots)
+
+        minPtr = om.MScriptUtil().asDoublePtr()
+        maxPtr = om.MScriptUtil().asDoublePtr()
+        mfn.getKnotDomain(minPtr, maxPtr)
+
+        umin = om.MScriptUtil(minPtr).asDouble()
+        umax = om.MScriptUtil(maxPtr).asDouble()
+
+        breaks = sorted(set([umin, umax] + [knots[i] for i in range(
+            knots.length()) if umin < knots[i] < umax]))
+
+        starts = []
+
+        for spanStart, spanEnd in zip(breaks, breaks[1:]):
+            grain = (spanEnd-spanStart) / self.samplesPerSpan
+            starts += [spanStart + grain * i for i in range(
+                self.samplesPerSpan)]
+
+        ends = starts[1:] + [umax]
+
+        # Build
+        self._absTolerance = tolerance * max(mfn.length(), 1e-10)
+
+        self.params = params = [umin]
+        self.lengths = lengths = [0.0]
+
+        for start, end in zip(starts, ends):
+            self._appendInterval(start, end, 0)
+
+        del(self._mfn, self._point, self._tangent)
+
+    #------------------------------------------------------|    Build
+
+    def _speed(self, param):
+        self._mfn.getDerivativesAtParm(
+            param, self._point, self._tangent, om.MSpace.kObject)
+
+        return self._tangent.length()
+
+    def _integrate(self, start, end):
+        half = (end-start) * 0.5
+        mid = start + half
+
+        return half * sum([weight * self._speed(mid + half * node) \
+            for node, weight in zip(_gaussNodes, _gaussWeights)])
+
+    def _appendInterval(self, start, end, depth, whole=None):
+        if whole is None:
+            whole = self._integrate(start, end)
+
+        mid = (start+end) * 0.5
+        first = self._integrate(start, mid)
+        second = self._integrate(mid, end)
+
+        # Refine until the quadrature has converged and the midpoint sits
+        # close enough to the chord for linear interpolation
+        error = max(abs(first + second - whole),
+                    abs(first - second) * 0.5)
+
+        if error > self._absTolerance * 0.25 and depth < self.maxDepth:
+            self._appendInterval(start, mid, depth+1, whole=first)
+            self._appendInterval(mid, end, depth+1, whole=second)
+
+        else:
+            base = self.lengths[-1]
+
+            self.params += [mid, end]
+            self.lengths += [base + first, base + first + second]
+
+    #------------------------------------------------------|    Lookups
+
+    def length(self):
+        """
+        :return: The full curve length.
+        :rtype: float
+        """
+        return self.lengths[-1]
+
+    def paramAtLength(self, length):
+        """
+        :param float length: the length to look up; out-of-range values
+            are clamped
+        :return: The parameter at the given length.
+        :rtype: float
+        """
+        return self._interpolate(self.lengths, self.params, length)
+
+    def paramAtFraction(self, fraction):
+        """
+        :param float fraction: the length fraction to look up
+        :return: The parameter at the given fraction.
+        :rtype: float
+        """
+        return self.paramAtLength(self.lengths[-1] * fraction)
+
+    def lengthAtParam(self, param):
+        """
+        :param float param: the parameter to look up; out-of-range values
+            are clamped
+        :return: The curve length at the given parameter.
+        :rtype: float
+        """
+        return self._interpolate(self.params, self.lengths, param)
+
+    def fractionAtParam(self, param):
+        """
+        :param float param: the parameter to look up
+        :return: The length fraction at the given parameter.
+        :rtype: float
+        """
+        length = self.lengths[-1]
+
+        if length:
+            return self.lengthAtParam(param) / length
+
+        return 0.0
+
+    @staticmethod
+    def _interpolate(keys, values, key):
+        index = bisect_left(keys, key)
+
+        if index <= 0:
+            return values[0]
+
+        if index >= len(keys):
+            return values[-1]
+
+        startKey, endKey = keys[index-1], keys[index]
+        span = endKey-startKey
+
+        if span <= 0.0:
+            return values[index]
+
+        weight = (key-startKey) / span
+        return values[index-1] + (values[index]-values[index-1]) * weight
+
+_arcLengthTables = OrderedDict()
+
+maxArcLengthTables = 256
+
+def getArcLengthTable(mfn, tolerance=None):
+    """
+    Returns a shared :class:`ArcLengthTable` for the curve. Tables are
+    keyed by :func:`getCurveDataHash`, so they're reused by every plug or
+    shape that carries the same geometry, and are rebuilt automatically
+    when the geometry changes. To keep repeat lookups cheap, the digest
+    is only recomputed when the curve data object changes, or when its
+    length, CV / knot counts or length-to-parameter mapping do. Up to
+    :data:`maxArcLengthTables` tables are kept, least-recently used first
+    out.
+
+    :param mfn: a function set for the curve
+    :type mfn: :class:`~maya.OpenMaya.MFnNurbsCurve`
+    :param float tolerance: the maximum lookup error, as a fraction of
+        the curve length; defaults to
+        :attr:`ArcLengthTable.defaultTolerance`
+    :return: The table.
+    :rtype: :class:`ArcLengthTable`
+    """
+    if tolerance is None:
+        tolerance = ArcLengthTable.defaultTolerance
+
+    key = (_getCachedCurveDataHash(mfn), tolerance)
+
+    try:
+        table = _arcLengthTables.pop(key)
+
+    except KeyError:
+        table = ArcLengthTable(mfn, tolerance=tolerance)
+
+        while len(_arcLengthTables) >= maxArcLengthTables:
+            _arcLengthTables.popitem(last=False)
+
+    _arcLengthTables[key] = table
+    return table
+
+def clearArcLengthTables():
+    """
+    Discards all cached :class:`ArcLengthTable` instances.
+    """
+    _arcLengthTables.clear()
+    _curveDataHashes.clear()
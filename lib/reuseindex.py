@@ -0,0 +1,239 @@
+"""
+Lazily-built lookup indices for reusable sampler outputs, such as
+``pointOnCurveInfo`` nodes on a curve or clones of a ``remapValue`` node.
+See :class:`SampleIndex`.
+"""
+
+import maya.cmds as m
+import maya.OpenMaya as om
+import pymel.core as p
+
+import paya.lib.nodereuse as _nr
+from paya.lib.buildbatch import flushesBuildBatch
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    KEYS
+#----------------------------------------------------------|
+
+def getSampleKey(item):
+    """
+    :param item: a sampling argument, for example a curve parameter
+    :type item: float, int, bool, :class:`~paya.runtime.plugs.Attribute`
+    :return: A hashable key for the argument. Plugs are keyed by node UUID
+        and attribute path; numbers are keyed by their float value, so
+        that ``1``, ``1.0`` and ``True`` match, as they would when
+        compared against an attribute value.
+    """
+    if isinstance(item, p.Attribute):
+        return _nr.getOperandKey(item)
+
+    return float(item)
+
+def getInputOrValueKey(plug):
+    """
+    :param plug: the plug to inspect
+    :type plug: :class:`~paya.runtime.plugs.Attribute`
+    :return: A sample key for the plug's input, if it has one, otherwise
+        for its value.
+    """
+    inputs = plug.inputs(plugs=True)
+
+    if inputs:
+        return getSampleKey(inputs[0])
+
+    return getSampleKey(plug.get())
+
+def getOwnerKey(owner):
+    """
+    :param owner: the node or plug that owns a set of samples
+    :type owner: :class:`~paya.runtime.nodes.DependNode`,
+        :class:`~paya.runtime.plugs.Attribute`
+    :return: A hashable key for the owner, robust to renames.
+    """
+    if isinstance(owner, p.Attribute):
+        return _nr.getOperandKey(owner)
+
+    return ('node', owner.__apimfn__().uuid().asString())
+
+def countOutputs(owner):
+    """
+    Default signature function for :class:`SampleIndex`.
+
+    :param owner: the node or plug that owns a set of samples
+    :type owner: :class:`~paya.runtime.nodes.DependNode`,
+        :class:`~paya.runtime.plugs.Attribute`
+    :return: The number of outgoing connections from *owner*.
+    :rtype: int
+    """
+    return len(m.listConnections(
+        str(owner), s=False, d=True, plugs=True) or [])
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    INDEX
+#----------------------------------------------------------|
+
+_indices = []
+_callbacks = []
+
+class SampleIndex:
+    """
+    Per-owner mapping of sample key: sample output. The mapping for an
+    owner is built by scanning the scene the first time it's queried, and
+    is then kept current by calling :meth:`add` whenever a new sample is
+    created, so that repeated lookups don't rescan every downstream node.
+
+    Hits are validated before being returned; outputs that have been
+    deleted (for example, after an undo) or reconfigured are dropped.
+
+    Alongside each owner's mapping, a *signature* of the owner (by
+    default, its number of outgoing connections) is stored. Every so many
+    misses, the signature is compared against the owner's current one, and
+    the owner is rescanned if they differ, so that samples created by
+    other means (e.g. outside Paya) are still found. Since signatures
+    usually take time proportional to the number of samples, they're
+    only compared once the misses since the last comparison add up to
+    :attr:`checkRatio` of the indexed samples; :meth:`add` doesn't
+    compare them at all. This keeps lookups and additions amortized
+    constant-time.
+
+    All indices are cleared when a scene is opened or a new one is
+    started, while Paya is running; see :func:`startCallbacks`.
+
+    :param listEntries: a function that takes an owner and returns
+        ``(key, output)`` pairs for every existing sample, by inspecting
+        the scene
+    :param getKey: a function that takes an output and returns its current
+        key, used to validate hits
+    :param getSignature: a function that takes an owner and returns a
+        value that changes whenever samples are added to it; defaults to
+        :func:`countOutputs`
+    """
+    checkRatio = 0.125
+
+    def __init__(self, listEntries, getKey, getSignature=None):
+        self._listEntries = listEntries
+        self._getKey = getKey
+        self._getSignature = countOutputs \
+            if getSignature is None else getSignature
+        self._byOwner = {}
+        self._signatures = {}
+        self._misses = {}
+
+        _indices.append(self)
+
+    def _scan(self, owner, ownerKey):
+        self._signatures[ownerKey] = self._getSignature(owner)
+        self._misses[ownerKey] = 0
+        index = self._byOwner[ownerKey] = {}
+
+        for entryKey, output in self._listEntries(owner):
+            index.setdefault(entryKey, output)
+
+        return index
+
+    @flushesBuildBatch
+    def find(self, owner, key):
+        """
+        :param owner: the node or plug that owns the samples
+        :param key: the key to look up, typically built using
+            :func:`getSampleKey`
+        :return: The matching output, or ``None``.
+        """
+        ownerKey = getOwnerKey(owner)
+
+        try:
+            index = self._byOwner[ownerKey]
+            scanned = False
+
+        except KeyError:
+            index = self._scan(owner, ownerKey)
+            scanned = True
+
+        output = self._validate(index, key)
+
+        if output is None and not scanned:
+            misses = self._misses[ownerKey] + 1
+
+            if misses < len(index) * self.checkRatio:
+                self._misses[ownerKey] = misses
+
+            elif self._getSignature(owner) != self._signatures[ownerKey]:
+                # Samples were added, by this index or by other means;
+                # rescan
+                output = self._validate(self._scan(owner, ownerKey), key)
+
+            else:
+                self._misses[ownerKey] = 0
+
+        return output
+
+    def _validate(self, index, key):
+        try:
+            output = index[key]
+
+        except KeyError:
+            return None
+
+        if output.exists() and self._getKey(output) == key:
+            return output
+
+        del(index[key])
+        return None
+
+    def add(self, owner, key, output):
+        """
+        Records a newly-created sample. If the owner hasn't been indexed
+        yet this does nothing, as the sample will be picked up when the
+        index is built.
+
+        :param owner: the node or plug that owns the sample
+        :param key: the sample key
+        :param output: the sample output
+        """
+        ownerKey = getOwnerKey(owner)
+
+        try:
+            self._byOwner[ownerKey][key] = output
+
+        except KeyError:
+            pass
+
+    def clear(self):
+        """
+        Discards all indexed samples; indices will be rebuilt on the next
+        query.
+        """
+        self._byOwner.clear()
+        self._signatures.clear()
+        self._misses.clear()
+
+def clearAll(*args):
+    """
+    Clears every :class:`SampleIndex`.
+    """
+    for index in _indices:
+        index.clear()
+
+def startCallbacks():
+    """
+    Called by :func:`paya.startstop.start`. Starts clearing all indices
+    on new / open scene, since node UUIDs persist in saved files.
+    """
+    if not _callbacks:
+        _callbacks.extend([
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew,
+                                         clearAll),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen,
+                                         clearAll)
+        ])
+
+def stopCallbacks():
+    """
+    Called by :func:`paya.startstop.stop`. Removes the callbacks added by
+    :func:`startCallbacks` and clears all indices.
+    """
+    for callback in _callbacks:
+        om.MMessage.removeCallback(callback)
+
+    del(_callbacks[:])
+    clearAll()
@@ -1,6 +1,7 @@
 from collections import UserList
 from paya.config import undefined, takeUndefinedFromConfig
 import paya.lib.mathops as _mo
+from paya.lib.spatialindex import SpatialIndex
 from paya.util import short, LazyModule
 import pymel.util as _pu
 
@@ -901,8 +902,10 @@ class Chain:
         :type: :class:`list` [:class:`Chain`, :class:`Chain`]
         """
         twistChain = Chain(twistChain)
-        slaveAnchors = [joint.closestOf(twistChain) for joint in self]
-        slaveIndices = [twistChain.index(joint) for joint in slaveAnchors]
+        index = SpatialIndex(twistChain.points())
+
+        slaveIndices = [index.nearest(
+            joint.getWorldPosition()) for joint in self]
 
         out = []
 
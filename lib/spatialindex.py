@@ -0,0 +1,299 @@
+"""
+Uniform hash-grid index for point proximity queries. See
+:class:`SpatialIndex`.
+
+This module has no Maya dependencies, and can be used (and profiled)
+outside of Maya.
+"""
+
+import math
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    HELPERS
+#----------------------------------------------------------|
+
+def _conformPoints(points):
+    if hasattr(points, 'shape'):
+        # NumPy arrays
+        points = points.tolist()
+
+    return [tuple(map(float, list(point)[:3])) for point in points]
+
+def _guessCellSize(points):
+    num = len(points)
+
+    if not num:
+        return 1.0
+
+    mins = [min(point[i] for point in points) for i in range(3)]
+    maxs = [max(point[i] for point in points) for i in range(3)]
+    extents = [mx-mn for mn, mx in zip(mins, maxs)]
+
+    # Aim for roughly one point per cell, over the non-degenerate axes
+    largest = max(extents)
+
+    if largest == 0.0:
+        return 1.0
+
+    extents = [extent for extent in extents if extent > largest * 1e-6]
+    volume = 1.0
+
+    for extent in extents:
+        volume *= extent
+
+    cellSize = (volume / num) ** (1.0 / len(extents))
+
+    return max(cellSize, largest * 1e-6)
+
+def _sqDist(a, b):
+    return (a[0]-b[0])**2 + (a[1]-b[1])**2 + (a[2]-b[2])**2
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    INDEX
+#----------------------------------------------------------|
+
+class SpatialIndex:
+    """
+    Buckets points into a uniform grid of cubic cells, so that nearest,
+    k-nearest and radius queries only inspect nearby points.
+
+    Results are point indices. Ties are resolved in favour of the lower
+    index, so that results are consistent with a linear scan.
+
+    :Example:
+
+        .. code-block:: python
+
+            index = r.SpatialIndex(
+                [joint.gwp() for joint in twistChain])
+
+            closest = twistChain[index.nearest(joint.gwp())]
+
+    :param points: the points to index
+    :type points: [:class:`~paya.runtime.data.Point`, :class:`list`],
+        :class:`numpy.ndarray`
+    :param cellSize: the grid cell size; defaults to a size that
+        places roughly one point in each cell
+    :type cellSize: :class:`float`, ``None``
+    """
+    def __init__(self, points, cellSize=None):
+        self.points = _conformPoints(points)
+
+        if cellSize is None:
+            cellSize = _guessCellSize(self.points)
+
+        elif cellSize <= 0.0:
+            raise ValueError("The cell size must be positive.")
+
+        self.cellSize = float(cellSize)
+        self._cells = cells = {}
+
+        for i, point in enumerate(self.points):
+            cells.setdefault(self._getCell(point), []).append(i)
+
+        if cells:
+            self._minCell = tuple(
+                min(cell[i] for cell in cells) for i in range(3))
+            self._maxCell = tuple(
+                max(cell[i] for cell in cells) for i in range(3))
+
+    def __len__(self):
+        return len(self.points)
+
+    def __repr__(self):
+        return '{}({} points, cellSize={})'.format(
+            type(self).__name__, len(self), self.cellSize)
+
+    def _getCell(self, point):
+        cellSize = self.cellSize
+
+        return (math.floor(point[0] / cellSize),
+                math.floor(point[1] / cellSize),
+                math.floor(point[2] / cellSize))
+
+    #------------------------------------------------------|    Cell iteration
+
+    def _iterBoxCells(self, minCell, maxCell):
+        # Clamp to occupied bounds
+        minCell = [max(a, b) for a, b in zip(minCell, self._minCell)]
+        maxCell = [min(a, b) for a, b in zip(maxCell, self._maxCell)]
+        numCells = 1
+
+        for a, b in zip(minCell, maxCell):
+            if b < a:
+                return
+
+            numCells *= b - a + 1
+
+        cells = self._cells
+
+        if numCells > len(cells):
+            # Cheaper to check every occupied cell
+            for cell, indices in cells.items():
+                if all(a <= c <= b for a, c, b in zip(
+                        minCell, cell, maxCell)):
+                    yield indices
+
+            return
+
+        for x in range(minCell[0], maxCell[0]+1):
+            for y in range(minCell[1], maxCell[1]+1):
+                for z in range(minCell[2], maxCell[2]+1):
+                    indices = cells.get((x, y, z))
+
+                    if indices:
+                        yield indices
+
+    def _iterRingCells(self, centerCell, ring):
+        # Cells at a Chebyshev distance of exactly *ring*, clamped to
+        # occupied bounds
+        cx, cy, cz = centerCell
+        lo = self._minCell
+        hi = self._maxCell
+        cells = self._cells
+
+        if ring == 0:
+            indices = cells.get(centerCell)
+
+            if indices:
+                yield indices
+
+            return
+
+        xs = range(max(cx-ring, lo[0]), min(cx+ring, hi[0])+1)
+        ys = range(max(cy-ring, lo[1]), min(cy+ring, hi[1])+1)
+        zRange = range(max(cz-ring, lo[2]), min(cz+ring, hi[2])+1)
+        zCaps = [z for z in (cz-ring, cz+ring) if lo[2] <= z <= hi[2]]
+
+        for x in xs:
+            onXFace = abs(x-cx) == ring
+
+            for y in ys:
+                zs = zRange if onXFace or abs(y-cy) == ring else zCaps
+
+                for z in zs:
+                    indices = cells.get((x, y, z))
+
+                    if indices:
+                        yield indices
+
+    def _getMaxRing(self, centerCell):
+        return max(max(c-lo, hi-c) for c, lo, hi in zip(
+            centerCell, self._minCell, self._maxCell))
+
+    def _getMinRing(self, centerCell):
+        return max(max(lo-c, c-hi, 0) for c, lo, hi in zip(
+            centerCell, self._minCell, self._maxCell))
+
+    #------------------------------------------------------|    Queries
+
+    def kNearest(self, point, k):
+        """
+        :param point: the query point
+        :type point: :class:`~paya.runtime.data.Point`, :class:`list`
+        :param int k: the number of points to return
+        :return: The indices of up to *k* points closest to *point*,
+            nearest first.
+        :rtype: [:class:`int`]
+        """
+        if k < 1 or not self.points:
+            return []
+
+        point = tuple(map(float, list(point)[:3]))
+        points = self.points
+        centerCell = self._getCell(point)
+        maxRing = self._getMaxRing(centerCell)
+        ring = self._getMinRing(centerCell)
+        cellSize = self.cellSize
+        found = []
+
+        while ring <= maxRing:
+            for indices in self._iterRingCells(centerCell, ring):
+                found += [(_sqDist(point, points[i]), i) for i in indices]
+
+            if len(found) >= k:
+                found.sort()
+                del(found[k:])
+
+                # Unvisited points are at least ring * cellSize away
+                limit = ring * cellSize
+
+                if found[-1][0] < limit * limit:
+                    break
+
+            ring += 1
+
+        found.sort()
+        return [i for sqDist, i in found[:k]]
+
+    def nearest(self, point):
+        """
+        :param point: the query point
+        :type point: :class:`~paya.runtime.data.Point`, :class:`list`
+        :raises ValueError: The index is empty.
+        :return: The index of the point closest to *point*.
+        :rtype: :class:`int`
+        """
+        result = self.kNearest(point, 1)
+
+        if result:
+            return result[0]
+
+        raise ValueError("The index is empty.")
+
+    def withinRadius(self, point, radius):
+        """
+        :param point: the query point
+        :type point: :class:`~paya.runtime.data.Point`, :class:`list`
+        :param float radius: the search radius (inclusive)
+        :return: The indices of all points within *radius* of *point*,
+            in ascending order.
+        :rtype: [:class:`int`]
+        """
+        if not self.points:
+            return []
+
+        point = tuple(map(float, list(point)[:3]))
+        points = self.points
+        minCell = self._getCell([x-radius for x in point])
+        maxCell = self._getCell([x+radius for x in point])
+        sqRadius = radius * radius
+
+        out = []
+
+        for indices in self._iterBoxCells(minCell, maxCell):
+            out += [i for i in indices \
+                if _sqDist(point, points[i]) <= sqRadius]
+
+        out.sort()
+        return out
+
+    def getCollocatedGroups(self, tolerance=1e-6):
+        """
+        Groups points that lie within *tolerance* of each other. Groups
+        are built greedily in index order: each group starts at the lowest
+        ungrouped index, and takes every other ungrouped point within
+        *tolerance* of that first point.
+
+        :param float tolerance: the collocation tolerance; defaults to
+            1e-6
+        :return: Lists of point indices, one per group; every index
+            appears exactly once.
+        :rtype: [[:class:`int`]]
+        """
+        grouped = [False] * len(self.points)
+        groups = []
+
+        for i, point in enumerate(self.points):
+            if grouped[i]:
+                continue
+
+            group = [x for x in self.withinRadius(point, tolerance) \
+                if not grouped[x]]
+
+            for x in group:
+                grouped[x] = True
+
+            groups.append(group)
+
+        return groups
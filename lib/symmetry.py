@@ -1,10 +1,31 @@
-from paya.util import short
-import paya.runtime as r
+"""
+Symmetry tools. :class:`SymmetricModelling` brackets Maya's symmetry
+settings; :class:`SymmetryMap` holds a reusable vertex correspondence for
+flipping and mirroring component data, such as blend shape deltas.
+"""
+
+import re
+import json
+import hashlib
+from collections import deque
+
+import maya.api.OpenMaya as om2
+
+from paya.util import short, LazyModule
+from paya.lib.spatialindex import SpatialIndex
+import paya.lib.arraymath as _am
+from paya.lib.arraymath import np
+
+r = LazyModule('paya.runtime')
 
 flags = ['about', 'allowPartial', 'axis', 'preserveSeam',
          'reset', 'seamFalloffCurve', 'seamTolerance',
          'symmetry', 'tolerance', 'topoSymmetry']
 
+#----------------------------------------------------------|
+#----------------------------------------------------------|    SETTINGS
+#----------------------------------------------------------|
+
 class SymmetricModelling:
     """
     Context manager. Applies overrides via
@@ -48,4 +69,524 @@ class SymmetricModelling:
         for k, v in self.before.items():
             r.symmetricModelling(e=True, **{k: v})
 
-        return False
\ No newline at end of file
+        return False
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    MAPS
+#----------------------------------------------------------|
+
+symmetryMapVersion = 1
+
+def _getAxisIndex(axis):
+    try:
+        return 'xyz'.index(axis.lower().strip('-'))
+
+    except ValueError:
+        raise ValueError("Not a valid axis: {}".format(axis))
+
+def _getMeshDagPath(mesh):
+    sel = om2.MSelectionList()
+    sel.add(str(mesh))
+    dagPath = sel.getDagPath(0)
+
+    if dagPath.apiType() != om2.MFn.kMesh:
+        dagPath.extendToShape()
+
+    return dagPath
+
+def _getEdgeIndex(edge):
+    if isinstance(edge, int):
+        return edge
+
+    mt = re.search(r"\[(\d+)\]$", str(edge))
+
+    if mt:
+        return int(mt.groups()[0])
+
+    raise ValueError("Couldn't resolve an edge index from: {}".format(edge))
+
+def getTopologyHash(faceCounts, faceConnects):
+    """
+    :param faceCounts: vertex counts per face
+    :type faceCounts: [int], :class:`~maya.api.OpenMaya.MIntArray`
+    :param faceConnects: flattened face-vertex indices
+    :type faceConnects: [int], :class:`~maya.api.OpenMaya.MIntArray`
+    :return: A digest that identifies the mesh topology.
+    :rtype: str
+    """
+    hsh = hashlib.sha1()
+    hsh.update(json.dumps(list(faceCounts)).encode())
+    hsh.update(json.dumps(list(faceConnects)).encode())
+
+    return hsh.hexdigest()
+
+def _walkTopology(faceCounts, faceConnects, numVertices, seedEdge):
+    # Matches faces across a centre edge by walking both sides in lockstep;
+    # mirrored faces have reversed winding, so each face is read starting
+    # at the matched edge and heading towards its second vertex
+    faces = []
+    edgeFaces = {}
+    start = 0
+
+    for count in faceCounts:
+        face = list(faceConnects[start:start+count])
+        faceIndex = len(faces)
+        faces.append(face)
+
+        for i in range(count):
+            edge = frozenset((face[i], face[(i+1) % count]))
+            edgeFaces.setdefault(edge, []).append(faceIndex)
+
+        start += count
+
+    a, b = seedEdge
+    seedFaces = edgeFaces.get(frozenset(seedEdge), [])
+
+    if len(seedFaces) != 2:
+        raise ValueError(
+            "The symmetry edge must be an interior edge (with two faces).")
+
+    mapping = [-1] * numVertices
+    mapping[a] = a
+    mapping[b] = b
+
+    visited = set()
+    queue = deque([(seedFaces[0], seedFaces[1], a, b, a, b)])
+
+    def orient(face, first, second):
+        count = len(face)
+        i = face.index(first)
+
+        if face[(i+1) % count] == second:
+            return [face[(i+x) % count] for x in range(count)]
+
+        return [face[(i-x) % count] for x in range(count)]
+
+    while queue:
+        faceA, faceB, a, b, mirrorA, mirrorB = queue.popleft()
+
+        if faceA in visited or faceB in visited:
+            continue
+
+        visited.add(faceA)
+        visited.add(faceB)
+
+        loopA = orient(faces[faceA], a, b)
+        loopB = orient(faces[faceB], mirrorA, mirrorB)
+
+        if len(loopA) != len(loopB):
+            raise ValueError("The mesh is not topologically symmetrical.")
+
+        for vertex, mirror in zip(loopA, loopB):
+            if mapping[vertex] == -1:
+                mapping[vertex] = mirror
+                mapping[mirror] = vertex
+
+            elif mapping[vertex] != mirror:
+                raise ValueError(
+                    "The mesh is not topologically symmetrical.")
+
+        count = len(loopA)
+
+        for i in range(count):
+            edgeA = (loopA[i], loopA[(i+1) % count])
+            edgeB = (loopB[i], loopB[(i+1) % count])
+
+            nextA = [x for x in edgeFaces[frozenset(edgeA)] if x != faceA]
+            nextB = [x for x in edgeFaces[frozenset(edgeB)] if x != faceB]
+
+            if nextA and nextB:
+                queue.append((nextA[0], nextB[0])+edgeA+edgeB)
+
+    return mapping
+
+class SymmetryMap:
+    """
+    A vertex correspondence across a symmetry plane, computed once per base
+    mesh and reused to flip or mirror sparse component data (for example
+    blend shape deltas; see
+    :meth:`~paya.lib.bsnboltons.Targets.flip`) without going through
+    Maya's symmetry solver every time.
+
+    Maps are built positionally (via :class:`~paya.lib.spatialindex.SpatialIndex`)
+    or topologically (by walking out from an edge on the symmetry line),
+    and can be saved alongside an asset; see :meth:`save` and :meth:`load`.
+    Use :meth:`get` to share maps for the same mesh within a session.
+
+    Requires NumPy.
+
+    :Example:
+
+        .. code-block:: python
+
+            smap = r.SymmetryMap.get('body_GEO')
+            bsn.targets.flip(smap, 'smileL', 'blinkL')
+
+    :param mapping: for each vertex, the index of its counterpart; vertices
+        on the symmetry plane map to themselves, and unmatched vertices to
+        ``-1``
+    :type mapping: [int], :class:`numpy.ndarray`
+    :param sides: for each vertex, ``1`` on the positive side of the
+        symmetry plane, ``-1`` on the negative side, and ``0`` on the plane
+    :type sides: [int], :class:`numpy.ndarray`
+    :param str axis: the symmetry axis; defaults to ``'x'``
+    :param topologyHash: a digest of the mesh topology, used by
+        :meth:`matchesMesh`; defaults to ``None``
+    :type topologyHash: str, None
+    """
+    __cache__ = {}
+
+    def __init__(self, mapping, sides, axis='x', topologyHash=None):
+        _am.requireNumpy()
+
+        self.mapping = np.asarray(mapping, dtype=np.int64)
+        self.sides = np.asarray(sides, dtype=np.int8)
+
+        if self.mapping.shape != self.sides.shape:
+            raise ValueError("Mismatched mapping and sides.")
+
+        self.axis = axis.lower().strip('-')
+        self._axisIndex = _getAxisIndex(self.axis)
+        self.topologyHash = topologyHash
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def __repr__(self):
+        return '{}({} vertices, axis={}, unmatched={})'.format(
+            type(self).__name__, len(self), repr(self.axis),
+            len(self.unmatched()))
+
+    #------------------------------------------------------|    Constructors
+
+    @staticmethod
+    def _getSides(points, mapping, axisIndex):
+        points = np.asarray(points, dtype=np.float64)
+        coords = points[:, axisIndex]
+        matched = mapping >= 0
+
+        # Compare against counterparts, so that topological maps work
+        # without a centred mesh
+        sides = np.sign(coords)
+        sides[matched] = np.sign(
+            coords[matched] - coords[mapping[matched]])
+
+        sides[mapping == np.arange(len(mapping))] = 0
+
+        return sides.astype(np.int8)
+
+    @classmethod
+    @short(axis='ax', tolerance='tol')
+    def fromPoints(cls, points, axis='x', tolerance=1e-4, topologyHash=None):
+        """
+        Builds a positional map by reflecting each point across the symmetry
+        plane (through the origin) and looking up its nearest neighbour.
+        Matches must be mutual, so that no two vertices share a
+        counterpart; others (for example collocated vertices) are left
+        unmatched.
+
+        :param points: the mesh points
+        :type points: [:class:`list`], :class:`numpy.ndarray`
+        :param str axis/ax: the symmetry axis; defaults to ``'x'``
+        :param float tolerance/tol: the maximum distance between a
+            reflected point and its counterpart; defaults to 1e-4
+        :param topologyHash: passed through to the constructor; defaults
+            to ``None``
+        :type topologyHash: str, None
+        :return: The map.
+        :rtype: :class:`SymmetryMap`
+        """
+        _am.requireNumpy()
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        axisIndex = _getAxisIndex(axis)
+        mirrored = points.copy()
+        mirrored[:, axisIndex] *= -1.0
+
+        index = SpatialIndex(points)
+        mapping = np.full(len(points), -1, dtype=np.int64)
+        sqTolerance = tolerance * tolerance
+
+        for i, point in enumerate(mirrored.tolist()):
+            for j in index.kNearest(point, 1):
+                if ((points[j]-mirrored[i]) ** 2).sum() <= sqTolerance:
+                    mapping[i] = j
+
+        matched = np.nonzero(mapping >= 0)[0]
+        mapping[matched[mapping[mapping[matched]] != matched]] = -1
+
+        return cls(mapping, cls._getSides(points, mapping, axisIndex),
+                   axis=axis, topologyHash=topologyHash)
+
+    @classmethod
+    @short(axis='ax')
+    def fromTopology(cls, faceCounts, faceConnects,
+                     points, symmetryEdge, axis='x'):
+        """
+        Builds a topological map by walking out from an edge on the
+        symmetry line. Vertices on shells that can't be reached from the
+        edge are left unmatched.
+
+        :param faceCounts: vertex counts per face
+        :type faceCounts: [int]
+        :param faceConnects: flattened face-vertex indices
+        :type faceConnects: [int]
+        :param points: the mesh points, used to derive sides
+        :type points: [:class:`list`], :class:`numpy.ndarray`
+        :param symmetryEdge: the two vertex indices of an edge on the
+            symmetry line
+        :type symmetryEdge: (int, int)
+        :param str axis/ax: the symmetry axis; defaults to ``'x'``
+        :raises ValueError: The mesh isn't topologically symmetrical
+            about the edge.
+        :return: The map.
+        :rtype: :class:`SymmetryMap`
+        """
+        _am.requireNumpy()
+
+        faceCounts = list(faceCounts)
+        faceConnects = list(faceConnects)
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+        mapping = np.array(_walkTopology(
+            faceCounts, faceConnects, len(points), tuple(symmetryEdge)),
+            dtype=np.int64)
+
+        return cls(mapping,
+                   cls._getSides(points, mapping, _getAxisIndex(axis)),
+                   axis=axis,
+                   topologyHash=getTopologyHash(faceCounts, faceConnects))
+
+    @classmethod
+    @short(axis='ax', symmetryEdge='se', tolerance='tol')
+    def fromMesh(cls, mesh, axis='x', symmetryEdge=None, tolerance=1e-4):
+        """
+        Builds a map from a mesh's object-space points.
+
+        :param mesh: the mesh
+        :type mesh: str, :class:`~paya.runtime.nodes.Mesh`,
+            :class:`~paya.runtime.nodes.Transform`
+        :param str axis/ax: the symmetry axis; defaults to ``'x'``
+        :param symmetryEdge/se: if provided, build a topological map from
+            this edge, which must lie on the symmetry line; otherwise, build
+            a positional map; defaults to ``None``
+        :type symmetryEdge/se: int, str,
+            :class:`~paya.runtime.comps.MeshEdge`, None
+        :param float tolerance/tol: the positional matching tolerance;
+            defaults to 1e-4
+        :return: The map.
+        :rtype: :class:`SymmetryMap`
+        """
+        fn = om2.MFnMesh(_getMeshDagPath(mesh))
+        points = [(pt.x, pt.y, pt.z) for pt in fn.getPoints()]
+        faceCounts, faceConnects = fn.getVertices()
+
+        if symmetryEdge is None:
+            return cls.fromPoints(
+                points, axis=axis, tolerance=tolerance,
+                topologyHash=getTopologyHash(faceCounts, faceConnects))
+
+        edge = fn.getEdgeVertices(_getEdgeIndex(symmetryEdge))
+
+        return cls.fromTopology(faceCounts, faceConnects,
+                                points, edge, axis=axis)
+
+    @classmethod
+    @short(axis='ax', symmetryEdge='se', tolerance='tol', refresh='ref')
+    def get(cls, mesh, axis='x', symmetryEdge=None,
+            tolerance=1e-4, refresh=False):
+        """
+        Same as :meth:`fromMesh`, except that maps are cached per mesh and
+        options for the rest of the session. Cached maps are discarded if
+        the vertex count has changed.
+
+        :param bool refresh/ref: rebuild the map even if it's cached;
+            defaults to ``False``
+        :return: The map.
+        :rtype: :class:`SymmetryMap`
+        """
+        dagPath = _getMeshDagPath(mesh)
+        fn = om2.MFnMesh(dagPath)
+
+        key = (om2.MFnDependencyNode(dagPath.node()).uuid().asString(),
+               axis.lower().strip('-'),
+               None if symmetryEdge is None \
+                   else _getEdgeIndex(symmetryEdge),
+               tolerance)
+
+        if not refresh:
+            cached = cls.__cache__.get(key)
+
+            if cached is not None and len(cached) == fn.numVertices:
+                return cached
+
+        result = cls.__cache__[key] = cls.fromMesh(
+            dagPath.fullPathName(), axis=axis,
+            symmetryEdge=symmetryEdge, tolerance=tolerance)
+
+        return result
+
+    @classmethod
+    def clearCache(cls):
+        """
+        Discards all maps cached by :meth:`get`.
+        """
+        cls.__cache__.clear()
+
+    #------------------------------------------------------|    Inspections
+
+    def unmatched(self):
+        """
+        :return: The indices of vertices that have no counterpart.
+        :rtype: :class:`numpy.ndarray`
+        """
+        return np.nonzero(self.mapping < 0)[0]
+
+    def matchesMesh(self, mesh):
+        """
+        :param mesh: the mesh to check
+        :type mesh: str, :class:`~paya.runtime.nodes.Mesh`,
+            :class:`~paya.runtime.nodes.Transform`
+        :return: ``True`` if this map can be used with *mesh*. If this map
+            has no topology hash, only the vertex count is compared.
+        :rtype: bool
+        """
+        fn = om2.MFnMesh(_getMeshDagPath(mesh))
+
+        if fn.numVertices != len(self):
+            return False
+
+        if self.topologyHash is None:
+            return True
+
+        return getTopologyHash(*fn.getVertices()) == self.topologyHash
+
+    #------------------------------------------------------|    Persistence
+
+    def save(self, filepath):
+        """
+        Saves this map to a compressed NumPy ``.npz`` archive.
+
+        :param str filepath: the destination file path
+        :return: ``self``
+        :rtype: :class:`SymmetryMap`
+        """
+        header = {'version': symmetryMapVersion,
+                  'axis': self.axis,
+                  'topologyHash': self.topologyHash}
+
+        np.savez_compressed(filepath,
+                            header=np.array(json.dumps(header)),
+                            mapping=self.mapping.astype(np.int32),
+                            sides=self.sides)
+
+        return self
+
+    @classmethod
+    def load(cls, filepath, mesh=None):
+        """
+        Loads a map saved using :meth:`save`.
+
+        :param str filepath: the source file path
+        :param mesh: if provided, check that the map fits this mesh;
+            defaults to ``None``
+        :type mesh: None, str, :class:`~paya.runtime.nodes.Mesh`,
+            :class:`~paya.runtime.nodes.Transform`
+        :raises ValueError: The map doesn't fit *mesh*.
+        :return: The map.
+        :rtype: :class:`SymmetryMap`
+        """
+        _am.requireNumpy()
+
+        with np.load(filepath, allow_pickle=False) as data:
+            header = json.loads(str(data['header']))
+            mapping = data['mapping']
+            sides = data['sides']
+
+        if header['version'] > symmetryMapVersion:
+            raise ValueError(
+                "Unsupported symmetry map version: {}".format(
+                    header['version']))
+
+        result = cls(mapping, sides, axis=header['axis'],
+                     topologyHash=header['topologyHash'])
+
+        if mesh is not None and not result.matchesMesh(mesh):
+            raise ValueError(
+                "The symmetry map in {} doesn't fit mesh {}.".format(
+                    filepath, mesh))
+
+        return result
+
+    #------------------------------------------------------|    Operations
+
+    def _reflect(self, deltas):
+        deltas = np.array(deltas, dtype=np.float64).reshape(-1, 3)
+        deltas[:, self._axisIndex] *= -1.0
+
+        return deltas
+
+    def flipDeltas(self, indices, deltas):
+        """
+        Swaps sparse per-vertex deltas across the symmetry plane.
+        Deltas on unmatched vertices are left as they are.
+
+        :param indices: ``(N,)`` vertex indices
+        :type indices: :class:`numpy.ndarray`, [int]
+        :param deltas: ``(N, 3)`` deltas
+        :type deltas: :class:`numpy.ndarray`, [[float]]
+        :return: The flipped ``(indices, deltas)``.
+        :rtype: (:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        deltas = np.asarray(deltas, dtype=np.float64).reshape(-1, 3)
+
+        mirrors = self.mapping[indices]
+        matched = mirrors >= 0
+
+        outIndices = np.where(matched, mirrors, indices)
+        outDeltas = np.where(matched[:, None], self._reflect(deltas), deltas)
+
+        return outIndices, outDeltas
+
+    @short(direction='d')
+    def mirrorDeltas(self, indices, deltas, direction=1):
+        """
+        Copies sparse per-vertex deltas from one side of the symmetry plane
+        to the other. Deltas on the plane lose their component along the
+        axis. Deltas on unmatched vertices are left as they are.
+
+        :param indices: ``(N,)`` vertex indices
+        :type indices: :class:`numpy.ndarray`, [int]
+        :param deltas: ``(N, 3)`` deltas
+        :type deltas: :class:`numpy.ndarray`, [[float]]
+        :param int direction/d: ``1`` to copy from the positive side,
+            ``-1`` to copy from the negative side; defaults to ``1``
+        :return: The mirrored ``(indices, deltas)``.
+        :rtype: (:class:`numpy.ndarray`, :class:`numpy.ndarray`)
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        deltas = np.asarray(deltas, dtype=np.float64).reshape(-1, 3)
+
+        sides = self.sides[indices]
+        mirrors = self.mapping[indices]
+
+        source = sides == direction
+        copied = source & (mirrors >= 0)
+        centre = sides == 0
+        unmatched = (sides == -direction) & (mirrors < 0)
+
+        centreDeltas = deltas[centre].copy()
+        centreDeltas[:, self._axisIndex] = 0.0
+
+        outIndices = np.concatenate([indices[source],
+                                     mirrors[copied],
+                                     indices[centre],
+                                     indices[unmatched]])
+
+        outDeltas = np.concatenate([deltas[source],
+                                    self._reflect(deltas[copied]),
+                                    centreDeltas,
+                                    deltas[unmatched]])
+
+        return outIndices, outDeltas
@@ -177,7 +177,7 @@ class AnimSpaceSwitcher(r.networks.System):
                 scale=scale
             )
 
-        node.tag('allNodes', tracker.getNodes())
+        node.tag('allNodes', tracker.getNodes(), packed=True)
 
         #----------------------------------------------|    Finish
 
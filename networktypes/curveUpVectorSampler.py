@@ -1,5 +1,6 @@
 import paya.lib.typeman as _tm
 import paya.lib.mathops as _mo
+import paya.lib.reuseindex as _ri
 from paya.util import short
 import maya.cmds as m
 import paya.runtime as r
@@ -151,25 +152,15 @@ class CurveUpVectorSampler(r.networks.System):
     #-------------------------------------------------------|    Sampling
 
     def _findSample(self, param):
-        arr = self.attr('samples')
-        param, pdim, put, pisplug = _mo.info(param).values()
-        indices = arr.getArrayIndices()
-
-        for index in indices:
-            compound = arr[index]
-            thisParam = compound.attr('parameter')
-            theseInputs = thisParam.inputs(plugs=True)
+        param = _mo.info(param)['item']
+        existing = _sampleIndex.find(
+            self, _ri.getSampleKey(param))
 
-            if (theseInputs and pisplug):
-                if theseInputs[0] == param:
-                    return compound.attr('vector')
+        if existing is None:
+            raise NoMatchingSampleError(
+                "No matching sample found for parameter {}.".format(param))
 
-            elif ((not theseInputs) and (not pisplug)):
-                if thisParam.get() == param:
-                    return compound.attr('vector')
-
-        raise NoMatchingSampleError(
-            "No matching sample found for parameter {}.".format(param))
+        return existing
 
     @short(plug='p')
     @_tm.plugCheck('param')
@@ -209,7 +200,11 @@ class CurveUpVectorSampler(r.networks.System):
             self._sampleAtParam(compound.attr('parameter')
                                 ) >> compound.attr('vector')
 
-        return compound.attr('vector')
+        out = compound.attr('vector')
+        _sampleIndex.add(
+            self, _ri.getSampleKey(_mo.info(parameter)['item']), out)
+
+        return out
 
     def _sampleAtParam(self, param, plug=True):
         raise NotImplementedError("Not implemented on the base class.")
@@ -226,4 +221,30 @@ class CurveUpVectorSampler(r.networks.System):
         #
         #     return out
         #
-        # return [3, 4, 5]
\ No newline at end of file
+        # return [3, 4, 5]
+
+
+#-------------------------------------------------------|
+#-------------------------------------------------------|    REUSE INDEX
+#-------------------------------------------------------|
+
+def _getSampleKey(vector):
+    # Unconnected vectors are left over from undone samples
+    if vector.inputs():
+        return _ri.getInputOrValueKey(vector.parent().attr('parameter'))
+
+def _listSamples(sampler):
+    arr = sampler.attr('samples')
+
+    for index in arr.getArrayIndices():
+        vector = arr[index].attr('vector')
+        key = _getSampleKey(vector)
+
+        if key is not None:
+            yield key, vector
+
+def _getSamplesSignature(sampler):
+    return len(sampler.attr('samples').getArrayIndices())
+
+_sampleIndex = _ri.SampleIndex(_listSamples, _getSampleKey,
+                               getSignature=_getSamplesSignature)
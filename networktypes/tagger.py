@@ -8,6 +8,20 @@ from paya.util import short
 
 
 
+def _getUuids(names):
+    # Returns {name: uuid} with a single 'ls' call; the names must each
+    # resolve to exactly one node
+    names = list(dict.fromkeys(names))
+    uuids = m.ls(*names, uuid=True) if names else []
+
+    if len(uuids) != len(names):
+        raise RuntimeError(
+            "Expected {} UUIDs, got {}; are some node names "
+            "ambiguous or missing?".format(len(names), len(uuids)))
+
+    return dict(zip(names, uuids))
+
+
 class Tagger(r.networks.System):
 
     #-------------------------------------------------|
@@ -76,7 +90,8 @@ class Tagger(r.networks.System):
     #-------------------------------------------------|    Editing
     #-------------------------------------------------|
 
-    def tag(self, tagName, *attrsOrNodes):
+    @short(packed='pk')
+    def tag(self, tagName, *attrsOrNodes, packed=False):
         """
         Tags attributes or nodes for later retrieval via :meth:`getByTag`.
 
@@ -85,8 +100,17 @@ class Tagger(r.networks.System):
         :type \*attrNodes: :class:`str`,
             :class:`~paya.runtime.plugs.Attribute`,
             :class:`~paya.runtime.plugs.DependNode`
-        :return:
+        :param bool packed/pk: instead of making a message connection per
+            member, store member UUIDs in a single string array attribute;
+            this is much cheaper for large tags (e.g. all the nodes created
+            by a part), at the expense of live connections; defaults to
+            ``False``
+        :return: ``self``
+        :rtype: :class:`Tagger`
         """
+        if packed:
+            return self._tagPacked(tagName, expandArgs(*attrsOrNodes))
+
         attrsOrNodes = [x if isinstance(x, r.PyNode) \
             else r.PyNode(x) for x in expandArgs(*attrsOrNodes)]
 
@@ -113,11 +137,104 @@ class Tagger(r.networks.System):
 
         return self
 
+    def _tagPacked(self, tagName, attrsOrNodes):
+        if not attrsOrNodes:
+            raise ValueError("No nodes or attributes were specified.")
+
+        nodes = []
+        attrs = []
+
+        for item in attrsOrNodes:
+            if not isinstance(item, r.PyNode):
+                item = str(item)
+
+                if '.' not in item:
+                    nodes.append(item)
+                    continue
+
+                item = r.Attribute(item)
+
+            if isinstance(item, r.Attribute):
+                if item.type() == 'message':
+                    nodes.append(str(item.node()))
+                else:
+                    attrs.append((str(item.node()),
+                                  item.attrName(longName=True)))
+            else:
+                nodes.append(str(item))
+
+        # One query for all the nodes, rather than one per member
+        uuids = _getUuids(nodes + [node for node, attrName in attrs])
+
+        entries = [uuids[node] for node in nodes] + \
+                  ['{}.{}'.format(uuids[node], attrName) \
+                   for node, attrName in attrs]
+
+        attrName = '{}_packedTag'.format(tagName)
+        plug = '{}.{}'.format(self, attrName)
+
+        if self.hasAttr(attrName):
+            existing = m.getAttr(plug) or []
+        else:
+            self.addAttr(attrName, dt='stringArray')
+            existing = []
+
+        entries = list(dict.fromkeys(existing + entries))
+        m.setAttr(plug, len(entries), *entries, type='stringArray')
+
+        return self
+
+    def _resolvePacked(self, entries):
+        namespace = self.namespace().strip(':')
+        entries = [entry.partition('.') for entry in entries]
+
+        # Resolve all UUIDs with two 'ls' calls, rather than one per entry
+        uuids = list(dict.fromkeys([uuid for uuid, _, _ in entries]))
+        paths = m.ls(*uuids, long=True) if uuids else []
+        pathsByUuid = {}
+
+        if paths:
+            pathUuids = m.ls(*paths, uuid=True)
+
+            if len(pathUuids) != len(paths):
+                raise RuntimeError(
+                    "Expected {} UUIDs, got {}.".format(
+                        len(paths), len(pathUuids)))
+
+            for path, uuid in zip(paths, pathUuids):
+                pathsByUuid.setdefault(uuid, []).append(path)
+
+        out = []
+
+        for uuid, _, attrName in entries:
+            paths = pathsByUuid.get(uuid, [])
+
+            if len(paths) > 1:
+                # The same UUIDs may be loaded more than once via
+                # references; prefer members in this tagger's namespace
+                local = [path for path in paths \
+                         if path.split('|')[-1].rpartition(':')[0] \
+                         == namespace]
+
+                if local:
+                    paths = local
+
+            for path in paths:
+                if attrName:
+                    out.append(r.Attribute('{}.{}'.format(path, attrName)))
+                else:
+                    out.append(r.PyNode(path))
+
+        return out
+
     def getByTag(self, tagName):
         """
         :param str tagName: the tag to inspect
         :return: Nodes and attributes tagged with the specified *tagName*.
-        :rtype: :class:`list` [:class:
+            Members of packed tags are looked up by UUID; members that
+            have since been deleted are skipped.
+        :rtype: :class:`list` [:class:`~paya.runtime.nodes.DependNode`,
+            :class:`~paya.runtime.plugs.Attribute`]
         """
         attrName = '{}_tag'.format(tagName)
         out = []
@@ -135,6 +252,14 @@ class Tagger(r.networks.System):
 
                     out.append(input)
 
+        attrName = '{}_packedTag'.format(tagName)
+
+        if self.hasAttr(attrName):
+            entries = m.getAttr('{}.{}'.format(self, attrName))
+
+            if entries:
+                out += self._resolvePacked(entries)
+
         return out
 
     def getTags(self):
@@ -142,16 +267,20 @@ class Tagger(r.networks.System):
         :return: Tags in use.
         :rtype: :class:`list` [:class:`str`]
         """
-        attrs = [attr for attr \
-                 in self.listAttr(ud=True) if attr.type() == 'message']
+        attrs = [attr for attr in self.listAttr(ud=True) \
+                 if attr.type() in ('message', 'stringArray')]
 
         out = []
 
         for attr in attrs:
-            mt = re.match(r"^(.+?)_tag$", attr.attrName(longName=True))
+            mt = re.match(r"^(.+?)_(?:tag|packedTag)$",
+                          attr.attrName(longName=True))
 
             if mt:
-                out.append(mt.groups()[0])
+                tagName = mt.groups()[0]
+
+                if tagName not in out:
+                    out.append(tagName)
 
         return out
 
@@ -185,6 +314,11 @@ class Tagger(r.networks.System):
 
                 self.deleteAttr(attrName)
 
+            attrName = '{}_packedTag'.format(tagName)
+
+            if self.hasAttr(attrName):
+                self.deleteAttr(attrName)
+
         if removeAll:
             r.delete(self)
         else:
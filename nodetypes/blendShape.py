@@ -188,6 +188,7 @@ class BlendShape:
         .. note::
 
             Data for inbetweens is not included. This is a Maya limitation.
+            To include inbetweens, use :meth:`exportDeltas` instead.
 
         :param \*targets: the targets to export; these must be
             :class:`~paya.lib.bsnboltons.Target` instances or
@@ -223,4 +224,36 @@ class BlendShape:
         :rtype: :class:`BlendShape`
         """
         r.blendShape(self, e=True, ip=filepath)
+        return self
+
+    def exportDeltas(self, *targets, filepath):
+        """
+        Exports stored deltas, including inbetweens, to a compressed NumPy
+        archive. Requires NumPy. See
+        :meth:`~paya.lib.bsnboltons.Targets.exportDeltas`.
+
+        :param \*targets: the targets to export, as
+            :class:`~paya.lib.bsnboltons.Target` instances, aliases or
+            logical indices; if omitted, defaults to all targets
+        :type \*targets: :class:`~paya.lib.bsnboltons.Target`, str, int
+        :param str filepath: the destination file path
+        :return: ``self``
+        :rtype: :class:`BlendShape`
+        """
+        self.targets.exportDeltas(filepath, *targets)
+        return self
+
+    @short(createMissing='cm')
+    def importDeltas(self, filepath, createMissing=True):
+        """
+        Imports deltas exported using :meth:`exportDeltas`. See
+        :meth:`~paya.lib.bsnboltons.Targets.importDeltas`.
+
+        :param str filepath: the source file path
+        :param bool createMissing/cm: create targets that don't exist yet;
+            defaults to ``True``
+        :return: ``self``
+        :rtype: :class:`BlendShape`
+        """
+        self.targets.importDeltas(filepath, createMissing=createMissing)
         return self
\ No newline at end of file
@@ -5,6 +5,8 @@ import paya.lib.names as _nm
 import paya.lib.attrs as _atr
 from paya.util import short, resolveFlags, LazyModule, undefined
 import paya.pools as _pl
+import paya.pluginfo as _pi
+import paya.lib.buildbatch as _bb
 import paya.lib.names as _nm
 import paya.lib.suffixes as _sf
 import maya.cmds as m
@@ -269,6 +271,31 @@ class DependNode:
 
         return node
 
+    @classmethod
+    def createNodes(cls, number, names=None):
+        """
+        Creates several nodes of this type with a single MEL call. See
+        :func:`paya.lib.buildbatch.createNodes`.
+
+        :param int number: the number of nodes to create
+        :param names: names for the nodes; defaults to contextual names
+        :type names: :class:`list` [:class:`str`], ``None``
+        :return: The nodes.
+        :rtype: :class:`list` [:class:`DependNode`]
+        """
+        if not names:
+            names = [cls.makeName() for x in range(number)]
+
+        nodes = _bb.createNodes(cls.__melnode__, names)
+
+        if cls.__is_subtype__:
+            for node in nodes:
+                node.setSubtype(cls.__name__)
+
+            nodes = [node.asSubtype(cls.__name__) for node in nodes]
+
+        return nodes
+
     @classmethod
     def createFromMacro(cls, macro, **overrides):
         """
@@ -508,6 +535,7 @@ class DependNode:
         :rtype: None, :class:`~paya.runtime.plugs.Attribute`
         """
         attrSection = kwargs.pop('attrSection', None)
+
         result = r.nodetypes.DependNode.addAttr(self, attrName, **kwargs)
 
         if 'query' in kwargs or 'edit' in kwargs:
@@ -535,6 +563,23 @@ class DependNode:
         except r.MayaAttributeError:
             return None
 
+    def deleteAttr(self, attr, *args, **kwargs):
+        """
+        Overloads :meth:`~pymel.core.nodetypes.DependNode.deleteAttr` to
+        clear classifications cached by :mod:`~paya.pluginfo` for this
+        node's dynamic attributes.
+
+        :param attr: the attribute to delete
+        :param \*args: forwarded to
+            :meth:`~pymel.core.nodetypes.DependNode.deleteAttr`
+        :param \*\*kwargs: forwarded to
+            :meth:`~pymel.core.nodetypes.DependNode.deleteAttr`
+        """
+        result = r.nodetypes.DependNode.deleteAttr(self, attr, *args, **kwargs)
+        _pi.clearCacheForNode(self)
+
+        return result
+
     @short(keyable='k', channelBox='cb')
     def maskAnimAttrs(self, *args, keyable=None, channelBox=None):
         """
@@ -707,7 +752,8 @@ class DependNode:
 
     #-----------------------------------------------------------|    Tags
 
-    def tag(self, tag, *nodesOrAttrs):
+    @short(packed='pk')
+    def tag(self, tag, *nodesOrAttrs, packed=False):
         """
         Tags nodes or attributes for quick retrieval via :meth:`getByTag`
         on this node.
@@ -717,6 +763,10 @@ class DependNode:
         :type \*nodesOrAttrs: :class:`~paya.runtime.plugs.Attribute`,
             :class:`~paya.runtime.plugs.PyNode`,
             :class:`str`
+        :param bool packed/pk: store members as UUIDs in a single attribute
+            rather than connecting each one; recommended for large tags;
+            see :meth:`~paya.runtime.networks.Tagger.tag`; defaults to
+            ``False``
         :return: ``self``
         :rtype: :class:`~paya.runtime.nodes.DependNode`
         """
@@ -724,7 +774,7 @@ class DependNode:
 
         if nodesOrAttrs:
             tagger = r.networks.Tagger.getFromTaggingNode(self, create=True)
-            tagger.tag(tag, nodesOrAttrs)
+            tagger.tag(tag, nodesOrAttrs, packed=packed)
         else:
             raise RuntimeError("No nodes or attributes were specified.")
 
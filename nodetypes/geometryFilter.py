@@ -2,6 +2,7 @@ import os
 
 import maya.cmds as m
 import paya.lib.xmlweights as _xw
+from paya.lib.deformerindex import DeformerIndex
 import paya.lib.suffixes as _sf
 from paya.util import short, uncap
 import pymel.util as _pu
@@ -20,36 +21,26 @@ class GeometryFilter:
             :class:`~paya.runtime.nodes.Transform`,
             :class:`~paya.runtime.nodes.DeformableShape`,
         :return: Deformers of this type detected across the specified
-            geometries.
+            geometries. See :class:`~paya.lib.deformerindex.DeformerIndex`
+            for caching.
         :rtype: [:class:`~paya.runtime.nodes.GeometryFilter`]
         """
-        out = []
         geos = list(map(r.PyNode, _pu.expandArgs(*geometry)))
 
         if not geos:
             raise RuntimeError("No geometries specified.")
 
         shapes = [geo.toShape() for geo in geos]
+        index = DeformerIndex.get()
+        out = []
 
         for shape in shapes:
-            history = shape.history(type=cls.__melnode__)
-
-            if history:
-                for deformer in history:
-                    assocGeo = r.deformer(deformer, q=True, g=True)
-
-                    if assocGeo:
-                        assocGeo = map(r.PyNode, assocGeo)
-                        if any([shape in shapes for shape in assocGeo]):
-                            out.append(deformer)
+            for deformer in index.getDeformers(
+                    shape, type=cls.__melnode__):
+                if deformer not in out:
+                    out.append(deformer)
 
-        _out = []
-
-        for item in out:
-            if item not in _out:
-                _out.append(item)
-
-        return _out
+        return list(map(r.PyNode, out))
 
     #----------------------------------------------------|    DG inspections
 
@@ -61,6 +52,9 @@ class GeometryFilter:
         :rtype: The shapes affected by this deformer.
         :return: [:class:`~paya.runtime.nodes.DeformableShape`]
         """
+        if DeformerIndex.active():
+            return list(map(r.PyNode, DeformerIndex.get().getShapes(self)))
+
         out = r.deformer(self, q=True, g=True)
 
         if not out:
@@ -3,6 +3,7 @@ import re
 from paya.geoshapext import ShapeExtensionMeta
 import paya.lib.nurbsutil as _nu
 import paya.lib.mathops as _mo
+from paya.lib.spatialindex import SpatialIndex
 import paya.lib.typeman as _tm
 from paya.util import short
 import paya.runtime as r
@@ -391,38 +392,16 @@ class NurbsCurve(metaclass=ShapeExtensionMeta):
     def getCollocatedCVGroups(self, tolerance=1e-6):
         """
         :param float tolerance/tol: the collocation tolerance;
-            defaults to 1e-7
+            defaults to 1e-6
         :return: A list of lists, where each sub-list comprises CVs which
             are collocated.
         :rtype: [[:class:`~paya.runtime.comps.NurbsCurveCV`]]
         """
         cvs = list(self.comp('cv'))
-        num = len(cvs)
-        indices = range(num)
         points = [r.pointPosition(cv, world=True) for cv in cvs]
+        groups = SpatialIndex(points).getCollocatedGroups(tolerance)
 
-        groups = []
-
-        usedIndices = []
-
-        for i, startCV, startPoint in zip(indices, cvs, points):
-            if i in usedIndices:
-                continue
-
-            group = [startCV]
-            usedIndices.append(i)
-
-            for x, cv, point in zip(indices, cvs, points):
-                if x in usedIndices:
-                    continue
-
-                if point.isEquivalent(startPoint, tol=1e-6):
-                    group.append(cv)
-                    usedIndices.append(x)
-
-            groups.append(group)
-
-        return groups
+        return [[cvs[i] for i in group] for group in groups]
 
     @short(tolerance='tol', merge='mer')
     def clusterAll(self, merge=False, tolerance=1e-6):
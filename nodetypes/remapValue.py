@@ -1,5 +1,6 @@
 from paya.lib.typeman import plugCheck
 import paya.lib.mathops as _mo
+import paya.lib.reuseindex as _ri
 from paya.util import short
 import paya.runtime as r
 
@@ -134,6 +135,9 @@ class RemapValue:
             clone = self.createClone()
             clone.attr('inputValue').release()
             position >> clone.attr('inputValue')
+            _cloneIndex.add(self, _ri.getSampleKey(
+                _mo.info(position)['item']), clone)
+
             return clone.attr('outValue')
 
         if self.attr('inputValue').inputs() \
@@ -263,6 +267,9 @@ class RemapValue:
             clone = self.createClone()
             clone.attr('inputValue').release()
             position >> clone.attr('inputValue')
+            _cloneIndex.add(self, _ri.getSampleKey(
+                _mo.info(position)['item']), clone)
+
             return clone.attr('outColor')
 
         if self.attr('inputValue').inputs() \
@@ -422,20 +429,11 @@ class RemapValue:
         :return: An existing clone configured for the specified position.
         :rtype: :class:`RemapValue`
         """
-        position, pdim, put, pisplug = _mo.info(position).values()
-
-        clones = self.getClones()
-
-        for clone in clones:
-            inputs = clone.attr('inputValue').inputs(plugs=True)
-
-            if inputs and pisplug:
-                if inputs[0] == position:
-                    return clone.attr('outValue')
+        clone = _cloneIndex.find(
+            self, _ri.getSampleKey(_mo.info(position)['item']))
 
-            elif (not inputs) and (not pisplug):
-                if clone.attr('inputValue').get() == position:
-                    return clone.attr('outValue')
+        if clone is not None:
+            return clone
 
         raise NoCloneForPositionError
 
@@ -448,4 +446,18 @@ class RemapValue:
         :rtype: :class:`RemapValue`
         """
         for clone in self.getClones():
-            self.driveSlave(clone, siv=True)
\ No newline at end of file
+            self.driveSlave(clone, siv=True)
+
+
+#-------------------------------------------------------|
+#-------------------------------------------------------|    REUSE INDEX
+#-------------------------------------------------------|
+
+def _getCloneKey(clone):
+    return _ri.getInputOrValueKey(clone.attr('inputValue'))
+
+def _listClones(master):
+    for clone in master.getClones():
+        yield _getCloneKey(clone), clone
+
+_cloneIndex = _ri.SampleIndex(_listClones, _getCloneKey)
@@ -1,14 +1,100 @@
 import re
 import os
-import xml.etree.ElementTree as ET
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import maya.cmds as m
 from paya.util import short
+import paya.lib.arraymath as _am
+import paya.lib.binweights as _bw
+import paya.lib.xmlweights as _xw
+from paya.lib.deformerindex import usesDeformerIndex
 import pymel.util as _pu
 import maya.cmds as m
 import paya.runtime as r
 
 
+def _getDefaultNumWorkers():
+    return min(8, os.cpu_count() or 1)
+
+def _iterPipelined(pool, func, argsList, window):
+    # Yields (args, result) in order, keeping at most *window* calls in
+    # flight to bound memory use
+    pending = deque()
+
+    for args in argsList:
+        pending.append((args, pool.submit(func, *args)))
+
+        if len(pending) >= window:
+            args, future = pending.popleft()
+            yield args, future.result()
+
+    while pending:
+        args, future = pending.popleft()
+        yield args, future.result()
+
+def _encodeAndWrite(filepath,
+                    extracted,
+                    float16,
+                    weightTolerance,
+                    options=None,
+                    knownHash=None):
+    # If *options* are provided, hashes the content and skips writing if
+    # it matches *knownHash*; returns the hash (or None) and whether the
+    # file was written
+    contentHash = None
+
+    if options is not None:
+        contentHash = _bw.getContentHash(*extracted, options=options)
+
+        if contentHash == knownHash and os.path.isfile(filepath):
+            return contentHash, False
+
+    header, arrays = _bw.encode(*extracted,
+                                f16=float16, wt=weightTolerance)
+    _bw.write(filepath, header, arrays)
+
+    return contentHash, True
+
+def _resolveInfluence(path):
+    # Returns the full path of the influence at the specified (full or
+    # partial) DAG path, creating any missing members as joints
+    matches = m.ls(path, long=True)
+
+    if len(matches) == 1:
+        return matches[0]
+
+    if matches:
+        raise RuntimeError(
+            "More than one match found for influence: {}".format(path))
+
+    segments = path.strip('|').split('|')
+    first = '|'+segments[0] if path.startswith('|') else segments[0]
+    matches = m.ls(first, long=True)
+
+    if len(matches) > 1:
+        raise RuntimeError(
+            "More than one match found for influence parent: {}".format(
+                first))
+
+    if matches:
+        current = matches[0]
+
+    else:
+        current = '|'+m.createNode('joint', n=segments[0], ss=True)
+
+    for segment in segments[1:]:
+        child = '{}|{}'.format(current, segment)
+
+        if not m.objExists(child):
+            m.createNode('joint', n=segment, p=current, ss=True)
+
+        current = child
+
+    return current
+
+
 class SkinCluster:
 
     #------------------------------------------------------------|    Constructor
@@ -143,10 +229,7 @@ class SkinCluster:
                 )
 
         if replace:
-            existing = []
-
-            for geo in geos:
-                existing += cls.getFromGeo(geo)
+            existing = cls.getFromGeo(geos) if geos else []
 
             if existing:
                 r.delete(existing)
@@ -180,48 +263,25 @@ class SkinCluster:
 
         return infls, geos
 
-    @classmethod
-    @short(
-        worldSpace='ws',
-        positionTolerance='pt',
-        method='m',
-        loadWeights='lw')
-    def createFromXMLFile(cls,
-                          xmlfile,
-                          method='index',
-                          worldSpace=None,
-                          positionTolerance=None,
-                          loadWeights=True):
-        # Open the XML file
-        tree = ET.parse(xmlfile)
-        root = tree.getroot()
+    @staticmethod
+    def _parseXMLHeader(xmlfile):
+        # Returns a shape name, deformer name and influence names from
+        # the metadata of a deformerWeights XML file
+        header = _xw.readHeader(xmlfile)
+
+        if not header['shapes']:
+            raise RuntimeError(
+                "No shape information found inside: {}".format(xmlfile)
+            )
 
         # Get this information from the first available deformer entry:
         # Shape name
         # Deformer name (will assume it's a skinCluster)
         # influence names
+        shapeName = header['shapes'][0]
+        weightEntries = header['weights']
 
-        # Determine shape name
-        shapeEntry = root.find('shape')
-        shapeName = shapeEntry.attrib['name']
-        matches = m.ls(shapeName)
-
-        nm = len(matches)
-
-        if nm is 0:
-            raise RuntimeError(
-                "Shape doesn't exist: {}".format(shapeName))
-
-        if nm > 1:
-            raise RuntimeError(
-                "More than one match found for: {}".format(shapeName))
-
-        shape = matches[0]
-
-        # Determine deformer name
-        weightEntries = root.findall('weights')
-
-        deformerNames = list(set([weightEntry.attrib['deformer'] \
+        deformerNames = list(set([weightEntry['deformer'] \
                          for weightEntry in weightEntries]))
 
         nm = len(deformerNames)
@@ -231,32 +291,36 @@ class SkinCluster:
                 "More than one deformers specified inside: {}".format(xmlfile)
             )
 
-        if nm is 0:
+        if nm == 0:
             raise RuntimeError(
                 "No deformer information found inside: {}".format(xmlfile)
             )
 
-        deformer = deformerNames[0]
+        joints = [weightEntry['source'] for weightEntry in weightEntries]
+
+        return shapeName, deformerNames[0], joints
 
+    @classmethod
+    def _createFromXMLHeader(cls,
+                             xmlfile,
+                             shape,
+                             deformer,
+                             joints,
+                             method='index',
+                             worldSpace=None,
+                             positionTolerance=None,
+                             loadWeights=True):
         # Deal with existing
         existing = r.nodes.SkinCluster.getFromGeo(shape)
 
         if existing:
             r.delete(existing)
 
-        # Get influences
-        joints = [weightEntry.attrib['source'] \
-                  for weightEntry in weightEntries]
-
-        for joint in joints:
-            if not m.objExists(joint):
-                m.createNode('joint', n=joint)
-
         # Create the deformer
         args = joints + [shape]
         kwargs = {
             'tsb': True,
-            'n': deformerNames[0],
+            'n': deformer,
             'bm': 0,
             'dr': 4.5,
             'nw': 1,
@@ -272,10 +336,209 @@ class SkinCluster:
             skin.loadWeights(xmlfile,
                              shape=shape,
                              method=method,
+                             worldSpace=worldSpace,
                              positionTolerance=positionTolerance)
 
         return skin
 
+    @classmethod
+    @short(
+        worldSpace='ws',
+        positionTolerance='pt',
+        method='m',
+        loadWeights='lw')
+    def createFromXMLFile(cls,
+                          xmlfile,
+                          method='index',
+                          worldSpace=None,
+                          positionTolerance=None,
+                          loadWeights=True):
+        """
+        Recreates a skinCluster from a ``deformerWeights`` XML file. Only
+        the file's metadata is read to build the deformer; see
+        :func:`paya.lib.xmlweights.readHeader`. Any existing skinClusters
+        on the shape are removed, and missing influences are created as
+        joints.
+
+        :param str xmlfile: the XML file
+        :param str method/m: the weight-loading method; defaults to
+            ``'index'``
+        :param worldSpace/ws: see :meth:`loadWeights`
+        :param positionTolerance/pt: see :meth:`loadWeights`
+        :param bool loadWeights/lw: load the weights too; defaults to
+            ``True``
+        :return: The new skinCluster.
+        :rtype: :class:`SkinCluster`
+        """
+        shapeName, deformer, joints = cls._parseXMLHeader(xmlfile)
+        matches = m.ls(shapeName)
+
+        nm = len(matches)
+
+        if nm == 0:
+            raise RuntimeError(
+                "Shape doesn't exist: {}".format(shapeName))
+
+        if nm > 1:
+            raise RuntimeError(
+                "More than one match found for: {}".format(shapeName))
+
+        shape = matches[0]
+
+        # Get influences
+        for joint in joints:
+            if not m.objExists(joint):
+                m.createNode('joint', n=joint)
+
+        return cls._createFromXMLHeader(
+            xmlfile, shape, deformer, joints,
+            method=method,
+            worldSpace=worldSpace,
+            positionTolerance=positionTolerance,
+            loadWeights=loadWeights
+        )
+
+    @classmethod
+    @short(
+        worldSpace='ws',
+        positionTolerance='pt',
+        method='m',
+        loadWeights='lw')
+    @usesDeformerIndex
+    def createManyFromXMLFiles(cls,
+                               xmlfiles,
+                               method='index',
+                               worldSpace=None,
+                               positionTolerance=None,
+                               loadWeights=True):
+        """
+        Batched version of :meth:`createFromXMLFile`. All file metadata is
+        read first, and shapes and influences are resolved for the whole
+        batch with one ``ls`` call each, so that a missing shape or an
+        ambiguous name is reported before any deformers are rebuilt.
+
+        :param xmlfiles: a directory containing XML files, or a list of
+            XML file paths
+        :type xmlfiles: str, [str]
+        :param str method/m: the weight-loading method; defaults to
+            ``'index'``
+        :param worldSpace/ws: see :meth:`loadWeights`
+        :param positionTolerance/pt: see :meth:`loadWeights`
+        :param bool loadWeights/lw: load the weights too; defaults to
+            ``True``
+        :raises RuntimeError: A shape couldn't be resolved.
+        :return: The new skinClusters, in file order.
+        :rtype: [:class:`SkinCluster`]
+        """
+        if isinstance(xmlfiles, str):
+            xmlfiles = [os.path.join(xmlfiles, item) for item \
+                        in sorted(os.listdir(xmlfiles)) \
+                        if os.path.splitext(item)[1] == '.xml']
+
+        headers = [cls._parseXMLHeader(xmlfile) for xmlfile in xmlfiles]
+
+        # Resolve shapes
+        shapeMatches = _xw.resolveNames(
+            [shapeName for shapeName, deformer, joints in headers])
+
+        errors = []
+
+        for shapeName, matches in shapeMatches.items():
+            if not matches:
+                errors.append("Shape doesn't exist: {}".format(shapeName))
+
+            elif len(matches) > 1:
+                errors.append(
+                    "More than one match found for: {}".format(shapeName))
+
+        if errors:
+            raise RuntimeError('\n'.join(errors))
+
+        # Create missing influences
+        allJoints = []
+
+        for shapeName, deformer, joints in headers:
+            allJoints += joints
+
+        for joint, matches in _xw.resolveNames(allJoints).items():
+            if not matches:
+                m.createNode('joint', n=joint)
+
+        out = []
+
+        for xmlfile, (shapeName, deformer, joints) in zip(
+                xmlfiles, headers):
+            out.append(cls._createFromXMLHeader(
+                xmlfile, shapeMatches[shapeName][0], deformer, joints,
+                method=method,
+                worldSpace=worldSpace,
+                positionTolerance=positionTolerance,
+                loadWeights=loadWeights
+            ))
+
+        return out
+
+    @classmethod
+    @short(loadWeights='lw')
+    def createFromBinaryWeightsFile(cls, filepath, loadWeights=True):
+        """
+        Recreates a skinCluster from a file written by
+        :meth:`dumpBinaryWeights`. Only the file header is read to build
+        the deformer. Any existing skinClusters on the shape are removed,
+        and missing influences are created as joints, along with any
+        missing parents named in their (partial) DAG paths.
+
+        :param str filepath: the binary weights file
+        :param bool loadWeights/lw: load the weights too; defaults to
+            ``True``
+        :return: The new skinCluster.
+        :rtype: :class:`SkinCluster`
+        """
+        skin = cls._createFromBinaryWeightsHeader(
+            _bw.readHeader(filepath))
+
+        if loadWeights:
+            skin.loadBinaryWeights(filepath)
+
+        return skin
+
+    @classmethod
+    def _createFromBinaryWeightsHeader(cls, header):
+        shapeName = header['shape']
+        matches = m.ls(shapeName)
+
+        if not matches:
+            raise RuntimeError(
+                "Shape doesn't exist: {}".format(shapeName))
+
+        if len(matches) > 1:
+            raise RuntimeError(
+                "More than one match found for: {}".format(shapeName))
+
+        shape = matches[0]
+        existing = r.nodes.SkinCluster.getFromGeo(shape)
+
+        if existing:
+            r.delete(existing)
+
+        joints = [_resolveInfluence(joint)
+                  for joint in header['influences']]
+
+        settings = header['settings']
+
+        return r.skinCluster(
+            *(joints + [shape]),
+            tsb=True,
+            n=header['deformer'],
+            bm=0,
+            dr=4.5,
+            nw=settings['normalizeWeights'],
+            mi=settings['maxInfluences'],
+            omi=bool(settings['maintainMaxInfluences']),
+            sm=settings['skinningMethod'],
+            wd=0
+        )
+
     #------------------------------------------------------------|    Macros
 
     def macro(self):
@@ -385,6 +648,7 @@ class SkinCluster:
         method='m',
         weights='w'
     )
+    @usesDeformerIndex
     def copyTo(
             self,
             geo,
@@ -535,6 +799,64 @@ class SkinCluster:
 
         return self
 
+    #----------------------------------------------------|    Binary weight I/O
+
+    @short(shape='sh', float16='f16', weightTolerance='wt')
+    def dumpBinaryWeights(self,
+                          filepath,
+                          shape=None,
+                          float16=False,
+                          weightTolerance=0.0):
+        """
+        Writes weights, including DQ blend weights, to a compact binary
+        file using bulk API calls. This is substantially faster, and
+        smaller on disk, than :meth:`dumpWeights`. See
+        :mod:`paya.lib.binweights` for the format. Requires NumPy.
+
+        :param str filepath: the destination file; by convention, this
+            should have a ``.pwb`` extension
+        :param shape/sh: the shape to export weights for; defaults to the
+            first shape
+        :type shape/sh: str, :class:`~paya.runtime.nodes.DeformableShape`
+        :param bool float16/f16: quantize weights to half precision;
+            defaults to ``False``
+        :param float weightTolerance/wt: discard weights at or below this
+            value; defaults to 0.0
+        :return: ``self``
+        :rtype: :class:`SkinCluster`
+        """
+        _bw.dump(self, filepath, sh=shape,
+                 f16=float16, wt=weightTolerance)
+
+        return self
+
+    @short(shape='sh', normalize='nr', blendWeights='bw')
+    def loadBinaryWeights(self,
+                          filepath,
+                          shape=None,
+                          normalize=False,
+                          blendWeights=True):
+        """
+        Loads weights written by :meth:`dumpBinaryWeights`. Influences are
+        matched by name, so their order on this skinCluster doesn't need
+        to match the file. Requires NumPy.
+
+        :param str filepath: the binary weights file
+        :param shape/sh: the shape to load weights onto; defaults to the
+            first shape
+        :type shape/sh: str, :class:`~paya.runtime.nodes.DeformableShape`
+        :param bool normalize/nr: normalize weights on load; defaults to
+            ``False``
+        :param bool blendWeights/bw: load DQ blend weights too; defaults
+            to ``True``
+        :return: ``self``
+        :rtype: :class:`SkinCluster`
+        """
+        _bw.load(self, filepath, sh=shape,
+                 nr=normalize, bw=blendWeights)
+
+        return self
+
     #----------------------------------------------------|    Shape inversion
 
     @short(name='n')
@@ -585,23 +907,77 @@ class SkinCluster:
         vertexConnections='vc',
         weightTolerance='wt',
         weightPrecision='wp',
-        makedirs='md'
+        makedirs='md',
+        binary='bin',
+        float16='f16',
+        workers='wk',
+        incremental='inc'
     )
+    @usesDeformerIndex
     def dumpAll(cls,
                 destDir,
-                clearDir=False, # clear existing XML files
+                clearDir=False, # clear existing weight files
                 makedirs=False,
                 vertexConnections=None,
                 weightPrecision=None,
-                weightTolerance=None
+                weightTolerance=None,
+                binary=False,
+                float16=False,
+                workers=None,
+                incremental=False
                 ):
+        """
+        Dumps weights for every skinCluster in the scene into *destDir*,
+        one file per skinCluster.
+
+        In binary mode, weights are extracted on the main thread while
+        encoding and writing run on a thread pool. XML mode goes through
+        ``deformerWeights``, which must run on the main thread, and is
+        therefore serial.
+
+        In incremental mode, each skinCluster's influences, settings and
+        weights are hashed, together with the export options, and
+        compared against a manifest stored alongside the files (see
+        :func:`paya.lib.binweights.readManifest`); only changed
+        skinClusters are rewritten. Non-incremental dumps discard the
+        manifest.
+
+        :param str destDir: the destination directory
+        :param bool clearDir: remove existing weight files from *destDir*
+            first; in incremental mode, only files that don't belong to
+            a current skinCluster are removed; defaults to ``False``
+        :param bool makedirs/md: create *destDir* if it doesn't exist;
+            defaults to ``False``
+        :param vertexConnections/vc: XML only; see :meth:`dumpWeights`
+        :param weightPrecision/wp: XML only; see :meth:`dumpWeights`
+        :param weightTolerance/wt: discard weights at or below this value;
+            defaults to ``None``
+        :param bool binary/bin: write binary ``.pwb`` files instead of XML;
+            see :meth:`dumpBinaryWeights`; skinClusters on geometry other
+            than meshes and NURBS curves are dumped as XML, with a
+            warning; defaults to ``False``
+        :param bool float16/f16: binary only; quantize weights to half
+            precision; defaults to ``False``
+        :param workers/wk: binary only; the number of writer threads;
+            defaults to the CPU count, capped at 8
+        :type workers/wk: int, None
+        :param bool incremental/inc: only rewrite skinClusters that have
+            changed since the last incremental dump; change detection
+            needs NumPy, and a mesh or NURBS curve; XML files that can't
+            be checked are always rewritten; defaults to ``False``
+        :return: The file paths for all current skinClusters, including
+            any that were skipped in incremental mode.
+        :rtype: [str]
+        """
+        weightExtensions = ('.xml', _bw.fileExtension)
+
         if os.path.isdir(destDir):
-            if clearDir:
+            if clearDir and not incremental:
                 listing = os.listdir(destDir)
 
                 for item in listing:
                     head, tail = os.path.splitext(item)
-                    if tail == '.xml':
+                    if tail in weightExtensions:
                         fullPath = os.path.join(destDir, item)
                         os.remove(fullPath)
                         print('Removed file: {}'.format(fullPath))
@@ -614,16 +990,94 @@ class SkinCluster:
                 print("Directory doesn't exist: ", destDir)
 
         skinClusters = r.ls(type='skinCluster')
+        num = len(skinClusters)
+        startTime = time.perf_counter()
 
-        count = 0
-        out = []
+        jobs = []
 
         for skinCluster in skinClusters:
             shape = r.skinCluster(skinCluster, q=True, geometry=True)[0]
-            filename = '{}_on_{}.xml'.format(
-                skinCluster.basename(), shape.basename())
+            useBinary = binary and _bw.isSupportedShape(shape)
+
+            if binary and not useBinary:
+                r.warning(("Binary weights aren't supported on {}; "+
+                           "dumping {} as XML instead.").format(
+                    shape, skinCluster))
+
+            filename = '{}_on_{}{}'.format(
+                skinCluster.basename(), shape.basename(),
+                _bw.fileExtension if useBinary else '.xml')
+
+            jobs.append((skinCluster, shape,
+                         os.path.join(destDir, filename), useBinary))
+
+        if incremental:
+            manifest = _bw.readManifest(destDir)
+            newManifest = {}
+
+            binaryOptions = {'binary': True,
+                             'float16': bool(float16),
+                             'weightTolerance': weightTolerance}
+
+            xmlOptions = {'binary': False,
+                          'weightTolerance': weightTolerance,
+                          'weightPrecision': weightPrecision,
+                          'vertexConnections': vertexConnections}
 
-            fullpath = os.path.join(destDir, filename)
+            if clearDir:
+                current = [os.path.basename(job[2]) for job in jobs]
+
+                for item in os.listdir(destDir):
+                    head, tail = os.path.splitext(item)
+
+                    if tail in weightExtensions and item not in current:
+                        fullPath = os.path.join(destDir, item)
+                        os.remove(fullPath)
+                        print('Removed file: {}'.format(fullPath))
+
+        else:
+            manifest = newManifest = binaryOptions = xmlOptions = None
+            manifestPath = os.path.join(destDir, _bw.manifestName)
+
+            if os.path.isfile(manifestPath):
+                os.remove(manifestPath)
+
+        def record(skinCluster, shape, fullpath,
+                   contentHash, written, options):
+            if incremental:
+                # Entries without a hash are always rewritten and reloaded
+                newManifest[os.path.basename(fullpath)] = {
+                    'hash': contentHash,
+                    'deformer': str(skinCluster),
+                    'shape': shape.name(),
+                    'options': options
+                }
+
+            if written:
+                out.append(fullpath)
+
+            else:
+                skipped.append(fullpath)
+
+        def dumpXML(i, skinCluster, shape, fullpath):
+            # Hashing goes through _bw.extract(), which needs NumPy and
+            # doesn't support all geometry; the XML writer does
+            contentHash = None
+
+            if incremental and _am.np is not None \
+                    and _bw.isSupportedShape(shape):
+                contentHash = _bw.getContentHash(
+                    *_bw.extract(skinCluster, shape), options=xmlOptions)
+
+                if contentHash == manifest.get(os.path.basename(
+                        fullpath), {}).get('hash') \
+                        and os.path.isfile(fullpath):
+                    record(skinCluster, shape, fullpath,
+                           contentHash, False, xmlOptions)
+
+                    print("[{}/{}] Unchanged {}".format(
+                        i+1, num, skinCluster))
+                    return
 
             skinCluster.dumpWeights(
                 fullpath,
@@ -632,45 +1086,218 @@ class SkinCluster:
                 weightTolerance=weightTolerance
             )
 
-            count += 1
-            out.append(fullpath)
+            record(skinCluster, shape, fullpath,
+                   contentHash, True, xmlOptions)
+            print("[{}/{}] Dumped {}".format(i+1, num, skinCluster))
 
-        if count:
-            print("Dumped {} skinClusters into: {}".format(count, destDir))
+        out = []
+        skipped = []
+
+        binaryJobs = [(i, job) for i, job in enumerate(jobs) if job[3]]
+
+        if binaryJobs:
+            if workers is None:
+                workers = _getDefaultNumWorkers()
+
+            extractTime = 0.0
+            pending = deque()
+
+            def collect():
+                skinCluster, shape, fullpath, future = pending.popleft()
+                record(skinCluster, shape, fullpath,
+                       *future.result(), binaryOptions)
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for i, (skinCluster, shape, fullpath, _) in binaryJobs:
+                    _startTime = time.perf_counter()
+                    extracted = _bw.extract(skinCluster, shape)
+                    extractTime += time.perf_counter()-_startTime
+
+                    knownHash = manifest.get(os.path.basename(
+                        fullpath), {}).get('hash') if incremental else None
+
+                    pending.append((skinCluster, shape, fullpath,
+                                    pool.submit(_encodeAndWrite,
+                                                fullpath,
+                                                extracted,
+                                                float16,
+                                                weightTolerance or 0.0,
+                                                binaryOptions,
+                                                knownHash)))
+
+                    print("[{}/{}] Extracted {}".format(
+                        i+1, num, skinCluster))
+
+                    # Bound the number of dense weight arrays in memory
+                    if len(pending) >= workers * 2:
+                        collect()
+
+                while pending:
+                    collect()
+
+            print(("Extraction took {:.2f}s on the main thread; "+
+                   "writing ran on {} worker(s).").format(
+                extractTime, workers))
+
+        for i, (skinCluster, shape, fullpath, useBinary) in enumerate(jobs):
+            if not useBinary:
+                dumpXML(i, skinCluster, shape, fullpath)
+
+        if incremental:
+            _bw.writeManifest(destDir, newManifest)
+
+        if out or skipped:
+            print(("Dumped {} skinClusters into: {} ({:.2f}s); "+
+                   "{} unchanged.").format(
+                len(out), destDir,
+                time.perf_counter()-startTime, len(skipped)))
         else:
             print("No skinClusters were found to dump.")
 
-        return out
+        return [job[2] for job in jobs]
+
+    @staticmethod
+    def _matchesManifestEntry(entry):
+        # Returns True if the skinCluster described by a manifest entry
+        # exists, and its current content hash matches the entry
+        deformer = entry['deformer']
+        shape = entry['shape']
+
+        if entry['hash'] is None:
+            return False
+
+        if not (m.objExists(deformer) and m.objExists(shape)):
+            return False
+
+        if m.nodeType(deformer) != 'skinCluster':
+            return False
+
+        try:
+            extracted = _bw.extract(deformer, shape)
+
+        except (ImportError, RuntimeError, TypeError, ValueError):
+            return False
+
+        return _bw.getContentHash(
+            *extracted, options=entry['options']) == entry['hash']
 
     @classmethod
     @short(method='m',
            worldSpace='ws',
-           positionTolerance='pt')
+           positionTolerance='pt',
+           workers='wk',
+           incremental='inc')
+    @usesDeformerIndex
     def loadAll(cls,
                 sourceDir,
                 method='index',
                 worldSpace=None,
-                positionTolerance=None):
+                positionTolerance=None,
+                workers=None,
+                incremental=False):
         """
+        Recreates skinClusters from every weights file in *sourceDir*.
+
+        Binary ``.pwb`` files are read and decoded on a thread pool, ahead
+        of deformer creation and weight application on the main thread.
+        XML files are loaded serially, via :meth:`createManyFromXMLFiles`.
+
+        :param str sourceDir: the directory to read from
+        :param str method/m: XML only; see :meth:`createFromXMLFile`;
+            defaults to ``'index'``
+        :param worldSpace/ws: XML only; see :meth:`createFromXMLFile`
+        :param positionTolerance/pt: XML only; see
+            :meth:`createFromXMLFile`
+        :param workers/wk: the number of reader threads for binary files;
+            defaults to the CPU count, capped at 8
+        :type workers/wk: int, None
+        :param bool incremental/inc: skip files whose skinCluster already
+            exists in the scene with a content hash that matches the
+            directory manifest written by :meth:`dumpAll`; files that
+            can't be checked (see :meth:`dumpAll`) are always reloaded;
+            defaults to ``False``
+        :return: The recreated skinClusters, and any that were skipped
+            in incremental mode.
+        :rtype: [:class:`SkinCluster`]
+
         To-Dos:
         - add option to just read weights, without recreating skins
         - add option to filter for shapes
         """
-        listing = os.listdir(sourceDir)
-        out = []
+        listing = sorted(os.listdir(sourceDir))
+        xmlPaths = []
+        binPaths = []
 
         for item in listing:
             head, tail = os.path.splitext(item)
+            fullPath = os.path.join(sourceDir, item)
 
             if tail == '.xml':
-                fullPath = os.path.join(sourceDir, item)
-                out.append(r.nodes.SkinCluster.createFromXMLFile(
-                    fullPath,
-                    method=method,
-                    worldSpace=worldSpace,
-                    positionTolerance=positionTolerance,
-                    includeShapes=includeShapes,
-                    excludeShapes=excludeShapes
-                ))
-
-        return out
\ No newline at end of file
+                xmlPaths.append(fullPath)
+
+            elif tail == _bw.fileExtension:
+                binPaths.append(fullPath)
+
+        num = len(xmlPaths) + len(binPaths)
+        startTime = time.perf_counter()
+        out = []
+
+        if incremental:
+            manifest = _bw.readManifest(sourceDir)
+            unchanged = set()
+
+            for fullPath in xmlPaths + binPaths:
+                entry = manifest.get(os.path.basename(fullPath))
+
+                if entry and cls._matchesManifestEntry(entry):
+                    unchanged.add(fullPath)
+                    out.append(r.PyNode(entry['deformer']))
+
+                    print("[{}/{}] Unchanged {}".format(
+                        len(out), num, fullPath))
+
+            xmlPaths = [x for x in xmlPaths if x not in unchanged]
+            binPaths = [x for x in binPaths if x not in unchanged]
+
+        if binPaths:
+            if workers is None:
+                workers = _getDefaultNumWorkers()
+
+            applyTime = 0.0
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for (fullPath,), decoded in _iterPipelined(
+                        pool, _bw.decode,
+                        [(fullPath,) for fullPath in binPaths],
+                        workers * 2):
+                    _startTime = time.perf_counter()
+                    header, weights, blendWeights = decoded
+
+                    skin = cls._createFromBinaryWeightsHeader(header)
+                    _bw.apply(skin, header, weights, blendWeights)
+                    applyTime += time.perf_counter()-_startTime
+
+                    out.append(skin)
+                    print("[{}/{}] Loaded {}".format(
+                        len(out), num, fullPath))
+
+            print(("Creation and weight application took {:.2f}s on "+
+                   "the main thread; reading ran on {} worker(s).").format(
+                applyTime, workers))
+
+        if xmlPaths:
+            out += cls.createManyFromXMLFiles(
+                xmlPaths,
+                method=method,
+                worldSpace=worldSpace,
+                positionTolerance=positionTolerance
+            )
+
+            print("[{}/{}] Loaded {} XML file(s)".format(
+                len(out), num, len(xmlPaths)))
+
+        if out:
+            print("Loaded {} skinClusters from: {} ({:.2f}s)".format(
+                len(out), sourceDir, time.perf_counter()-startTime))
+
+        return out
@@ -18,7 +18,7 @@ def partCreator(f):
                 self._postCreate()
 
             allNodes = tracker.getNodes()
-            groupNode.tag('dependencies', allNodes)
+            groupNode.tag('dependencies', allNodes, packed=True)
 
             xforms = [node for node in allNodes \
                 if isinstance(node, p.nodetypes.Transform)]
@@ -5,12 +5,13 @@ classes.
 """
 
 import re
+from types import MappingProxyType
 import maya.OpenMaya as om
 import maya.cmds as m
 import pymel.core as p
 
 from paya.util import uncap
-from paya.apiutil import enumIndexToKey
+from paya.apiutil import getEnumReverseMap
 
 #------------------------------------------------------------|
 #------------------------------------------------------------|    Constants
@@ -141,6 +142,38 @@ mFnDataEnumsToTreeKeys = parseMFnDataEnums()
 mFnNumericDataEnumsToTreeKeys = parseMFnNumericDataEnums()
 mFnUnitAttributeEnumsToTreeKeys = parseMFnUnitAttributeEnums()
 
+def reverseMFnEnums(enumClass, enumsToTreeKeys):
+    """
+    Runs on startup.
+
+    :param enumClass: the class carrying the enums, for example
+        :class:`maya.OpenMaya.MFnNumericData`
+    :param dict enumsToTreeKeys: one of the ``{enum name: paya class
+        name}`` mappings returned by the ``parse*Enums()`` functions
+    :return: A frozen ``{enum index: paya class name}`` mapping, resolved
+        in the same way as :func:`~paya.apiutil.enumIndexToKey`.
+    :rtype: :class:`~types.MappingProxyType`
+    """
+    out = {}
+
+    for index, enum in getEnumReverseMap(enumClass).items():
+        try:
+            out[index] = enumsToTreeKeys[enum]
+
+        except KeyError:
+            continue
+
+    return MappingProxyType(out)
+
+mFnDataIndicesToTreeKeys = reverseMFnEnums(
+    om.MFnData, mFnDataEnumsToTreeKeys)
+
+mFnNumericDataIndicesToTreeKeys = reverseMFnEnums(
+    om.MFnNumericData, mFnNumericDataEnumsToTreeKeys)
+
+mFnUnitAttributeIndicesToTreeKeys = reverseMFnEnums(
+    om.MFnUnitAttribute, mFnUnitAttributeEnumsToTreeKeys)
+
 tree = {
     'Attribute': {
         'Math': {
@@ -174,29 +207,37 @@ tree = {
     }
 }
 
-def _getPath(key, invent=True):
+def flattenTree():
+    """
+    Runs on startup.
+
+    :return: A frozen ``{paya class name: path}`` mapping for every key
+        in the plug tree.
+    :rtype: :class:`~types.MappingProxyType`
+    """
     global tree
-    buffer = {'result': None}
+    out = {}
 
-    def parse(history):
-        dct = tree
+    def parse(history, dct):
+        for _key, subdct in dct.items():
+            possiblePath = history + [_key]
+            out[_key] = tuple(possiblePath)
+            parse(possiblePath, subdct)
 
-        for _key in history:
-            dct = dct[_key]
+    parse([], tree)
 
-        for _key in dct:
-            possiblePath = history + [_key]
+    return MappingProxyType(out)
 
-            if _key == key:
-                buffer['result'] = possiblePath
-            else:
-                parse(possiblePath)
+treePaths = flattenTree()
+
+def _getPath(key, invent=True):
+    global treePaths
 
-    parse([])
-    result = buffer['result']
+    try:
+        return list(treePaths[key])
 
-    if result:
-        return result
+    except KeyError:
+        pass
 
     if invent:
         return ['Attribute', key]
@@ -340,7 +381,112 @@ def getPath(key, invent=True):
 #------------------------------------------------------------|    Instance analysis
 #------------------------------------------------------------|
 
-def getInfoFromMPlug(mplug):
+#------------------------------------------------------------|    Classification cache
+
+# Attribute classifications are static per node type and attribute, so
+# they're cached under (node type, attribute name). Dynamic attributes
+# are cached per node instead, under {node UUID: {attribute name: entry}};
+# each entry carries a handle to the attribute it was computed for, so
+# that attributes deleted and re-added behind Paya's back (e.g. via
+# maya.cmds) are re-analysed. Generic attributes are never cached, as
+# their classification follows the current data.
+
+_infoCache = {}
+_dynamicInfoCache = {}
+_callbacks = []
+
+def _getMPlugNodeAndAttr(mplug):
+    mfnNode = om.MFnDependencyNode(mplug.node())
+    attrName = om.MFnAttribute(mplug.attribute()).name()
+
+    return mfnNode, attrName
+
+def clearCacheForNode(node):
+    """
+    Clears cached classifications for dynamic attributes on the specified
+    node. Called by Paya when attributes are added or removed.
+
+    :param node: the node to inspect
+    :type node: :class:`str`, :class:`~paya.runtime.nodes.DependNode`
+    """
+    sel = om.MSelectionList()
+    sel.add(str(node))
+    mobj = om.MObject()
+    sel.getDependNode(0, mobj)
+    uuid = om.MFnDependencyNode(mobj).uuid().asString()
+
+    _dynamicInfoCache.pop(uuid, None)
+
+def clearCache(*args):
+    """
+    Clears all cached plug classifications. Called automatically when a
+    scene is opened or a new one is started, while Paya is running.
+    """
+    _infoCache.clear()
+    _dynamicInfoCache.clear()
+
+def startCallbacks():
+    """
+    Called by :func:`paya.startstop.start`. Starts clearing the cache on
+    new / open scene.
+    """
+    if not _callbacks:
+        _callbacks.extend([
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew,
+                                         clearCache),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen,
+                                         clearCache)
+        ])
+
+def stopCallbacks():
+    """
+    Called by :func:`paya.startstop.stop`. Removes the callbacks added by
+    :func:`startCallbacks` and clears the cache.
+    """
+    for callback in _callbacks:
+        om.MMessage.removeCallback(callback)
+
+    del(_callbacks[:])
+    clearCache()
+
+def _getInfoFromMPlug(mplug):
+    # Returns (info, cacheable)
+    mfnNode, attrName = _getMPlugNodeAndAttr(mplug)
+
+    if mplug.isDynamic():
+        nodeCache = _dynamicInfoCache.setdefault(
+            mfnNode.uuid().asString(), {})
+
+        try:
+            handle, info = nodeCache[attrName]
+
+            if handle.isValid() and handle.object() == mplug.attribute():
+                return info, True
+
+        except KeyError:
+            pass
+
+        info, cacheable = _analyseMPlug(mplug)
+
+        if cacheable:
+            nodeCache[attrName] = (om.MObjectHandle(mplug.attribute()), info)
+
+        return info, cacheable
+
+    key = (mfnNode.typeName(), attrName)
+
+    try:
+        return _infoCache[key], True
+
+    except KeyError:
+        info, cacheable = _analyseMPlug(mplug)
+
+        if cacheable:
+            _infoCache[key] = info
+
+        return info, cacheable
+
+def _analyseMPlug(mplug):
     if mplug.isArray():
         mplug = mplug.elementByLogicalIndex(0)
 
@@ -349,7 +495,13 @@ def getInfoFromMPlug(mplug):
 
         if numChildren in (2, 3, 4):
             children = [mplug.child(x) for x in range(mplug.numChildren())]
-            childInfos = [getInfoFromMPlug(child) for child in children]
+            childInfos = []
+            cacheable = True
+
+            for child in children:
+                childInfo, childCacheable = _getInfoFromMPlug(child)
+                childInfos.append(childInfo)
+                cacheable = cacheable and childCacheable
 
             mathDimensions = [childInfo.get(
                 'mathDimension') for childInfo in childInfos]
@@ -359,7 +511,7 @@ def getInfoFromMPlug(mplug):
                     return {
                         'type':getPath('Quaternion', invent=False),
                         'mathDimension': 4
-                    }
+                    }, cacheable
 
                 if numChildren is 3:
                     mathUnitTypes = [childInfo.get(
@@ -369,80 +521,90 @@ def getInfoFromMPlug(mplug):
                         return {
                             'type':getPath('Point', invent=False),
                             'mathDimension': 3
-                        }
+                        }, cacheable
 
                     elif all([mathUnitType == 'angle' for mathUnitType in mathUnitTypes]):
                         return {
                             'type':getPath('EulerRotation', invent=False),
                             'mathDimension': 3
-                        }
+                        }, cacheable
 
                     else:
                         return {
                             'type':getPath('Vector', invent=False),
                             'mathDimension': 3
-                        }
+                        }, cacheable
 
                 return {
                     'type':getPath('Math{}D'.format(numChildren), invent=False),
                     'mathDimension': numChildren
-                }
+                }, cacheable
+
+            return {'type':getPath('Compound')}, cacheable
 
-        return {'type':getPath('Compound')}
+        return {'type':getPath('Compound')}, True
 
     mobj = mplug.attribute()
 
     if mobj.hasFn(om.MFn.kNumericAttribute):
         mfn = om.MFnNumericAttribute(mobj)
-        subtype = mfn.unitType()
-        subtypeStr = enumIndexToKey(subtype, om.MFnNumericData)
-        key = mFnNumericDataEnumsToTreeKeys[subtypeStr]
-        return perKeyInfo[key]
+        key = mFnNumericDataIndicesToTreeKeys[mfn.unitType()]
+        return perKeyInfo[key], True
 
     if mobj.hasFn(om.MFn.kUnitAttribute):
         mfn = om.MFnUnitAttribute(mobj)
-        subtypeStr = enumIndexToKey(mfn.unitType(), om.MFnUnitAttribute)
-        key = mFnUnitAttributeEnumsToTreeKeys[subtypeStr]
-        return perKeyInfo[key]
+        key = mFnUnitAttributeIndicesToTreeKeys[mfn.unitType()]
+        return perKeyInfo[key], True
 
     if mobj.hasFn(om.MFn.kTypedAttribute):
+        mfn = om.MFnTypedAttribute(mobj)
+        attrType = mfn.attrType()
+        cacheable = attrType != om.MFnData.kAny
+
         try:
             dataObj = mplug.asMObject()
             dataTypeStr = dataObj.apiTypeStr()
             key = mFnEnumsToTreeKeys[dataTypeStr]
-            return perKeyInfo[key]
+            return perKeyInfo[key], cacheable
         except RuntimeError:
-            mfn = om.MFnTypedAttribute(mobj)
-            attrType = mfn.attrType()
-            key = mFnDataEnumsToTreeKeys[enumIndexToKey(attrType, om.MFnData)]
-            return perKeyInfo[key]
+            key = mFnDataIndicesToTreeKeys[attrType]
+            return perKeyInfo[key], cacheable
 
     if mobj.hasFn(om.MFn.kGenericAttribute):
         try:
             dataObj = mplug.asMObject()
             dataTypeStr = dataObj.apiTypeStr()
             key = mFnEnumsToTreeKeys[dataTypeStr]
-            return perKeyInfo[key]
+            return perKeyInfo[key], False
         except RuntimeError:
             mhandle = mplug.asMDataHandle()
-            typ = mhandle.type()
-            typeStr = enumIndexToKey(typ, om.MFnData)
-            key = mFnDataEnumsToTreeKeys[typeStr]
-            return perKeyInfo[key]
+            key = mFnDataIndicesToTreeKeys[mhandle.type()]
+            return perKeyInfo[key], False
 
     if mobj.hasFn(om.MFn.kMatrixAttribute):
-        return perKeyInfo['Matrix']
+        return perKeyInfo['Matrix'], True
 
     elif mobj.hasFn(om.MFn.kEnumAttribute):
-        return {'type':getPath('Enum'), 'mathDimension': 1}
+        return {'type':getPath('Enum'), 'mathDimension': 1}, True
 
     elif mobj.hasFn(om.MFn.kMessageAttribute):
-        return {'type':getPath('Message')}
+        return {'type':getPath('Message')}, True
 
     raise RuntimeError(
         "Could not parse plug: {}".format(mplug.name())
     )
 
+def getInfoFromMPlug(mplug):
+    """
+    :param mplug: the plug to inspect
+    :type mplug: :class:`~maya.OpenMaya.MPlug`
+    :return: Classification information for the plug, in the format
+        described in :func:`parsePerKeyInfo`. Results are cached; the
+        returned dictionary should not be edited.
+    :rtype: :class:`dict`
+    """
+    return _getInfoFromMPlug(mplug)[0]
+
 def getInfoFromAttr(pmattr):
     return getInfoFromMPlug(pmattr.__apimplug__())
 
@@ -6,6 +6,8 @@ import pymel.core as p
 import paya.pluginfo as _pi
 from paya.util import short
 import paya.lib.attrs as _atr
+import paya.lib.lazymath as _lm
+import paya.lib.buildbatch as _bb
 import paya.runtime as r
 
 cap = lambda x: x[0].upper()+x[1:]
@@ -448,8 +450,29 @@ class Attribute:
         if plug:
             return self
 
+        if _bb.BuildBatch.active():
+            _bb.BuildBatch.flush()
+
         return p.general.Attribute.get(self, **kwargs)
 
+    def set(self, *args, **kwargs):
+        """
+        Overloads :meth:`~pymel.core.general.Attribute.set` to defer simple
+        value sets inside :class:`~paya.lib.buildbatch.BuildBatch` blocks.
+
+        :param \*args: forwarded to the base method
+        :param \*\*kwargs: forwarded to the base method
+        """
+        if _bb.BuildBatch.active():
+            if len(args) == 1 and not kwargs:
+                if _bb.BuildBatch.queueSet(self, args[0]):
+                    return
+
+            else:
+                _bb.BuildBatch.flush()
+
+        return p.general.Attribute.set(self, *args, **kwargs)
+
     #-----------------------------------------------------------------|    State management
 
     @short(recursive='r', force='f')
@@ -651,11 +674,15 @@ class Attribute:
         :type plug/p: bool or None
         :return: self
         """
+        if isinstance(source, _lm.Expression):
+            source = source.compile()
+
         if plug is None:
             plug = isinstance(source, (str, p.Attribute))
 
         if plug:
-            r.connectAttr(source, self, f=True)
+            if not _bb.BuildBatch.queueConnection(source, self):
+                r.connectAttr(source, self, f=True)
 
         else:
             self.set(source)
@@ -664,6 +691,52 @@ class Attribute:
 
     __rrshift__ = put
 
+    def __rshift__(self, other):
+        """
+        Overloads the PyMEL connection operator (``>>``) to defer the
+        connection inside :class:`~paya.lib.buildbatch.BuildBatch` blocks.
+        """
+        if not _bb.BuildBatch.queueConnection(self, other):
+            return p.general.Attribute.__rshift__(self, other)
+
+    @_bb.flushesBuildBatch
+    def disconnect(self, *args, **kwargs):
+        """
+        Overloads :meth:`~pymel.core.general.Attribute.disconnect` to
+        commit any pending :class:`~paya.lib.buildbatch.BuildBatch`
+        operations first.
+        """
+        return p.general.Attribute.disconnect(self, *args, **kwargs)
+
+    __floordiv__ = disconnect
+
+    @_bb.flushesBuildBatch
+    def inputs(self, *args, **kwargs):
+        """
+        Overloads :meth:`~pymel.core.general.Attribute.inputs` to commit
+        any pending :class:`~paya.lib.buildbatch.BuildBatch` operations
+        first.
+        """
+        return p.general.Attribute.inputs(self, *args, **kwargs)
+
+    @_bb.flushesBuildBatch
+    def outputs(self, *args, **kwargs):
+        """
+        Overloads :meth:`~pymel.core.general.Attribute.outputs` to commit
+        any pending :class:`~paya.lib.buildbatch.BuildBatch` operations
+        first.
+        """
+        return p.general.Attribute.outputs(self, *args, **kwargs)
+
+    @_bb.flushesBuildBatch
+    def isConnected(self, *args, **kwargs):
+        """
+        Overloads :meth:`~pymel.core.general.Attribute.isConnected` to
+        commit any pending :class:`~paya.lib.buildbatch.BuildBatch`
+        operations first.
+        """
+        return p.general.Attribute.isConnected(self, *args, **kwargs)
+
     #-----------------------------------------------------------------|    Section attributes
 
     def isSectionAttr(self):
@@ -14,37 +14,47 @@ class BezierCurve:
 
     # Necessary otherwise will look up MFnBezierCurve, which doesn't exist
 
-    def getShapeMFn(self):
+    @short(refresh='ref')
+    def getShapeMFn(self, refresh=False):
         """
         Returns an API function set for the shape type associated with this
         plug, initialised around the MObject of the data block. Useful for
         performing spot inspections (like ``numCVs()`` on a curve output)
         without creating a shape.
 
+        The function set is cached on this plug instance. Pass
+        ``refresh=True`` to re-read the data block, for example after the
+        upstream geometry has changed.
+
+        :param bool refresh/ref: rebuild the function set; defaults to
+            ``False``
         :return: The function set.
         :rtype: :class:`~maya.OpenMaya.MFnNurbsCurve`
         """
-        try:
-            return getattr(self, '_shapeMFn')
+        if not refresh:
+            try:
+                return getattr(self, '_shapeMFn')
 
-        except AttributeError:
-            # This will crash if called on a root array mplug, so force an
-            # index
+            except AttributeError:
+                pass
 
-            if self.isArray():
-                plug = self[0]
+        # This will crash if called on a root array mplug, so force an
+        # index
 
-            else:
-                plug = self
+        if self.isArray():
+            plug = self[0]
 
-            plug.evaluate()
-            mplug = plug.__apimplug__()
-            handle = mplug.asMDataHandle()
-            mobj = handle.data()
+        else:
+            plug = self
 
-            self._shapeMFn = out = om.MFnNurbsCurve(mobj)
+        plug.evaluate()
+        mplug = plug.__apimplug__()
+        handle = mplug.asMDataHandle()
+        mobj = handle.data()
 
-            return out
+        self._shapeMFn = out = om.MFnNurbsCurve(mobj)
+
+        return out
 
     #---------------------------------------------------------------|
     #---------------------------------------------------------------|    SPOT INSPECTIONS
@@ -52,38 +52,48 @@ class Geometry:
 
         return shape
 
-    def getShapeMFn(self):
+    @short(refresh='ref')
+    def getShapeMFn(self, refresh=False):
         """
         Returns an API function set for the shape type associated with this
         plug, initialised around the MObject of the data block. Useful for
         performing spot inspections (like ``numCVs()`` on a curve output)
         without creating a shape.
 
+        The function set is cached on this plug instance. Pass
+        ``refresh=True`` to re-read the data block, for example after the
+        upstream geometry has changed.
+
+        :param bool refresh/ref: rebuild the function set; defaults to
+            ``False``
         :return: The function set.
         :rtype: :class:`~maya.OpenMaya.MFnDagNode`
         """
-        try:
-            return getattr(self, '_shapeMFn')
+        if not refresh:
+            try:
+                return getattr(self, '_shapeMFn')
+
+            except AttributeError:
+                pass
 
-        except AttributeError:
-            # This will crash if called on a root array mplug, so force an
-            # index
+        # This will crash if called on a root array mplug, so force an
+        # index
 
-            if self.isArray():
-                plug = self[0]
+        if self.isArray():
+            plug = self[0]
 
-            else:
-                plug = self
+        else:
+            plug = self
 
-            plug.evaluate()
-            mplug = plug.__apimplug__()
-            handle = mplug.asMDataHandle()
-            mobj = handle.data()
+        plug.evaluate()
+        mplug = plug.__apimplug__()
+        handle = mplug.asMDataHandle()
+        mobj = handle.data()
 
-            mfnClass = getattr(om, 'MFn'+self.__class__.__name__)
-            self._shapeMFn = out = mfnClass(mobj)
+        mfnClass = getattr(om, 'MFn'+self.__class__.__name__)
+        self._shapeMFn = out = mfnClass(mobj)
 
-            return out
+        return out
 
     #---------------------------------------------------------|    Geometry filtering
 
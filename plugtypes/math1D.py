@@ -5,6 +5,8 @@ import maya.OpenMaya as om
 import pymel.util as _pu
 from paya.util import short
 import paya.lib.mathops as _mo
+import paya.lib.nodereuse as _nr
+import paya.lib.lazymath as _lm
 import paya.runtime as r
 
 if not r.pluginInfo('quatNodes', q=True, loaded=True):
@@ -153,6 +155,8 @@ class Math1D:
 
     #-----------------------------------------------------------|    Addition
 
+    @_lm.deferrable('add')
+    @_nr.reusable
     def __add__(self, other, swap=False):
         """
         Implements **addition** (``+``).
@@ -162,10 +166,25 @@ class Math1D:
         other, dim, unitType, isplug = _mo.info(other).values()
 
         if dim is 1:
+            if not isplug:
+                folded = _mo.foldScalarOperation(self, 'add', other, swap=swap)
+
+                if folded is not None:
+                    return folded
+
             node = r.nodes.PlusMinusAverage.createNode()
             self >> node.attr('input1D')[1 if swap else 0]
             node.attr('input1D')[0 if swap else 1].put(other, p=isplug)
-            return node.attr('output1D')
+            output = node.attr('output1D')
+
+            if not isplug:
+                _mo.recordFoldableOutput(
+                    output, 'add', self, other,
+                    node.attr('input1D')[1 if swap else 0],
+                    node.attr('input1D')[0 if swap else 1]
+                )
+
+            return output
 
         if dim is 2:
             node = r.nodes.PlusMinusAverage.createNode()
@@ -211,6 +230,8 @@ class Math1D:
 
     #-----------------------------------------------------------|    Subtraction
 
+    @_lm.deferrable('sub')
+    @_nr.reusable
     def __sub__(self, other, swap=False):
         """
         Implements **subtraction** (``-``).
@@ -219,6 +240,12 @@ class Math1D:
         """
         other, dim, ut, isplug = _mo.info(other).values()
 
+        if dim == 1 and not isplug:
+            folded = _mo.foldScalarOperation(self, 'sub', other, swap=swap)
+
+            if folded is not None:
+                return folded
+
         if dim in (1, 2, 3):
             node = r.nodes.PlusMinusAverage.createNode()
             node.attr('operation').set(2)
@@ -226,8 +253,16 @@ class Math1D:
             if dim is 1:
                 self >> node.attr('input1D')[1 if swap else 0]
                 node.attr('input1D')[0 if swap else 1].put(other, p=isplug)
+                output = node.attr('output1D')
 
-                return node.attr('output1D')
+                if not (isplug or swap):
+                    _mo.recordFoldableOutput(
+                        output, 'add', self, -other,
+                        node.attr('input1D')[0],
+                        node.attr('input1D')[1]
+                    )
+
+                return output
 
             else:
                 for child in node.attr('input{}D'.format(dim))[1 if swap else 0]:
@@ -251,6 +286,8 @@ class Math1D:
 
     #-----------------------------------------------------------|    Multiply
 
+    @_lm.deferrable('mul')
+    @_nr.reusable
     def __mul__(self, other, swap=False):
         """
         Implements **multiplication** (``-``).
@@ -260,11 +297,25 @@ class Math1D:
         other, dim, ut, isplug = _mo.info(other).values()
 
         if dim is 1:
+            if not isplug:
+                folded = _mo.foldScalarOperation(self, 'mul', other, swap=swap)
+
+                if folded is not None:
+                    return folded
+
             node = r.nodes.MultiplyDivide.createNode()
             self >> node.attr('input{}X'.format(2 if swap else 1))
             other >> node.attr('input{}X'.format(1 if swap else 2))
+            output = node.attr('outputX')
+
+            if not isplug:
+                _mo.recordFoldableOutput(
+                    output, 'mul', self, other,
+                    node.attr('input{}X'.format(2 if swap else 1)),
+                    node.attr('input{}X'.format(1 if swap else 2))
+                )
 
-            return node.attr('outputX')
+            return output
 
         if dim is 3:
             node = r.nodes.MultiplyDivide.createNode()
@@ -288,6 +339,8 @@ class Math1D:
 
     #-----------------------------------------------------------|    Divide
 
+    @_lm.deferrable('div')
+    @_nr.reusable
     def __truediv__(self, other, swap=False):
         """
         Implements **division** (``/``).
@@ -296,6 +349,12 @@ class Math1D:
         """
         other, dim, ut, isplug = _mo.info(other).values()
 
+        if dim == 1 and not isplug:
+            folded = _mo.foldScalarOperation(self, 'div', other, swap=swap)
+
+            if folded is not None:
+                return folded
+
         if dim in (1, 3):
             node = r.nodes.MultiplyDivide.createNode()
             node.attr('operation').set(2)
@@ -303,8 +362,16 @@ class Math1D:
             if dim is 1:
                 self >> node.attr('input{}X'.format(2 if swap else 1))
                 node.attr('input{}X'.format(1 if swap else 2)).put(other, p=isplug)
+                output = node.attr('outputX')
 
-                return node.attr('outputX')
+                if not (isplug or swap) and other != 0:
+                    _mo.recordFoldableOutput(
+                        output, 'mul', self, 1.0 / other,
+                        node.attr('input1X'),
+                        node.attr('input2X')
+                    )
+
+                return output
 
             else:
                 for dest in node.attr('input{}'.format(2 if swap else 1)):
@@ -328,6 +395,7 @@ class Math1D:
 
     #-----------------------------------------------------------|    Power
 
+    @_nr.reusable
     def __pow__(self, other, modulo=None, swap=False):
         """
         Implements **power** (``**``). The *modulo* keyword argument is
@@ -337,6 +405,12 @@ class Math1D:
         """
         other, dim, ut, isplug = _mo.info(other).values()
 
+        if dim == 1 and not isplug:
+            folded = _mo.foldScalarOperation(self, 'pow', other, swap=swap)
+
+            if folded is not None:
+                return folded
+
         if dim in (1, 3):
             node = r.nodes.MultiplyDivide.createNode()
             node.attr('operation').set(3)
@@ -376,6 +450,8 @@ class Math1D:
 
     #-----------------------------------------------------------|    Unary
 
+    @_lm.deferrable('neg')
+    @_nr.reusable
     def __neg__(self):
         """
         Implements unary negation (``-``).
@@ -2,6 +2,8 @@ import pymel.core.nodetypes as _nt
 from pymel.util import expandArgs
 import paya.runtime as r
 import paya.lib.mathops as _mo
+import paya.lib.nodereuse as _nr
+import paya.lib.lazymath as _lm
 from paya.util import resolveFlags, short, cap, undefined
 from paya.config import takeUndefinedFromConfig
 
@@ -41,6 +43,7 @@ class Matrix:
 
     #-----------------------------------------------------------|    Addition
 
+    @_nr.reusable
     def __add__(self, other, swap=False):
         """
         Implements **addition** (``+``).
@@ -75,9 +78,11 @@ class Matrix:
         :type others: str, Matrix, Matrix, [list]
         :return: :class:`~paya.runtime.plugs.Matrix`
         """
-        items = [self] * list(others)
+        items = [self] + list(others)
         return _mo.multMatrices(*items)
 
+    @_lm.deferrable('mul')
+    @_nr.reusable
     def __mul__(self, other, swap=False):
         """
         Implements **multiplication** (``*``).
@@ -86,6 +91,10 @@ class Matrix:
         """
         other, dim, ut, isplug = _mo.info(other).values()
 
+        if dim == 16 and not isplug \
+                and _mo.foldsIdentity(other, 'mul'):
+            return self
+
         if dim is 3 and swap:
             node = r.nodes.PointMatrixMult.createNode()
             node.attr('vectorMultiply').set(True)
@@ -112,6 +121,7 @@ class Matrix:
 
     #-----------------------------------------------------------|    Point-matrix mult
 
+    @_nr.reusable
     def __rxor__(self, other):
         """
         Uses the exclusive-or operator (``^``) to implement
@@ -246,6 +256,8 @@ class Matrix:
 
     #--------------------------------------------------------------------|    Signing
 
+    @_lm.deferrable('inverse')
+    @_nr.reusable
     def inverse(self):
         """
         :return: The inverse of this matrix.
@@ -372,6 +384,7 @@ class Matrix:
 
     #--------------------------------------------------------------------|    Misc
 
+    @_nr.reusable
     def transpose(self):
         """
         :return: The transposition of this matrix.
@@ -6,6 +6,8 @@ from paya.lib.typeman import plugCheck
 import paya.lib.mathops as _mo
 import paya.lib.typeman as _tm
 import paya.lib.nurbsutil as _nu
+import paya.lib.arraymath as _am
+import paya.lib.reuseindex as _ri
 from paya.geoshapext import copyToShape
 from paya.util import short, resolveFlags
 import paya.runtime as r
@@ -256,8 +258,7 @@ class NurbsCurve:
             if parametric:
                 if uniform:
                     fractions = _mo.floatRange(0, 1, number)
-                    return [self.paramAtFraction(
-                        fraction, p=False) for fraction in fractions]
+                    return self.paramsAtFractions(fractions)
 
                 umin, umax = self.knotDomain(p=False)
                 return _mo.floatRange(umin, umax, number)
@@ -428,6 +429,274 @@ class NurbsCurve:
             mfn.getKnots(arr)
             return [arr[i] for i in range(arr.length())]
 
+    #---------------------------------------------------------------|
+    #---------------------------------------------------------------|    BATCH SAMPLING
+    #---------------------------------------------------------------|
+
+    @short(tolerance='tol')
+    def getArcLengthTable(self, tolerance=None):
+        """
+        Returns an arc-length lookup table for this curve, shared by the
+        value implementations of all length / fraction / parameter
+        conversions and the batch sampling methods. Tables are cached
+        against a hash of the current curve data (see
+        :func:`~paya.lib.nurbsutil.getArcLengthTable`), so they're built
+        once per distinct geometry and discarded when it changes.
+
+        :param float tolerance/tol: the maximum lookup error, as a fraction
+            of the curve length; defaults to
+            :attr:`ArcLengthTable.defaultTolerance
+            <paya.lib.nurbsutil.ArcLengthTable.defaultTolerance>`
+        :return: The lookup table.
+        :rtype: :class:`~paya.lib.nurbsutil.ArcLengthTable`
+        """
+        return _nu.getArcLengthTable(self.getShapeMFn(ref=True),
+                                     tolerance=tolerance)
+
+    @copyToShape()
+    def paramsAtFractions(self, fractions):
+        """
+        Value-only batch version of :meth:`paramAtFraction`.
+
+        :param fractions: the fractions to convert
+        :type fractions: [float]
+        :return: The parameters.
+        :rtype: [float]
+        """
+        table = self.getArcLengthTable()
+        return [table.paramAtFraction(fraction) for fraction in fractions]
+
+    def _resolveSampleParams(self, numberFractionsOrParams, mfn,
+                             parametric=False, uniform=False):
+        # Fractions are resolved against the same function set that will
+        # be sampled, so that the table and the samples can't disagree;
+        # uniform parameters are just evenly-spaced fractions
+        if parametric and uniform \
+                and not hasattr(numberFractionsOrParams, '__iter__'):
+            parametric = uniform = False
+
+        fractionsOrParams = self._resolveNumberFractionsOrParams(
+            numberFractionsOrParams, par=parametric, uni=uniform)
+
+        if parametric:
+            return fractionsOrParams
+
+        table = _nu.getArcLengthTable(mfn)
+        return [table.paramAtFraction(fraction) \
+                for fraction in fractionsOrParams]
+
+    @staticmethod
+    def _packSamples(triples, cls, asArray):
+        if asArray:
+            _am.requireNumpy()
+            return _am.np.array(triples, dtype=float).reshape(-1, 3)
+
+        return [cls(triple) for triple in triples]
+
+    @copyToShape()
+    @short(parametric='par',
+           uniform='uni',
+           asArray='arr')
+    def samplePoints(self,
+                     numberFractionsOrParams,
+                     parametric=False,
+                     uniform=False,
+                     asArray=False):
+        """
+        Value-only batch version of :meth:`distributePoints`. All samples
+        are evaluated in one pass over a single function set, with
+        fractions resolved via :meth:`getArcLengthTable`.
+
+        :param numberFractionsOrParams: a number of samples, or a list of
+            fractions or parameters (values only)
+        :type numberFractionsOrParams: int, [float]
+        :param bool parametric/par: interpret *numberFractionsOrParams* as
+            parameters, not fractions; defaults to ``False``
+        :param bool uniform/uni: if *numberFractionsOrParams* is a number
+            and *parametric* is ``True``, distribute the parameters by
+            length; defaults to ``False``
+        :param bool asArray/arr: return an ``(N, 3)`` NumPy array instead of
+            a list of points; defaults to ``False``
+        :return: The sampled points.
+        :rtype: [:class:`~paya.runtime.data.Point`], :class:`numpy.ndarray`
+        """
+        mfn = self.getShapeMFn(ref=True)
+        params = self._resolveSampleParams(
+            numberFractionsOrParams, mfn, parametric, uniform)
+
+        point = om.MPoint()
+        space = om.MSpace.kWorld
+        out = []
+
+        for param in params:
+            mfn.getPointAtParam(param, point, space)
+            out.append((point.x, point.y, point.z))
+
+        return self._packSamples(out, r.data.Point, asArray)
+
+    @copyToShape()
+    @short(parametric='par',
+           uniform='uni',
+           normalize='nr',
+           asArray='arr')
+    def sampleTangents(self,
+                       numberFractionsOrParams,
+                       parametric=False,
+                       uniform=False,
+                       normalize=False,
+                       asArray=False):
+        """
+        Value-only batch version of :meth:`distributeTangents`. All samples
+        are evaluated in one pass over a single function set.
+
+        :param numberFractionsOrParams: a number of samples, or a list of
+            fractions or parameters (values only)
+        :type numberFractionsOrParams: int, [float]
+        :param bool parametric/par: interpret *numberFractionsOrParams* as
+            parameters, not fractions; defaults to ``False``
+        :param bool uniform/uni: if *numberFractionsOrParams* is a number
+            and *parametric* is ``True``, distribute the parameters by
+            length; defaults to ``False``
+        :param bool normalize/nr: normalize the tangents; defaults to
+            ``False``
+        :param bool asArray/arr: return an ``(N, 3)`` NumPy array instead of
+            a list of vectors; defaults to ``False``
+        :return: The sampled tangents.
+        :rtype: [:class:`~paya.runtime.data.Vector`], :class:`numpy.ndarray`
+        """
+        mfn = self.getShapeMFn(ref=True)
+        params = self._resolveSampleParams(
+            numberFractionsOrParams, mfn, parametric, uniform)
+
+        point = om.MPoint()
+        tangent = om.MVector()
+        space = om.MSpace.kWorld
+        out = []
+
+        for param in params:
+            if normalize:
+                tangent = mfn.tangent(param, space)
+
+            else:
+                mfn.getDerivativesAtParm(param, point, tangent, space)
+
+            out.append((tangent.x, tangent.y, tangent.z))
+
+        return self._packSamples(out, r.data.Vector, asArray)
+
+    @copyToShape(worldSpaceOnly=True)
+    @short(parametric='par',
+           uniform='uni',
+           upVector='upv',
+           upVectorSampler='ups',
+           defaultToNormal='dtn',
+           asArray='arr')
+    def sampleFrames(self,
+                     numberFractionsOrParams,
+                     primaryAxis,
+                     secondaryAxis,
+                     parametric=False,
+                     uniform=False,
+                     upVector=None,
+                     upVectorSampler=None,
+                     defaultToNormal=None,
+                     asArray=False):
+        """
+        Value-only batch version of :meth:`distributeMatrices` with
+        ``chain=False``. Points and tangents are evaluated in one pass over
+        a single function set; where NumPy is available, the matrices are
+        also constructed in bulk via
+        :func:`~paya.lib.arraymath.createAimMatrices`.
+
+        :param numberFractionsOrParams: a number of samples, or a list of
+            fractions or parameters (values only)
+        :type numberFractionsOrParams: int, [float]
+        :param str primaryAxis: the axis to align to the curve tangent
+        :param str secondaryAxis: the axis to align to the up vector
+        :param bool parametric/par: interpret *numberFractionsOrParams* as
+            parameters, not fractions; defaults to ``False``
+        :param bool uniform/uni: if *numberFractionsOrParams* is a number
+            and *parametric* is ``True``, distribute the parameters by
+            length; defaults to ``False``
+        :param upVector/upv: one up vector value, or one per sample; if
+            omitted, an up vector sampler or the curve normal is used;
+            defaults to ``None``
+        :type upVector/upv: None, list, tuple,
+            :class:`~paya.runtime.data.Vector`, [list, tuple,
+            :class:`~paya.runtime.data.Vector`]
+        :param upVectorSampler/ups: if *upVector* is omitted, an up vector
+            sampler created using :meth:`createUpVectorSampler`; defaults
+            to ``None``
+        :type upVectorSampler/ups: None, str,
+            :class:`~paya.runtime.networks.CurveUpVectorSampler`
+        :param bool defaultToNormal/dtn: if *upVector* and *upVectorSampler*
+            are omitted, use the curve normal even if a default sampler has
+            been defined; defaults to ``False``
+        :param bool asArray/arr: return an ``(N, 4, 4)`` NumPy array instead
+            of a list of matrices; defaults to ``False``
+        :return: The sampled matrices.
+        :rtype: [:class:`~paya.runtime.data.Matrix`], :class:`numpy.ndarray`
+        """
+        mfn = self.getShapeMFn(ref=True)
+        params = self._resolveSampleParams(
+            numberFractionsOrParams, mfn, parametric, uniform)
+
+        num = len(params)
+
+        point = om.MPoint()
+        tangent = om.MVector()
+        space = om.MSpace.kWorld
+
+        points = []
+        tangents = []
+
+        for param in params:
+            mfn.getDerivativesAtParm(param, point, tangent, space)
+            points.append((point.x, point.y, point.z))
+            tangents.append((tangent.x, tangent.y, tangent.z))
+
+        if upVector is None:
+            if upVectorSampler:
+                upVectorSampler = r.PyNode(upVectorSampler).asSubtype()
+
+            elif not defaultToNormal:
+                upVectorSampler = self.getDefaultUpVectorSampler()
+
+            if upVectorSampler is None:
+                upVectors = []
+
+                for param in params:
+                    normal = mfn.normal(param, space)
+                    upVectors.append((normal.x, normal.y, normal.z))
+
+            else:
+                upVectors = [upVectorSampler.sampleAtParam(
+                    param, p=False) for param in params]
+
+        else:
+            upVectors = _tm.conformVectorArg(upVector, ll=num)
+
+        if asArray or _am.available():
+            _am.requireNumpy()
+
+            matrices = _am.createAimMatrices(
+                primaryAxis, _am.asVectorArray(tangents),
+                secondaryAxis, _am.asVectorArray(upVectors),
+                _am.asVectorArray(points)
+            )
+
+            if asArray:
+                return matrices
+
+            return _am.asMatrices(matrices)
+
+        return [r.createMatrix(
+            primaryAxis, r.data.Vector(tangent),
+            secondaryAxis, upVector,
+            t=r.data.Point(point)
+        ).pick(t=True, r=True) for point, tangent, upVector in zip(
+            points, tangents, upVectors)]
+
     #---------------------------------------------------------------|
     #---------------------------------------------------------------|    LOCAL-LEVEL SAMPLING
     #---------------------------------------------------------------|
@@ -496,37 +765,15 @@ class NurbsCurve:
 
     #-----------------------------------------------|    PointOnCurveInfo
 
-    def _findExistingInfoAtParam(self, param, turnOnPercentage=False):
-        param, paramDim, paramUnitType, paramIsPlug = \
-            _mo.info(param).values()
-        turnOnPercentage, topDim, topUnitType, topIsPlug = \
-            _mo.info(turnOnPercentage).values()
-        existingNodes = self.outputs(type='pointOnCurveInfo')
-
-        for existingNode in existingNodes:
-            paramOnNode = existingNode.attr('parameter')
-            paramOnNodeInputs = paramOnNode.inputs(plugs=True)
-
-            if paramIsPlug and paramOnNodeInputs:
-                paramsMatch = param == paramOnNodeInputs[0]
-
-            elif (not paramIsPlug) and (not paramOnNodeInputs):
-                paramsMatch = param == paramOnNode.get()
-
-            else:
-                paramsMatch = False
+    def _getInfoAtParamKey(self, param, turnOnPercentage=False):
+        return (_ri.getSampleKey(self),
+                _ri.getSampleKey(_mo.info(param)['item']),
+                _ri.getSampleKey(_mo.info(turnOnPercentage)['item']))
 
-            if paramsMatch:
-                topOnNode = existingNode.attr('turnOnPercentage')
-                topOnNodeInputs = topOnNode.inputs(plugs=True)
-
-                if topIsPlug and topOnNodeInputs:
-                    if turnOnPercentage == topOnNodeInputs[0]:
-                        return existingNode
-
-                elif (not topIsPlug) and (not topOnNodeInputs):
-                    if turnOnPercentage == topOnNode.get():
-                        return existingNode
+    def _findExistingInfoAtParam(self, param, turnOnPercentage=False):
+        return _infoAtParamIndex.find(
+            self, self._getInfoAtParamKey(param, turnOnPercentage)
+        )
 
     @copyToShape(worldSpaceOnly=True)
     @short(reuse='re',
@@ -576,6 +823,12 @@ class NurbsCurve:
             param >> node.attr('parameter')
             turnOnPercentage >> node.attr('turnOnPercentage')
 
+            _infoAtParamIndex.add(
+                self,
+                self._getInfoAtParamKey(param, turnOnPercentage),
+                node
+            )
+
             return node
 
         if turnOnPercentage:
@@ -776,6 +1029,10 @@ class NurbsCurve:
         :rtype: [:class:`~paya.runtime.data.Point`
             | :class:`~paya.runtime.plugs.Vector`]
         """
+        if not plug:
+            return self.samplePoints(numberFractionsOrParams,
+                                     par=parametric, uni=uniform)
+
         fractionsOrParams = \
             self._resolveNumberFractionsOrParams(numberFractionsOrParams,
                                                  par=parametric,
@@ -904,10 +1161,7 @@ class NurbsCurve:
             out = self.paramAtPoint(point, plug=True)
         else:
             # Length space doesn't matter for this calculation
-            mfn = self.getShapeMFn()
-            length = mfn.length()
-            targetLength = length * fraction
-            out = mfn.findParamFromLength(targetLength)
+            out = self.getArcLengthTable().paramAtFraction(fraction)
 
         return out
 
@@ -924,8 +1178,11 @@ class NurbsCurve:
         :return: The parameter at the given length.
         :rtype: :class:`float`, :class:`~paya.runtime.plugs.Math1D`
         """
-        fraction = length / self.length(p=plug)
-        return self.paramAtFraction(fraction, p=plug)
+        if plug:
+            fraction = length / self.length(p=True)
+            return self.paramAtFraction(fraction, p=True)
+
+        return self.getArcLengthTable().paramAtLength(length)
 
     @copyToShape()
     @short(parametric='par',
@@ -968,9 +1225,12 @@ class NurbsCurve:
         if parametric:
             params = fractionsOrParams
 
-        else:
+        elif plug:
             params = [self.paramAtFraction(f,
-                        p=plug) for f in fractionsOrParams]
+                        p=True) for f in fractionsOrParams]
+
+        else:
+            params = self.paramsAtFractions(fractionsOrParams)
 
         return params
 
@@ -989,7 +1249,10 @@ class NurbsCurve:
         :return: The curve length at the specified fraction.
         :rtype: :class:`float` | :class:`~paya.runtime.plugs.Math1D`
         """
-        return self.length(plug=plug) * fraction
+        if plug:
+            return self.length(plug=True) * fraction
+
+        return self.getArcLengthTable().length() * fraction
 
     @copyToShape()
     @short(plug='p', checkDomain='cd')
@@ -1053,26 +1316,8 @@ class NurbsCurve:
             return self.detach(param, select=0)[0].length(plug=True)
 
         else:
-            umin, umax = self.knotDomain()
-
-            if param <= umin:
-                return 0.0
-
-            if param >= umax:
-                return self.length()
-
-            # Use nodes instead of MFn to get a properly spaced reading
-            output = self.detach(param, select=0)[0]
-            length = output.length(p=False)
-
-            _node = str(output.node())
-
-            m.evalDeferred(
-                "import maya.cmds as m\nif m.objExists('{}'):\n\tm.delete('{}')".format(
-                    _node, _node)
-            )
-
-            return length
+            # Integrated from the curve derivative, so properly spaced
+            return self.getArcLengthTable().lengthAtParam(param)
 
     @copyToShape()
     @short(plug='p')
@@ -1127,6 +1372,15 @@ class NurbsCurve:
             par=parametric,
             uni=uniform)
 
+        if not plug:
+            table = self.getArcLengthTable()
+
+            if parametric:
+                return [table.lengthAtParam(x) for x in fractionsOrParams]
+
+            length = table.length()
+            return [length * x for x in fractionsOrParams]
+
         meth = self.lengthAtParam if parametric else self.lengthAtFraction
 
         return [meth(fractionOrParam,
@@ -1165,7 +1419,10 @@ class NurbsCurve:
         :return: The length fraction at the specified parameter.
         :rtype: :class:`float` | :class:`~paya.runtime.plugs.Math1D`
         """
-        return self.lengthAtParam(param, p=plug) / self.length(p=plug)
+        if plug:
+            return self.lengthAtParam(param, p=True) / self.length(p=True)
+
+        return self.getArcLengthTable().fractionAtParam(param)
 
     @copyToShape()
     @short(plug='p')
@@ -1180,7 +1437,10 @@ class NurbsCurve:
         :return: The length fraction at the specified length.
         :rtype: :class:`float` | :class:`~paya.runtime.plugs.Math1D`
         """
-        return length / self.length(p=plug)
+        if plug:
+            return length / self.length(p=True)
+
+        return length / self.getArcLengthTable().length()
 
     @copyToShape()
     def distributeFractions(self, number):
@@ -1401,6 +1661,7 @@ class NurbsCurve:
 
     @copyToShape()
     @short(plug='p', normalize='nr')
+    @plugCheck('numberFractionsOrParams')
     def distributeTangents(self,
                            numberFractionsOrParams,
                            plug=None,
@@ -1428,6 +1689,12 @@ class NurbsCurve:
         :rtype: [:class:`~paya.runtime.data.Vector`] |
             [:class:`~paya.runtime.plugs.Vector`]
         """
+        if not plug:
+            return self.sampleTangents(numberFractionsOrParams,
+                                       par=parametric,
+                                       uni=uniform,
+                                       nr=normalize)
+
         fractionsOrParams = self._resolveNumberFractionsOrParams(
             numberFractionsOrParams,
             par=parametric,
@@ -2321,6 +2588,17 @@ class NurbsCurve:
 
         #--------------------------------|    Dispatch
 
+        if not plug and upObject is None and not aimCurve:
+            return self.sampleFrames(
+                fractionsOrParams,
+                primaryAxis,
+                secondaryAxis,
+                parametric=parametric,
+                upVector=None if upVector is None else upVectors,
+                upVectorSampler=upVectorSampler,
+                defaultToNormal=defaultToNormal
+            )
+
         out = []
 
         meth = self.matrixAtParam if parametric else self.matrixAtFraction
@@ -3831,4 +4109,27 @@ class NurbsCurve:
             for i, numCuts in enumerate(cutsPerSegment):
                 numCuts >> node.attr('numberOfKnots')[i]
 
-        return node.attr('outputCurve')
\ No newline at end of file
+        return node.attr('outputCurve')
+
+
+#---------------------------------------------------------------|
+#---------------------------------------------------------------|    REUSE INDICES
+#---------------------------------------------------------------|
+
+def _getInfoAtParamNodeKey(node):
+    inputs = node.attr('inputCurve').inputs(plugs=True)
+
+    if inputs:
+        return (_ri.getSampleKey(inputs[0]),
+                _ri.getInputOrValueKey(node.attr('parameter')),
+                _ri.getInputOrValueKey(node.attr('turnOnPercentage')))
+
+def _listInfoAtParamNodes(curve):
+    for node in curve.outputs(type='pointOnCurveInfo'):
+        key = _getInfoAtParamNodeKey(node)
+
+        if key is not None:
+            yield key, node
+
+_infoAtParamIndex = _ri.SampleIndex(_listInfoAtParamNodes,
+                                    _getInfoAtParamNodeKey)
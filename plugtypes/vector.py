@@ -1,4 +1,7 @@
 from paya.util import short, resolveFlags
+import paya.lib.nodereuse as _nr
+import paya.lib.lazymath as _lm
+import paya.lib.mathops as _mo
 import paya.runtime as r
 
 
@@ -172,12 +175,18 @@ class Vector:
 
     #-----------------------------------------------------------|    Addition
 
+    @_lm.deferrable('add')
+    @_nr.reusable
     def __add__(self, other, swap=False):
         """
         Implements element-wise **addition** (``+``).
         """
         item, dim, ut, isplug = r.mathInfo(other).values()
 
+        if not isplug and dim in (1, 3) \
+                and _mo.foldsIdentity(item, 'add', swap=swap):
+            return self
+
         if dim in (1, 3):
             node = r.nodes.PlusMinusAverage.createNode()
 
@@ -202,12 +211,18 @@ class Vector:
 
     #-----------------------------------------------------------|    Subtraction
 
+    @_lm.deferrable('sub')
+    @_nr.reusable
     def __sub__(self, other, swap=False):
         """
         Implements element-wise **subtraction** (``-``).
         """
         item, dim, ut, isplug = r.mathInfo(other).values()
 
+        if not isplug and dim in (1, 3) \
+                and _mo.foldsIdentity(item, 'sub', swap=swap):
+            return self
+
         if dim in (1, 3):
             node = r.nodes.PlusMinusAverage.createNode()
             node.attr('operation').set(2)
@@ -233,12 +248,18 @@ class Vector:
 
     #-----------------------------------------------------------|    Multiply
 
+    @_lm.deferrable('mul')
+    @_nr.reusable
     def __mul__(self, other, swap=False):
         """
         Implements **multiplication** (``*``).
         """
         item, dim, unitType, isplug = r.mathInfo(other).values()
 
+        if not isplug and (dim in (1, 3) or (dim == 16 and not swap)) \
+                and _mo.foldsIdentity(item, 'mul', swap=swap):
+            return self
+
         if dim in (1, 3):
             node = r.nodes.MultiplyDivide.createNode()
             self >> node.attr('input{}'.format(2 if swap else 1))
@@ -253,7 +274,7 @@ class Vector:
 
             return node.attr('output').setClass(type(self))
 
-        elif dim is 16 and not swap:
+        elif dim == 16 and not swap:
             node = r.nodes.PointMatrixMult.createNode()
             node.attr('vectorMultiply').set(True)
             self >> node.attr('inPoint')
@@ -270,6 +291,7 @@ class Vector:
 
     #-----------------------------------------------------------|    Unary neg
 
+    @_lm.deferrable('neg')
     def __neg__(self):
         """
         Implements element-wise **unary negation** (``-``).
@@ -278,12 +300,18 @@ class Vector:
 
     #-----------------------------------------------------------|    Divide
 
+    @_lm.deferrable('div')
+    @_nr.reusable
     def __truediv__(self, other, swap=False):
         """
         Implements element-wise **division** (``/``).
         """
         item, dim, ut, isplug = r.mathInfo(other).values()
 
+        if not isplug and dim in (1, 3) \
+                and _mo.foldsIdentity(item, 'div', swap=swap):
+            return self
+
         if dim in (1, 3):
             node = r.nodes.MultiplyDivide.createNode()
             node.attr('operation').set(2)
@@ -310,12 +338,17 @@ class Vector:
 
     #-----------------------------------------------------------|    Power
 
+    @_nr.reusable
     def __pow__(self, other, swap=False):
         """
         Implements element-wise **power** (``**``).
         """
         item, dim, ut, isplug = r.mathInfo(other).values()
 
+        if not isplug and dim in (1, 3) \
+                and _mo.foldsIdentity(item, 'pow', swap=swap):
+            return self
+
         if dim in (1, 3):
             node = r.nodes.MultiplyDivide.createNode()
             node.attr('operation').set(3)
@@ -426,6 +459,7 @@ class Vector:
     #---------------------------------------------------------------|    VECTOR-SPECIFIC
     #---------------------------------------------------------------|
 
+    @_nr.reusable
     def __xor__(self, other):
         """
         Uses the exclusive-or operator (``^``) to implement
@@ -438,6 +472,7 @@ class Vector:
         other >> node.attr('inMatrix')
         return node.attr('output').setClass(type(self))
 
+    @_nr.reusable
     def length(self):
         """
         :return: The length of this vector.
@@ -455,6 +490,7 @@ class Vector:
         return self / self.length()
 
     @short(normalize='nr')
+    @_nr.reusable
     def dot(self, other, normalize=False):
         """
         Returns the dot product of ``self`` and *other*.
@@ -473,6 +509,7 @@ class Vector:
         return node.attr('outputX')
 
     @short(normalize='nr', guard='g', inlineGate='ig')
+    @_nr.reusable
     def cross(self, other, normalize=False, guard=False, inlineGate=None):
         """
         :param other: the other vector
@@ -1,5 +1,7 @@
 import traceback
+import importlib
 import inspect
+import json
 import os
 import re
 import sys
@@ -80,6 +82,7 @@ class ClassPool:
 
     def __init__(self):
         self._cache = {}
+        self._templateIndex = None
 
     def browse(self):
         """
@@ -111,6 +114,110 @@ class ClassPool:
         """
         return self.__plural__
 
+    #------------------------------------------------------------|    Template index
+
+    def templateIndexPath(self):
+        """
+        :return: The path to the on-disk template index for this pool, for
+            example ``paya/.nodetypes_index.json``. The file is kept next to
+            the template package, rather than inside it, so that writing it
+            doesn't invalidate the directory modification times it records.
+        :rtype: str
+        """
+        return os.path.join(payaroot, '.{}_index.json'.format(self.longName()))
+
+    def _walkTemplates(self):
+        dirpath = self.dirPath()
+        templates = {}
+        mtimes = {}
+
+        for root, dirs, files in os.walk(dirpath):
+            dirs[:] = [d for d in dirs if not (
+                d.startswith('.') or d == '__pycache__')]
+
+            mtimes[os.path.relpath(root, dirpath)] = os.path.getmtime(root)
+
+            for fil in files:
+                head, tail = os.path.splitext(fil)
+
+                if (head and head[0] in ('.', '_')) \
+                        or (not head) \
+                        or (tail != '.py'):
+                    continue
+
+                templates[head] = path_to_dotpath(os.path.join(root, fil))
+
+        return {'mtimes': mtimes, 'templates': templates}
+
+    def _templateIndexIsCurrent(self, index):
+        dirpath = self.dirPath()
+
+        try:
+            for relpath, mtime in index['mtimes'].items():
+                if os.path.getmtime(
+                        os.path.join(dirpath, relpath)) != mtime:
+                    return False
+
+        except (OSError, KeyError, AttributeError):
+            return False
+
+        return True
+
+    def buildTemplateIndex(self, save=True):
+        """
+        Crawls the template package and rebuilds the ``{module basename:
+        module dotpath}`` index used by :meth:`readClass`.
+
+        :param bool save: write the index to :meth:`templateIndexPath`
+            for subsequent sessions; defaults to ``True``
+        :return: The index.
+        :rtype: dict
+        """
+        index = self._walkTemplates()
+
+        if save:
+            filepath = self.templateIndexPath()
+            tmppath = filepath+'.tmp'
+
+            try:
+                with open(tmppath, 'w') as f:
+                    json.dump(index, f, indent=4)
+
+                os.replace(tmppath, filepath)
+
+            except OSError:
+                # Read-only install etc.; the in-memory index still applies
+                pass
+
+        self._templateIndex = index['templates']
+        return self._templateIndex
+
+    def getTemplateIndex(self):
+        """
+        Returns the template index for this pool, loading it from
+        :meth:`templateIndexPath` if the recorded directory modification
+        times still match, and rebuilding it otherwise. The index is only
+        sourced once per session (or per :meth:`purge`).
+
+        :return: A ``{module basename: module dotpath}`` mapping.
+        :rtype: dict
+        """
+        if self._templateIndex is None:
+            try:
+                with open(self.templateIndexPath(), 'r') as f:
+                    index = json.load(f)
+
+            except (OSError, ValueError):
+                index = None
+
+            if index is not None and self._templateIndexIsCurrent(index):
+                self._templateIndex = index['templates']
+
+            else:
+                self.buildTemplateIndex()
+
+        return self._templateIndex
+
     #------------------------------------------------------------|    Purge
 
     def purge(self, quiet=False):
@@ -118,6 +225,7 @@ class ClassPool:
         Purges cached information.
         """
         self._cache.clear()
+        self._templateIndex = None
 
         searchString = 'paya.'+self.longName()
         modsToDelete = [name for name in sys.modules if searchString in name]
@@ -139,32 +247,15 @@ class ClassPool:
         :return: The retrieved class.
         :rtype: :class:`str`
         """
-        dirpath = self.dirPath()
-        requiredModBasename = clsname[0].lower()+clsname[1:]
-        foundModuleFile = None
-
-        for root, dirs, files in os.walk(dirpath):
-            for fil in files:
-                head, tail = os.path.splitext(fil)
-
-                if (head and head[0] in ('.', '_')) \
-                        or (not head) \
-                        or (tail != '.py'):
-                    continue
-
-                if head == requiredModBasename:
-                    foundModuleFile = os.path.join(root, fil)
+        try:
+            modName = self.getTemplateIndex()[uncap(clsname)]
 
-        if foundModuleFile is None:
+        except KeyError:
             raise MissingTemplateError(
                 "Couldn't find template for class '{}'.".format(clsname)
             )
 
-        # Convert the file path to a dotpath and source the module
-        modName = path_to_dotpath(foundModuleFile)
-        exec("import "+modName) in locals()
-
-        mod = eval(modName)
+        mod = importlib.import_module(modName)
         return getattr(mod, clsname)
 
     def getByName(self, clsname):
@@ -600,6 +691,14 @@ class PlugClassPool(ShadowPool):
     __roots__ = [pymel.core.general.Attribute]
     __doctitle__ ='Plug (Attribute) Types'
 
+    def purge(self, quiet=False):
+        """
+        Purges cached information, including plug classifications cached
+        by :mod:`~paya.pluginfo`.
+        """
+        _pi.clearCache()
+        super().purge(quiet=quiet)
+
     def getFromPyMELInstance(self, inst):
         """
         Given a PyMEL instance, returns an appropriate Paya class for
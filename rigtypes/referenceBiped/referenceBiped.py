@@ -16,6 +16,10 @@ class ReferenceBiped(r.rigs.Rig):
         ['init', 'buildParts', 'attachParts', 'bind', 'config']
     ]
 
+    __stageInputs__ = {
+        'init': ['layout.ma']
+    }
+
     #-------------------------------------------------------------|
     #-------------------------------------------------------------|    MODEL MANAGEMENT
     #-------------------------------------------------------------|
@@ -38,6 +42,21 @@ class ReferenceBiped(r.rigs.Rig):
         """
         return cls.getAssetDir().joinpath('model.ma')
 
+    @classmethod
+    def getStageInputFiles(cls, stageName):
+        """
+        Adds the model scene to the inputs for the ``init`` stage.
+        """
+        out = super().getStageInputFiles(stageName)
+
+        if stageName == 'init':
+            modelScene = cls.getModelScene()
+
+            if modelScene.is_file():
+                out.append(modelScene)
+
+        return out
+
     @classmethod
     def importModelScene(cls):
         path = cls.getModelScene().as_posix()
@@ -1,8 +1,16 @@
 import re
+import sys
 import time
 import os
+import json
+import subprocess
 import shutil
+import inspect
+import gzip
+import hashlib
+import tempfile
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import maya.cmds as m
 import pymel.core as p
@@ -10,7 +18,108 @@ from pymel.util import expandArgs
 from paya.util import short, without_duplicates
 from paya.trunk import Trunk
 from paya.lib.evalgraph import EvalGraph
+import paya.lib.buildprofiler as _bp
 
+snapshotHashVersion = 1
+
+_snapshotExtensions = {'mayaAscii': '.ma', 'mayaBinary': '.mb'}
+
+_fileHashes = {}
+
+_compressionPool = None
+_pendingCompressions = {}   # Scene path: future
+
+_sceneSnapshot = None   # (Scene path, modification time) of the snapshot
+                        # last opened or saved in this session
+
+def _compressSnapshot(scenePath):
+    # Runs on a background thread; plain file I/O only
+    compressedPath = scenePath+'.gz'
+    tmpPath = compressedPath+'.tmp'
+
+    with open(scenePath, 'rb') as src, \
+            gzip.open(tmpPath, 'wb', compresslevel=1) as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+
+    # Keep the modification time, so that _openSnapshot() can tell the
+    # compressed file from a rewritten one
+    shutil.copystat(scenePath, tmpPath)
+    os.replace(tmpPath, compressedPath)
+    os.remove(scenePath)
+
+def _waitForSnapshot(scenePath):
+    future = _pendingCompressions.pop(scenePath, None)
+
+    if future is not None:
+        try:
+            future.result()
+
+        except (IOError, OSError) as exc:
+            # The uncompressed scene is still a valid snapshot
+            print("Couldn't compress snapshot {}: {}".format(scenePath, exc))
+
+def _flushSnapshots():
+    for scenePath in list(_pendingCompressions):
+        _waitForSnapshot(scenePath)
+
+def _getFileHash(path):
+    # Memoized on modification time and size, so that unchanged inputs
+    # aren't re-read on every build
+    stat = os.stat(path)
+    key = (Path(path).as_posix(), stat.st_mtime_ns, stat.st_size)
+
+    try:
+        return _fileHashes[key]
+
+    except KeyError:
+        hsh = hashlib.sha1()
+
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                hsh.update(chunk)
+
+        result = _fileHashes[key] = hsh.hexdigest()
+        return result
+
+# Run by mayapy worker processes; see Rig._buildStagesInWorkers()
+_workerScript = '''
+import sys
+import importlib
+
+import maya.standalone
+maya.standalone.initialize(name='python')
+
+import maya.cmds as m
+import paya.runtime
+
+projectDir, moduleName, className, stageName, stageHash = sys.argv[1:]
+m.workspace(projectDir, openWorkspace=True)
+
+cls = importlib.import_module(moduleName)
+
+for part in className.split('.'):
+    cls = getattr(cls, part)
+
+with paya.runtime:
+    cls._buildStage(stageName, stageHash)
+    cls.flushSnapshots()
+'''
+
+def _getDefaultNumWorkers():
+    # Each worker is a full mayapy session, so keep this conservative
+    return min(4, os.cpu_count() or 1)
+
+def _getMethodSource(method):
+    try:
+        return inspect.getsource(method)
+
+    except (OSError, TypeError):
+        code = getattr(method, '__code__', None)
+
+        if code is None:
+            return repr(method)
+
+        return repr((code.co_code, code.co_consts, code.co_names))
 
 class Rig(Trunk):
     """
@@ -28,6 +137,18 @@ class Rig(Trunk):
                     # directioned connections between two or more
                     # nodes
 
+    __stageInputs__ = {}    # Stage name: list of file patterns, passed
+                            # to findFiles(); matching files are hashed
+                            # into the stage's snapshot key
+
+    __snapshotFormat__ = 'mayaAscii'    # 'mayaAscii' or 'mayaBinary'
+
+    __snapshotCompression__ = False     # If True, snapshots are gzipped
+                                        # on a background thread after
+                                        # saving, and decompressed to a
+                                        # temporary file when read; this
+                                        # trades build time for disk space
+
     @classmethod
     def getAssetName(cls):
         """
@@ -177,6 +298,156 @@ class Rig(Trunk):
     #-------------------------------------------------------------|    BUILD MANAGEMENT
     #-------------------------------------------------------------|
 
+    #---------------------------------------------------------|    Snapshot hashing
+
+    @classmethod
+    def getStageInputFiles(cls, stageName):
+        """
+        :param str stageName: the build stage
+        :return: The input files for the stage, located by passing the
+            patterns listed under *stageName* in ``__stageInputs__`` to
+            :meth:`~paya.trunk.Trunk.findFiles`. Override to add files from
+            elsewhere.
+        :rtype: [:class:`~pathlib.Path`]
+        """
+        out = []
+
+        for pattern in cls.__stageInputs__.get(stageName, []):
+            out += cls.findFiles(pattern)
+
+        return sorted(set(out))
+
+    @classmethod
+    def getStageHash(cls, stageName, _cache=None):
+        """
+        :param str stageName: the build stage
+        :return: A digest of everything the stage's output depends on: the
+            rig class, the stage method's source, the hashes of the stage's
+            dependencies, and the contents of its input files (see
+            :meth:`getStageInputFiles`).
+        :rtype: :class:`str`
+        """
+        if _cache is None:
+            _cache = {}
+
+        try:
+            return _cache[stageName]
+
+        except KeyError:
+            pass
+
+        graph = _cache.setdefault(None, cls.getBuildGraph())
+
+        try:
+            method = getattr(cls, stageName)
+
+        except AttributeError:
+            raise RuntimeError(
+                "Missing build method for stage '{}'.".format(stageName))
+
+        hsh = hashlib.sha1()
+
+        header = [snapshotHashVersion,
+                  '{}.{}'.format(cls.__module__, cls.__qualname__),
+                  stageName,
+                  _getMethodSource(method)]
+
+        # Dependency order is significant, as it determines import order
+        for dependency in graph.getNodeInputs(stageName):
+            header.append([dependency, cls.getStageHash(dependency, _cache)])
+
+        for path in cls.getStageInputFiles(stageName):
+            header.append([path.as_posix(), _getFileHash(path)])
+
+        hsh.update(json.dumps(header).encode('utf-8'))
+
+        result = _cache[stageName] = hsh.hexdigest()
+        return result
+
+    @classmethod
+    def getStageHashes(cls, *stageNames):
+        """
+        :param \*stageNames: the stages to hash; if omitted, every stage in
+            the build graph is hashed
+        :type \*stageNames: :class:`str`, [:class:`str`]
+        :return: A mapping of stage name: :meth:`stage hash <getStageHash>`.
+            Hashes for upstream stages are included.
+        :rtype: :class:`dict`
+        """
+        stageNames = expandArgs(*stageNames)
+
+        if not stageNames:
+            stageNames = cls.getBuildGraph().nodes()
+
+        cache = {}
+
+        for stageName in stageNames:
+            cls.getStageHash(stageName, cache)
+
+        del(cache[None])
+        return cache
+
+    @classmethod
+    def getSnapshotHashFile(cls, stageName):
+        """
+        :param str stageName: the build stage
+        :return: The path to the sidecar file that records the hash a
+            stage's snapshot was built with.
+        :rtype: :class:`~pathlib.Path`
+        """
+        return cls.getSnapshotsDir().joinpath('{}.json'.format(stageName))
+
+    @classmethod
+    def getSnapshotHash(cls, stageName):
+        """
+        :param str stageName: the build stage
+        :return: The hash recorded for the stage's snapshot, if any.
+        :rtype: :class:`str`, ``None``
+        """
+        try:
+            with open(cls.getSnapshotHashFile(stageName), 'r') as f:
+                return json.load(f).get('hash')
+
+        except (IOError, ValueError):
+            return None
+
+    @classmethod
+    def setSnapshotHash(cls, stageName, stageHash):
+        """
+        Records the hash a stage's snapshot was built with.
+
+        :param str stageName: the build stage
+        :param str stageHash: the hash to record
+        """
+        path = cls.getSnapshotHashFile(stageName)
+        tmpPath = path.with_suffix('.json.tmp')
+
+        with open(tmpPath, 'w') as f:
+            json.dump({'hash': stageHash,
+                       'rig': cls.__name__,
+                       'time': time.time()}, f)
+
+        os.replace(tmpPath, path)
+
+    @classmethod
+    def snapshotIsCurrent(cls, stageName, stageHash=None):
+        """
+        :param str stageName: the build stage
+        :param stageHash: the current hash for the stage, if already
+            known; defaults to ``None``
+        :type stageHash: :class:`str`, ``None``
+        :return: ``True`` if the stage has a snapshot that was built with
+            its current hash.
+        :rtype: :class:`bool`
+        """
+        if not cls.snapshotExists(stageName):
+            return False
+
+        if stageHash is None:
+            stageHash = cls.getStageHash(stageName)
+
+        return cls.getSnapshotHash(stageName) == stageHash
+
     #---------------------------------------------------------|    Snapshots
 
     @classmethod
@@ -202,10 +473,13 @@ class Rig(Trunk):
         :param str stageName: the name of the stage for which to source a
             snapshot
         :return: ``True`` if there's a snapshot for the specified build
-            stage, otherwise ``False``.
+            stage, compressed or otherwise, otherwise ``False``.
         :rtype: :class:`bool`
         """
-        return cls.getSnapshotScene(stageName).is_file()
+        scene = cls.getSnapshotScene(stageName)
+
+        return scene.is_file() or \
+            cls.getCompressedSnapshot(stageName).is_file()
 
     @classmethod
     def removeSnapshot(cls, stageName):
@@ -215,18 +489,26 @@ class Rig(Trunk):
         :param str stageName: the build stage for the snapshot
         """
         path = cls.getSnapshotScene(stageName)
-        
+        _waitForSnapshot(path.as_posix())
+
         try:
-            os.remove(path)
-            print("Removed snapshot: {}".format(path))
+            os.remove(cls.getSnapshotHashFile(stageName))
         except IOError:
             pass
 
+        for _path in (path, cls.getCompressedSnapshot(stageName)):
+            try:
+                os.remove(_path)
+                print("Removed snapshot: {}".format(_path))
+            except IOError:
+                pass
+
     @classmethod
     def clearSnapshots(cls):
         """
         Deletes the snapshots directory along with its contents.
         """
+        _flushSnapshots()
         dr = cls.getSnapshotsDir()
 
         if dr.is_dir():
@@ -238,54 +520,187 @@ class Rig(Trunk):
         """
         :param str stageName: the name of the build stage for which to source
             a snapshot scene.
-        :return: The path to a Maya scene snapshot for the specified stage.
-            Note that this does not check whether the file actually exists.
+        :return: The path to a Maya scene snapshot for the specified stage,
+            in the format set by ``__snapshotFormat__``. Note that this
+            does not check whether the file actually exists, and that
+            compressed snapshots are stored at
+            :meth:`getCompressedSnapshot` instead.
         :rtype: :class:`~pathlib.Path`
         """
-        return cls.getSnapshotsDir().joinpath('{}.ma'.format(stageName))
+        try:
+            ext = _snapshotExtensions[cls.__snapshotFormat__]
+
+        except KeyError:
+            raise ValueError("Unsupported snapshot format: {}".format(
+                cls.__snapshotFormat__))
+
+        return cls.getSnapshotsDir().joinpath(
+            '{}{}'.format(stageName, ext))
+
+    @classmethod
+    def getCompressedSnapshot(cls, stageName):
+        """
+        :param str stageName: the name of the build stage
+        :return: The path to the compressed form of the stage's snapshot;
+            see ``__snapshotCompression__``. Note that this does not check
+            whether the file actually exists.
+        :rtype: :class:`~pathlib.Path`
+        """
+        scene = cls.getSnapshotScene(stageName)
+        return scene.with_name(scene.name+'.gz')
+
+    @classmethod
+    def flushSnapshots(cls):
+        """
+        Waits for any snapshots that are being compressed in the
+        background.
+        """
+        _flushSnapshots()
+
+    #---------------------------------------------------------|    Snapshot I/O
+
+    @classmethod
+    def _readSnapshot(cls, stageName, callback):
+        # Calls *callback* with a readable scene path for the stage's
+        # snapshot, decompressing to a temporary file if necessary
+        scene = cls.getSnapshotScene(stageName)
+        _waitForSnapshot(scene.as_posix())
+
+        if scene.is_file():
+            return callback(scene.as_posix())
+
+        tmpDir = tempfile.mkdtemp(prefix='paya_snapshot_')
+        tmpPath = os.path.join(tmpDir, scene.name)
+
+        try:
+            with _bp.phase('decompress', snapshot=stageName):
+                with gzip.open(cls.getCompressedSnapshot(
+                        stageName), 'rb') as src, \
+                        open(tmpPath, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+
+            return callback(tmpPath)
+
+        finally:
+            shutil.rmtree(tmpDir, ignore_errors=True)
+
+    @classmethod
+    def _getSnapshotMTime(cls, stageName):
+        # Returns the modification time of the stage's snapshot, whether
+        # or not it's been compressed, or None if there isn't one
+        for path in (cls.getSnapshotScene(stageName),
+                     cls.getCompressedSnapshot(stageName)):
+            try:
+                return os.stat(path).st_mtime_ns
+
+            except OSError:
+                continue
+
+    @classmethod
+    def _openSnapshot(cls, stageName):
+        # Skips reopening if the snapshot is already the open, unmodified
+        # scene, and hasn't been rewritten (e.g. by a worker) since
+        global _sceneSnapshot
+
+        scene = cls.getSnapshotScene(stageName)
+        current = m.file(q=True, sceneName=True)
+        mtime = cls._getSnapshotMTime(stageName)
+
+        if current and Path(current) == scene \
+                and not m.file(q=True, modified=True) \
+                and mtime is not None \
+                and _sceneSnapshot == (scene.as_posix(), mtime):
+            return
+
+        def openScene(path):
+            m.file(path, open=True, force=True)
+
+            # If the snapshot was decompressed to a temporary file, point
+            # the scene back at its real path
+            m.file(rename=scene.as_posix())
+
+        with _bp.phase('open', snapshot=stageName):
+            cls._readSnapshot(stageName, openScene)
+
+        _sceneSnapshot = (scene.as_posix(), mtime)
+
+    @classmethod
+    def _importSnapshot(cls, stageName):
+        with _bp.phase('import', snapshot=stageName):
+            cls._readSnapshot(stageName, lambda path: m.file(
+                path, i=True, type=cls.__snapshotFormat__))
+
+    @classmethod
+    def _saveSnapshot(cls, stageName, stageHash):
+        global _compressionPool, _sceneSnapshot
+
+        scene = cls.getSnapshotScene(stageName)
+
+        with _bp.phase('save', snapshot=stageName):
+            cls.getSnapshotsDir(create=True)
+            _waitForSnapshot(scene.as_posix())
+
+            try:
+                os.remove(cls.getCompressedSnapshot(stageName))
+            except IOError:
+                pass
+
+            m.file(rename=scene.as_posix())
+            m.file(save=True, force=True, type=cls.__snapshotFormat__)
+
+        _sceneSnapshot = (scene.as_posix(), os.stat(scene).st_mtime_ns)
+
+        cls.setSnapshotHash(stageName, stageHash)
+
+        if cls.__snapshotCompression__:
+            # Compress while the next stage runs
+            if _compressionPool is None:
+                _compressionPool = ThreadPoolExecutor(max_workers=2)
+
+            _pendingCompressions[scene.as_posix()] = \
+                _compressionPool.submit(_compressSnapshot, scene.as_posix())
 
     @classmethod
-    def pruneSnapshots(cls, dirtyStages=None):
+    def pruneSnapshots(cls, dirtyStages=None, stageHashes=None):
         """
-        Performs housekeeping on build-stage snapshots. For every stage, if
-        there isn't a snapshot, snapshots for all downstream stages are also
-        deleted.
+        Performs housekeeping on build-stage snapshots. Snapshots whose
+        recorded hash doesn't match the stage's current
+        :meth:`hash <getStageHash>` are deleted. Since stage hashes include
+        those of their dependencies, staleness propagates downstream
+        automatically.
 
         :param dirtyStages: one or more stages for which snapshots should
             be explicitly deleted, along with those of all their descendants;
+            use this for changes that aren't covered by stage hashes;
             defaults to ``None``
         :type dirtyStages: :class:`str`, [:class:`str`]
+        :param stageHashes: precomputed stage hashes, as returned by
+            :meth:`getStageHashes`; only these stages are checked for
+            staleness; defaults to ``None`` (all stages)
+        :type stageHashes: :class:`dict`, ``None``
         """
         graph = cls.getBuildGraph()
-        cleared = set()
 
-        # Remove any snapshots for 'dirty' stages
+        if stageHashes is None:
+            stageHashes = cls.getStageHashes()
+
+        # Remove any snapshots for 'dirty' stages and their descendants
         if dirtyStages:
             dirtyStages = without_duplicates(expandArgs(dirtyStages))
+            cleared = set()
 
             for dirtyStage in dirtyStages:
-                if cls.snapshotExists(dirtyStage):
-                    cls.removeSnapshot(dirtyStage)
-                    cleared.add(dirtyStage)
-
-        # Evaluate from start terminals; propagate any gaps in snapshots
-        # downstream
-        startTerminals = graph.nodes(startTerminals=True)
-
-        for startTerminal in startTerminals:
-            sequence = [startTerminal] \
-                       + graph.getNodesDownstreamOf(startTerminal)
-
-            for node in sequence:
-                if not cls.snapshotExists(node):
-                    for desc in graph.getNodesDownstreamOf(node):
-                        if desc not in cleared:
-                            cls.removeSnapshot(desc)
-                            cleared.add(desc)
-                    
-                    break
-
-                cleared.add(node)
+                for stage in [dirtyStage] \
+                        + graph.getNodesDownstreamOf(dirtyStage):
+                    if stage not in cleared:
+                        cls.removeSnapshot(stage)
+                        cleared.add(stage)
+
+        # Remove stale snapshots
+        for stage, stageHash in stageHashes.items():
+            if cls.snapshotExists(stage) \
+                    and not cls.snapshotIsCurrent(stage, stageHash):
+                cls.removeSnapshot(stage)
 
     #---------------------------------------------------------|    Graph evaluation
 
@@ -298,12 +713,232 @@ class Rig(Trunk):
         """
         return EvalGraph.fromSegments(cls.__graph__)
 
+    @classmethod
+    def _buildStage(cls, stageName, stageHash, sceneStage=None):
+        # Builds a single stage and saves its snapshot. If the stage has
+        # one input, it's built into that input's result, which is only
+        # opened if it's not already the open scene (*sceneStage*);
+        # otherwise, it's built into a new scene with all its dependencies
+        # imported
+        dependencies = cls.getBuildGraph().getNodeInputs(stageName)
+
+        with _bp.stage(stageName):
+            if len(dependencies) == 1:
+                if dependencies[0] != sceneStage:
+                    cls._openSnapshot(dependencies[0])
+            else:
+                with _bp.phase('new'):
+                    m.file(newFile=True, force=True)
+
+                for dependency in dependencies:
+                    cls._importSnapshot(dependency)
+
+            # Source the namesake method, run it
+            with _bp.run():
+                getattr(cls, stageName)()
+
+            cls._saveSnapshot(stageName, stageHash)
+
+    #---------------------------------------------------------|    Parallel building
+
+    @classmethod
+    def getMayapyPath(cls):
+        """
+        :return: The path to the ``mayapy`` interpreter used for parallel
+            builds, if one can be found. In this implementation, this is
+            the current interpreter if it's ``mayapy``, otherwise it's
+            looked for under ``$MAYA_LOCATION/bin`` and on ``PATH``. Can be
+            overriden freely.
+        :rtype: :class:`str`, ``None``
+        """
+        exe = 'mayapy.exe' if os.name == 'nt' else 'mayapy'
+
+        if os.path.basename(sys.executable).lower().startswith('mayapy'):
+            return sys.executable
+
+        location = os.environ.get('MAYA_LOCATION')
+
+        if location:
+            path = os.path.join(location, 'bin', exe)
+
+            if os.path.isfile(path):
+                return path
+
+        return shutil.which(exe)
+
+    @classmethod
+    def _runStageWorker(cls, mayapy, projectDir,
+                        snapshotsDir, stageName, stageHash):
+        # Called from a thread; mustn't touch the Maya API
+        logPath = snapshotsDir.joinpath('{}.log'.format(stageName))
+
+        env = os.environ.copy()
+        env['PYTHONPATH'] = os.pathsep.join(
+            [path for path in sys.path if path])
+
+        with open(logPath, 'w') as f:
+            result = subprocess.run(
+                [mayapy, '-c', _workerScript, projectDir,
+                 cls.__module__, cls.__qualname__, stageName, stageHash],
+                stdout=f, stderr=subprocess.STDOUT, env=env
+            )
+
+        return result.returncode, logPath
+
+    @classmethod
+    def _getWorkerStages(cls, stages):
+        # Splits *stages* (stale, in build order) into those worth building
+        # in workers, and those that must be built in this session before
+        # the workers are launched. Only stages with a single input and an
+        # independent sibling go to workers; chains and merges are left to
+        # the serial pass, which builds them into the open scene.
+        graph = cls.getBuildGraph()
+        stale = set(stages)
+        upstreamMap = {stage: set(graph.getNodesUpstreamOf(stage)) \
+                       for stage in stages}
+
+        def independent(a, b):
+            return a != b and a not in upstreamMap[b] \
+                   and b not in upstreamMap[a]
+
+        candidates = [stage for stage in stages \
+                      if len(graph.getNodeInputs(stage)) < 2]
+
+        while True:
+            candidateSet = set(candidates)
+
+            # Drop candidates with no sibling to run alongside, and those
+            # waiting on a merge of other candidates
+            kept = [stage for stage in candidates \
+                    if any(independent(stage, other) \
+                           for other in candidates) \
+                    and not any(upstreamMap[upstream] & candidateSet \
+                                for upstream in (upstreamMap[stage] & \
+                                                 stale) - candidateSet)]
+
+            if kept == candidates:
+                break
+
+            candidates = kept
+
+        prerequisites = set()
+
+        for stage in candidates:
+            prerequisites.update(upstreamMap[stage] & stale)
+
+        prerequisites = [stage for stage in stages \
+                         if stage in prerequisites and \
+                         stage not in candidates]
+
+        return candidates, prerequisites
+
+    @classmethod
+    def _buildStagesInWorkers(cls, stages, stageHashes, workers):
+        # Builds the independent branches among *stages* (stale, in build
+        # order) in mayapy workers, launching each one as soon as its
+        # dependencies have snapshots. Anything the branches need that
+        # isn't built in a worker is built into this session first. Stops
+        # launching on the first failure; whatever's left is picked up by
+        # the serial pass in build(). Returns {stage: seconds} for
+        # successful worker builds, and the stages built in this session,
+        # in order.
+        graph = cls.getBuildGraph()
+        pending, prerequisites = cls._getWorkerStages(stages)
+
+        if not pending:
+            print("No independent stages to build in parallel.")
+            return {}, []
+
+        mayapy = cls.getMayapyPath()
+
+        if mayapy is None:
+            print("Couldn't find mayapy; building serially.")
+            return {}, []
+
+        if cls.__module__ == '__main__':
+            print("Rig classes defined in __main__ can't be "+
+                  "built in workers; building serially.")
+            return {}, []
+
+        sceneStage = None
+
+        for stage in prerequisites:
+            cls._buildStage(stage, stageHashes[stage], sceneStage=sceneStage)
+            sceneStage = stage
+
+        # Workers read snapshots from disk
+        cls.flushSnapshots()
+
+        projectDir = m.workspace(q=True, rd=True)
+        snapshotsDir = cls.getSnapshotsDir(create=True)
+
+        timings = {}
+        running = {}
+        failed = False
+        profiler = _bp.BuildProfiler.active()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                if not failed:
+                    busy = set(pending) | \
+                           set(item[0] for item in running.values())
+
+                    for stage in list(pending):
+                        if len(running) >= workers:
+                            break
+
+                        if busy.intersection(graph.getNodeInputs(stage)):
+                            continue
+
+                        pending.remove(stage)
+                        print("Building '{}' in a worker...".format(stage))
+
+                        future = pool.submit(
+                            cls._runStageWorker, mayapy, projectDir,
+                            snapshotsDir, stage, stageHashes[stage])
+
+                        slot = min(set(range(workers)) - set(
+                            item[2] for item in running.values()))
+
+                        running[future] = (stage, time.time(), slot)
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    stage, startTime, slot = running.pop(future)
+                    elapsed = time.time() - startTime
+                    returnCode, logPath = future.result()
+
+                    if returnCode == 0 and cls.snapshotIsCurrent(
+                            stage, stageHashes[stage]):
+                        timings[stage] = elapsed
+
+                        if profiler is not None:
+                            end = time.perf_counter()
+                            profiler.addWorkerStage(
+                                stage, end-elapsed, end, worker=slot)
+                        print("Built '{}' in a worker in {:.2f} seconds.".format(
+                            stage, elapsed))
+                    else:
+                        failed = True
+                        print("Worker for '{}' failed (exit code {}); see "
+                              "{}. Remaining stages will be built "
+                              "serially.".format(stage, returnCode, logPath))
+
+        return timings, prerequisites
+
     @classmethod
     def build(cls,
               targetStages=None,
               rebuildDependencies=True,
               clearSnapshots=False,
-              dirtyStages=None):
+              dirtyStages=None,
+              parallel=False,
+              workers=None,
+              profile=False):
         """
         Runs a rig-building sequence.
 
@@ -319,7 +954,43 @@ class Rig(Trunk):
             'dirty', meaning their snapshots, and those of their descendants,
             should be cleared before building; defaults to ``None``
         :type dirtyStages: :class:`str`, [:class:`str`]
+        :param bool parallel: build independent branches of the graph
+            concurrently, in separate ``mayapy`` processes (see
+            :meth:`getMayapyPath`), each starting from its dependencies'
+            snapshots; stages with no independent sibling, and stages
+            that merge several inputs, are built in this session, as
+            usual; if workers can't be started, or one fails, the
+            remaining stages are built serially; defaults to ``False``
+        :param workers: the maximum number of concurrent worker processes;
+            defaults to ``None`` (up to 4, depending on CPU count)
+        :type workers: :class:`int`, ``None``
+        :param profile: record per-stage timings, node counts, memory use
+            and hot calls via a
+            :class:`~paya.lib.buildprofiler.BuildProfiler`, and write
+            them as JSON and Chrome trace files into this directory, or
+            into the snapshots directory if ``True``; defaults to
+            ``False``
+        :type profile: :class:`bool`, :class:`str`,
+            :class:`~pathlib.Path`
         """
+        if profile:
+            profiler = _bp.BuildProfiler(cls.getAssetName())
+
+            with profiler:
+                cls.build(targetStages=targetStages,
+                          rebuildDependencies=rebuildDependencies,
+                          clearSnapshots=clearSnapshots,
+                          dirtyStages=dirtyStages,
+                          parallel=parallel,
+                          workers=workers)
+
+            outDir = cls.getSnapshotsDir() if profile is True else profile
+
+            for path in profiler.save(outDir):
+                print("Wrote build profile: {}".format(path))
+
+            return
+
         print("\n#----------|    Start of '{}' Build    |----------#".format(cls.__name__))
 
         startTime = time.time()
@@ -358,54 +1029,81 @@ class Rig(Trunk):
 
         #------------------------|    Housekeep snapshots
 
-        if clearSnapshots:
-            cls.clearSnapshots()
-        else:
-            cls.pruneSnapshots(dirtyStages=dirtyStages)
+        with _bp.phase('hash'):
+            stageHashes = cls.getStageHashes(list(methodsMap))
+
+        with _bp.phase('prune'):
+            if clearSnapshots:
+                cls.clearSnapshots()
+            else:
+                cls.pruneSnapshots(dirtyStages=dirtyStages,
+                                   stageHashes=stageHashes)
+
+        #------------------------|    Build independent stages in
+        #------------------------|    workers
+
+        workerTimings = {}
+        prebuiltStages = []
+
+        if parallel:
+            if workers is None:
+                workers = _getDefaultNumWorkers()
+
+            if workers > 1:
+                stagesToBuild = [stage for stage in without_duplicates(
+                    graph.getBuildSequence(targetStages)) \
+                    if not cls.snapshotIsCurrent(stage, stageHashes[stage])]
+
+                workerTimings, prebuiltStages = \
+                    cls._buildStagesInWorkers(
+                        stagesToBuild, stageHashes, workers)
 
         #------------------------|    Iterate
 
         resolvedStages = []
-        previousStage = ''
+        restoredStages = []
+
+        # The stage whose result is in the open scene
+        sceneStage = prebuiltStages[-1] if prebuiltStages else None
 
         for targetStage in targetStages:
             buildSequence = \
                 graph.getNodesUpstreamOf(targetStage) + [targetStage]
 
             for stageToBuild in buildSequence:
-                snapshot = cls.getSnapshotScene(stageToBuild)
+                if stageToBuild in resolvedStages:
+                    continue
 
-                if snapshot.exists():
-                    # Just open the scene, so that the next stage in line
-                    # can build into it
-                    m.file(snapshot.as_posix(), open=True, force=True)
-                else:
-                    dependencies = graph.getNodeInputs(stageToBuild)
+                if stageToBuild in prebuiltStages:
+                    resolvedStages.append(stageToBuild)
+                    continue
 
-                    # If this stage has one input, and that's previousStage,
-                    # just build into the currently-open scene; otherwise,
-                    # create a new scene and import all dependencies
-                    # before running the build
+                stageHash = stageHashes[stageToBuild]
 
-                    if not (
-                        len(dependencies) is 1
-                        and dependencies[0] == previousStage
-                    ):
-                        m.file(newFile=True, force=True)
+                if cls.snapshotIsCurrent(stageToBuild, stageHash):
+                    # Defer opening until something needs to build into it
+                    restoredStages.append(stageToBuild)
 
-                        for dependency in dependencies:
-                            p.importFile(
-                                cls.getSnapshotScene(dependency).as_posix()
-                            )
+                    if stageToBuild not in workerTimings:
+                        profiler = _bp.BuildProfiler.active()
 
-                    # Source the namesake method, run it
-                    getattr(cls, stageToBuild)()
+                        if profiler is not None:
+                            profiler.markRestored(stageToBuild)
+                else:
+                    cls._buildStage(stageToBuild,
+                                    stageHash, sceneStage=sceneStage)
 
-                    p.renameFile(snapshot)
-                    p.saveFile()
+                    sceneStage = stageToBuild
 
                 resolvedStages.append(stageToBuild)
-                previousStage = stageToBuild
+
+            # Leave the target stage's result open
+            if sceneStage != targetStage:
+                cls._openSnapshot(targetStage)
+                sceneStage = targetStage
+
+        with _bp.phase('flush'):
+            cls.flushSnapshots()
 
         endTime = time.time()
 
@@ -413,4 +1111,12 @@ class Rig(Trunk):
 
         print("#----------|    End of '{}' Build    |----------#".format(cls.__name__))
         print("Resolved nodes: {}".format(", ".join(resolvedStages)))
+        print("Restored from snapshots: {}".format(
+            ", ".join(restoredStages) or 'none'))
+
+        if workerTimings:
+            print("Built in workers: {}".format(", ".join(
+                ["{} ({:.2f}s)".format(stage, elapsed) \
+                 for stage, elapsed in workerTimings.items()])))
+
         print("Elapsed time: {} seconds".format(endTime-startTime))
\ No newline at end of file
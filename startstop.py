@@ -2,6 +2,8 @@ import maya.cmds as m
 from paya.nativeunits import NativeUnits
 from paya.patch import patchPyMEL, unpatchPyMEL
 from paya.pools import pools
+import paya.pluginfo as _pi
+import paya.lib.reuseindex as _ri
 
 global running
 running = False
@@ -22,6 +24,8 @@ def start(quiet=False):
 
     else:
         patchPyMEL(quiet=True)
+        _pi.startCallbacks()
+        _ri.startCallbacks()
         running = True
         if not quiet:
             print("PyMEL has been patched.")
@@ -39,6 +43,8 @@ def stop(quiet=False):
 
     if running:
         unpatchPyMEL(quiet=True)
+        _pi.stopCallbacks()
+        _ri.stopCallbacks()
 
         for pool in pools:
             pool.purge(quiet=True)
@@ -0,0 +1,81 @@
+"""
+Shared fixtures. Maya isn't required: tests that touch Maya modules
+install lightweight stand-ins via :func:`mockModules` and load the Paya
+modules under test straight from the source tree.
+"""
+
+import os
+import sys
+import types
+import importlib.util
+
+import pytest
+
+rootdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def mockModules(monkeypatch, **modules):
+    """
+    Installs stand-in modules for the duration of a test.
+
+    :param monkeypatch: the pytest ``monkeypatch`` fixture
+    :param modules: keyword arguments mapping dotted module names, with
+        dots replaced by underscores, to attribute dictionaries; for
+        example ``maya_cmds={'ls': ls}``
+    :return: The installed modules, keyed by dotted name.
+    :rtype: dict
+    """
+    out = {}
+
+    for key, attrs in modules.items():
+        name = key.replace('_', '.')
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        monkeypatch.setitem(sys.modules, name, module)
+        out[name] = module
+
+        parent, _, child = name.rpartition('.')
+
+        if parent in out:
+            setattr(out[parent], child, module)
+
+    return out
+
+
+def loadPayaModule(monkeypatch, name):
+    """
+    Loads a Paya module from the source tree, without importing
+    :mod:`paya.runtime`.
+
+    :param monkeypatch: the pytest ``monkeypatch`` fixture
+    :param str name: the module name, relative to the package, e.g.
+        ``'lib.buildbatch'``
+    :return: The module.
+    """
+    if 'paya' not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            'paya', os.path.join(rootdir, '__init__.py'),
+            submodule_search_locations=[rootdir])
+
+        package = importlib.util.module_from_spec(spec)
+        monkeypatch.setitem(sys.modules, 'paya', package)
+        spec.loader.exec_module(package)
+
+    fullName = 'paya.'+name
+    path = os.path.join(rootdir, *name.split('.'))+'.py'
+    spec = importlib.util.spec_from_file_location(fullName, path)
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, fullName, module)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+@pytest.fixture
+def monkeymodules(monkeypatch):
+    """
+    Returns :func:`mockModules` and :func:`loadPayaModule`, bound to the
+    test's ``monkeypatch``.
+    """
+    return (lambda **modules: mockModules(monkeypatch, **modules),
+            lambda name: loadPayaModule(monkeypatch, name))
@@ -0,0 +1,139 @@
+"""
+Checks the NumPy backend in :mod:`paya.lib.arraymath` against the original
+pure-Python paths in :mod:`paya.lib.mathops`. Needs PyMEL (i.e. mayapy) and
+NumPy; skipped otherwise.
+"""
+
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pymel.core')
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    FIXTURES
+#----------------------------------------------------------|
+
+@pytest.fixture
+def mo(monkeymodules):
+    mock, load = monkeymodules
+    return load('lib.mathops')
+
+@pytest.fixture
+def useNumpy(mo):
+    from paya.config import Config
+
+    def useNumpy(state):
+        return Config(useNumpy=state)
+
+    return useNumpy
+
+def getHelixPoints(num=60, turns=2.0):
+    out = []
+
+    for i in range(num):
+        angle = turns * 2.0 * math.pi * i / (num-1)
+        out.append([math.cos(angle) * 5.0, i * 0.3, math.sin(angle) * 5.0])
+
+    # Include an in-line stretch, to exercise neighbour blending
+    last = out[-1]
+    out += [[last[0], last[1]+0.3*x, last[2]] for x in range(1, 4)]
+
+    return out
+
+def getTangents(points):
+    points = np.asarray(points, dtype=float)
+    tangents = np.gradient(points, axis=0)
+
+    return (tangents / np.linalg.norm(tangents, axis=1)[:, None]).tolist()
+
+def asArray(items):
+    return np.array([list(item) for item in items], dtype=float)
+
+def assertClose(pure, other):
+    np.testing.assert_allclose(
+        asArray(pure), np.asarray(other, dtype=float).reshape(
+            asArray(pure).shape), atol=1e-9)
+
+def runAllPaths(useNumpy, f, *args, **kwargs):
+    with useNumpy(False):
+        pure = f(*args, **kwargs)
+
+    with useNumpy(True):
+        fast = f(*args, **kwargs)
+
+    return pure, fast
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_deflipVectors(mo, useNumpy):
+    vectors = [[0, 1, 0], [0, -1, 0.1], [0.1, 1, 0], [0, -1, 0]]
+    pure, fast = runAllPaths(useNumpy, mo.deflipVectors, vectors)
+
+    assertClose(pure, fast)
+    assertClose(pure, mo.deflipVectors(np.array(vectors, dtype=float)))
+
+def test_getFramedAimAndUpVectors(mo, useNumpy):
+    points = getHelixPoints()
+    pure, fast = runAllPaths(
+        useNumpy, mo.getFramedAimAndUpVectors, points, [1, 0, 0])
+
+    for _pure, _fast in zip(pure, fast):
+        assertClose(_pure, _fast)
+
+    arrays = mo.getFramedAimAndUpVectors(np.array(points), [1, 0, 0])
+
+    for _pure, _array in zip(pure, arrays):
+        assertClose(_pure, _array)
+
+@pytest.mark.parametrize('framed', [False, True])
+def test_getChainedAimMatrices(mo, useNumpy, framed):
+    points = getHelixPoints()
+    pure, fast = runAllPaths(
+        useNumpy, mo.getChainedAimMatrices,
+        points, 'y', 'x', [1, 0, 0], framed=framed)
+
+    flat = lambda matrices: [list(matrix.flat) for matrix in matrices]
+    assertClose(flat(pure), flat(fast))
+
+    array = mo.getChainedAimMatrices(
+        np.array(points), 'y', 'x', [1, 0, 0], framed=framed)
+
+    assertClose(flat(pure), array.reshape(-1, 16))
+
+@pytest.mark.parametrize('fromEnd', [False, True])
+def test_parallelTransport(mo, useNumpy, fromEnd):
+    tangents = getTangents(getHelixPoints())
+    pure, fast = runAllPaths(useNumpy, mo.parallelTransport,
+                             [1, 0, 0], tangents, fromEnd=fromEnd)
+
+    assertClose(pure, fast)
+    assertClose(pure, mo.parallelTransport(
+        [1, 0, 0], np.array(tangents), fromEnd=fromEnd))
+
+@pytest.mark.parametrize('unwindSwitch', [0, 1, 2])
+def test_blendCurveNormalSets(mo, useNumpy, unwindSwitch):
+    tangents = getTangents(getHelixPoints())
+    normalsA = mo.parallelTransport([1, 0, 0], tangents)
+    normalsB = mo.parallelTransport([0, 0, 1], tangents, fromEnd=True)
+
+    pure, fast = runAllPaths(useNumpy, mo.blendCurveNormalSets,
+                             normalsA, normalsB, tangents,
+                             unwindSwitch=unwindSwitch)
+
+    assertClose(pure, fast)
+    assertClose(pure, mo.blendCurveNormalSets(
+        asArray(normalsA), asArray(normalsB), np.array(tangents),
+        unwindSwitch=unwindSwitch))
+
+def test_bidirectionalParallelTransport(mo, useNumpy):
+    tangents = getTangents(getHelixPoints())
+    pure, fast = runAllPaths(useNumpy, mo.bidirectionalParallelTransport,
+                             [1, 0, 0], [0, 0, 1], tangents)
+
+    assertClose(pure, fast)
+    assertClose(pure, mo.bidirectionalParallelTransport(
+        [1, 0, 0], [0, 0, 1], np.array(tangents)))
@@ -0,0 +1,246 @@
+"""
+Round-trip tests for the array side of :mod:`paya.lib.binweights`. Needs
+NumPy; skipped otherwise. Run this file directly for a size and timing
+benchmark.
+"""
+
+import os
+import time
+import tempfile
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from conftest import mockModules, loadPayaModule
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    FIXTURES
+#----------------------------------------------------------|
+
+def loadBinweights(monkeypatch):
+    mockModules(
+        monkeypatch,
+        maya={},
+        maya_cmds={'about': lambda **kwargs: '2024'},
+        maya_api={},
+        maya_api_OpenMaya={},
+        maya_api_OpenMayaAnim={},
+        pymel={},
+        pymel_core={}
+    )
+
+    return loadPayaModule(monkeypatch, 'lib.binweights')
+
+@pytest.fixture
+def bw(monkeypatch):
+    return loadBinweights(monkeypatch)
+
+def getWeights(numComponents, numInfluences, maxInfluences=4, seed=0):
+    # Normalized, sparse weights, as a skinCluster would hold them
+    rng = np.random.default_rng(seed)
+    weights = np.zeros((numComponents, numInfluences))
+
+    for row in range(numComponents):
+        cols = rng.choice(numInfluences,
+                          size=rng.integers(1, maxInfluences+1),
+                          replace=False)
+        values = rng.random(len(cols))
+        weights[row, cols] = values / values.sum()
+
+    return weights
+
+def getExtracted(numComponents=200, numInfluences=30, seed=0):
+    header = {
+        'shape': 'bodyShape',
+        'deformer': 'skinCluster1',
+        'deformerType': 'skinCluster',
+        'componentType': 'vertex',
+        'numComponents': numComponents,
+        'numInfluences': numInfluences,
+        'influences': ['joint{}'.format(i) for i in range(numInfluences)],
+        'settings': {'skinningMethod': 0, 'maxInfluences': 4,
+                     'maintainMaxInfluences': 1, 'normalizeWeights': 1}
+    }
+
+    weights = getWeights(numComponents, numInfluences, seed=seed)
+    blendWeights = np.linspace(
+        0.0, 1.0, numComponents).astype(np.float32)
+
+    return header, weights, blendWeights
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_packUnpackIsLossless(bw):
+    weights = getWeights(100, 12)
+    indptr, indices, values = bw.packWeights(weights)
+
+    assert indptr.dtype == np.int64 and len(indptr) == 101
+    assert indices.dtype == np.uint16
+    assert values.size == np.count_nonzero(weights)
+
+    unpacked = bw.unpackWeights(indptr, indices, values, 12)
+    assert np.allclose(unpacked, weights, atol=1e-7)
+
+def test_weightToleranceDropsSmallWeights(bw):
+    weights = np.array([[0.5, 0.001, 0.499],
+                        [0.0, 1.0, 0.0]])
+
+    indptr, indices, values = bw.packWeights(weights, wt=0.01)
+
+    assert indptr.tolist() == [0, 2, 3]
+    assert indices.tolist() == [0, 2, 1]
+
+def test_wideInfluenceListsUseWideIndices(bw):
+    weights = np.zeros((2, 70000))
+    weights[0, 69999] = 1.0
+    weights[1, 3] = 1.0
+
+    indptr, indices, values = bw.packWeights(weights)
+
+    assert indices.dtype == np.uint32
+    assert np.array_equal(
+        bw.unpackWeights(indptr, indices, values, 70000), weights)
+
+def test_float16StaysWithinTolerance(bw):
+    weights = getWeights(500, 40)
+    indptr, indices, values = bw.packWeights(weights, f16=True)
+
+    assert values.dtype == np.float16
+
+    error = np.abs(bw.unpackWeights(
+        indptr, indices, values, 40) - weights).max()
+
+    assert error <= 2.5e-4
+
+@pytest.mark.parametrize('memoryMap', [True, False])
+@pytest.mark.parametrize('float16', [True, False])
+def test_fileRoundTrip(bw, tmp_path, memoryMap, float16):
+    header, weights, blendWeights = getExtracted()
+    filepath = str(tmp_path.joinpath('skin.pwb'))
+
+    bw.write(filepath, *bw.encode(header, weights, blendWeights,
+                                  f16=float16))
+
+    assert bw.isBinaryWeightsFile(filepath)
+
+    readHeader = bw.readHeader(filepath)
+
+    for key, value in header.items():
+        assert readHeader[key] == value
+
+    assert readHeader['numWeights'] == np.count_nonzero(weights)
+
+    for info in readHeader['arrays'].values():
+        assert info['offset'] % 16 == 0
+
+    _header, arrays = bw.read(filepath, mm=memoryMap)
+    assert isinstance(arrays['weights'], np.memmap) == memoryMap
+
+    _header, decoded, decodedBlend = bw.decode(filepath, mm=memoryMap)
+
+    assert np.allclose(decoded, weights,
+                       atol=2.5e-4 if float16 else 1e-7)
+    assert np.array_equal(decodedBlend, blendWeights)
+
+def test_emptyArraysRoundTrip(bw, tmp_path):
+    header, weights, blendWeights = getExtracted(numComponents=5)
+    weights[:] = 0.0
+    filepath = str(tmp_path.joinpath('empty.pwb'))
+
+    bw.write(filepath, *bw.encode(header, weights))
+
+    for memoryMap in (True, False):
+        _header, decoded, decodedBlend = bw.decode(filepath, mm=memoryMap)
+
+        assert decoded.shape == weights.shape
+        assert not decoded.any()
+        assert decodedBlend is None
+
+def test_otherFilesAreRejected(bw, tmp_path):
+    filepath = tmp_path.joinpath('skin.xml')
+    filepath.write_bytes(b'<?xml version="1.0"?>' + b' ' * 32)
+
+    assert not bw.isBinaryWeightsFile(str(filepath))
+
+    with pytest.raises(ValueError):
+        bw.readHeader(str(filepath))
+
+def test_contentHashTracksContentAndOptions(bw):
+    header, weights, blendWeights = getExtracted()
+    options = {'binary': True, 'float16': False, 'weightTolerance': None}
+
+    base = bw.getContentHash(header, weights, blendWeights, options)
+
+    assert base == bw.getContentHash(
+        dict(header), weights.copy(), blendWeights.copy(), dict(options))
+
+    edited = weights.copy()
+    edited[0] = np.roll(edited[0], 1)
+
+    assert bw.getContentHash(
+        header, edited, blendWeights, options) != base
+
+    assert bw.getContentHash(
+        header, weights, blendWeights * 0.5, options) != base
+
+    assert bw.getContentHash(
+        dict(header, influences=header['influences'][::-1]),
+        weights, blendWeights, options) != base
+
+    assert bw.getContentHash(
+        header, weights, blendWeights,
+        dict(options, float16=True)) != base
+
+    # Informational keys aren't hashed
+    assert bw.getContentHash(
+        dict(header, arrays={}), weights, blendWeights, options) == base
+
+def test_manifestRoundTrip(bw, tmp_path):
+    dirPath = str(tmp_path)
+    assert bw.readManifest(dirPath) == {}
+
+    manifest = {'skinCluster1_on_body.pwb': {
+        'hash': 'abc', 'deformer': 'skinCluster1', 'shape': 'bodyShape',
+        'options': {'binary': True}}}
+
+    bw.writeManifest(dirPath, manifest)
+
+    assert bw.readManifest(dirPath) == manifest
+    assert os.listdir(dirPath) == [bw.manifestName]
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    BENCHMARK
+#----------------------------------------------------------|
+
+def benchmark(bw, numComponents=100000, numInfluences=120):
+    header, weights, blendWeights = getExtracted(
+        numComponents, numInfluences)
+
+    print("{} components, {} influences; dense float64: {:.1f} MB".format(
+        numComponents, numInfluences, weights.nbytes / 1e6))
+
+    with tempfile.TemporaryDirectory() as dirPath:
+        for float16 in (False, True):
+            filepath = os.path.join(dirPath, 'skin.pwb')
+
+            startTime = time.perf_counter()
+            bw.write(filepath, *bw.encode(header, weights, blendWeights,
+                                          f16=float16))
+            writeTime = time.perf_counter() - startTime
+
+            for memoryMap in (False, True):
+                startTime = time.perf_counter()
+                bw.decode(filepath, mm=memoryMap)
+                readTime = time.perf_counter() - startTime
+
+                print(("float16={}, memoryMap={}: {:.1f} MB on disk, "
+                       "encode+write {:.3f}s, read+decode {:.3f}s").format(
+                    float16, memoryMap, os.path.getsize(filepath) / 1e6,
+                    writeTime, readTime))
+
+if __name__ == '__main__':
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        benchmark(loadBinweights(monkeypatch))
@@ -0,0 +1,105 @@
+"""
+Tests for the delta array helpers in :mod:`paya.lib.bsnboltons`, against
+mocked ``getAttr`` / ``setAttr``. Needs NumPy; skipped otherwise.
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    FIXTURES
+#----------------------------------------------------------|
+
+class MockAttrs(dict):
+    def getAttr(self, plug):
+        return self.get(plug)
+
+    def setAttr(self, plug, size, *values, type=None):
+        assert size == len(values)
+        self[plug] = list(values)
+
+
+@pytest.fixture
+def attrs():
+    return MockAttrs()
+
+@pytest.fixture
+def bb(monkeymodules, attrs):
+    mock, load = monkeymodules
+
+    mock(
+        maya={},
+        maya_cmds={'about': lambda **kwargs: '2024',
+                   'getAttr': attrs.getAttr,
+                   'setAttr': attrs.setAttr},
+        maya_mel={'eval': lambda *args: None},
+        maya_api={},
+        maya_api_OpenMaya={},
+        pymel={},
+        pymel_core={},
+        pymel_util={},
+        paya_runtime={}
+    )
+
+    return load('lib.bsnboltons')
+
+item = 'bsn.inputTarget[0].inputTargetGroup[0].inputTargetItem[6000]'
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_compressRanges(bb):
+    assert list(bb._compressRanges(np.array([]))) == []
+    assert list(bb._compressRanges(np.array([4]))) == [(4, 4)]
+
+    assert list(bb._compressRanges(
+        np.array([0, 1, 2, 5, 7, 8, 10]))) == \
+           [(0, 2), (5, 5), (7, 8), (10, 10)]
+
+def test_readDeltas(bb, attrs):
+    attrs[item+'.inputPointsTarget'] = [
+        (0.1, 0.0, 0.0, 1.0), (0.2, 0.0, 0.0, 1.0),
+        (0.3, 0.0, 0.0, 1.0), (0.0, 0.5, 0.0, 1.0),
+        (0.0, 0.0, 0.7, 1.0)]
+
+    attrs[item+'.inputComponentsTarget'] = ['vtx[0:2]', 'vtx[5]',
+                                            'vtx[12]']
+
+    indices, deltas = bb._readDeltas(item)
+
+    assert indices.tolist() == [0, 1, 2, 5, 12]
+    assert deltas.shape == (5, 3)
+    assert deltas[3].tolist() == [0.0, 0.5, 0.0]
+    assert deltas[4].tolist() == [0.0, 0.0, 0.7]
+
+def test_readDeltasWhenEmpty(bb, attrs):
+    indices, deltas = bb._readDeltas(item)
+
+    assert indices.shape == (0,) and deltas.shape == (0, 3)
+
+def test_writeDeltasRoundTrip(bb, attrs):
+    indices = [9, 2, 3, 0, 4]
+    deltas = [[float(i), 0.0, 1.0] for i in indices]
+
+    bb._writeDeltas(item, indices, deltas, 'cv')
+
+    assert attrs[item+'.inputComponentsTarget'] == \
+           ['cv[0]', 'cv[2:4]', 'cv[9]']
+
+    readIndices, readDeltas = bb._readDeltas(item)
+
+    assert readIndices.tolist() == [0, 2, 3, 4, 9]
+    assert readDeltas[:, 0].tolist() == [0.0, 2.0, 3.0, 4.0, 9.0]
+
+def test_writeDeltasRejectsBadInput(bb, attrs):
+    with pytest.raises(ValueError):
+        bb._writeDeltas(item, [0, 1], [[0.0, 0.0, 0.0]], 'vtx')
+
+    # Would be written as overlapping components
+    with pytest.raises(ValueError):
+        bb._writeDeltas(item, [3, 1, 3],
+                        [[0.0, 0.0, 0.0]] * 3, 'vtx')
+
+    assert not attrs
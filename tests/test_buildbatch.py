@@ -0,0 +1,265 @@
+import re
+
+import pytest
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    MOCK SCENE
+#----------------------------------------------------------|
+
+class MockNode:
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.alive = True
+
+    def hasFn(self, fn):
+        return fn == 'kDagNode' and self.parent is not None
+
+    def fullPathName(self):
+        return '{}|{}'.format(self.parent, self.name)
+
+
+class MObjectHandle:
+    def __init__(self, mobj):
+        self.mobj = mobj
+
+    def isValid(self):
+        return self.mobj.alive
+
+    def object(self):
+        return self.mobj
+
+    def hashCode(self):
+        return id(self.mobj)
+
+
+class MockPyNode:
+    def __init__(self, mobj):
+        self.mobj = mobj
+
+    def __apimobject__(self):
+        return self.mobj
+
+
+class MockAttribute:
+    def __init__(self, node, attrName, mathDimension=1):
+        self.mockNode = node
+        self.attrName = attrName
+        self._mathDimension = mathDimension
+
+    def node(self):
+        return MockPyNode(self.mockNode)
+
+    def plugAttr(self, longName=False, fullPath=False):
+        return self.attrName
+
+    def mathDimension(self):
+        return self._mathDimension
+
+
+class Unit(float):
+    pass
+
+
+class Recorder:
+    def __init__(self):
+        self.scripts = []
+        self.warnings = []
+        self.undo = []
+
+
+@pytest.fixture
+def bb(monkeymodules):
+    mock, load = monkeymodules
+    recorder = Recorder()
+
+    def melEval(script):
+        recorder.scripts.append(script)
+        return re.findall(r'createNode -ss -n "([^"]+)"', script)
+
+    mock(
+        maya={},
+        maya_cmds={
+            'undoInfo': lambda **kwargs: recorder.undo.append(kwargs),
+            'warning': recorder.warnings.append
+        },
+        maya_mel={'eval': melEval},
+        maya_OpenMaya={
+            'MObjectHandle': MObjectHandle,
+            'MFn': type('MFn', (), {'kDagNode': 'kDagNode'}),
+            'MFnDagNode': lambda mobj: mobj,
+            'MFnDependencyNode': lambda mobj: type(
+                'MFnDependencyNode', (), {'name': lambda self: mobj.name})()
+        },
+        pymel={},
+        pymel_core={
+            'Attribute': MockAttribute,
+            'PyNode': lambda name: ('PyNode', name),
+            'datatypes': type('datatypes', (), {
+                'Unit': Unit,
+                'EulerRotation': type('EulerRotation', (list,), {}),
+                'Quaternion': type('Quaternion', (list,), {}),
+                'Vector': type('Vector', (list,), {}),
+                'Matrix': type('Matrix', (list,), {
+                    'flat': property(lambda self: list(self))})
+            })
+        }
+    )
+
+    module = load('lib.buildbatch')
+    module.BuildBatch.clear()
+    module.recorder = recorder
+
+    return module
+
+def getLines(script):
+    return [line for line in script.split('\n') if line]
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_operationsAreCommittedAsOneCallOnExit(bb):
+    a = MockNode('a')
+    b = MockNode('b')
+
+    with bb.BuildBatch():
+        assert bb.BuildBatch.queueConnection(
+            MockAttribute(a, 'output'), MockAttribute(b, 'input'))
+        assert bb.BuildBatch.queueSet(MockAttribute(b, 'factor'), 2.5)
+
+        assert bb.recorder.scripts == []
+
+    assert len(bb.recorder.scripts) == 1
+    assert getLines(bb.recorder.scripts[0]) == [
+        'connectAttr -f "a.output" "b.input";',
+        'setAttr "b.factor" 2.5;'
+    ]
+
+    assert bb.recorder.undo == [
+        {'openChunk': True, 'chunkName': 'BuildBatch'},
+        {'closeChunk': True}
+    ]
+
+def test_nothingIsQueuedOutsideBlocks(bb):
+    a = MockNode('a')
+
+    assert not bb.BuildBatch.queueConnection(
+        MockAttribute(a, 'output'), MockAttribute(a, 'input'))
+    assert not bb.BuildBatch.queueSet(MockAttribute(a, 'input'), 1)
+    assert bb.recorder.scripts == []
+
+def test_duplicateShortNamesResolveToTheirOwnNodes(bb):
+    left = MockNode('jnt', parent='|L_arm')
+    right = MockNode('jnt', parent='|R_arm')
+
+    with bb.BuildBatch():
+        bb.BuildBatch.queueSet(MockAttribute(right, 'tx'), 1)
+        bb.BuildBatch.queueSet(MockAttribute(left, 'tx'), 2)
+
+    assert getLines(bb.recorder.scripts[0]) == [
+        'setAttr "|R_arm|jnt.tx" 1;',
+        'setAttr "|L_arm|jnt.tx" 2;'
+    ]
+
+def test_renamesInsideTheBlockAreFollowed(bb):
+    node = MockNode('before')
+
+    with bb.BuildBatch():
+        bb.BuildBatch.queueSet(MockAttribute(node, 'tx'), 1)
+        node.name = 'after'
+
+    assert getLines(bb.recorder.scripts[0]) == ['setAttr "after.tx" 1;']
+
+def test_deletedNodesAreSkippedWithAWarning(bb):
+    a = MockNode('a')
+    b = MockNode('b')
+    c = MockNode('c')
+
+    with bb.BuildBatch():
+        bb.BuildBatch.queueConnection(
+            MockAttribute(a, 'output'), MockAttribute(b, 'input'))
+        bb.BuildBatch.queueSet(MockAttribute(b, 'factor'), 3)
+        bb.BuildBatch.queueConnection(
+            MockAttribute(a, 'output'), MockAttribute(c, 'input'))
+
+        b.alive = False
+
+    assert getLines(bb.recorder.scripts[0]) == [
+        'connectAttr -f "a.output" "c.input";'
+    ]
+
+    assert len(bb.recorder.warnings) == 1
+    assert 'skipped 2' in bb.recorder.warnings[0]
+
+def test_queueIsCommittedAtChunkSize(bb, monkeypatch):
+    monkeypatch.setattr(bb.BuildBatch, 'chunkSize', 2)
+    node = MockNode('a')
+
+    with bb.BuildBatch():
+        for i in range(5):
+            bb.BuildBatch.queueSet(MockAttribute(node, 'tx'), i)
+
+        assert len(bb.recorder.scripts) == 2
+
+    assert len(bb.recorder.scripts) == 3
+    assert getLines(bb.recorder.scripts[-1]) == ['setAttr "a.tx" 4;']
+
+def test_nestedBlocksCommitOnOutermostExit(bb):
+    node = MockNode('a')
+
+    with bb.BuildBatch():
+        with bb.BuildBatch():
+            bb.BuildBatch.queueSet(MockAttribute(node, 'tx'), 1)
+
+        assert bb.recorder.scripts == []
+
+    assert len(bb.recorder.scripts) == 1
+    assert len(bb.recorder.undo) == 2
+
+def test_errorsDiscardTheQueue(bb):
+    node = MockNode('a')
+
+    with pytest.raises(ValueError):
+        with bb.BuildBatch():
+            bb.BuildBatch.queueSet(MockAttribute(node, 'tx'), 1)
+            raise ValueError
+
+    assert bb.recorder.scripts == []
+    assert bb.recorder.undo[-1] == {'closeChunk': True}
+    assert not bb.BuildBatch.__queue__
+
+def test_unbatchableSetsFlushPendingOperations(bb):
+    node = MockNode('a')
+
+    with bb.BuildBatch():
+        bb.BuildBatch.queueSet(MockAttribute(node, 'tx'), 1)
+
+        assert not bb.BuildBatch.queueSet(
+            MockAttribute(node, 'name'), 'text')
+
+        assert len(bb.recorder.scripts) == 1
+
+def test_formatSetAttrArgs(bb):
+    Vector = bb.p.datatypes.Vector
+    Matrix = bb.p.datatypes.Matrix
+
+    assert bb.formatSetAttrArgs(2, 1) == '2'
+    assert bb.formatSetAttrArgs(0.5, 1) == '0.5'
+    assert bb.formatSetAttrArgs(Unit(1.0), 1) is None
+    assert bb.formatSetAttrArgs(Vector([1, 2, 3]), 3) == '1.0 2.0 3.0'
+    assert bb.formatSetAttrArgs([1, 2], 3) is None
+    assert bb.formatSetAttrArgs(
+        bb.p.datatypes.EulerRotation([0, 0, 0]), 3) is None
+    assert bb.formatSetAttrArgs(list(range(16)), 16).startswith(
+        '-type "matrix" 0.0 1.0')
+    assert bb.formatSetAttrArgs(Matrix([1.0] * 16), 16).startswith(
+        '-type "matrix" 1.0')
+    assert bb.formatSetAttrArgs(Matrix(['x'] * 16), 16) is None
+
+def test_createNodesUsesOneCall(bb):
+    nodes = bb.createNodes('multiplyDivide', ['a_MD', 'b_MD'])
+
+    assert nodes == [('PyNode', 'a_MD'), ('PyNode', 'b_MD')]
+    assert len(bb.recorder.scripts) == 1
+    assert bb.createNodes('multiplyDivide', []) == []
@@ -0,0 +1,175 @@
+import pytest
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    MOCK SCENE
+#----------------------------------------------------------|
+
+class MockNode:
+    # Deformers have a list of outputs; other nodes have None
+    def __init__(self, name, outputs=None):
+        self.name = name
+        self.outputs = outputs
+        self.alive = True
+
+
+class MObjectHandle:
+    def __init__(self, mobj):
+        self.mobj = mobj
+
+    def isValid(self):
+        return self.mobj.alive
+
+    def object(self):
+        return self.mobj
+
+    def hashCode(self):
+        return id(self.mobj)
+
+
+class MockScene:
+    def __init__(self):
+        self.nodes = {}
+        self.callbacks = {}
+        self.numScans = 0
+
+    def add(self, node):
+        self.nodes[node.name] = node
+        self._notify('added', node)
+
+        return node
+
+    def delete(self, node):
+        self._notify('removed', node)
+        node.alive = False
+        del self.nodes[node.name]
+
+    def _notify(self, key, node):
+        if node.outputs is not None:
+            for callback in self.callbacks.get(key, []):
+                callback(node)
+
+
+@pytest.fixture
+def scene():
+    return MockScene()
+
+@pytest.fixture
+def di(monkeymodules, scene):
+    mock, load = monkeymodules
+
+    class MItDependencyNodes:
+        def __init__(self, fn):
+            scene.numScans += 1
+            self.nodes = [node for node in scene.nodes.values() \
+                          if node.outputs is not None]
+
+        def isDone(self):
+            return not self.nodes
+
+        def thisNode(self):
+            return self.nodes[0]
+
+        def next(self):
+            self.nodes.pop(0)
+
+    class MSelectionList:
+        def add(self, name):
+            self.node = scene.nodes[name]
+
+        def getDependNode(self, index):
+            return self.node
+
+    def addCallback(key):
+        def add(callback, typeName):
+            scene.callbacks.setdefault(key, []).append(callback)
+            return (key, callback)
+
+        return add
+
+    def removeCallbacks(callbacks):
+        for key, callback in callbacks:
+            scene.callbacks[key].remove(callback)
+
+    mock(
+        maya={},
+        maya_cmds={},
+        maya_api={},
+        maya_api_OpenMaya={
+            'MObjectHandle': MObjectHandle,
+            'MSelectionList': MSelectionList,
+            'MItDependencyNodes': MItDependencyNodes,
+            'MFn': type('MFn', (), {'kGeometryFilt': 'kGeometryFilt'}),
+            'MFnDependencyNode': lambda mobj: type(
+                'MFnDependencyNode', (), {'name': lambda self: mobj.name,
+                                          'typeName': 'skinCluster'})(),
+            'MDagPath': type('MDagPath', (), {
+                'getAPathTo': staticmethod(lambda mobj: type(
+                    'MDagPath', (), {
+                        'fullPathName': lambda self: '|'+mobj.name})())}),
+            'MDGMessage': type('MDGMessage', (), {
+                'addNodeAddedCallback': staticmethod(addCallback('added')),
+                'addNodeRemovedCallback': staticmethod(
+                    addCallback('removed'))}),
+            'MMessage': type('MMessage', (), {
+                'removeCallbacks': staticmethod(removeCallbacks)})
+        },
+        maya_api_OpenMayaAnim={
+            'MFnGeometryFilter': lambda mobj: type(
+                'MFnGeometryFilter', (), {
+                    'getOutputGeometry': lambda self: list(mobj.outputs)})()
+        }
+    )
+
+    return load('lib.deformerindex')
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_lookupsOutsideBlocksRebuild(di, scene):
+    shape = scene.add(MockNode('bodyShape'))
+    scene.add(MockNode('skin1', outputs=[shape]))
+
+    assert di.DeformerIndex.get().getDeformers('bodyShape') == ['skin1']
+    assert di.DeformerIndex.get().getDeformers('bodyShape') == ['skin1']
+    assert scene.numScans == 2
+
+def test_replacingDeformersDoesntRescan(di, scene):
+    shapes = [scene.add(MockNode('shape{}'.format(i))) \
+              for i in range(5)]
+
+    skins = [scene.add(MockNode('skin{}'.format(i), outputs=[shape])) \
+             for i, shape in enumerate(shapes)]
+
+    with di.DeformerIndex() as index:
+        for i, shape in enumerate(shapes):
+            assert index.getDeformers(shape.name) == [skins[i].name]
+
+            scene.delete(skins[i])
+            assert index.getDeformers(shape.name) == []
+
+            # Created first, hooked up afterwards
+            newSkin = scene.add(MockNode('newSkin{}'.format(i), outputs=[]))
+            assert index.getDeformers(shape.name) == []
+
+            newSkin.outputs.append(shape)
+            assert index.getDeformers(shape.name) == [newSkin.name]
+            assert index.getShapes(newSkin.name) == ['|'+shape.name]
+
+    assert scene.numScans == 1
+    assert scene.callbacks == {'added': [], 'removed': []}
+
+def test_invalidateRescans(di, scene):
+    shape = scene.add(MockNode('bodyShape'))
+    skin = scene.add(MockNode('skin1', outputs=[]))
+
+    with di.DeformerIndex() as index:
+        assert index.getShapes('skin1') == []
+
+        # Membership edit on an existing deformer
+        skin.outputs.append(shape)
+        di.DeformerIndex.invalidate()
+
+        assert index.getShapes('skin1') == ['|bodyShape']
+
+    assert scene.numScans == 2
@@ -0,0 +1,331 @@
+"""
+Tests for :mod:`paya.lib.evalgraph`, including a randomized parity check
+against :class:`ReferenceGraph`, a direct transcription of the original,
+recursive implementation. Run this file directly for a benchmark on
+generated graphs.
+"""
+
+import sys
+import time
+import random
+
+import pytest
+
+from conftest import mockModules, loadPayaModule
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    REFERENCE
+#----------------------------------------------------------|
+
+class ReferenceGraph:
+    # The original EvalGraph algorithms, minus error handling
+    def __init__(self, dct):
+        self._dct = dct
+        self._nodes = []
+
+        for node, inputs in dct.items():
+            for item in inputs + [node]:
+                if item not in self._nodes:
+                    self._nodes.append(item)
+
+        allInputs = set()
+
+        for node in self._nodes:
+            allInputs.update(dct.get(node, []))
+
+        self.startNodes = [node for node in self._nodes \
+                           if not dct.get(node)]
+        self.endNodes = [node for node in self._nodes \
+                         if node not in allInputs]
+        self.orphanNodes = [node for node in self._nodes \
+                            if node in self.startNodes \
+                            and node in self.endNodes]
+
+    def nodes(self):
+        return self._nodes
+
+    def getNodeInputs(self, node):
+        return self._dct.get(node, [])
+
+    def getNodeOutputs(self, node):
+        return [_node for _node in self._nodes \
+                if node in self._dct.get(_node, [])]
+
+    def getNodesUpstreamOf(self, node):
+        out = []
+
+        def _trace(_node):
+            if _node not in out:
+                for input in self.getNodeInputs(_node):
+                    _trace(input)
+
+                if _node != node:
+                    out.append(_node)
+
+        _trace(node)
+        return out
+
+    def getNodesDownstreamOf(self, node):
+        out = []
+
+        def _trace(_node):
+            if _node not in out:
+                if _node != node:
+                    out.append(_node)
+
+                for output in self.getNodeOutputs(_node):
+                    _trace(output)
+
+        _trace(node)
+        return out
+
+    def cycleCheck(self):
+        # Walks every path from every node; only used by the benchmark
+        for node in self._nodes:
+            def _trace(_node, callers):
+                if _node in callers:
+                    raise RuntimeError(
+                        "Node visited more than once: {}".format(_node))
+
+                for output in self.getNodeOutputs(_node):
+                    _trace(output, callers+[_node])
+
+            _trace(node, [])
+
+    def hasPath(self, start, end):
+        return start == end or end in self.getNodesDownstreamOf(start)
+
+    def reduceTargetList(self, targets):
+        targets = list(dict.fromkeys(targets))
+        upstreamMap = {target: self.getNodesUpstreamOf(target) \
+                       for target in targets}
+
+        return [target for target in targets if not any(
+            target in upstreamMap[other] for other in targets)]
+
+    def getBuildSequence(self, targets=None):
+        targets = self.reduceTargetList(targets) \
+            if targets else self.endNodes
+
+        fullSequence = []
+
+        for target in targets:
+            thisSequence = []
+
+            def _trace(_node):
+                if _node not in fullSequence:
+                    if _node not in thisSequence:
+                        for input in self.getNodeInputs(_node):
+                            _trace(input)
+
+                    thisSequence.append(_node)
+
+            _trace(target)
+            fullSequence += thisSequence
+
+        return fullSequence
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    FIXTURES
+#----------------------------------------------------------|
+
+def expandArgs(*args):
+    out = []
+
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            out += expandArgs(*arg)
+
+        else:
+            out.append(arg)
+
+    return out
+
+def loadEvalgraph(monkeypatch):
+    mockModules(monkeypatch,
+                pymel={},
+                pymel_core={},
+                pymel_util={'expandArgs': expandArgs})
+
+    return loadPayaModule(monkeypatch, 'lib.evalgraph')
+
+@pytest.fixture
+def eg(monkeypatch):
+    return loadEvalgraph(monkeypatch)
+
+def getRandomDAG(rng, numNodes, maxInputs=3):
+    # Inputs are drawn from earlier nodes only, so there are no cycles;
+    # names and key order are shuffled so that node order isn't
+    # topological
+    names = ['n{}'.format(i) for i in range(numNodes)]
+    rng.shuffle(names)
+    dct = {}
+
+    for i, name in enumerate(names):
+        inputs = rng.sample(names[:i], rng.randint(0, min(i, maxInputs)))
+
+        if inputs or rng.random() < 0.5:
+            dct[name] = inputs
+
+    keys = list(dct)
+    rng.shuffle(keys)
+
+    return {key: dct[key] for key in keys}
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_docstringExample(eg):
+    graph = eg.EvalGraph.fromSegments([['A', 'C', 'D', 'G'],
+                                       ['B', 'C', 'E', 'H'],
+                                       ['E', 'F', 'G']])
+
+    assert list(graph) == ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
+
+def test_parityWithReference(eg):
+    rng = random.Random(3)
+
+    for trial in range(300):
+        dct = getRandomDAG(rng, rng.randint(1, 25))
+
+        if not dct:
+            continue
+
+        ref = ReferenceGraph(dct)
+        graph = eg.EvalGraph(dct)
+        nodes = ref.nodes()
+
+        assert graph.nodes() == nodes
+        assert graph.nodes(st=True) == ref.startNodes
+        assert graph.nodes(et=True) == ref.endNodes
+        assert graph.nodes(o=True) == ref.orphanNodes
+
+        for node in nodes:
+            assert graph.getNodeInputs(node) == ref.getNodeInputs(node)
+            assert graph.getNodeOutputs(node) == ref.getNodeOutputs(node)
+            assert graph.getNodesUpstreamOf(node) == \
+                   ref.getNodesUpstreamOf(node)
+            assert graph.getNodesDownstreamOf(node) == \
+                   ref.getNodesDownstreamOf(node)
+
+            for end in rng.sample(nodes, min(3, len(nodes))):
+                if ref.hasPath(node, end):
+                    path = graph.getPath(node, end)
+
+                    assert path[0] == node and path[-1] == end
+                    assert all(b in graph.getNodeOutputs(a) \
+                               for a, b in zip(path, path[1:]))
+
+                else:
+                    with pytest.raises(eg.NoPathError):
+                        graph.getPath(node, end)
+
+        targets = rng.sample(nodes, min(4, len(nodes)))
+
+        assert graph.reduceTargetList(targets) == \
+               ref.reduceTargetList(targets)
+
+        # The reference can repeat shared inputs; order is otherwise
+        # unchanged
+        for _targets in (targets, None):
+            expected = list(dict.fromkeys(ref.getBuildSequence(_targets)))
+            assert graph.getBuildSequence(_targets) == expected
+
+def test_buildSequenceDoesntRepeatSharedInputs(eg):
+    segments = [['A', 'B', 'D'], ['A', 'C', 'D']]
+
+    assert ReferenceGraph(eg.EvalGraph.fromSegments(
+        segments)._dct).getBuildSequence() == ['A', 'B', 'A', 'C', 'D']
+
+    graph = eg.EvalGraph.fromSegments(segments)
+    assert graph.getBuildSequence() == ['A', 'B', 'C', 'D']
+
+def test_getPathReturnsAShortestPath(eg):
+    graph = eg.EvalGraph.fromSegments([['A', 'B', 'C', 'D'],
+                                       ['A', 'D']])
+
+    assert graph.getPath('A', 'D') == ['A', 'D']
+    assert graph.getPath('B', 'D') == ['B', 'C', 'D']
+    assert graph.getPath('C', 'C') == ['C']
+
+    with pytest.raises(eg.NoPathError):
+        graph.getPath('D', 'A')
+
+def test_cyclesAreReported(eg):
+    with pytest.raises(eg.CycleError) as info:
+        eg.EvalGraph.fromSegments([['root', 'a', 'b', 'c', 'a'],
+                                   ['x', 'y']])
+
+    message = str(info.value)
+    assert 'a -> b -> c -> a' in message
+    assert 'root' not in message and 'x' not in message
+
+def test_separateCyclesAndSelfLoopsAreAllReported(eg):
+    with pytest.raises(eg.CycleError) as info:
+        eg.EvalGraph({'a': ['b'], 'b': ['a'], 'c': ['c'], 'd': []})
+
+    message = str(info.value)
+    assert 'c -> c' in message
+    assert ('a -> b -> a' in message) or ('b -> a -> b' in message)
+
+def test_deepChainsDontHitTheRecursionLimit(eg):
+    numNodes = sys.getrecursionlimit() * 2
+    graph = eg.EvalGraph.fromSegments(
+        [['n{}'.format(i) for i in range(numNodes)]])
+
+    assert len(graph.getBuildSequence()) == numNodes
+    assert len(graph.getNodesDownstreamOf('n0')) == numNodes-1
+
+def test_missingNodesRaise(eg):
+    graph = eg.EvalGraph.fromSegments([['A', 'B']])
+
+    with pytest.raises(eg.NonexistentNodeError):
+        graph.getNodesUpstreamOf('C')
+
+    with pytest.raises(eg.NonexistentNodeError):
+        graph.getBuildSequence(['C'])
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    BENCHMARK
+#----------------------------------------------------------|
+
+def benchmark(eg, numNodes=5000, referenceNodes=500):
+    rng = random.Random(0)
+
+    def run(cls, dct):
+        startTime = time.perf_counter()
+        graph = cls(dct)
+
+        if cls is ReferenceGraph:
+            graph.cycleCheck()
+
+        buildTime = time.perf_counter()
+        graph.getBuildSequence()
+        sequenceTime = time.perf_counter()
+
+        for node in graph.nodes()[:200]:
+            graph.getNodesUpstreamOf(node)
+
+        upstreamTime = time.perf_counter()
+
+        return (buildTime-startTime,
+                sequenceTime-buildTime,
+                upstreamTime-sequenceTime)
+
+    template = ("{:>9} {:>6} nodes: init {:.3f}s, getBuildSequence "
+                "{:.3f}s, 200 x getNodesUpstreamOf {:.3f}s")
+
+    dct = getRandomDAG(rng, referenceNodes)
+    print(template.format('reference', referenceNodes,
+                          *run(ReferenceGraph, dct)))
+    print(template.format('EvalGraph', referenceNodes,
+                          *run(eg.EvalGraph, dct)))
+
+    dct = getRandomDAG(rng, numNodes)
+    print(template.format('EvalGraph', numNodes,
+                          *run(eg.EvalGraph, dct)))
+
+if __name__ == '__main__':
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        benchmark(loadEvalgraph(monkeypatch))
@@ -0,0 +1,181 @@
+"""
+Tests for :class:`paya.lib.mathops.FoldConstants`, against mock plugs
+whose ``+`` and ``*`` operators create nodes in a mock scene.
+"""
+
+import types
+
+import pytest
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    MOCK SCENE
+#----------------------------------------------------------|
+
+class MockNode:
+    def __init__(self, scene, name):
+        self.scene = scene
+        self.name = name
+
+    def __str__(self):
+        return self.name
+
+    def exists(self):
+        return self.name in self.scene.nodes
+
+
+class MockScene:
+    def __init__(self, mo):
+        self.mo = mo
+        self.nodes = {}
+        self.connected = set()
+
+    def createNode(self):
+        node = MockNode(self, 'node{}'.format(len(self.nodes)+1))
+        self.nodes[node.name] = node
+
+        return node
+
+    def listConnections(self, node, s=True, d=True):
+        return ['downstream'] if node in self.connected else []
+
+    def delete(self, names):
+        for name in names:
+            del(self.nodes[name])
+
+
+class Plug:
+    def __init__(self, node, attrName, input=None, value=None):
+        self._node = node
+        self.attrName = attrName
+        self.input = input
+        self.value = value
+
+    def node(self):
+        return self._node
+
+    def inputs(self, plugs=False):
+        return [] if self.input is None else [self.input]
+
+    def isConnected(self):
+        return self.input is not None
+
+    def get(self):
+        return self.value
+
+    def _operate(self, operation, constant):
+        mo = self._node.scene.mo
+        folded = mo.foldScalarOperation(self, operation, constant)
+
+        if folded is not None:
+            return folded
+
+        node = self._node.scene.createNode()
+        output = Plug(node, 'output')
+
+        mo.recordFoldableOutput(output, operation, self, constant,
+                                Plug(node, 'input1', input=self),
+                                Plug(node, 'input2', value=constant))
+
+        return output
+
+    def __add__(self, constant):
+        return self._operate('add', constant)
+
+    def __mul__(self, constant):
+        return self._operate('mul', constant)
+
+
+@pytest.fixture
+def mo(monkeymodules, monkeypatch):
+    mock, load = monkeymodules
+
+    datatypes = types.SimpleNamespace(
+        **{name: type(name, (list,), {}) for name in [
+            'Vector', 'Point', 'Matrix', 'EulerRotation',
+            'Quaternion', 'Array']},
+        Unit=type('Unit', (float,), {}))
+
+    mock(
+        maya={},
+        maya_cmds={'about': lambda **kwargs: '2024'},
+        maya_OpenMaya={},
+        maya_api={},
+        maya_api_OpenMaya={},
+        pymel={},
+        pymel_core={'datatypes': datatypes},
+        pymel_util={},
+        paya_runtime={}
+    )
+
+    module = load('lib.mathops')
+    monkeypatch.setattr(module._nr, 'getOperandKey',
+                        lambda item: (str(item.node()), item.attrName))
+
+    return module
+
+@pytest.fixture
+def scene(mo, monkeypatch):
+    scene = MockScene(mo)
+
+    monkeypatch.setattr(mo.m, 'listConnections',
+                        scene.listConnections, raising=False)
+    monkeypatch.setattr(mo.m, 'delete', scene.delete, raising=False)
+
+    return scene
+
+@pytest.fixture
+def plug(scene):
+    return Plug(scene.createNode(), 'output')
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_foldingIsOptIn(mo, scene, plug):
+    assert len(scene.nodes) == 1
+    assert (plug * 1) is not plug
+    assert len(scene.nodes) == 2
+
+def test_chainsCollapse(mo, scene, plug):
+    with mo.FoldConstants():
+        assert (plug * 1) is plug
+        assert (plug + 0.0) is plug
+        assert (plug * 2 * 0.5) is plug
+
+        total = plug + 1.0 + 2.0
+        assert total.input is None
+        assert scene.nodes[str(total.node())]
+
+    assert not mo.FoldConstants.__records__
+
+def test_intermediateNodesAreKeptByDefault(mo, scene, plug):
+    with mo.FoldConstants():
+        doubled = plug * 2
+        assert (doubled * 0.5) is plug
+
+    # The caller still holds 'doubled'
+    assert doubled.node().exists()
+
+def test_deadNodesAreRemovedOnRequest(mo, scene, plug):
+    with mo.FoldConstants(rdn=True):
+        assert (plug * 2 * 0.5) is plug
+
+        connected = plug + 1.0
+        scene.connected.add(str(connected.node()))
+        assert (connected + -1.0) is plug
+
+    assert connected.node().exists()
+    assert list(scene.nodes) == [str(plug.node()), str(connected.node())]
+
+def test_onlyNodesCreatedInTheBlockAreRemoved(mo, scene, plug):
+    with mo.FoldConstants():
+        doubled = plug * 2
+
+        with mo.FoldConstants(removeDeadNodes=True):
+            assert (doubled * 0.5) is plug
+
+            tripled = plug * 3
+            assert (tripled * 2) is not tripled
+
+        assert doubled.node().exists()
+        assert not tripled.node().exists()
@@ -0,0 +1,164 @@
+"""
+Tests for the arc-length table cache keys in :mod:`paya.lib.nurbsutil`,
+against a mock curve function set that counts full data reads.
+"""
+
+import pytest
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    MOCK API
+#----------------------------------------------------------|
+
+class MockArray(list):
+    def length(self):
+        return len(self)
+
+
+class MockPoint:
+    def __init__(self, x, y, z, w=1.0):
+        self.x, self.y, self.z, self.w = x, y, z, w
+
+
+class MockData:
+    # Stands in for a curve data MObject; edits happen in place
+    def __init__(self, cvs, knots, degree=1):
+        self.cvs = cvs
+        self.knots = knots
+        self.degree = degree
+        self.alive = True
+
+
+class MObjectHandle:
+    def __init__(self, data):
+        self.data = data
+
+    def hashCode(self):
+        return id(self.data)
+
+    def isValid(self):
+        return self.data.alive
+
+
+class MockMFn:
+    numReads = 0
+
+    def __init__(self, data):
+        self.data = data
+
+    def object(self):
+        return self.data
+
+    def degree(self):
+        return self.data.degree
+
+    def form(self):
+        return 1
+
+    def numCVs(self):
+        return len(self.data.cvs)
+
+    def numKnots(self):
+        return len(self.data.knots)
+
+    def getKnots(self, arr):
+        arr.extend(self.data.knots)
+
+    def getCVs(self, arr, space):
+        type(self).numReads += 1
+        arr.extend([MockPoint(*cv) for cv in self.data.cvs])
+
+    def length(self):
+        cvs = self.data.cvs
+
+        return sum(sum((a-b)**2 for a, b in zip(p, q)) ** 0.5 \
+                   for p, q in zip(cvs, cvs[1:]))
+
+    def findParamFromLength(self, length):
+        # Good enough to tell reparameterizations apart
+        return length / max(self.length(), 1e-10) * self.data.knots[-1]
+
+
+class MockTable:
+    defaultTolerance = 1e-5
+
+    def __init__(self, mfn, tolerance=None):
+        self.tolerance = tolerance
+
+
+@pytest.fixture
+def nu(monkeymodules):
+    mock, load = monkeymodules
+
+    mock(
+        maya={},
+        maya_OpenMaya={
+            'MObjectHandle': MObjectHandle,
+            'MDoubleArray': MockArray,
+            'MPointArray': MockArray,
+            'MSpace': type('MSpace', (), {'kObject': 'kObject'})
+        },
+        paya_runtime={}
+    )
+
+    module = load('lib.nurbsutil')
+    MockMFn.numReads = 0
+
+    return module
+
+def getData(height=2.0):
+    return MockData([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0),
+                     (1.0, height, 0.0)], [0.0, 1.0, 2.0])
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_hashesAreContentDigests(nu):
+    a = nu.getCurveDataHash(MockMFn(getData()))
+    b = nu.getCurveDataHash(MockMFn(getData()))
+    c = nu.getCurveDataHash(MockMFn(getData(height=2.5)))
+
+    assert a == b != c
+    assert isinstance(a, str) and len(a) == 40
+
+def test_tablesAreSharedByIdenticalGeometry(nu, monkeypatch):
+    monkeypatch.setattr(nu, 'ArcLengthTable', MockTable)
+    nu.clearArcLengthTables()
+
+    first = nu.getArcLengthTable(MockMFn(getData()))
+
+    assert nu.getArcLengthTable(MockMFn(getData())) is first
+    assert nu.getArcLengthTable(MockMFn(getData(height=2.5))) is not first
+    assert nu.getArcLengthTable(
+        MockMFn(getData()), tolerance=1e-3) is not first
+
+def test_unchangedDataIsntReread(nu, monkeypatch):
+    monkeypatch.setattr(nu, 'ArcLengthTable', MockTable)
+    nu.clearArcLengthTables()
+
+    data = getData()
+
+    for _ in range(20):
+        table = nu.getArcLengthTable(MockMFn(data))
+
+    assert MockMFn.numReads == 1
+
+    # Edited in place
+    data.cvs[2] = (1.0, 3.0, 0.0)
+    edited = nu.getArcLengthTable(MockMFn(data))
+
+    assert MockMFn.numReads == 2
+    assert edited is not table
+
+    # Reparameterized in place, at the same length
+    data.knots[:] = [0.0, 1.0, 4.0]
+    assert nu.getArcLengthTable(MockMFn(data)) is not edited
+    assert MockMFn.numReads == 3
+
+    # Released
+    data.alive = False
+    nu.getArcLengthTable(MockMFn(data))
+    assert MockMFn.numReads == 4
+
+    nu.clearArcLengthTables()
+    assert not nu._curveDataHashes
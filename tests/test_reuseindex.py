@@ -0,0 +1,171 @@
+"""
+Tests for :class:`paya.lib.reuseindex.SampleIndex`, against a mock scene
+that counts the per-sample work done by signature checks and scans. Run
+this file directly for a benchmark.
+"""
+
+import pytest
+
+from conftest import mockModules, loadPayaModule
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    MOCK SCENE
+#----------------------------------------------------------|
+
+class MockSample:
+    def __init__(self, scene, key):
+        self.scene = scene
+        self.key = key
+
+    def exists(self):
+        return self in self.scene.samples
+
+
+class MockScene:
+    def __init__(self):
+        self.samples = []
+        self.work = 0
+
+    def create(self, key):
+        sample = MockSample(self, key)
+        self.samples.append(sample)
+
+        return sample
+
+    def delete(self, sample):
+        self.samples.remove(sample)
+
+    def listEntries(self, owner):
+        self.work += len(self.samples)
+        return [(sample.key, sample) for sample in self.samples]
+
+    def getSignature(self, owner):
+        # Like countOutputs(), proportional to the number of samples
+        self.work += len(self.samples)
+        return len(self.samples)
+
+
+def loadReuseindex(monkeypatch):
+    mockModules(
+        monkeypatch,
+        maya={},
+        maya_cmds={'about': lambda **kwargs: '2024'},
+        maya_mel={},
+        maya_OpenMaya={},
+        pymel={},
+        pymel_core={'Attribute': type('Attribute', (), {})}
+    )
+
+    module = loadPayaModule(monkeypatch, 'lib.reuseindex')
+    monkeypatch.setattr(module, 'getOwnerKey', lambda owner: owner)
+
+    return module
+
+@pytest.fixture
+def ri(monkeypatch):
+    return loadReuseindex(monkeypatch)
+
+@pytest.fixture
+def scene():
+    return MockScene()
+
+def getIndex(ri, scene):
+    return ri.SampleIndex(scene.listEntries, lambda sample: sample.key,
+                          getSignature=scene.getSignature)
+
+def findOrCreate(index, scene, key):
+    sample = index.find('curve', key)
+
+    if sample is None:
+        sample = scene.create(key)
+        index.add('curve', key, sample)
+
+    return sample
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_samplesAreReused(ri, scene):
+    index = getIndex(ri, scene)
+    samples = [findOrCreate(index, scene, float(i)) for i in range(10)]
+
+    assert [findOrCreate(index, scene, float(i)) \
+            for i in range(10)] == samples
+
+    assert len(scene.samples) == 10
+
+def test_workIsLinear(ri, scene):
+    index = getIndex(ri, scene)
+
+    for i in range(2000):
+        findOrCreate(index, scene, float(i))
+
+    # A signature and a scan every len(index) * checkRatio misses; it
+    # used to be two signatures per sample, i.e. quadratic
+    assert scene.work < 2000 * 25
+
+def test_externalSamplesAreFound(ri, scene):
+    index = getIndex(ri, scene)
+    findOrCreate(index, scene, 0.0)
+
+    external = scene.create(1.0)
+    assert index.find('curve', 1.0) is external
+
+def test_externalSamplesAreFoundAfterAFewMisses(ri, scene):
+    index = getIndex(ri, scene)
+
+    for i in range(80):
+        findOrCreate(index, scene, float(i))
+
+    external = scene.create(-1.0)
+    numMisses = 0
+
+    while index.find('curve', -1.0) is None:
+        numMisses += 1
+
+    assert numMisses <= 80 * index.checkRatio
+
+def test_deletedSamplesAreDropped(ri, scene):
+    index = getIndex(ri, scene)
+    sample = findOrCreate(index, scene, 0.0)
+
+    scene.delete(sample)
+    assert index.find('curve', 0.0) is None
+
+    assert findOrCreate(index, scene, 0.0) is not sample
+
+def test_clearRescans(ri, scene):
+    index = getIndex(ri, scene)
+    findOrCreate(index, scene, 0.0)
+
+    external = scene.create(1.0)
+    ri.clearAll()
+
+    scene.work = 0
+    assert index.find('curve', 1.0) is external
+    assert scene.work == 4
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    BENCHMARK
+#----------------------------------------------------------|
+
+def benchmark(monkeypatch, numSamples=(1000, 4000)):
+    ri = loadReuseindex(monkeypatch)
+
+    for num in numSamples:
+        scene = MockScene()
+        index = getIndex(ri, scene)
+
+        for i in range(num):
+            findOrCreate(index, scene, float(i))
+
+        # Previously, a signature per miss and per add
+        previous = sum(range(num)) + sum(range(1, num+1))
+
+        print(("{} samples: {} units of per-sample scene work, "
+               "vs {} before").format(num, scene.work, previous))
+
+if __name__ == '__main__':
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        benchmark(monkeypatch)
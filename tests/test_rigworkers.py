@@ -0,0 +1,166 @@
+import os
+import sys
+import types
+
+import pytest
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    FIXTURES
+#----------------------------------------------------------|
+
+class MockRuntime:
+    def __init__(self):
+        self.active = False
+
+    def __enter__(self):
+        self.active = True
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.active = False
+        return False
+
+
+@pytest.fixture
+def rig(monkeymodules):
+    mock, load = monkeymodules
+
+    mock(
+        maya={},
+        maya_cmds={},
+        maya_api={},
+        maya_api_OpenMaya={},
+        pymel={},
+        pymel_core={},
+        pymel_util={'expandArgs': lambda *args: list(args)}
+    )
+
+    return load('rigtypes.rig.rig')
+
+def getWorkerStages(rig, segments, stages=None):
+    class TestRig(rig.Rig):
+        __graph__ = segments
+
+    if stages is None:
+        stages = list(TestRig.getBuildGraph().getBuildSequence())
+
+    return TestRig._getWorkerStages(stages)
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_workerBuildsInsideTheRuntime(rig, monkeypatch):
+    runtime = MockRuntime()
+    calls = []
+
+    class WorkerRig:
+        @classmethod
+        def _buildStage(cls, stageName, stageHash):
+            calls.append(('build', stageName, stageHash, runtime.active))
+
+        @classmethod
+        def flushSnapshots(cls):
+            calls.append(('flush', runtime.active))
+
+    maya = sys.modules['maya']
+    maya.standalone = types.SimpleNamespace(
+        initialize=lambda **kwargs: calls.append(('initialize',)))
+    monkeypatch.setitem(sys.modules, 'maya.standalone', maya.standalone)
+    sys.modules['maya.cmds'].workspace = \
+        lambda *args, **kwargs: calls.append(('workspace',) + args)
+
+    monkeypatch.setitem(sys.modules, 'paya.runtime', runtime)
+    monkeypatch.setattr(sys.modules['paya'], 'runtime', runtime,
+                        raising=False)
+
+    module = types.ModuleType('workerrig')
+    module.WorkerRig = WorkerRig
+    monkeypatch.setitem(sys.modules, 'workerrig', module)
+
+    monkeypatch.setattr(sys, 'argv', ['-c', '/project', 'workerrig',
+                                      'WorkerRig', 'bind', 'abc123'])
+
+    exec(rig._workerScript, {'__name__': '__main__'})
+
+    assert calls == [
+        ('initialize',),
+        ('workspace', '/project'),
+        ('build', 'bind', 'abc123', True),
+        ('flush', True)
+    ]
+
+    assert not runtime.active
+
+def test_chainsStaySerial(rig):
+    assert getWorkerStages(rig, [['a', 'b', 'c']]) == ([], [])
+
+def test_branchesGoToWorkersAfterTheirRoot(rig):
+    segments = [['root', 'l1', 'l2', 'merge'],
+                ['root', 'r1', 'merge']]
+
+    workerStages, prerequisites = getWorkerStages(rig, segments)
+
+    assert sorted(workerStages) == ['l1', 'l2', 'r1']
+    assert prerequisites == ['root']
+
+def test_currentStagesAreNotPrerequisites(rig):
+    segments = [['root', 'left', 'merge'],
+                ['root', 'right', 'merge']]
+
+    workerStages, prerequisites = getWorkerStages(
+        rig, segments, stages=['left', 'right', 'merge'])
+
+    assert sorted(workerStages) == ['left', 'right']
+    assert prerequisites == []
+
+def test_stagesBehindAMergeOfWorkerStagesStaySerial(rig):
+    segments = [['a', 'merge', 'x'],
+                ['b', 'merge', 'y']]
+
+    workerStages, prerequisites = getWorkerStages(rig, segments)
+
+    assert sorted(workerStages) == ['a', 'b']
+    assert prerequisites == []
+
+def test_loneBranchStaysSerial(rig):
+    segments = [['root', 'left', 'merge'],
+                ['root', 'right', 'merge']]
+
+    assert getWorkerStages(
+        rig, segments, stages=['left', 'merge']) == ([], [])
+
+def test_rewrittenSnapshotsAreReopened(rig, tmp_path, monkeypatch):
+    scene = tmp_path.joinpath('bind.ma')
+    scene.write_text('// bind')
+    state = {'sceneName': '', 'opened': []}
+
+    def file(*args, **kwargs):
+        if kwargs.get('q'):
+            return state['sceneName'] if 'sceneName' in kwargs else False
+
+        if kwargs.get('open'):
+            state['opened'].append(args[0])
+            state['sceneName'] = args[0]
+
+        elif 'rename' in kwargs:
+            state['sceneName'] = kwargs['rename']
+
+    monkeypatch.setattr(rig.m, 'file', file, raising=False)
+    monkeypatch.setattr(rig, '_sceneSnapshot', None)
+
+    class TestRig(rig.Rig):
+        @classmethod
+        def getSnapshotScene(cls, stageName):
+            return tmp_path.joinpath(stageName+'.ma')
+
+    TestRig._openSnapshot('bind')
+    TestRig._openSnapshot('bind')
+    assert len(state['opened']) == 1
+
+    # Rewritten by another process
+    stat = scene.stat()
+    os.utime(scene, ns=(stat.st_atime_ns, stat.st_mtime_ns+10**9))
+
+    TestRig._openSnapshot('bind')
+    assert len(state['opened']) == 2
@@ -0,0 +1,172 @@
+"""
+Tests for :mod:`paya.lib.spatialindex`, checked against brute-force
+search. Run this file directly for a benchmark on 100k points.
+"""
+
+import time
+import random
+
+import pytest
+
+from conftest import loadPayaModule
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    BRUTE FORCE
+#----------------------------------------------------------|
+
+def sqDist(a, b):
+    return sum((x-y)**2 for x, y in zip(a, b))
+
+def bruteKNearest(points, point, k):
+    found = sorted((sqDist(point, p), i) for i, p in enumerate(points))
+    return [i for _, i in found[:k]]
+
+def bruteWithinRadius(points, point, radius):
+    return [i for i, p in enumerate(points) \
+            if sqDist(point, p) <= radius * radius]
+
+def bruteCollocatedGroups(points, tolerance):
+    grouped = set()
+    groups = []
+
+    for i, point in enumerate(points):
+        if i in grouped:
+            continue
+
+        group = [x for x in bruteWithinRadius(points, point, tolerance) \
+                 if x not in grouped]
+
+        grouped.update(group)
+        groups.append(group)
+
+    return groups
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    FIXTURES
+#----------------------------------------------------------|
+
+@pytest.fixture
+def si(monkeypatch):
+    return loadPayaModule(monkeypatch, 'lib.spatialindex')
+
+def getRandomPoints(rng, num, flat=False):
+    # Snapped to a coarse grid so that there are exact ties and
+    # collocated points
+    return [(rng.randint(-20, 20) * 0.5,
+             rng.randint(-20, 20) * 0.5,
+             0.0 if flat else rng.randint(-20, 20) * 0.5) \
+            for _ in range(num)]
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+@pytest.mark.parametrize('flat', [False, True])
+@pytest.mark.parametrize('cellSize', [None, 0.3, 4.0])
+def test_queriesMatchBruteForce(si, flat, cellSize):
+    rng = random.Random(1)
+    points = getRandomPoints(rng, 400, flat=flat)
+    index = si.SpatialIndex(points, cellSize=cellSize)
+
+    for _ in range(50):
+        # Some queries fall well outside the indexed bounds
+        point = [rng.uniform(-15, 15) for _ in range(3)]
+
+        for k in (1, 5, 30):
+            assert index.kNearest(point, k) == \
+                   bruteKNearest(points, point, k)
+
+        assert index.nearest(point) == bruteKNearest(points, point, 1)[0]
+
+        for radius in (0.0, 0.5, 2.0, 50.0):
+            assert index.withinRadius(point, radius) == \
+                   bruteWithinRadius(points, point, radius)
+
+    for tolerance in (1e-6, 0.6):
+        assert index.getCollocatedGroups(tolerance) == \
+               bruteCollocatedGroups(points, tolerance)
+
+def test_tiesResolveToTheLowerIndex(si):
+    index = si.SpatialIndex([[1, 0, 0], [-1, 0, 0], [0, 1, 0], [1, 0, 0]])
+
+    assert index.nearest([0, 0, 0]) == 0
+    assert index.kNearest([0, 0, 0], 3) == [0, 1, 2]
+    assert index.getCollocatedGroups() == [[0, 3], [1], [2]]
+
+def test_kLargerThanThePointCount(si):
+    index = si.SpatialIndex([[0, 0, 0], [3, 0, 0]])
+    assert index.kNearest([2, 0, 0], 10) == [1, 0]
+
+def test_emptyIndex(si):
+    index = si.SpatialIndex([])
+
+    assert len(index) == 0
+    assert index.kNearest([0, 0, 0], 3) == []
+    assert index.withinRadius([0, 0, 0], 1.0) == []
+    assert index.getCollocatedGroups() == []
+
+    with pytest.raises(ValueError):
+        index.nearest([0, 0, 0])
+
+def test_singlePointAndCollocatedPoints(si):
+    assert si.SpatialIndex([[1, 2, 3]]).nearest([50, 50, 50]) == 0
+
+    index = si.SpatialIndex([[1, 2, 3]] * 4)
+    assert index.getCollocatedGroups() == [[0, 1, 2, 3]]
+
+def test_nonPositiveCellSizesAreRejected(si):
+    with pytest.raises(ValueError):
+        si.SpatialIndex([[0, 0, 0]], cellSize=0.0)
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    BENCHMARK
+#----------------------------------------------------------|
+
+def benchmark(si, numPoints=100000, numQueries=2000, numBrute=20):
+    rng = random.Random(0)
+    points = [(rng.uniform(-100, 100),
+               rng.uniform(-100, 100),
+               rng.uniform(-100, 100)) for _ in range(numPoints)]
+
+    queries = [(rng.uniform(-100, 100),
+                rng.uniform(-100, 100),
+                rng.uniform(-100, 100)) for _ in range(numQueries)]
+
+    startTime = time.perf_counter()
+    index = si.SpatialIndex(points)
+    print("{} points: build {:.3f}s".format(
+        numPoints, time.perf_counter()-startTime))
+
+    startTime = time.perf_counter()
+
+    for query in queries:
+        index.kNearest(query, 5)
+
+    indexTime = (time.perf_counter()-startTime) / numQueries
+
+    startTime = time.perf_counter()
+
+    for query in queries[:numBrute]:
+        assert bruteKNearest(points, query, 5) == index.kNearest(query, 5)
+
+    bruteTime = (time.perf_counter()-startTime) / numBrute
+
+    print("5-NN: {:.3f}ms per query vs {:.1f}ms brute force".format(
+        indexTime * 1e3, bruteTime * 1e3))
+
+    startTime = time.perf_counter()
+
+    for query in queries:
+        index.withinRadius(query, 5.0)
+
+    print("radius 5.0: {:.3f}ms per query".format(
+        (time.perf_counter()-startTime) / numQueries * 1e3))
+
+    startTime = time.perf_counter()
+    index.getCollocatedGroups()
+    print("getCollocatedGroups: {:.3f}s".format(
+        time.perf_counter()-startTime))
+
+if __name__ == '__main__':
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        benchmark(loadPayaModule(monkeypatch, 'lib.spatialindex'))
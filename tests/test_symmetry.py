@@ -0,0 +1,169 @@
+"""
+Tests for :class:`paya.lib.symmetry.SymmetryMap` on a small, symmetrical
+quad grid. Needs NumPy; skipped otherwise.
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    FIXTURES
+#----------------------------------------------------------|
+
+@pytest.fixture
+def sy(monkeymodules):
+    mock, load = monkeymodules
+
+    mock(
+        maya={},
+        maya_cmds={'about': lambda **kwargs: '2024'},
+        maya_api={},
+        maya_api_OpenMaya={},
+        pymel={},
+        pymel_core={},
+        pymel_util={}
+    )
+
+    return load('lib.symmetry')
+
+def v(row, col):
+    # Vertex index on a 5 x 3 grid
+    return row * 5 + col
+
+def getGrid():
+    # Columns at x = -2..2, rows at y = 0..2; column 2 is the centre line.
+    # Each face is wound the same way, so mirrored faces wind in reverse
+    points = [(col-2.0, float(row), 0.0) \
+              for row in range(3) for col in range(5)]
+
+    faceCounts = []
+    faceConnects = []
+
+    for row in range(2):
+        for col in range(4):
+            faceCounts.append(4)
+            faceConnects += [v(row, col), v(row, col+1),
+                             v(row+1, col+1), v(row+1, col)]
+
+    return points, faceCounts, faceConnects
+
+def getGridMapping():
+    return [v(row, 4-col) for row in range(3) for col in range(5)]
+
+def getGridSides():
+    return [(col > 2) - (col < 2) for row in range(3) for col in range(5)]
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_walkTopology(sy):
+    points, faceCounts, faceConnects = getGrid()
+
+    # Seeded from either face winding
+    for seedEdge in [(v(0, 2), v(1, 2)), (v(2, 2), v(1, 2))]:
+        assert sy._walkTopology(faceCounts, faceConnects,
+                                len(points), seedEdge) == getGridMapping()
+
+def test_walkTopologyLeavesOtherShellsUnmatched(sy):
+    points, faceCounts, faceConnects = getGrid()
+
+    # A separate triangle
+    faceCounts.append(3)
+    faceConnects += [15, 16, 17]
+
+    mapping = sy._walkTopology(faceCounts, faceConnects,
+                               18, (v(0, 2), v(1, 2)))
+
+    assert mapping == getGridMapping() + [-1, -1, -1]
+
+def test_walkTopologyRejectsBadInput(sy):
+    points, faceCounts, faceConnects = getGrid()
+
+    # Border edges only have one face
+    with pytest.raises(ValueError):
+        sy._walkTopology(faceCounts, faceConnects,
+                         len(points), (v(0, 0), v(0, 1)))
+
+    # Split the last quad on the right into two triangles
+    faceCounts = faceCounts[:-1] + [3, 3]
+    faceConnects = faceConnects[:-4] + [v(1, 3), v(1, 4), v(2, 4),
+                                        v(1, 3), v(2, 4), v(2, 3)]
+
+    with pytest.raises(ValueError):
+        sy._walkTopology(faceCounts, faceConnects,
+                         len(points), (v(0, 2), v(1, 2)))
+
+def test_fromTopologyAndFromPointsAgree(sy):
+    points, faceCounts, faceConnects = getGrid()
+
+    topological = sy.SymmetryMap.fromTopology(
+        faceCounts, faceConnects, points, (v(0, 2), v(1, 2)))
+
+    positional = sy.SymmetryMap.fromPoints(points)
+
+    for smap in (topological, positional):
+        assert smap.mapping.tolist() == getGridMapping()
+        assert smap.sides.tolist() == getGridSides()
+        assert not len(smap.unmatched())
+
+    assert topological.topologyHash == \
+           sy.getTopologyHash(faceCounts, faceConnects)
+
+def test_fromPointsMatchesAreOneToOne(sy):
+    points, faceCounts, faceConnects = getGrid()
+
+    # A vertex with no counterpart, and one collocated with v(1, 3)
+    points += [(3.0, 0.0, 0.0), (1.0, 1.0, 0.0)]
+    smap = sy.SymmetryMap.fromPoints(points)
+
+    assert smap.mapping.tolist() == getGridMapping() + [-1, -1]
+    assert smap.unmatched().tolist() == [15, 16]
+    assert smap.sides.tolist()[15:] == [1, 1]
+
+    matched = smap.mapping[smap.mapping >= 0]
+    assert len(set(matched.tolist())) == len(matched)
+
+def test_flipDeltas(sy):
+    points, faceCounts, faceConnects = getGrid()
+    points.append((3.0, 0.0, 0.0))
+    smap = sy.SymmetryMap.fromPoints(points)
+
+    indices, deltas = smap.flipDeltas(
+        [v(0, 0), v(1, 2), v(2, 3), 15],
+        [[1, 2, 3], [4, 5, 6], [-1, 0, 1], [7, 8, 9]])
+
+    assert indices.tolist() == [v(0, 4), v(1, 2), v(2, 1), 15]
+    assert deltas.tolist() == [[-1, 2, 3], [-4, 5, 6],
+                               [1, 0, 1], [7, 8, 9]]
+
+    # Flipping twice round-trips
+    twice = smap.flipDeltas(indices, deltas)
+    assert twice[0].tolist() == [v(0, 0), v(1, 2), v(2, 3), 15]
+    assert twice[1].tolist() == [[1, 2, 3], [4, 5, 6],
+                                 [-1, 0, 1], [7, 8, 9]]
+
+def test_mirrorDeltas(sy):
+    points, faceCounts, faceConnects = getGrid()
+
+    # Unmatched vertices on each side
+    points += [(3.0, 0.0, 0.0), (-3.0, 5.0, 0.0)]
+    smap = sy.SymmetryMap.fromPoints(points)
+
+    source = [v(0, 3), v(0, 1), v(1, 2), 15, 16]
+    deltas = [[1, 2, 3], [5, 5, 5], [1, 1, 1], [2, 2, 2], [3, 3, 3]]
+
+    indices, out = smap.mirrorDeltas(source, deltas)
+
+    # Positive side, then copies, then the centre, then unmatched
+    # vertices on the other side; v(0, 1) is overwritten
+    assert indices.tolist() == [v(0, 3), 15, v(0, 1), v(1, 2), 16]
+    assert out.tolist() == [[1, 2, 3], [2, 2, 2], [-1, 2, 3],
+                            [0, 1, 1], [3, 3, 3]]
+
+    indices, out = smap.mirrorDeltas(source, deltas, direction=-1)
+
+    assert indices.tolist() == [v(0, 1), 16, v(0, 3), v(1, 2), 15]
+    assert out.tolist() == [[5, 5, 5], [3, 3, 3], [-5, 5, 5],
+                            [0, 1, 1], [2, 2, 2]]
@@ -0,0 +1,265 @@
+"""
+Tests for packed tags on :class:`paya.networktypes.tagger.Tagger`, against
+a mock scene that counts Maya calls. Run this file directly for a
+benchmark on a 5k-node tag.
+"""
+
+import time
+
+import pytest
+
+from conftest import mockModules, loadPayaModule
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    MOCK SCENE
+#----------------------------------------------------------|
+
+def expandArgs(*args):
+    out = []
+
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            out += expandArgs(*arg)
+
+        else:
+            out.append(arg)
+
+    return out
+
+
+class MockScene:
+    # Full paths and UUIDs; UUIDs may repeat across references
+    def __init__(self):
+        self.uuids = {}
+        self.pathsByUuid = {}
+        self.pathsByName = {}
+        self.attrs = {}
+        self.numCalls = 0
+
+    def add(self, path, uuid):
+        self.uuids[path] = uuid
+        self.pathsByUuid.setdefault(uuid, []).append(path)
+        self.pathsByName.setdefault(path.split('|')[-1], []).append(path)
+
+    def delete(self, path):
+        uuid = self.uuids.pop(path)
+        self.pathsByUuid[uuid].remove(path)
+        self.pathsByName[path.split('|')[-1]].remove(path)
+
+    def _match(self, arg):
+        if arg in self.uuids:
+            return [arg]
+
+        return self.pathsByUuid.get(arg) or self.pathsByName.get(arg, [])
+
+    def ls(self, *args, uuid=False, long=False):
+        self.numCalls += 1
+        paths = {}
+
+        for arg in expandArgs(*args):
+            for path in self._match(arg):
+                paths[path] = None
+
+        if uuid:
+            return [self.uuids[path] for path in paths]
+
+        return list(paths)
+
+    def getAttr(self, plug):
+        self.numCalls += 1
+        return self.attrs.get(plug)
+
+    def setAttr(self, plug, size, *values, type=None):
+        self.numCalls += 1
+        assert size == len(values) and type == 'stringArray'
+        self.attrs[plug] = list(values)
+
+
+class PyNode(str):
+    def __new__(cls, name):
+        return str.__new__(cls, name)
+
+
+class Attribute(PyNode):
+    def node(self):
+        return PyNode(self.split('.')[0])
+
+    def type(self):
+        return 'message' if self.endswith('.message') else 'double'
+
+    def attrName(self, longName=False):
+        return self.split('.', 1)[1]
+
+
+class System(str):
+    def __new__(cls, name, scene):
+        out = str.__new__(cls, name)
+        out.scene = scene
+        out.userAttrs = []
+
+        return out
+
+    def namespace(self):
+        return self.rpartition(':')[0] + ':'
+
+    def hasAttr(self, attrName):
+        return attrName in self.userAttrs
+
+    def addAttr(self, attrName, **kwargs):
+        self.userAttrs.append(attrName)
+
+
+def loadTagger(monkeypatch, scene):
+    mockModules(
+        monkeypatch,
+        maya={},
+        maya_cmds={'ls': scene.ls,
+                   'getAttr': scene.getAttr,
+                   'setAttr': scene.setAttr},
+        pymel={},
+        pymel_core={},
+        pymel_util={'expandArgs': expandArgs}
+    )
+
+    mockModules(
+        monkeypatch,
+        paya_runtime={'PyNode': PyNode,
+                      'Attribute': Attribute,
+                      'networks': type('networks', (), {'System': System})}
+    )
+
+    return loadPayaModule(monkeypatch, 'networktypes.tagger')
+
+@pytest.fixture
+def scene():
+    scene = MockScene()
+    scene.add('|rig|arm', 'U1')
+    scene.add('|rig|hand', 'U2')
+    scene.add('|rig|elbow', 'U3')
+
+    # The same file referenced in; UUIDs repeat
+    scene.add('|ref:rig|ref:arm', 'U1')
+    scene.add('|ref:rig|ref:hand', 'U2')
+
+    return scene
+
+@pytest.fixture
+def tg(monkeypatch, scene):
+    return loadTagger(monkeypatch, scene)
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    TESTS
+#----------------------------------------------------------|
+
+def test_packedRoundTrip(tg, scene):
+    tagger = tg.Tagger('tags', scene)
+    tagger.tag('deps', ['arm', 'hand.translateX', 'elbow.message'],
+               packed=True)
+
+    assert scene.attrs['tags.deps_packedTag'] == \
+           ['U1', 'U3', 'U2.translateX']
+
+    # Re-tagging merges, without repeats
+    tagger.tag('deps', 'arm', 'elbow', packed=True)
+    assert scene.attrs['tags.deps_packedTag'] == \
+           ['U1', 'U3', 'U2.translateX']
+
+    scene.numCalls = 0
+    members = tagger.getByTag('deps')
+
+    assert members == ['|rig|arm', '|rig|elbow', '|rig|hand.translateX']
+    assert isinstance(members[0], tg.r.PyNode)
+    assert isinstance(members[2], tg.r.Attribute)
+
+    # One getAttr, two ls calls
+    assert scene.numCalls == 3
+
+def test_duplicateUuidsPreferTheTaggersNamespace(tg, scene):
+    tagger = tg.Tagger('tags', scene)
+    tagger.tag('deps', 'arm', 'hand.translateX', packed=True)
+
+    refTagger = tg.Tagger('ref:tags', scene)
+    refTagger.userAttrs.append('deps_packedTag')
+    scene.attrs['ref:tags.deps_packedTag'] = \
+        scene.attrs['tags.deps_packedTag']
+
+    assert tagger.getByTag('deps') == \
+           ['|rig|arm', '|rig|hand.translateX']
+
+    assert refTagger.getByTag('deps') == \
+           ['|ref:rig|ref:arm', '|ref:rig|ref:hand.translateX']
+
+def test_deletedMembersAreSkipped(tg, scene):
+    tagger = tg.Tagger('tags', scene)
+    tagger.tag('deps', 'arm', 'elbow', 'hand.translateX', packed=True)
+
+    scene.delete('|rig|elbow')
+    scene.delete('|rig|hand')
+    scene.delete('|ref:rig|ref:hand')
+
+    assert tagger.getByTag('deps') == ['|rig|arm']
+
+def test_ambiguousNamesAreRejected(tg, scene):
+    scene.add('|other|arm', 'U9')
+
+    with pytest.raises(RuntimeError):
+        tg.Tagger('tags', scene).tag('deps', 'arm', packed=True)
+
+def test_misalignedLookupsAreRejected(tg, scene, monkeypatch):
+    tagger = tg.Tagger('tags', scene)
+    tagger.tag('deps', 'arm', 'hand', packed=True)
+
+    ls = scene.ls
+
+    def dropOne(*args, **kwargs):
+        result = ls(*args, **kwargs)
+        return result[1:] if kwargs.get('uuid') else result
+
+    monkeypatch.setattr(tg.m, 'ls', dropOne)
+
+    with pytest.raises(RuntimeError):
+        tagger.getByTag('deps')
+
+#----------------------------------------------------------|
+#----------------------------------------------------------|    BENCHMARK
+#----------------------------------------------------------|
+
+def benchmark(monkeypatch, numNodes=5000):
+    scene = MockScene()
+    names = ['node{}'.format(i) for i in range(numNodes)]
+
+    for i, name in enumerate(names):
+        scene.add('|part|'+name, 'U{}'.format(i))
+
+    tg = loadTagger(monkeypatch, scene)
+    tagger = tg.Tagger('tags', scene)
+
+    def run(label, func):
+        scene.numCalls = 0
+        startTime = time.perf_counter()
+        result = func()
+        print("{}: {} Maya calls, {:.3f}s".format(
+            label, scene.numCalls, time.perf_counter()-startTime))
+
+        return result
+
+    # Message tags need a connectAttr per member, plus a listConnections
+    # per member on retrieval
+    print("message tag: {} connectAttr calls; getByTag: {} "
+          "listConnections calls".format(numNodes, numNodes))
+
+    run("packed tag, {} nodes".format(numNodes),
+        lambda: tagger.tag('deps', names, packed=True))
+
+    entries = scene.attrs['tags.deps_packedTag']
+
+    perEntry = run("per-entry ls resolution", lambda: [
+        scene.ls(entry, long=True) for entry in entries])
+
+    batched = run("packed getByTag", lambda: tagger.getByTag('deps'))
+
+    assert [path for paths in perEntry for path in paths] == batched
+
+if __name__ == '__main__':
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        benchmark(monkeypatch)